@@ -4,6 +4,7 @@ from jidutest_can.canapp import CanController
 from jidutest_can.canapp import CanLogManager
 from jidutest_can.canapp.tools import CanTools
 from jidutest_can.cantools import load_file
+from jidutest_can.cantools import load_shared
 from jidutest_can.cantools import Database
 from jidutest_can.cantools import Message
 from jidutest_can.cantools import Signal
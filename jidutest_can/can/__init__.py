@@ -12,13 +12,20 @@ from jidutest_can.can.tools import CanInitializationError
 from jidutest_can.can.tools import CanInterfaceNotImplementedError
 from jidutest_can.can.tools import CanTimeoutError
 
+from jidutest_can.can.bcm import CyclicSendScheduler
 from jidutest_can.can.bcm import CyclicSendTaskABC
+from jidutest_can.can.bcm import JitterStatistics
 from jidutest_can.can.bcm import LimitedDurationCyclicSendTaskABC
 from jidutest_can.can.bcm import ModifiableCyclicTaskABC
 from jidutest_can.can.bcm import MultiRateCyclicSendTaskABC 
+from jidutest_can.can.bcm import PeriodicTaskRegistry
 from jidutest_can.can.bcm import RestartableCyclicTaskABC
+from jidutest_can.can.bcm import ScheduledCyclicSendTask
 from jidutest_can.can.bcm import ThreadBasedReceiveTask
+from jidutest_can.can.e2e_monitor import E2EMonitor
+from jidutest_can.can.e2e_monitor import E2EStatistics
 from jidutest_can.can.listener import Listener
+from jidutest_can.can.listener import QueuedListener
 
 from jidutest_can.can.bus import CanBus
 from jidutest_can.can.bus import ThreadSafeBus
@@ -31,6 +38,14 @@ from jidutest_can.can.notifier import Notifier
 from jidutest_can.can.notifier import Reader
 from jidutest_can.can.notifier import RedirectReader
 
+from jidutest_can.can.signal_state import MessageState
+from jidutest_can.can.signal_state import SignalStateStore
+
+from jidutest_can.can.waiter import AsyncFrameSubscription
+from jidutest_can.can.waiter import AsyncFrameWaiter
+from jidutest_can.can.waiter import FrameSubscription
+from jidutest_can.can.waiter import FrameWaiter
+
 
 from jidutest_can.can.util import set_logging_level
 from jidutest_can.can.io import BLFWriter
@@ -38,5 +53,9 @@ from jidutest_can.can.io import ASCWriter
 from jidutest_can.can.io import Logger
 from jidutest_can.can.io import SizedRotatingLogger
 from jidutest_can.can.io import LogReader
+from jidutest_can.can.io import ParallelBLFReader
 from jidutest_can.can.io import MessageSync
+from jidutest_can.can.io import ReplayEngine
+from jidutest_can.can.io import ReplayReport
 from jidutest_can.can.io import Printer
+from jidutest_can.can.io import ThreadedWriter
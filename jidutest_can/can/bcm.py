@@ -1,10 +1,16 @@
 import abc
+import copy
+import heapq
+import itertools
+import math
 import queue
 import sys
 import time
 import logging
 import threading
 from typing import Callable
+from typing import Dict
+from typing import List
 from typing import Optional
 from typing import Sequence
 from typing import Tuple
@@ -38,6 +44,9 @@ logger = logging.getLogger(__name__)
 NANOSECONDS_IN_SECOND: Final[int] = 1_000_000_000
 NANOSECONDS_IN_MILLISECOND: Final[int] = 1_000_000
 
+#: Updates the data of a message in place just before it is sent.
+PayloadGenerator = Callable[[RawMessage], None]
+
 
 class CyclicTask(abc.ABC):
     """
@@ -148,6 +157,35 @@ class RestartableCyclicTaskABC(CyclicSendTaskABC):
 class ModifiableCyclicTaskABC(CyclicSendTaskABC):
     """Adds support for modifying a periodic message"""
 
+    #: Called with every message just before it is sent, if supported by the
+    #: task, see :meth:`~can.BusABC.send_periodic`.
+    payload_generator: Optional[PayloadGenerator] = None
+
+    def _loopback_copy(self, message: RawMessage) -> RawMessage:
+        """Return a copy of the sent `message` for the listeners of the bus."""
+        looped = copy.copy(message)
+        if self.payload_generator is not None:
+            # the generator updates the data of the message in place
+            looped.data = bytearray(message.data)
+        return looped
+
+    def _generate_payload(self, message: RawMessage) -> bool:
+        """Let :attr:`payload_generator` update `message` before it is sent.
+
+        Errors of the generator are handled like errors of the bus, see
+        :class:`ThreadBasedCyclicSendTask`.
+
+        :return: ``False`` if the message must not be sent and the task stops.
+        """
+        try:
+            self.payload_generator(message)
+        except Exception as exc:  # pylint: disable=broad-except
+            self.exception = exc
+            logger.exception(f"Payload generator of 0x{self.arbitration_id:X}: {exc}")
+            on_error = getattr(self, "on_error", None)
+            return bool(on_error and on_error(exc))
+        return True
+
     def _check_modified_messages(self, messages: Tuple[RawMessage, ...]) -> None:
         """Helper function to perform error checking when modifying the data in
         the cyclic task.
@@ -190,6 +228,52 @@ class ModifiableCyclicTaskABC(CyclicSendTaskABC):
 
         self.messages = messages
 
+    def modify_payloads(self, payloads: Union[Sequence[bytes], bytes]) -> None:
+        """Replace the data of the periodically sent messages, without
+        altering the timing.
+
+        New messages carrying `payloads` are built from the current ones and
+        swapped in as a whole, so every transmission sends either the previous
+        or the new messages, never a mix of both. The current messages are not
+        modified, no copies of them are needed.
+
+        :param payloads:
+            The new data of each message, in order. A single payload replaces
+            the data of all messages.
+
+        :raises ValueError: If the number of payloads does not match the
+                            number of messages
+        """
+        messages = self.messages
+        if isinstance(payloads, (bytes, bytearray)):
+            payloads = [payloads] * len(messages)
+        if len(payloads) != len(messages):
+            raise ValueError(
+                "The number of new payloads must be equal to the number of "
+                "messages of this task"
+            )
+        modified = []
+        for message, data in zip(messages, payloads):
+            data = bytearray(data)
+            modified.append(RawMessage(
+                arbitration_id=message.arbitration_id,
+                is_extended_id=message.is_extended_id,
+                is_remote_frame=message.is_remote_frame,
+                channel=message.channel,
+                dlc=len(data),
+                data=data,
+                is_fd=message.is_fd,
+                is_rx=message.is_rx,
+                bitrate_switch=message.bitrate_switch,
+                error_state_indicator=message.error_state_indicator,
+            ))
+        self.modify_data(modified)
+
+    @property
+    def payloads(self) -> Tuple[bytes, ...]:
+        """The data of the periodically sent messages."""
+        return tuple(bytes(message.data) for message in self.messages)
+
 
 class MultiRateCyclicSendTaskABC(CyclicSendTaskABC):
     """A Cyclic send task that supports switches send frequency after a set time."""
@@ -218,6 +302,82 @@ class MultiRateCyclicSendTaskABC(CyclicSendTaskABC):
         self._channel = channel
 
 
+class PeriodicTaskRegistry:
+    """Finds the cyclic send tasks of a bus by arbitration ID or message name
+    in constant time.
+
+    Tasks are registered by :meth:`~can.BusABC.send_periodic` and removed
+    again when they are stopped, see :attr:`~can.BusABC.task_registry`.
+    Several tasks may send the same arbitration ID, the one started last is
+    returned by :meth:`get`.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._tasks: Dict[int, List[CyclicSendTaskABC]] = dict()
+        self._frame_ids: Dict[str, int] = dict()
+
+    def register(self, task: CyclicSendTaskABC, name: Optional[str] = None) -> None:
+        """Register `task`, optionally under the message name `name`."""
+        with self._lock:
+            tasks = self._tasks.setdefault(task.arbitration_id, [])
+            if task in tasks:
+                tasks.remove(task)
+            tasks.append(task)
+            if name is not None:
+                self._frame_ids[name] = task.arbitration_id
+
+    def unregister(self, task: CyclicSendTaskABC) -> None:
+        """Forget `task`, unknown tasks are ignored."""
+        with self._lock:
+            tasks = self._tasks.get(task.arbitration_id)
+            if not tasks or task not in tasks:
+                return
+            tasks.remove(task)
+            if not tasks:
+                del self._tasks[task.arbitration_id]
+                for name in [name for name, frame_id in self._frame_ids.items()
+                             if frame_id == task.arbitration_id]:
+                    del self._frame_ids[name]
+
+    def get(self, frame_id: int) -> Optional[CyclicSendTaskABC]:
+        """Return the task sending `frame_id` started last, or ``None``."""
+        with self._lock:
+            tasks = self._tasks.get(frame_id)
+            return tasks[-1] if tasks else None
+
+    def get_all(self, frame_id: int) -> List[CyclicSendTaskABC]:
+        """Return all tasks sending `frame_id`, in the order they were started."""
+        with self._lock:
+            return list(self._tasks.get(frame_id, ()))
+
+    def get_by_name(self, name: str) -> Optional[CyclicSendTaskABC]:
+        """Return the task of the message `name` started last, or ``None``."""
+        with self._lock:
+            tasks = self._tasks.get(self._frame_ids.get(name))
+            return tasks[-1] if tasks else None
+
+    @property
+    def frame_ids(self) -> List[int]:
+        """The arbitration IDs with a registered task."""
+        with self._lock:
+            return list(self._tasks)
+
+    def clear(self) -> None:
+        """Forget all tasks."""
+        with self._lock:
+            self._tasks.clear()
+            self._frame_ids.clear()
+
+    def __contains__(self, frame_id: int) -> bool:
+        with self._lock:
+            return frame_id in self._tasks
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(tasks) for tasks in self._tasks.values())
+
+
 class ThreadBasedCyclicSendTask(
     ModifiableCyclicTaskABC, LimitedDurationCyclicSendTaskABC, RestartableCyclicTaskABC
 ):
@@ -231,6 +391,7 @@ class ThreadBasedCyclicSendTask(
         period: float,
         duration: Optional[float] = None,
         on_error: Optional[Callable[[Exception], bool]] = None,
+        payload_generator: Optional[PayloadGenerator] = None,
     ) -> None:
         """Transmits `messages` with a `period` seconds for `duration` seconds on a `bus`.
 
@@ -244,12 +405,15 @@ class ThreadBasedCyclicSendTask(
                          error happened on a `bus` while sending `messages`,
                          it shall return either ``True`` or ``False`` depending
                          on desired behaviour of `ThreadBasedCyclicSendTask`.
+        :param payload_generator: Called with each message just before it is
+                                  sent, to update its data in place.
 
         :raises ValueError: If the given messages are invalid
         """
         super().__init__(messages, period, duration)
         self.bus = bus
         self.send_lock = lock
+        self.payload_generator = payload_generator
         self.stopped = True
         self.thread: Optional[threading.Thread] = None
         self.end_time: Optional[float] = (
@@ -297,6 +461,8 @@ class ThreadBasedCyclicSendTask(
         while not self.stopped:
             # Prevent calling bus.send from multiple threads
             message = self.messages[msg_index]
+            if self.payload_generator is not None and not self._generate_payload(message):
+                break
             message.timestamp = time.time()
             with self.send_lock:
                 try:
@@ -311,7 +477,9 @@ class ThreadBasedCyclicSendTask(
                         break
             notifier = BUS_NOTIFIER_MAPPING.get(self.bus)
             if notifier and not self.bus.channel_info.startswith("TOSUN_CANBUS"):
-                getattr(notifier, "_on_message_received")(message)
+                # listeners may queue the message, e.g. ThreadedWriter, while
+                # the next period overwrites its timestamp
+                getattr(notifier, "_on_message_received")(self._loopback_copy(message))
             msg_due_time_ns += self.period_ns
             if self.end_time is not None and time.perf_counter() >= self.end_time:
                 break
@@ -330,6 +498,331 @@ class ThreadBasedCyclicSendTask(
                     time.sleep(delay_ns / NANOSECONDS_IN_SECOND)
 
 
+class JitterStatistics:
+    """Running statistics of the deviation between the scheduled and the
+    actual transmission time of a cyclic task, in seconds.
+
+    Positive values mean the message was sent late.
+    """
+
+    __slots__ = ("count", "mean", "minimum", "maximum", "overruns", "_m2")
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        #: number of periods skipped because the task fell behind by more than one period
+        self.overruns = 0
+        self._m2 = 0.0
+
+    def add(self, deviation: float) -> None:
+        # Welford's online algorithm, numerically stable and O(1)
+        self.count += 1
+        delta = deviation - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (deviation - self.mean)
+        if deviation < self.minimum:
+            self.minimum = deviation
+        if deviation > self.maximum:
+            self.maximum = deviation
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self._m2 / self.count) if self.count else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "std": self.std,
+            "min": self.minimum if self.count else 0.0,
+            "max": self.maximum if self.count else 0.0,
+            "overruns": self.overruns,
+        }
+
+    def __repr__(self) -> str:
+        return (f"JitterStatistics(count={self.count}, mean={self.mean * 1e3:.3f}ms, "
+                f"std={self.std * 1e3:.3f}ms, min={self.as_dict()['min'] * 1e3:.3f}ms, "
+                f"max={self.as_dict()['max'] * 1e3:.3f}ms, overruns={self.overruns})")
+
+
+class CyclicSendScheduler:
+    """Drives any number of :class:`ScheduledCyclicSendTask` objects from a
+    single daemon thread.
+
+    Due times are kept in a heap; the thread sleeps until the earliest one,
+    then sends every message due within `batch_window` seconds in one go,
+    taking the send lock of each bus only once per batch. One scheduler can
+    serve the tasks of a single bus or, via :meth:`default`, of the whole
+    process.
+    """
+
+    _default: Optional["CyclicSendScheduler"] = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, name: str = "Cyclic send scheduler", batch_window: float = 0.0002) -> None:
+        """
+        :param name: Name of the scheduler thread.
+        :param batch_window: Messages due within this many seconds after the
+                             earliest due message are sent in the same batch.
+        """
+        self.name = name
+        self.batch_window_ns = int(round(batch_window * NANOSECONDS_IN_SECOND))
+        self._heap: List[tuple] = []
+        self._sequence = itertools.count()
+        self._tasks: Dict["ScheduledCyclicSendTask", None] = dict()
+        self._condition = threading.Condition(threading.Lock())
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        if USE_WINDOWS_EVENTS:
+            try:
+                self._timer = win32event.CreateWaitableTimerEx(
+                    None,
+                    None,
+                    win32event.CREATE_WAITABLE_TIMER_HIGH_RESOLUTION,
+                    win32event.TIMER_ALL_ACCESS,
+                )
+            except (AttributeError, OSError):
+                self._timer = win32event.CreateWaitableTimer(None, False, None)
+            self._wake_event = win32event.CreateEvent(None, False, False, None)
+
+    @classmethod
+    def default(cls) -> "CyclicSendScheduler":
+        """Return the process wide scheduler, creating it on first use."""
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls(name="Cyclic send scheduler (default)")
+            return cls._default
+
+    @property
+    def tasks(self) -> List["ScheduledCyclicSendTask"]:
+        """The tasks currently scheduled."""
+        with self._condition:
+            return list(self._tasks)
+
+    def statistics(self) -> Dict["ScheduledCyclicSendTask", JitterStatistics]:
+        """Return the jitter statistics of all scheduled tasks."""
+        return {task: task.statistics for task in self.tasks}
+
+    def add(self, task: "ScheduledCyclicSendTask") -> None:
+        """Schedule `task`, its first message is sent immediately."""
+        with self._condition:
+            heapq.heappush(self._heap, (task.next_due_ns, next(self._sequence), task._generation, task))
+            self._tasks[task] = None
+            if self._thread is None or not self._thread.is_alive():
+                self._running = True
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+            elif self._heap[0][3] is task:
+                self._wake()
+
+    def stop(self) -> None:
+        """Stop the scheduler thread. Tasks still scheduled are not stopped
+        but will not be sent anymore until the scheduler is used again."""
+        with self._condition:
+            self._running = False
+            self._wake()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def _wake(self) -> None:
+        # must be called with the condition held
+        if USE_WINDOWS_EVENTS:
+            win32event.SetEvent(self._wake_event)
+        else:
+            self._condition.notify()
+
+    def _wait(self, delay_ns: int) -> None:
+        # must be called with the condition held
+        if USE_WINDOWS_EVENTS:
+            self._condition.release()
+            try:
+                # relative due time in 100 ns units
+                win32event.SetWaitableTimer(self._timer, -max(1, delay_ns // 100), 0, None, None, False)
+                win32event.WaitForMultipleObjects([self._timer, self._wake_event], False, win32event.INFINITE)
+            finally:
+                self._condition.acquire()
+        else:
+            self._condition.wait(delay_ns / NANOSECONDS_IN_SECOND)
+
+    def _next_batch(self) -> List[tuple]:
+        with self._condition:
+            while self._running:
+                if not self._heap:
+                    if USE_WINDOWS_EVENTS:
+                        self._wait(NANOSECONDS_IN_SECOND)
+                    else:
+                        self._condition.wait()
+                    continue
+                now_ns = time.perf_counter_ns()
+                delay_ns = self._heap[0][0] - now_ns
+                if delay_ns > self.batch_window_ns:
+                    self._wait(delay_ns)
+                    continue
+                batch = []
+                horizon_ns = now_ns + self.batch_window_ns
+                while self._heap and self._heap[0][0] <= horizon_ns:
+                    entry = heapq.heappop(self._heap)
+                    task = entry[3]
+                    if task.stopped or entry[2] != task._generation:
+                        # stale entry of a stopped or restarted task
+                        if task.stopped:
+                            self._tasks.pop(task, None)
+                        continue
+                    batch.append(entry)
+                return batch
+        return []
+
+    def _run(self) -> None:
+        while self._running:
+            batch = self._next_batch()
+            if not batch:
+                continue
+
+            # group by bus, so that every send lock is taken once per batch
+            by_bus: Dict[int, List[tuple]] = dict()
+            for entry in batch:
+                by_bus.setdefault(id(entry[3].bus), []).append(entry)
+
+            for entries in by_bus.values():
+                bus = entries[0][3].bus
+                bus_lock = entries[0][3].send_lock
+                sent = []
+                messages = []
+                now = time.time()
+                generated = []
+                for entry in entries:
+                    task = entry[3]
+                    message = task.messages[task.msg_index]
+                    if task.payload_generator is not None and not task._generate_payload(message):
+                        task.stopped = True
+                        continue
+                    message.timestamp = now
+                    generated.append(entry)
+                    messages.append(message)
+                entries = generated
+                index = 0
+                with bus_lock:
+                    while index < len(entries):
+                        try:
+                            count = bus.send_many(messages[index:])
+                        except Exception as exc:  # pylint: disable=broad-except
+                            # send_many() only raises for the first message
+                            task = entries[index][3]
+                            task.exception = exc
+                            logger.exception(f"{self.name} 0x{task.arbitration_id:X}: {exc}")
+                            if task.on_error and task.on_error(exc):
+                                sent.append((entries[index], messages[index], time.perf_counter_ns()))
+                            else:
+                                task.stopped = True
+                            index += 1
+                            continue
+                        if not count:
+                            break
+                        sent_ns = time.perf_counter_ns()
+                        for position in range(index, index + count):
+                            sent.append((entries[position], messages[position], sent_ns))
+                        index += count
+
+                notifier = BUS_NOTIFIER_MAPPING.get(bus)
+                loopback = notifier and not bus.channel_info.startswith("TOSUN_CANBUS")
+                for (due_ns, _, generation, task), message, sent_ns in sent:
+                    if loopback:
+                        # the tasks of all buses share this thread, a failing
+                        # listener must not stop them
+                        try:
+                            getattr(notifier, "_on_message_received")(task._loopback_copy(message))
+                        except Exception as exc:  # pylint: disable=broad-except
+                            logger.exception(f"{self.name} 0x{task.arbitration_id:X} loopback: {exc}")
+                    task._advance(due_ns, sent_ns)
+
+            with self._condition:
+                for entry in batch:
+                    task = entry[3]
+                    if task.stopped or entry[2] != task._generation:
+                        if task.stopped:
+                            self._tasks.pop(task, None)
+                        continue
+                    heapq.heappush(self._heap, (task.next_due_ns, next(self._sequence), entry[2], task))
+
+
+class ScheduledCyclicSendTask(
+    ModifiableCyclicTaskABC, LimitedDurationCyclicSendTaskABC, RestartableCyclicTaskABC
+):
+    """Cyclic send task driven by a shared :class:`CyclicSendScheduler`
+    instead of a thread of its own."""
+
+    def __init__(
+        self,
+        bus: "BusABC",
+        lock: threading.Lock,
+        messages: Union[Sequence[RawMessage], RawMessage],
+        period: float,
+        duration: Optional[float] = None,
+        on_error: Optional[Callable[[Exception], bool]] = None,
+        scheduler: Optional[CyclicSendScheduler] = None,
+        payload_generator: Optional[PayloadGenerator] = None,
+    ) -> None:
+        """Transmits `messages` with a `period` seconds for `duration` seconds on a `bus`.
+
+        `on_error` and `payload_generator` behave as for
+        :class:`ThreadBasedCyclicSendTask`.
+
+        :param scheduler: The scheduler driving this task, ``None`` selects
+                          :meth:`CyclicSendScheduler.default`.
+
+        :raises ValueError: If the given messages are invalid
+        """
+        super().__init__(messages, period, duration)
+        self.bus = bus
+        self.send_lock = lock
+        self.payload_generator = payload_generator
+        self.scheduler = scheduler or CyclicSendScheduler.default()
+        self.stopped = True
+        self.end_time: Optional[float] = (
+            time.perf_counter() + duration if duration else None
+        )
+        self.on_error = on_error
+        self.exception: Optional[Exception] = None
+        self.msg_index = 0
+        self.next_due_ns = 0
+        #: deviation of the actual from the scheduled send times
+        self.statistics = JitterStatistics()
+        self._generation = 0
+
+        self.start()
+
+    def stop(self) -> None:
+        self.stopped = True
+
+    def start(self) -> None:
+        if not self.stopped:
+            return
+        self.stopped = False
+        self._generation += 1
+        self.next_due_ns = time.perf_counter_ns()
+        self.scheduler.add(self)
+
+    def _advance(self, due_ns: int, sent_ns: int) -> None:
+        """Record the transmission of the current message and compute the next due time."""
+        self.statistics.add((sent_ns - due_ns) / NANOSECONDS_IN_SECOND)
+        if self.end_time is not None and time.perf_counter() >= self.end_time:
+            self.stopped = True
+            return
+        self.msg_index = (self.msg_index + 1) % len(self.messages)
+        next_due_ns = due_ns + self.period_ns
+        if next_due_ns < sent_ns - self.period_ns:
+            # fell behind by more than a period, resynchronize instead of bursting
+            self.statistics.overruns += (sent_ns - next_due_ns) // self.period_ns if self.period_ns else 1
+            next_due_ns = sent_ns
+        self.next_due_ns = next_due_ns
+
+
 class ThreadBasedReceiveTask(CyclicTask):
 
     def __init__(
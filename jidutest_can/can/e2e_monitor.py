@@ -0,0 +1,308 @@
+"""
+This module contains :class:`E2EMonitor`, a listener that verifies the
+end-to-end protection, i.e. the checksum (``Chks``) and counter (``Cntr``)
+signals, of every received frame and keeps statistics per arbitration ID.
+"""
+
+import logging
+import threading
+import time
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from jidutest_can.can.listener import Listener
+from jidutest_can.can.message import RawMessage
+from jidutest_can.can.tools.e2e import COUNTER_MODULUS
+from jidutest_can.can.tools.e2e import E2EGroup
+from jidutest_can.can.tools.e2e import E2EPlan
+
+
+logger = logging.getLogger(__name__)
+
+
+class E2EStatistics:
+    """The E2E statistics of one arbitration ID.
+
+    :attr frame_id: the arbitration ID
+    :attr name: the name of the message in the database
+    :attr frames: number of received frames
+    :attr crc_errors: number of checksums not matching the frame
+    :attr counter_jumps: number of counters not following the previous one,
+                         i.e. frames were lost or reordered
+    :attr repeats: number of counters equal to the previous one
+    :attr timeouts: number of gaps between two frames longer than the timeout,
+                    including the current gap if no frame has been received
+                    for longer than the timeout
+    :attr decode_errors: number of frames that could not be decoded or whose
+                         values do not fit into the CRC data
+    :attr last_timestamp: timestamp of the last frame, ``None`` before the
+                          first one
+    """
+
+    __slots__ = ("frame_id", "name", "frames", "crc_errors", "counter_jumps", "repeats",
+                 "timeouts", "decode_errors", "last_timestamp")
+
+    def __init__(self, frame_id: int, name: str) -> None:
+        self.frame_id = frame_id
+        self.name = name
+        self.frames = 0
+        self.crc_errors = 0
+        self.counter_jumps = 0
+        self.repeats = 0
+        self.timeouts = 0
+        self.decode_errors = 0
+        self.last_timestamp: Optional[float] = None
+
+    @property
+    def errors(self) -> int:
+        """Total number of detected errors."""
+        return self.crc_errors + self.counter_jumps + self.repeats + self.timeouts + self.decode_errors
+
+    def copy(self) -> "E2EStatistics":
+        statistics = E2EStatistics(self.frame_id, self.name)
+        for attribute in self.__slots__:
+            setattr(statistics, attribute, getattr(self, attribute))
+        return statistics
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the statistics as a dictionary."""
+        statistics = {attribute: getattr(self, attribute) for attribute in self.__slots__}
+        statistics["errors"] = self.errors
+        return statistics
+
+    def __repr__(self) -> str:
+        return (f"E2EStatistics(frame_id=0x{self.frame_id:x}, name={self.name!r}, frames={self.frames}, "
+                f"crc_errors={self.crc_errors}, counter_jumps={self.counter_jumps}, repeats={self.repeats}, "
+                f"timeouts={self.timeouts}, decode_errors={self.decode_errors})")
+
+
+class _MonitoredMessage:
+    """The compiled E2E checks of one database message."""
+
+    __slots__ = ("message", "groups", "crc_checked", "timeout", "statistics", "counters", "last_arrival",
+                 "silent")
+
+    def __init__(self, message: Any, plan: E2EPlan, timeout: Optional[float]) -> None:
+        self.message = message
+        self.groups: Tuple[E2EGroup, ...] = tuple(plan.groups)
+        #: whether the checksum of a group is checked, see _is_crc_checked()
+        self.crc_checked: Tuple[bool, ...] = tuple(self._is_crc_checked(group) for group in self.groups)
+        self.timeout = timeout
+        self.statistics = E2EStatistics(message.frame_id, message.name)
+        #: the last counter per group, ``None`` before the first frame
+        self.counters: List[Optional[int]] = [None] * len(self.groups)
+        #: time.monotonic() when the last frame was received, ``None`` before the first frame
+        self.last_arrival: Optional[float] = None
+        #: whether the timeout of the current gap has already been counted
+        self.silent = False
+
+    def _is_crc_checked(self, group: E2EGroup) -> bool:
+        if group.data_id is None:
+            return False
+        float_fields = [field.name for field in group.fields if field.signal.is_float]
+        if float_fields:
+            # the raw value of a float signal has no byte representation in the CRC data
+            logger.warning(f"The checksum {group.chks_name} of message {self.message.name} covers the float "
+                           f"signals {float_fields} and is not checked")
+            return False
+        return True
+
+
+class E2EMonitor(Listener):
+    """Verifies the E2E protection of received frames in real time.
+
+    For every message of the database with a checksum signal in a signal
+    group, see :class:`~can.tools.e2e.E2EPlan`, each received frame is checked
+    for
+
+    * a checksum matching the data ID, counter and covered signals (only if
+      the checksum signal has a data ID),
+    * a counter incremented by one (modulo 15) compared to the previous frame,
+      otherwise a repeat or a jump is counted,
+    * a gap to the previous frame not longer than the timeout, by default
+      `timeout_factor` times the cycle time of the message. A message which
+      stops being sent counts a timeout as soon as its silence exceeds the
+      timeout, see :meth:`check_timeouts`.
+
+    Checksums covering float signals are not checked. Frames of other arbitration IDs are ignored. Attach the monitor to a
+    :class:`~can.Notifier`::
+
+        monitor = E2EMonitor(db)
+        notifier = Notifier(bus, [monitor])
+        ...
+        print(monitor.summary())
+
+    The statistics can be read from any thread while frames are received.
+    """
+
+    def __init__(self,
+                 db: Any,
+                 timeout_factor: float = 2.0,
+                 timeouts: Optional[Dict[int, float]] = None) -> None:
+        """
+        :param db: The :class:`~jidutest_can.cantools.Database` defining the
+                   E2E protected messages.
+        :param timeout_factor: The timeout of a message in multiples of its
+                               cycle time. Messages without cycle time are not
+                               checked for timeouts.
+        :param timeouts: Timeouts in seconds per arbitration ID, overriding
+                         the ones derived from the cycle times.
+        """
+        super().__init__()
+        self.timeout_factor = timeout_factor
+        self._lock = threading.Lock()
+        self._monitored: Dict[int, _MonitoredMessage] = dict()
+        timeouts = timeouts or {}
+        for message in db.messages:
+            plan = E2EPlan(message)
+            if not plan:
+                continue
+            timeout = timeouts.get(message.frame_id)
+            if timeout is None and message.cycle_time:
+                timeout = message.cycle_time / 1000 * timeout_factor
+            self._monitored[message.frame_id] = _MonitoredMessage(message, plan, timeout)
+
+    @property
+    def frame_ids(self) -> List[int]:
+        """The monitored arbitration IDs."""
+        return list(self._monitored)
+
+    def on_message_received(self, msg: RawMessage) -> None:
+        self.on_messages_received((msg,))
+
+    def on_messages_received(self, msgs: Sequence[RawMessage]) -> None:
+        monitored = self._monitored
+        now = time.monotonic()
+        with self._lock:
+            for msg in msgs:
+                entry = monitored.get(msg.arbitration_id)
+                if entry is not None and not msg.is_error_frame and not msg.is_remote_frame:
+                    self._check(entry, msg, now)
+
+    def _check(self, entry: _MonitoredMessage, msg: RawMessage, now: float) -> None:
+        statistics = entry.statistics
+        statistics.frames += 1
+        entry.last_arrival = now
+        timestamp = msg.timestamp
+        if entry.silent:
+            # the timeout of this gap was counted by _check_timeouts()
+            entry.silent = False
+        elif entry.timeout is not None and statistics.last_timestamp is not None \
+                and timestamp - statistics.last_timestamp > entry.timeout:
+            statistics.timeouts += 1
+            logger.debug(f"E2E timeout of 0x{msg.arbitration_id:x}: "
+                         f"{timestamp - statistics.last_timestamp:.3f} s since the previous frame")
+        statistics.last_timestamp = timestamp
+
+        try:
+            values = entry.message.decode(msg.data, decode_choices=False, scaling=False)
+        except Exception as ex:
+            statistics.decode_errors += 1
+            logger.debug(f"Unable to decode 0x{msg.arbitration_id:x}: {ex}")
+            return
+
+        for index, group in enumerate(entry.groups):
+            counter = values.get(group.cntr_name)
+            if counter is None:
+                continue
+            last_counter = entry.counters[index]
+            entry.counters[index] = counter
+            if last_counter is not None:
+                if counter == last_counter:
+                    statistics.repeats += 1
+                elif (counter - last_counter) % COUNTER_MODULUS != 1:
+                    statistics.counter_jumps += 1
+                    logger.debug(f"E2E counter jump of {group.cntr_name}: {last_counter} -> {counter}")
+
+            if not entry.crc_checked[index]:
+                continue
+            try:
+                checksum = group.checksum(counter, [values[field.name] for field in group.fields])
+            except KeyError:
+                continue
+            except (OverflowError, TypeError, AttributeError) as ex:
+                # e.g. a negative value of a signed signal
+                statistics.decode_errors += 1
+                logger.debug(f"Unable to calculate the checksum {group.chks_name}: {ex}")
+                continue
+            if checksum != values.get(group.chks_name):
+                statistics.crc_errors += 1
+                logger.debug(f"E2E checksum error of {group.chks_name}: "
+                             f"received {values.get(group.chks_name)}, expected {checksum}")
+
+    def _check_timeouts(self, now: float) -> None:
+        for entry in self._monitored.values():
+            if entry.timeout is not None and entry.last_arrival is not None and not entry.silent \
+                    and now - entry.last_arrival > entry.timeout:
+                entry.silent = True
+                entry.statistics.timeouts += 1
+                logger.debug(f"E2E timeout of 0x{entry.message.frame_id:x}: "
+                             f"no frame for {now - entry.last_arrival:.3f} s")
+
+    def check_timeouts(self) -> None:
+        """Count a timeout for every arbitration ID which has not been received
+        for longer than its timeout since its last frame.
+
+        A gap is counted once, no matter how often it is checked or whether a
+        frame ends it later on. :meth:`statistics`, :meth:`get_statistics`,
+        :meth:`summary` and :attr:`errors` check the timeouts themselves, call
+        this method periodically to see them in between.
+        """
+        with self._lock:
+            self._check_timeouts(time.monotonic())
+
+    def get_statistics(self, frame_id: int) -> E2EStatistics:
+        """Return a copy of the statistics of an arbitration ID.
+
+        :raises KeyError: If the arbitration ID is not monitored.
+        """
+        with self._lock:
+            self._check_timeouts(time.monotonic())
+            return self._monitored[frame_id].statistics.copy()
+
+    def statistics(self, received_only: bool = True) -> Dict[int, E2EStatistics]:
+        """Return a copy of the statistics per arbitration ID.
+
+        :param received_only: Leave out the arbitration IDs without frames.
+        """
+        with self._lock:
+            self._check_timeouts(time.monotonic())
+            return {frame_id: entry.statistics.copy()
+                    for frame_id, entry in self._monitored.items()
+                    if entry.statistics.frames or not received_only}
+
+    @property
+    def errors(self) -> int:
+        """Total number of detected errors of all arbitration IDs."""
+        with self._lock:
+            self._check_timeouts(time.monotonic())
+            return sum(entry.statistics.errors for entry in self._monitored.values())
+
+    def reset(self) -> None:
+        """Reset all statistics and counters."""
+        with self._lock:
+            for entry in self._monitored.values():
+                entry.statistics = E2EStatistics(entry.message.frame_id, entry.message.name)
+                entry.counters = [None] * len(entry.groups)
+                entry.last_arrival = None
+                entry.silent = False
+
+    def summary(self, received_only: bool = True) -> str:
+        """Return the statistics as a table, one line per arbitration ID.
+
+        :param received_only: Leave out the arbitration IDs without frames.
+        """
+        lines = [f"{'ID':>10} {'Name':<32}{'Frames':>10}{'CRC':>8}{'Jumps':>8}{'Repeats':>9}"
+                 f"{'Timeouts':>10}{'Decode':>8}"]
+        for frame_id, statistics in sorted(self.statistics(received_only).items()):
+            lines.append(f"{frame_id:>#10x} {statistics.name:<32}{statistics.frames:>10}{statistics.crc_errors:>8}"
+                         f"{statistics.counter_jumps:>8}{statistics.repeats:>9}{statistics.timeouts:>10}"
+                         f"{statistics.decode_errors:>8}")
+        return "\n".join(lines)
+
+    def stop(self) -> None:
+        pass
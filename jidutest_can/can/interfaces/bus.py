@@ -24,6 +24,10 @@ from jidutest_can.can.tools import AutoDetectedConfig
 from jidutest_can.can.tools import CanFilters
 from jidutest_can.can.tools import CanFilterExtended
 from jidutest_can.can.bcm import CyclicSendTaskABC
+from jidutest_can.can.bcm import CyclicSendScheduler
+from jidutest_can.can.bcm import PayloadGenerator
+from jidutest_can.can.bcm import PeriodicTaskRegistry
+from jidutest_can.can.bcm import ScheduledCyclicSendTask
 from jidutest_can.can.bcm import ThreadBasedCyclicSendTask
 from jidutest_can.can.bcm import ThreadBasedReceiveTask
 from jidutest_can.can.message import RawMessage
@@ -58,8 +62,16 @@ class BusABC(metaclass=ABCMeta):
     #: Log level for received messages
     RECV_LOGGING_LEVEL = 9
 
+    #: Default maximum number of messages returned by :meth:`recv_batch`
+    RECV_BATCH_SIZE = 256
+
     _is_shutdown: bool = False
 
+    #: Scheduler driving the tasks created by :meth:`send_periodic`. ``None``
+    #: selects the process wide :meth:`CyclicSendScheduler.default`; assign a
+    #: dedicated :class:`CyclicSendScheduler` to give this bus its own thread.
+    cyclic_scheduler: Optional[CyclicSendScheduler] = None
+
     @abstractmethod
     def __init__(
         self,
@@ -87,7 +99,9 @@ class BusABC(metaclass=ABCMeta):
         :raises ~can.exceptions.CanInitializationError:
             If the bus cannot be initialized
         """
-        self._periodic_tasks: List[Union[_SelfRemovingCyclicTask, ThreadBasedCyclicSendTask]] = []
+        self._periodic_tasks: List[Union[_SelfRemovingCyclicTask,
+                                         ScheduledCyclicSendTask,
+                                         ThreadBasedCyclicSendTask]] = []
         self._cylic_task = None
         self.set_filters(can_filters)
 
@@ -132,6 +146,44 @@ class BusABC(metaclass=ABCMeta):
 
                 return None
 
+    def recv_batch(
+        self,
+        max_messages: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> List[RawMessage]:
+        """Block waiting for at least one message from the Bus, then return
+        it together with all messages that are already available.
+
+        Interfaces which can read several messages per driver call should
+        override this method.
+
+        :param max_messages:
+            maximum number of returned messages, defaults to
+            :attr:`RECV_BATCH_SIZE`
+        :param timeout:
+            seconds to wait for the first message or None to wait indefinitely
+
+        :return:
+            the received messages in order, an empty list on timeout
+
+        :raises ~can.exceptions.CanOperationError:
+            If an error occurred while reading
+        """
+        if max_messages is None:
+            max_messages = self.RECV_BATCH_SIZE
+        msg = self.recv(timeout)
+        if msg is None:
+            return []
+        batch = [msg]
+        while len(batch) < max_messages:
+            # recv(0) would give up at the first filtered message
+            msg, already_filtered = self._recv_internal(timeout=0)
+            if msg is None:
+                break
+            if already_filtered or self._matches_filters(msg):
+                batch.append(msg)
+        return batch
+
     def _recv_internal(
         self, timeout: Optional[float]
     ) -> Tuple[Optional[RawMessage], bool]:
@@ -207,12 +259,46 @@ class BusABC(metaclass=ABCMeta):
         """
         raise NotImplementedError("Trying to write to a readonly bus?")
 
+    def send_many(
+        self, msgs: Sequence[RawMessage], timeout: Optional[float] = None
+    ) -> int:
+        """Transmit several messages to the CAN bus, in order.
+
+        Interfaces which can transmit a burst cheaper than message by
+        message should override this method.
+
+        Like a partial write, sending stops at the first message which
+        fails. The error is only raised if no message was sent, otherwise
+        the number of sent messages is returned and the caller may retry
+        the remaining ones, which then raises the error.
+
+        :param msgs: The messages to send.
+        :param timeout: See :meth:`send`, applies to every message.
+
+        :return: The number of sent messages.
+
+        :raises ~can.exceptions.CanOperationError:
+            If an error occurred while sending the first message
+        """
+        sent = 0
+        for msg in msgs:
+            try:
+                self.send(msg, timeout)
+            except Exception:
+                if not sent:
+                    raise
+                break
+            sent += 1
+        return sent
+
     def send_periodic(
         self,
         msgs: Union[RawMessage, Sequence[RawMessage]],
         period: float,
         duration: Optional[float] = None,
         store_task: bool = True,
+        name: Optional[str] = None,
+        payload_generator: Optional[PayloadGenerator] = None,
     ) -> CyclicSendTaskABC:
         """Start sending messages at a given period on this bus.
 
@@ -232,8 +318,20 @@ class BusABC(metaclass=ABCMeta):
             Approximate duration in seconds to continue sending messages. If
             no duration is provided, the task will continue indefinitely.
         :param store_task:
-            If True (the default) the task will be attached to this Bus instance.
+            If True (the default) the task will be attached to this Bus instance
+            and registered in :attr:`task_registry`.
             Disable to instead manage tasks manually.
+        :param name:
+            The name of the message, to find the task by
+            :meth:`PeriodicTaskRegistry.get_by_name`.
+        :param payload_generator:
+            Called with each message just before it is sent, to update its
+            data in place, e.g. the counter and checksum of an E2E protected
+            message. The messages are only stored once then, the generator
+            keeps any state across transmissions and modifications.
+        :raises NotImplementedError:
+            If a `payload_generator` is given but the interface sends the
+            periodic messages by itself.
         :return:
             A started task instance. Note the task can be stopped (and depending on
             the backend modified) by calling the task's
@@ -263,13 +361,20 @@ class BusABC(metaclass=ABCMeta):
             raise ValueError("Must be either a message or a sequence of messages")
 
         # Create a backend specific task; will be patched to a _SelfRemovingCyclicTask later
-        task = cast(
-            _SelfRemovingCyclicTask,
-            self._send_periodic_internal(msgs, period, duration),
-        )
+        if payload_generator is None:
+            task = self._send_periodic_internal(msgs, period, duration)
+        elif type(self)._send_periodic_internal is not BusABC._send_periodic_internal:
+            raise NotImplementedError(
+                f"{type(self).__name__} sends periodic messages by itself, "
+                f"they can't be generated before each transmission"
+            )
+        else:
+            task = self._send_periodic_internal(msgs, period, duration, payload_generator)
+        task = cast(_SelfRemovingCyclicTask, task)
 
         # we wrap the task's stop method to also remove it from the Bus's list of tasks
         periodic_tasks = self._periodic_tasks
+        task_registry = self.task_registry
         original_stop_method = task.stop
 
         def wrapped_stop_method(remove_task: bool = True) -> None:
@@ -279,12 +384,14 @@ class BusABC(metaclass=ABCMeta):
                     periodic_tasks.remove(task)
                 except ValueError:
                     pass  # allow the task to be already removed
+                task_registry.unregister(task)
             original_stop_method()
 
         task.stop = wrapped_stop_method  # type: ignore
 
         if store_task:
             self._periodic_tasks.append(task)
+            task_registry.register(task, name)
 
         return task
 
@@ -293,8 +400,10 @@ class BusABC(metaclass=ABCMeta):
         msgs: Union[Sequence[RawMessage], RawMessage],
         period: float,
         duration: Optional[float] = None,
+        payload_generator: Optional[PayloadGenerator] = None,
     ) -> CyclicSendTaskABC:
-        """Default implementation of periodic message sending using threading.
+        """Default implementation of periodic message sending. All tasks are
+        driven by the single thread of :attr:`cyclic_scheduler`.
 
         Override this method to enable a more efficient backend specific approach.
 
@@ -305,6 +414,9 @@ class BusABC(metaclass=ABCMeta):
         :param duration:
             The duration between sending each message at the given rate. If
             no duration is provided, the task will continue indefinitely.
+        :param payload_generator:
+            Called with each message just before it is sent, see
+            :meth:`send_periodic`.
         :return:
             A started task instance. Note the task can be stopped (and
             depending on the backend modified) by calling the
@@ -315,8 +427,9 @@ class BusABC(metaclass=ABCMeta):
             self._lock_send_periodic = (  # pylint: disable=attribute-defined-outside-init
                 threading.Lock()
             )
-        task = ThreadBasedCyclicSendTask(
-            self, self._lock_send_periodic, msgs, period, duration
+        task = ScheduledCyclicSendTask(
+            self, self._lock_send_periodic, msgs, period, duration, scheduler=self.cyclic_scheduler,
+            payload_generator=payload_generator,
         )
         return task
 
@@ -340,6 +453,7 @@ class BusABC(metaclass=ABCMeta):
 
         if remove_tasks:
             self._periodic_tasks.clear()
+            self.task_registry.clear()
 
     def stop_cyclic_task(self) -> None:
         self._cylic_task.stop() 
@@ -512,6 +626,17 @@ class BusABC(metaclass=ABCMeta):
     def periodic_tasks(self):
         return self._periodic_tasks
 
+    @property
+    def task_registry(self) -> PeriodicTaskRegistry:
+        """The stored tasks of :meth:`send_periodic` by arbitration ID and
+        message name."""
+        if not hasattr(self, "_task_registry"):
+            # Created on first use, as for the send lock of the periodic tasks
+            self._task_registry = (  # pylint: disable=attribute-defined-outside-init
+                PeriodicTaskRegistry()
+            )
+        return self._task_registry
+
 
 class _SelfRemovingCyclicTask(CyclicSendTaskABC, ABC):
     """Removes itself from a bus.
@@ -1,11 +1,13 @@
 """
 Enable basic CAN over a PCAN USB device.
 """
+import ctypes
 import logging
 import platform
+import threading
 import time
 from datetime import datetime
-from typing import Any, List, Optional, Tuple, Union
+from typing import Any, List, Optional, Sequence, Tuple, Union
 from packaging import version
 from jidutest_can.can.message import RawMessage
 from jidutest_can.can.tools import CanError
@@ -61,6 +63,8 @@ from jidutest_can.can.interfaces.pcan.basic import (
     TPCANHandle,
     TPCANMsg,
     TPCANMsgFD,
+    TPCANTimestamp,
+    TPCANTimestampFD,
 )
 from jidutest_can.can.tools import BitTiming
 from jidutest_can.can.tools.bit_timing import BitTimingFd
@@ -245,6 +249,18 @@ class PcanBus(BusABC):
         self.channel_info = str(channel)
         self.fd = isinstance(timing, BitTimingFd) if timing else kwargs.get("fd", False)
 
+        # ctypes structures reused by every read and write instead of
+        # allocating new ones per message
+        if self.fd:
+            self._rx_msg = TPCANMsgFD()
+            self._rx_timestamp = TPCANTimestampFD()
+            self._tx_msg = TPCANMsgFD()
+        else:
+            self._rx_msg = TPCANMsg()
+            self._rx_timestamp = TPCANTimestamp()
+            self._tx_msg = TPCANMsg()
+        self._tx_lock = threading.Lock()
+
         hwtype = PCAN_TYPE_ISA
         ioport = 0x02A0
         interrupt = 11
@@ -476,24 +492,99 @@ class PcanBus(BusABC):
             return False
         return True
 
+    def _read_message(self) -> Tuple[Any, Optional[RawMessage]]:
+        """Read one message from the receive queue of the driver into the
+        preallocated structures.
+
+        :return: the status and the received message, ``None`` if the
+                 status is not ``PCAN_ERROR_OK``
+        """
+        if self.fd:
+            result = self.m_objPCANBasic.ReadFD(
+                self.m_PcanHandle, self._rx_msg, self._rx_timestamp
+            )[0]
+        else:
+            result = self.m_objPCANBasic.Read(
+                self.m_PcanHandle, self._rx_msg, self._rx_timestamp
+            )[0]
+
+        if result != PCAN_ERROR_OK:
+            return result, None
+
+        is_extended_id = bool(self._rx_msg.MSGTYPE & PCAN_MESSAGE_EXTENDED.value)
+        is_remote_frame = bool(self._rx_msg.MSGTYPE & PCAN_MESSAGE_RTR.value)
+        is_fd = bool(self._rx_msg.MSGTYPE & PCAN_MESSAGE_FD.value)
+        bitrate_switch = bool(self._rx_msg.MSGTYPE & PCAN_MESSAGE_BRS.value)
+        error_state_indicator = bool(self._rx_msg.MSGTYPE & PCAN_MESSAGE_ESI.value)
+        is_error_frame = bool(self._rx_msg.MSGTYPE & PCAN_MESSAGE_ERRFRAME.value)
+
+        if self.fd:
+            dlc = dlc2len(self._rx_msg.DLC)
+            timestamp = boottimeEpoch + (self._rx_timestamp.value / (1000.0 * 1000.0))
+        else:
+            dlc = self._rx_msg.LEN
+            timestamp = boottimeEpoch + (
+                (
+                    self._rx_timestamp.micros
+                    + 1000 * self._rx_timestamp.millis
+                    + 0x100000000 * 1000 * self._rx_timestamp.millis_overflow
+                )
+                / (1000.0 * 1000.0)
+            )
+
+        # 本处增加如下判断和处理，是为了防止时间戳出现大于当前时间的问题
+        if boottimeEpoch and timestamp > time.time():
+            timestamp -= boottimeEpoch
+        rx_msg = RawMessage(
+            timestamp=timestamp,
+            arbitration_id=self._rx_msg.ID,
+            is_extended_id=is_extended_id,
+            is_remote_frame=is_remote_frame,
+            is_error_frame=is_error_frame,
+            dlc=dlc,
+            data=self._rx_msg.DATA[:dlc],
+            is_fd=is_fd,
+            bitrate_switch=bitrate_switch,
+            error_state_indicator=error_state_indicator,
+            channel=self.channel_info
+        )
+
+        return PCAN_ERROR_OK, rx_msg
+
+    def _handle_read_error(self, result) -> None:
+        if result & (PCAN_ERROR_BUSLIGHT | PCAN_ERROR_BUSHEAVY):
+            logger.warning(self._get_formatted_error(result))
+
+        else:
+            error_msg = self._get_formatted_error(result)
+            logger.warning(error_msg)
+            setattr(self, "_error_num", getattr(self, "_error_num", 0) + 1)
+            error_num = getattr(self, "_error_num")
+            import pathlib
+            pcan_error_log = pathlib.Path("./pcan_error.log")
+            pcan_error_log.touch()
+            with open(pcan_error_log, "a") as f:
+                f.write(error_msg + "\n")
+                if not error_num % 3:
+                    f.write(f"[{self.channel_info}][{time.time()}]Resetting can bus ...\n")
+                    self.reset()
+                    f.write(f"[{self.channel_info}][{time.time()}]Reset can bus done.\n")
+                elif error_num > 30:
+                    logger.error(f"error msg num:{error_num} > 30.")
+                    f.write(f"error msg num:{error_num} > 30.\n")
+                    raise PcanCanOperationError(error_msg)
+
     def _recv_internal(
         self, timeout: Optional[float]
     ) -> Tuple[Optional[RawMessage], bool]:
         end_time = time.time() + timeout if timeout is not None else None
 
         while True:
-            if self.fd:
-                result, pcan_msg, pcan_timestamp = self.m_objPCANBasic.ReadFD(
-                    self.m_PcanHandle
-                )
-            else:
-                result, pcan_msg, pcan_timestamp = self.m_objPCANBasic.Read(
-                    self.m_PcanHandle
-                )
+            result, rx_msg = self._read_message()
 
             if result == PCAN_ERROR_OK:
                 # message received
-                break
+                return rx_msg, False
 
             if result == PCAN_ERROR_QRCVEMPTY:
                 # receive queue is empty, wait or return on timeout
@@ -528,71 +619,44 @@ class PcanBus(BusABC):
                     if self._recv_event in recv:
                         continue
 
-            elif result & (PCAN_ERROR_BUSLIGHT | PCAN_ERROR_BUSHEAVY):
-                logger.warning(self._get_formatted_error(result))
-
             else:
-                error_msg = self._get_formatted_error(result)
-                logger.warning(error_msg)
-                setattr(self, "_error_num", getattr(self, "_error_num", 0) + 1)
-                error_num = getattr(self, "_error_num")
-                import pathlib
-                pcan_error_log = pathlib.Path("./pcan_error.log")
-                pcan_error_log.touch()
-                with open(pcan_error_log, "a") as f:
-                    f.write(error_msg + "\n")
-                    if not error_num % 3:
-                        f.write(f"[{self.channel_info}][{time.time()}]Resetting can bus ...\n")
-                        self.reset()
-                        f.write(f"[{self.channel_info}][{time.time()}]Reset can bus done.\n")
-                    elif error_num > 30:
-                        logger.error(f"error msg num:{error_num} > 30.")
-                        f.write(f"error msg num:{error_num} > 30.\n")
-                        raise PcanCanOperationError(error_msg)
+                self._handle_read_error(result)
 
             return None, False
 
-        is_extended_id = bool(pcan_msg.MSGTYPE & PCAN_MESSAGE_EXTENDED.value)
-        is_remote_frame = bool(pcan_msg.MSGTYPE & PCAN_MESSAGE_RTR.value)
-        is_fd = bool(pcan_msg.MSGTYPE & PCAN_MESSAGE_FD.value)
-        bitrate_switch = bool(pcan_msg.MSGTYPE & PCAN_MESSAGE_BRS.value)
-        error_state_indicator = bool(pcan_msg.MSGTYPE & PCAN_MESSAGE_ESI.value)
-        is_error_frame = bool(pcan_msg.MSGTYPE & PCAN_MESSAGE_ERRFRAME.value)
-
-        if self.fd:
-            dlc = dlc2len(pcan_msg.DLC)
-            timestamp = boottimeEpoch + (pcan_timestamp.value / (1000.0 * 1000.0))
-        else:
-            dlc = pcan_msg.LEN
-            timestamp = boottimeEpoch + (
-                (
-                    pcan_timestamp.micros
-                    + 1000 * pcan_timestamp.millis
-                    + 0x100000000 * 1000 * pcan_timestamp.millis_overflow
-                )
-                / (1000.0 * 1000.0)
-            )
+    def recv_batch(
+        self,
+        max_messages: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> List[RawMessage]:
+        """Block waiting for the first message, then drain the receive queue
+        of the driver until it is empty or `max_messages` are read.
 
-        # 本处增加如下判断和处理，是为了防止时间戳出现大于当前时间的问题
-        if boottimeEpoch and timestamp > time.time():
-            timestamp -= boottimeEpoch
-        rx_msg = RawMessage(
-            timestamp=timestamp,
-            arbitration_id=pcan_msg.ID,
-            is_extended_id=is_extended_id,
-            is_remote_frame=is_remote_frame,
-            is_error_frame=is_error_frame,
-            dlc=dlc,
-            data=pcan_msg.DATA[:dlc],
-            is_fd=is_fd,
-            bitrate_switch=bitrate_switch,
-            error_state_indicator=error_state_indicator,
-            channel=self.channel_info
-        )
+        See :meth:`~can.BusABC.recv_batch`.
+        """
+        if max_messages is None:
+            max_messages = self.RECV_BATCH_SIZE
+        msg = self.recv(timeout)
+        if msg is None:
+            return []
+        batch = [msg]
+        while len(batch) < max_messages:
+            result, rx_msg = self._read_message()
+            if result == PCAN_ERROR_OK:
+                if self._matches_filters(rx_msg):
+                    batch.append(rx_msg)
+                continue
+            if result != PCAN_ERROR_QRCVEMPTY:
+                self._handle_read_error(result)
+            break
+        return batch
 
-        return rx_msg, False
+    def _write_message(self, msg: RawMessage):
+        """Fill the preallocated structure with `msg` and hand it to the
+        driver. The caller must hold ``self._tx_lock``.
 
-    def send(self, msg, timeout=None) -> int:
+        :return: the status of the driver call
+        """
         msgType = (
             PCAN_MESSAGE_EXTENDED.value
             if msg.is_extended_id
@@ -609,43 +673,27 @@ class PcanBus(BusABC):
         if msg.error_state_indicator:
             msgType |= PCAN_MESSAGE_ESI.value
 
-        if self.fd:
-            # create a TPCANMsg message structure
-            CANMsg = TPCANMsgFD()
-
-            # configure the message. ID, Length of data, message type and data
-            CANMsg.ID = msg.arbitration_id
-            CANMsg.DLC = len2dlc(msg.dlc)
-            CANMsg.MSGTYPE = msgType
-
-            # copy data
-            for i in range(msg.dlc):
-                CANMsg.DATA[i] = msg.data[i]
-
-            # logger.debug("Data: %s", msg.data)
-            # logger.debug("Type: %s", type(msg.data))
+        CANMsg = self._tx_msg
+        CANMsg.ID = msg.arbitration_id
+        CANMsg.MSGTYPE = msgType
 
-            result = self.m_objPCANBasic.WriteFD(self.m_PcanHandle, CANMsg)
+        # if a remote frame will be sent, data bytes are not important.
+        size = 0 if msg.is_remote_frame else min(msg.dlc, len(msg.data))
+        if size:
+            ctypes.memmove(CANMsg.DATA, bytes(msg.data[:size]), size)
+        # the structure is reused, clear the bytes left by a longer message
+        ctypes.memset(ctypes.addressof(CANMsg.DATA) + size, 0, ctypes.sizeof(CANMsg.DATA) - size)
 
-        else:
-            # create a TPCANMsg message structure
-            CANMsg = TPCANMsg()
-
-            # configure the message. ID, Length of data, message type and data
-            CANMsg.ID = msg.arbitration_id
-            CANMsg.LEN = msg.dlc
-            CANMsg.MSGTYPE = msgType
-
-            # if a remote frame will be sent, data bytes are not important.
-            if not msg.is_remote_frame:
-                # copy data
-                for i in range(CANMsg.LEN):
-                    CANMsg.DATA[i] = msg.data[i]
+        if self.fd:
+            CANMsg.DLC = len2dlc(msg.dlc)
+            return self.m_objPCANBasic.WriteFD(self.m_PcanHandle, CANMsg)
 
-            # logger.debug("Data: %s", msg.data)
-            # logger.debug("Type: %s", type(msg.data))
+        CANMsg.LEN = msg.dlc
+        return self.m_objPCANBasic.Write(self.m_PcanHandle, CANMsg)
 
-            result = self.m_objPCANBasic.Write(self.m_PcanHandle, CANMsg)
+    def send(self, msg, timeout=None) -> int:
+        with self._tx_lock:
+            result = self._write_message(msg)
 
         if result != PCAN_ERROR_OK:
             raise PcanCanOperationError(
@@ -654,6 +702,25 @@ class PcanBus(BusABC):
         logger.debug(f"Successfully sent:{msg}")
         return result
 
+    def send_many(self, msgs: Sequence[RawMessage], timeout: Optional[float] = None) -> int:
+        """Transmit `msgs` in order with the transmit lock taken once.
+
+        See :meth:`~can.BusABC.send_many`.
+        """
+        sent = 0
+        with self._tx_lock:
+            for msg in msgs:
+                result = self._write_message(msg)
+                if result != PCAN_ERROR_OK:
+                    if sent:
+                        break
+                    raise PcanCanOperationError(
+                        "Failed to send: " + self._get_formatted_error(result)
+                    )
+                sent += 1
+        logger.debug(f"Successfully sent {sent} messages")
+        return sent
+
     def flash(self, flash):
         """
         Turn on or off flashing of the device's LED for physical
@@ -744,7 +744,7 @@ class SmartVCIBasic:
 
     # Reads a CAN message from the receive queue of a PCAN Channel
     #
-    def Read(self, Channel):
+    def Read(self, Channel, MessageBuffer=None, TimestampBuffer=None):
         """Reads a CAN message from the receive queue of a PCAN Channel
 
         Remarks:
@@ -756,14 +756,18 @@ class SmartVCIBasic:
           [2]: A TPCANTimestamp structure with the time when a message was read
 
         Parameters:
-          Channel  : A TPCANHandle representing a PCAN Channel
+          Channel         : A TPCANHandle representing a PCAN Channel
+          MessageBuffer   : An optional TPCANMsg structure which is reused
+                            instead of allocating a new one
+          TimestampBuffer : An optional TPCANTimestamp structure which is
+                            reused instead of allocating a new one
 
         Returns:
           A tuple with three values
         """
         try:
-            msg = TPCANMsg()
-            timestamp = TPCANTimestamp()
+            msg = TPCANMsg() if MessageBuffer is None else MessageBuffer
+            timestamp = TPCANTimestamp() if TimestampBuffer is None else TimestampBuffer
             res = self.__m_dllBasic.CAN_Read(Channel, byref(msg), byref(timestamp))
             return TPCANStatus(res), msg, timestamp
         except:
@@ -772,7 +776,7 @@ class SmartVCIBasic:
 
     # Reads a CAN message from the receive queue of a FD capable PCAN Channel
     #
-    def ReadFD(self, Channel):
+    def ReadFD(self, Channel, MessageBuffer=None, TimestampBuffer=None):
         """Reads a CAN message from the receive queue of a FD capable PCAN Channel
 
         Remarks:
@@ -784,14 +788,18 @@ class SmartVCIBasic:
           [2]: A TPCANTimestampFD that is the time when a message was read
 
         Parameters:
-          Channel  : The handle of a FD capable PCAN Channel
+          Channel         : The handle of a FD capable PCAN Channel
+          MessageBuffer   : An optional TPCANMsgFD structure which is reused
+                            instead of allocating a new one
+          TimestampBuffer : An optional TPCANTimestampFD which is reused
+                            instead of allocating a new one
 
         Returns:
           A tuple with three values
         """
         try:
-            msg = TPCANMsgFD()
-            timestamp = TPCANTimestampFD()
+            msg = TPCANMsgFD() if MessageBuffer is None else MessageBuffer
+            timestamp = TPCANTimestampFD() if TimestampBuffer is None else TimestampBuffer
             res = self.__m_dllBasic.CAN_ReadFD(Channel, byref(msg), byref(timestamp))
             return TPCANStatus(res), msg, timestamp
         except:
@@ -7,6 +7,7 @@
 @Description : ToSun can Bus Class
 
 """
+import collections
 import queue
 import time
 import typing
@@ -24,6 +25,10 @@ from jidutest_can.can.interfaces.tosun.define_tosun import _is_windows
 
 logger = logging.getLogger(__file__)
 
+# 接收缓存为空时的等待时间，从最小值开始逐次翻倍直到最大值，单位为秒
+RX_BACKOFF_MIN = 0.0001
+RX_BACKOFF_MAX = 0.002
+
 
 class ToSunCanOperationError(CanOperationError):
     """Like :class:`can.exceptions.CanOperationError`, but specific to ToSun."""
@@ -53,6 +58,7 @@ class ToSunBus(BusABC):
             :param fd: Should the Bus be initialized in CAN-FD mode. default is False
             :param mode: 读取总线数据方式，READ_TX_RX_DEF.TX_RX_MESSAGES(receive msg inclued tx and rx msg),
                          READ_TX_RX_DEF.TX_RX_MESSAGES(only receive rx msg)
+            :param rx_batch_size: 每次调用驱动接口最多读取的报文数量，默认值为256
         异常说明：无
         返回值：None
         """
@@ -79,6 +85,9 @@ class ToSunBus(BusABC):
         self.init_counter: bool = True
         self.__mode = kwargs.get("mode", READ_TX_RX_DEF.TX_RX_MESSAGES)
         self.__can_data = list()
+        self.rx_batch_size = max(1, int(kwargs.get("rx_batch_size", self.RECV_BATCH_SIZE)))
+        self.__rx_buffer = (TLibCANFD * self.rx_batch_size)()
+        self.__rx_pending: typing.Deque[RawMessage] = collections.deque()
         enable120 = kwargs.get("enable120", True)
         self.__enable120 = A120.ENABLEA120 if enable120 else A120.DEABLEA120
         self.__bitrate = c_double(bitrate / 1000)
@@ -278,27 +287,76 @@ class ToSunBus(BusABC):
         else:
             return None
 
+    def _receive_rx_frames(self) -> typing.List[RawMessage]:
+        """
+        调用一次驱动接口，将最多rx_batch_size个报文读取到预分配的缓存中并转换为RawMessage
+        """
+        buffersize = c_int32(self.rx_batch_size)
+        # TODO: 此处在使用can msg结构和方法收取can数据时，会收不到任何数据，暂时使用canfd格式和方法
+        receive_canfd_msgs(self.ADeviceHandle, self.__rx_buffer, byref(buffersize), self.channel, self.__mode)
+        messages = [tosun_convert_msg(self.__rx_buffer[index]) for index in range(buffersize.value)]
+        for rx_msg in messages:
+            rx_msg.channel = self.channel_info
+        return messages
+
+    def _wait_rx_messages(self, timeout: typing.Optional[float]) -> typing.List[RawMessage]:
+        """
+        读取报文，接收缓存为空时以递增的间隔休眠等待，而不是空转占满CPU，超时返回空列表
+        """
+        end_time = None if timeout is None else time.perf_counter() + timeout
+        backoff = RX_BACKOFF_MIN
+        while True:
+            messages = self._receive_rx_frames()
+            if messages:
+                return messages
+            if end_time is None:
+                time_left = backoff
+            else:
+                time_left = end_time - time.perf_counter()
+                if time_left <= 0:
+                    return messages
+            time.sleep(min(backoff, time_left))
+            backoff = min(backoff * 2, RX_BACKOFF_MAX)
+
     def _recv_internal(
             self, timeout: typing.Optional[float] = None
     ) -> typing.Tuple[typing.Optional[RawMessage], bool]:
-        # if self.fd:
-        # TODO: 此处在使用can msg结构和方法收取can数据时，会收不到任何数据，暂时使用canfd格式和方法
-        fr_raw = (TLibCANFD * 1)()
-        recv_fun = receive_canfd_msgs
-        # else:
-        #     fr_raw = (TLibCAN * 1)()
-        #     recv_fun = receive_can_msgs
-
-        start_time = time.perf_counter()
-        while timeout is None or time.perf_counter() - start_time <= timeout:
-            buffersize = c_int32(1)
-            recv_fun(self.ADeviceHandle, fr_raw, byref(buffersize), self.channel, self.__mode)
-            if buffersize.value == 1:
-                rx_msg = tosun_convert_msg(fr_raw[0])
-                rx_msg.channel = self.channel_info
-                return rx_msg, False
+        if not self.__rx_pending:
+            self.__rx_pending.extend(self._wait_rx_messages(timeout))
+        if self.__rx_pending:
+            return self.__rx_pending.popleft(), False
         return None, False
 
+    def recv_batch(
+            self,
+            max_messages: typing.Optional[int] = None,
+            timeout: typing.Optional[float] = None,
+    ) -> typing.List[RawMessage]:
+        """
+        功能说明：阻塞等待直到收到报文，一次驱动接口调用最多读取rx_batch_size个报文并批量返回
+        参数说明：
+            :param max_messages: 返回的最大报文数量，默认值None表示rx_batch_size
+            :param timeout: 等待第一个报文的超时时间，单位为秒，None表示一直等待
+        异常说明：无
+        返回值：按接收顺序排列且满足过滤条件的报文列表，超时返回空列表
+        """
+        if max_messages is None:
+            max_messages = self.rx_batch_size
+        end_time = None if timeout is None else time.perf_counter() + timeout
+        while True:
+            if not self.__rx_pending:
+                time_left = None if end_time is None else max(0.0, end_time - time.perf_counter())
+                self.__rx_pending.extend(self._wait_rx_messages(time_left))
+            batch = []
+            while self.__rx_pending and len(batch) < max_messages:
+                rx_msg = self.__rx_pending.popleft()
+                if self._matches_filters(rx_msg):
+                    batch.append(rx_msg)
+            if batch or (end_time is not None and time.perf_counter() >= end_time):
+                if batch:
+                    logger.log(self.RECV_LOGGING_LEVEL, "Received %d messages", len(batch))
+                return batch
+
     def send(self, msg: RawMessage, timeout: float = 0.1, **kwargs) -> int:
         """
         发送can报文
@@ -342,6 +400,7 @@ class ToSunBus(BusABC):
         """
         清空can对应通道的接收缓存
         """
+        self.__rx_pending.clear()
         if self.fd:
             ret = clear_canfd_receive_buffers(self.ADeviceHandle, self.channel)
         else:
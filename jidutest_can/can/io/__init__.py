@@ -1,5 +1,6 @@
 from jidutest_can.can.io.blf import BLFReader
 from jidutest_can.can.io.blf import BLFWriter
+from jidutest_can.can.io.blf import ParallelBLFReader
 from jidutest_can.can.io.asc import ASCReader
 from jidutest_can.can.io.asc import ASCWriter
 from jidutest_can.can.io.canutils import CanutilsLogReader
@@ -16,4 +17,7 @@ from jidutest_can.can.io.logger import BaseRotatingLogger
 from jidutest_can.can.io.logger import SizedRotatingLogger
 from jidutest_can.can.io.player import LogReader
 from jidutest_can.can.io.player import MessageSync
+from jidutest_can.can.io.replay import ReplayEngine
+from jidutest_can.can.io.replay import ReplayReport
+from jidutest_can.can.io.threaded import ThreadedWriter
 from jidutest_can.can.io.printer import Printer
@@ -12,14 +12,24 @@ of uncompressed data each. This data contains the actual CAN messages and other
 objects types.
 """
 
+import bisect
+import collections
+import concurrent.futures
+import heapq
+import operator
+import os
 import struct
 import zlib
 import datetime
 import time
 import logging
+from typing import AbstractSet
+from typing import Deque
 from typing import List
+from typing import NamedTuple
 from typing import BinaryIO
 from typing import Generator
+from typing import Iterable
 from typing import Union
 from typing import Tuple
 from typing import Optional
@@ -143,6 +153,21 @@ def systemtime_to_timestamp(systemtime: TSystemTime) -> float:
         return 0
 
 
+def _decompress_container(obj_data: bytes) -> Optional[bytes]:
+    """Return the uncompressed data of a log container object, the object
+    data starts after the base object header. Returns None for unknown
+    compression methods."""
+    method, uncompressed_size = LOG_CONTAINER_STRUCT.unpack_from(obj_data)
+    container_data = obj_data[LOG_CONTAINER_STRUCT.size :]
+    if method == NO_COMPRESSION:
+        return container_data
+    if method == ZLIB_DEFLATE:
+        return zlib.decompress(container_data, 15, uncompressed_size)
+    # Unknown compression method
+    LOG.warning("Unknown compression method (%d)", method)
+    return None
+
+
 class BLFReader(MessageReader):
     """
     Iterator of CAN messages from a Binary Logging File.
@@ -178,6 +203,7 @@ class BLFReader(MessageReader):
         self.file.read(header[1] - FILE_HEADER_STRUCT.size)
         self._tail = b""
         self._pos = 0
+        self._object_pos = 0
 
     def __iter__(self) -> Generator[RawMessage, None, None]:
         while True:
@@ -194,15 +220,8 @@ class BLFReader(MessageReader):
             self.file.read(obj_size % 4)
 
             if obj_type == LOG_CONTAINER:
-                method, uncompressed_size = LOG_CONTAINER_STRUCT.unpack_from(obj_data)
-                container_data = obj_data[LOG_CONTAINER_STRUCT.size :]
-                if method == NO_COMPRESSION:
-                    data = container_data
-                elif method == ZLIB_DEFLATE:
-                    data = zlib.decompress(container_data, 15, uncompressed_size)
-                else:
-                    # Unknown compression method
-                    LOG.warning("Unknown compression method (%d)", method)
+                data = _decompress_container(obj_data)
+                if data is None:
                     continue
                 yield from self._parse_container(data)
         self.stop()
@@ -248,6 +267,7 @@ class BLFReader(MessageReader):
                     # Not enough data in container
                     return
                 raise BLFParseError("Could not find next object") from None
+            self._object_pos = pos
             header = unpack_obj_header_base(data, pos)
             # print(header)
             signature, _, header_version, obj_size, obj_type = header
@@ -366,6 +386,330 @@ class BLFReader(MessageReader):
             pos = next_pos
 
 
+class ContainerEntry(NamedTuple):
+    """Location of a log container in a BLF file."""
+
+    #: Offset of the container object in the file
+    file_offset: int
+    #: Size of the container object, without padding
+    obj_size: int
+    #: Offset of the uncompressed container data in the concatenated
+    #: uncompressed data of all containers
+    data_offset: int
+    #: Size of the uncompressed container data
+    data_size: int
+
+
+def index_containers(file: BinaryIO) -> List[ContainerEntry]:
+    """Read the headers of all log containers of an opened BLF file without
+    decompressing them. The file position is restored afterwards."""
+    position = file.tell()
+    file.seek(0)
+    header = FILE_HEADER_STRUCT.unpack(file.read(FILE_HEADER_STRUCT.size))
+    offset = header[1]
+    entries = []
+    data_offset = 0
+    while True:
+        file.seek(offset)
+        data = file.read(OBJ_HEADER_BASE_STRUCT.size + LOG_CONTAINER_STRUCT.size)
+        if len(data) < OBJ_HEADER_BASE_STRUCT.size:
+            break
+        signature, _, _, obj_size, obj_type = OBJ_HEADER_BASE_STRUCT.unpack_from(data)
+        if signature != b"LOBJ":
+            raise BLFParseError()
+        if obj_type == LOG_CONTAINER and len(data) == OBJ_HEADER_BASE_STRUCT.size + LOG_CONTAINER_STRUCT.size:
+            method, data_size = LOG_CONTAINER_STRUCT.unpack_from(data, OBJ_HEADER_BASE_STRUCT.size)
+            if method not in (NO_COMPRESSION, ZLIB_DEFLATE):
+                # skipped by the reader, does not contribute any data
+                data_size = 0
+            entries.append(ContainerEntry(offset, obj_size, data_offset, data_size))
+            data_offset += data_size
+        offset += obj_size + obj_size % 4
+    file.seek(position)
+    return entries
+
+
+def _read_containers(file: BinaryIO, entries: List[ContainerEntry]) -> bytes:
+    chunks = []
+    for entry in entries:
+        if not entry.data_size:
+            continue
+        file.seek(entry.file_offset + OBJ_HEADER_BASE_STRUCT.size)
+        data = _decompress_container(file.read(entry.obj_size - OBJ_HEADER_BASE_STRUCT.size))
+        if data is not None:
+            chunks.append(data)
+    return b"".join(chunks)
+
+
+def _is_object_chain(data: bytes, pos: int, links: int = 4) -> bool:
+    """Check that a chain of `links` plausible object headers starts at
+    `pos`, as far as `data` reaches."""
+    max_pos = len(data)
+    for _ in range(links):
+        if pos + OBJ_HEADER_BASE_STRUCT.size > max_pos:
+            return True
+        signature, header_size, header_version, obj_size, _ = OBJ_HEADER_BASE_STRUCT.unpack_from(data, pos)
+        if (
+            signature != b"LOBJ"
+            or header_version not in (1, 2)
+            or header_size < OBJ_HEADER_BASE_STRUCT.size
+            or obj_size < header_size
+        ):
+            return False
+        next_pos = pos + obj_size
+        if next_pos + 8 > max_pos:
+            return True
+        pos = data.find(b"LOBJ", next_pos, next_pos + 8)
+        if pos == -1:
+            return False
+    return True
+
+
+def _find_object_start(data: bytes) -> Optional[int]:
+    """Find the first object in data which may start in the middle of an
+    object continued from a previous container."""
+    pos = data.find(b"LOBJ")
+    while pos != -1:
+        if _is_object_chain(data, pos):
+            return pos
+        pos = data.find(b"LOBJ", pos + 1)
+    return None
+
+
+_timestamp_of = operator.itemgetter(0)
+
+#: Flags of the compact message tuples exchanged with the worker processes
+_EXTENDED_ID = 0x01
+_REMOTE_FRAME = 0x02
+_ERROR_FRAME = 0x04
+_FD = 0x08
+_RX = 0x10
+_BITRATE_SWITCH = 0x20
+_ERROR_STATE_INDICATOR = 0x40
+
+#: timestamp, arbitration id, flags, dlc, data, channel
+CompactMessage = Tuple[float, int, int, int, bytes, Any]
+
+
+def _compact(msg: RawMessage) -> CompactMessage:
+    """Pack a message into a tuple of builtins, which pickles several times
+    faster than the message object."""
+    flags = (
+        (_EXTENDED_ID if msg.is_extended_id else 0)
+        | (_REMOTE_FRAME if msg.is_remote_frame else 0)
+        | (_ERROR_FRAME if msg.is_error_frame else 0)
+        | (_FD if msg.is_fd else 0)
+        | (_RX if msg.is_rx else 0)
+        | (_BITRATE_SWITCH if msg.bitrate_switch else 0)
+        | (_ERROR_STATE_INDICATOR if msg.error_state_indicator else 0)
+    )
+    return msg.timestamp, msg.arbitration_id, flags, msg.dlc, bytes(msg.data), msg.channel
+
+
+def _expand(compact: CompactMessage) -> RawMessage:
+    """Unpack a tuple created by :func:`_compact`."""
+    timestamp, arbitration_id, flags, dlc, data, channel = compact
+    return RawMessage(
+        timestamp=timestamp,
+        arbitration_id=arbitration_id,
+        is_extended_id=bool(flags & _EXTENDED_ID),
+        is_remote_frame=bool(flags & _REMOTE_FRAME),
+        is_error_frame=bool(flags & _ERROR_FRAME),
+        is_fd=bool(flags & _FD),
+        is_rx=bool(flags & _RX),
+        bitrate_switch=bool(flags & _BITRATE_SWITCH),
+        error_state_indicator=bool(flags & _ERROR_STATE_INDICATOR),
+        dlc=dlc,
+        data=data,
+        channel=channel,
+    )
+
+
+def _parse_range(
+    filename: StringPathLike,
+    entries: List[ContainerEntry],
+    start: Optional[int],
+    stop: Optional[int],
+    frame_ids: Optional[AbstractSet[int]] = None,
+    frame_id_mask: int = 0x1FFFFFFF,
+) -> Tuple[Optional[int], int, List[CompactMessage]]:
+    """Parse the objects of the given consecutive containers which start in
+    ``[start, stop)``, offsets in the concatenated uncompressed data.
+
+    If `start` is None, parsing starts at the first object found after the
+    beginning of the first container. Objects may continue into the
+    containers after `stop`, `entries` should include them.
+
+    If `frame_ids` is given, only the messages whose masked arbitration id
+    is in it are returned, error frames are dropped.
+
+    :return: the offset of the first parsed object, the offset of the first
+             object which was not parsed, and the parsed messages as tuples
+             created by :func:`_compact`, sorted by timestamp
+    """
+    with BLFReader(filename) as reader:
+        data = _read_containers(reader.file, entries)
+        base = entries[0].data_offset
+        if start is None:
+            local_start = _find_object_start(data)
+            if local_start is None:
+                end = base + len(data)
+                return None, end, []
+        else:
+            local_start = start - base
+        local_stop = len(data) if stop is None else stop - base
+        messages = []
+        end = None
+        try:
+            for msg in reader._parse_data(data[local_start:]):
+                if local_start + reader._object_pos >= local_stop:
+                    end = base + local_start + reader._object_pos
+                    break
+                if frame_ids is not None and (
+                    msg.is_error_frame or (msg.arbitration_id & frame_id_mask) not in frame_ids
+                ):
+                    continue
+                messages.append(_compact(msg))
+        except struct.error:
+            # There was not enough data to unpack a struct
+            pass
+        if end is None:
+            end = base + local_start + reader._pos
+        # stable, keeps the file order of equal timestamps
+        messages.sort(key=_timestamp_of)
+        return base + local_start, end, messages
+
+
+class ParallelBLFReader(BLFReader):
+    """
+    Iterator of CAN messages from a Binary Logging File which decompresses
+    and parses the log containers in a pool of worker processes.
+
+    The container offsets are indexed first, then consecutive groups of
+    containers are handed to the workers. Objects continued across group
+    boundaries are parsed by the group in which they start. The workers
+    return the messages as compact tuples sorted by timestamp.
+
+    The messages are streamed: only about `jobs` groups are parsed ahead,
+    and the messages of a group are merged by timestamp with the ones of
+    the following groups whose time ranges overlap. A message is yielded
+    once a following group starts at or after its timestamp, so the memory
+    does not grow with the file. Messages with equal timestamps keep their
+    file order, so for a file written in time order the messages are
+    identical to and in the same order as the ones of :class:`BLFReader`.
+    A group starting before messages which were yielded already, i.e. a
+    file jumping back in time, is merged with the remaining messages only.
+
+    The messages may be filtered by arbitration id in the workers, which
+    saves sending the dropped messages back to the calling process.
+
+    Only files given as a path can be read in parallel, file-like objects
+    are read by the calling process.
+    """
+
+    def __init__(
+        self,
+        file: Union[StringPathLike, BinaryIO],
+        jobs: Optional[int] = None,
+        containers_per_chunk: int = 16,
+        frame_ids: Optional[Iterable[int]] = None,
+        frame_id_mask: int = 0x1FFFFFFF,
+        *args: Any,
+        **kwargs: Any,
+    ) -> None:
+        """
+        :param file: a path-like object or as file-like object to read from
+        :param jobs: number of worker processes, defaults to the number of CPUs
+        :param containers_per_chunk: number of log containers parsed per task
+        :param frame_ids: if given, only the messages whose arbitration id,
+                          masked with `frame_id_mask`, is in `frame_ids` are
+                          read, error frames are dropped
+        :param frame_id_mask: mask applied to the arbitration ids before they
+                              are compared to `frame_ids`
+        """
+        super().__init__(file, *args, **kwargs)
+        self.filename = None if hasattr(file, "read") else file
+        self.jobs = jobs or os.cpu_count() or 1
+        self.containers_per_chunk = max(1, containers_per_chunk)
+        self.frame_ids = None if frame_ids is None else frozenset(frame_ids)
+        self.frame_id_mask = frame_id_mask
+
+    def __iter__(self) -> Generator[RawMessage, None, None]:
+        if self.filename is None or self.jobs <= 1:
+            yield from self._filter(super().__iter__())
+            return
+
+        entries = index_containers(self.file)
+        step = self.containers_per_chunk
+        # a chunk includes the next container, the objects continued there
+        # belong to the chunk
+        chunks = [
+            (entries[i : i + step + 1], entries[i].data_offset,
+             entries[i + step].data_offset if i + step < len(entries) else None)
+            for i in range(0, len(entries), step)
+        ]
+        data_offsets = [entry.data_offset for entry in entries]
+        # the parsed messages of the previous chunks, sorted by timestamp
+        pending: List[CompactMessage] = []
+
+        with concurrent.futures.ProcessPoolExecutor(self.jobs) as pool:
+            # a few chunks in flight keep the workers busy while the memory
+            # stays bounded
+            futures: Deque[concurrent.futures.Future] = collections.deque()
+            submitted = 0
+            try:
+                end = 0
+                for index in range(len(chunks)):
+                    while submitted < len(chunks) and len(futures) <= self.jobs:
+                        chunk, start, stop = chunks[submitted]
+                        futures.append(pool.submit(
+                            _parse_range, self.filename, chunk, start if submitted == 0 else None, stop,
+                            self.frame_ids, self.frame_id_mask,
+                        ))
+                        submitted += 1
+                    first, next_end, messages = futures.popleft().result()
+                    if first != end:
+                        # the worker synchronised on a different object than
+                        # the one following the previous chunk, parse from there
+                        _, stop = chunks[index][1:]
+                        first_entry = bisect.bisect_right(data_offsets, end) - 1
+                        last_entry = index * step + step + 1
+                        _, next_end, messages = _parse_range(
+                            self.filename, entries[max(first_entry, 0) : last_entry], end, stop,
+                            self.frame_ids, self.frame_id_mask,
+                        )
+                    end = next_end
+                    if not messages:
+                        continue
+                    # the messages of the previous chunks up to the start of
+                    # this one are final, equal timestamps keep the file order
+                    watermark = _timestamp_of(messages[0])
+                    count = 0
+                    while count < len(pending) and _timestamp_of(pending[count]) <= watermark:
+                        count += 1
+                    for compact in pending[:count]:
+                        yield _expand(compact)
+                    pending = list(heapq.merge(pending[count:], messages, key=_timestamp_of))
+            finally:
+                # e.g. the iteration was abandoned, only wait for the running chunks
+                for future in futures:
+                    future.cancel()
+
+        for compact in pending:
+            yield _expand(compact)
+        self.stop()
+
+    def _filter(self, messages: Iterable[RawMessage]) -> Iterable[RawMessage]:
+        if self.frame_ids is None:
+            return messages
+        frame_ids = self.frame_ids
+        mask = self.frame_id_mask
+        return (
+            msg for msg in messages
+            if not msg.is_error_frame and (msg.arbitration_id & mask) in frame_ids
+        )
+
+
 class BLFWriter(FileIOMessageWriter):
     """
     Logs CAN data to a Binary Logging File compatible with Vector's tools.
@@ -15,6 +15,7 @@ from typing import Type
 from typing import Tuple
 from typing import cast
 from typing import Dict
+from typing import Sequence
 from typing import Set
 
 from types import TracebackType
@@ -231,6 +232,23 @@ class BaseRotatingLogger(Listener, BaseIOHandler, ABC):
 
         self.writer.on_message_received(msg)
 
+    def on_messages_received(self, msgs: Sequence[Message]) -> None:
+        """This method is called to handle the given messages.
+
+        The rollover condition is checked once per batch, so a file may
+        grow beyond its limit by one batch.
+
+        :param msgs:
+            the delivered messages
+        """
+        if not msgs:
+            return
+        if self.should_rollover(msgs[0]):
+            self.do_rollover()
+            self.rollover_count += 1
+
+        self.writer.on_messages_received(msgs)
+
     def _get_new_writer(self, filename: StringPathLike) -> FileIOMessageWriter:
         """Instantiate a new writer.
 
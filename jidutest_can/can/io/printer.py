@@ -5,6 +5,7 @@ This Listener simply prints to stdout / the terminal or a file.
 import logging
 
 from typing import Optional
+from typing import Sequence
 from typing import TextIO
 from typing import Union
 from typing import Any
@@ -55,6 +56,13 @@ class Printer(MessageWriter):
         else:
             print(msg)
 
+    def on_messages_received(self, msgs: Sequence[Message]) -> None:
+        lines = "".join(f"{msg}\n" for msg in msgs)
+        if self.write_to_file:
+            cast(TextIO, self.file).write(lines)
+        else:
+            print(lines, end="")
+
     def file_size(self) -> int:
         """Return an estimate of the current file size in bytes."""
         if self.file is not None:
@@ -0,0 +1,376 @@
+"""
+This module contains :class:`ReplayEngine`, which sends recorded messages
+again at their recorded times, and the :class:`ReplayReport` of a replay.
+"""
+
+import logging
+import threading
+import time
+import typing
+
+from jidutest_can.can.bcm import JitterStatistics
+from jidutest_can.can.interfaces.util import channel2int
+from jidutest_can.can.io.player import LogReader
+from jidutest_can.can.message import RawMessage
+from jidutest_can.can.typechecking import StringPathLike
+
+if typing.TYPE_CHECKING:
+    from jidutest_can.can.interfaces import BusABC
+
+
+logger = logging.getLogger(__name__)
+
+#: The messages to replay, a log file or the messages themselves.
+ReplaySource = typing.Union[StringPathLike, typing.Iterable[RawMessage]]
+
+
+class ReplayReport:
+    """The result of a replay.
+
+    :attr frames: number of replayed frames, error frames excluded
+    :attr sent: number of successfully sent frames
+    :attr errors: number of frames which could not be sent
+    :attr unmapped: number of frames of recorded channels without bus
+    :attr late: number of frames sent later than the tolerance of the engine
+    :attr batches: number of batches the frames were sent in
+    :attr loops: number of completed passes over the recording
+    :attr duration: wall time of the replay in seconds
+    :attr deviation: statistics of the actual minus the scheduled send time of
+                     every sent frame, in seconds
+    :attr interrupted: ``True`` if the replay was stopped before its end
+    """
+
+    __slots__ = ("frames", "sent", "errors", "unmapped", "late", "batches", "loops",
+                 "duration", "deviation", "interrupted")
+
+    def __init__(self) -> None:
+        self.frames = 0
+        self.sent = 0
+        self.errors = 0
+        self.unmapped = 0
+        self.late = 0
+        self.batches = 0
+        self.loops = 0
+        self.duration = 0.0
+        self.deviation = JitterStatistics()
+        self.interrupted = False
+
+    def as_dict(self) -> typing.Dict[str, typing.Any]:
+        """Return the report as a dictionary, the deviation in seconds."""
+        report = {attribute: getattr(self, attribute) for attribute in self.__slots__}
+        report["deviation"] = self.deviation.as_dict()
+        return report
+
+    def summary(self) -> str:
+        """Return the report as human readable text."""
+        deviation = self.deviation.as_dict()
+        return (f"Replayed {self.frames} frames in {self.duration:.3f} s ({self.loops} loops"
+                f"{', interrupted' if self.interrupted else ''}): {self.sent} sent in {self.batches} batches, "
+                f"{self.errors} errors, {self.unmapped} without bus, {self.late} late\n"
+                f"Deviation from schedule: mean {deviation['mean'] * 1e3:.3f} ms, "
+                f"std {deviation['std'] * 1e3:.3f} ms, min {deviation['min'] * 1e3:.3f} ms, "
+                f"max {deviation['max'] * 1e3:.3f} ms")
+
+    def __repr__(self) -> str:
+        return (f"ReplayReport(frames={self.frames}, sent={self.sent}, errors={self.errors}, "
+                f"unmapped={self.unmapped}, late={self.late}, loops={self.loops}, "
+                f"duration={self.duration:.3f}, deviation={self.deviation!r})")
+
+
+class ReplayEngine:
+    """Sends recorded messages on one or more buses at their recorded times.
+
+    Unlike iterating :class:`~can.MessageSync`, the engine
+
+    * maps every recorded channel to its buses once, matching the channel
+      numbers as :func:`~can.interfaces.util.channel2int` does, or by an
+      explicit `channel_map`,
+    * waits for the next deadline by sleeping until shortly before it and
+      spinning for the rest, so frames are sent precisely even where the
+      sleep of the platform is coarse,
+    * sends all frames due within `batch_window` as one batch, through
+      :meth:`~can.BusABC.send_many` per bus, so dense recordings do not fall
+      behind the recorded timing,
+    * replays at `speed` times the recorded speed, `loops` times,
+    * reports the deviation of every frame from its schedule, see
+      :class:`ReplayReport`.
+
+    ::
+
+        engine = ReplayEngine([bus1, bus2], speed=2.0)
+        report = engine.replay("trace.blf")
+        print(report.summary())
+    """
+
+    def __init__(
+        self,
+        buses: typing.Union["BusABC", typing.List["BusABC"], typing.Tuple["BusABC", ...], typing.Set["BusABC"]],
+        channel_map: typing.Optional[typing.Mapping[typing.Any, "BusABC"]] = None,
+        speed: float = 1.0,
+        loops: int = 1,
+        batch_window: float = 0.0002,
+        spin_threshold: float = 0.002,
+        skip: float = 60.0,
+        tolerance: float = 0.001,
+        max_batch: int = 256,
+    ) -> None:
+        """
+        :param buses: The buses to send on.
+        :param channel_map: Maps recorded channels to buses. Channels not in
+                            the map are matched by their channel number.
+        :param speed: The replay speed relative to the recording, e.g. ``2.0``
+                      replays twice as fast.
+        :param loops: The number of passes over the recording, ``0`` repeats
+                      until :meth:`stop` is called. Every pass starts right
+                      after the last frame of the previous one.
+        :param batch_window: Frames due within this many seconds after the
+                             first due frame are sent in the same batch.
+        :param spin_threshold: The last seconds before a deadline are spent
+                               spinning instead of sleeping.
+        :param skip: Periods of inactivity longer than this many seconds of
+                     replay time are shortened to it.
+        :param tolerance: Frames sent more than this many seconds after their
+                          deadline are counted as late.
+        :param max_batch: The maximum number of frames of a batch.
+        :raises ValueError: If `speed` is not positive or `loops` negative.
+        """
+        if speed <= 0:
+            raise ValueError(f"The speed must be positive, not {speed}")
+        if loops < 0:
+            raise ValueError(f"The number of loops must not be negative, not {loops}")
+        # a bus itself is iterable, over the received messages
+        if isinstance(buses, (list, tuple, set)):
+            self.buses: typing.Tuple["BusABC", ...] = tuple(buses)
+        else:
+            self.buses = (buses,)
+        self.channel_map = dict(channel_map or {})
+        self.speed = speed
+        self.loops = loops
+        self.batch_window = batch_window
+        self.spin_threshold = spin_threshold
+        self.skip = skip
+        self.tolerance = tolerance
+        self.max_batch = max_batch
+        self._bus_numbers = [(channel2int(bus.channel_info), bus) for bus in self.buses]
+        # sent frames carry the channel of their bus, replayed again they stay on it
+        self._channels: typing.Dict[typing.Any, typing.Tuple["BusABC", ...]] = {
+            bus.channel_info: (bus,) for bus in self.buses if bus.channel_info not in self.channel_map
+        }
+        self._stop_event = threading.Event()
+        self._thread: typing.Optional[threading.Thread] = None
+        #: The report of the running or last replay.
+        self.report = ReplayReport()
+
+    def buses_of(self, channel: typing.Any) -> typing.Tuple["BusABC", ...]:
+        """Return the buses the frames recorded on `channel` are sent on."""
+        try:
+            return self._channels[channel]
+        except KeyError:
+            pass
+        except TypeError:
+            # unhashable channel
+            return self._map_channel(channel)
+        buses = self._channels[channel] = self._map_channel(channel)
+        return buses
+
+    def _map_channel(self, channel: typing.Any) -> typing.Tuple["BusABC", ...]:
+        try:
+            return (self.channel_map[channel],)
+        except (KeyError, TypeError):
+            pass
+        number = channel2int(channel)
+        return tuple(bus for bus_number, bus in self._bus_numbers if bus_number == number)
+
+    def replay(self, source: ReplaySource) -> ReplayReport:
+        """Replay `source` and return the report when done.
+
+        A :class:`KeyboardInterrupt` stops the replay, the report is returned
+        nevertheless.
+
+        :param source: A log file, see :class:`~can.LogReader`, or the
+                       messages to replay. An iterator of messages can only
+                       be replayed once.
+        """
+        self._stop_event.clear()
+        self.report = ReplayReport()
+        try:
+            self._run(source)
+        except KeyboardInterrupt:
+            self.report.interrupted = True
+        return self.report
+
+    def start(self, source: ReplaySource) -> None:
+        """Replay `source` in a thread, see :meth:`replay`.
+
+        :raises RuntimeError: If a replay is running already.
+        """
+        if self.is_running:
+            raise RuntimeError("A replay is running already")
+        self._stop_event.clear()
+        self.report = ReplayReport()
+        self._thread = threading.Thread(target=self._run, args=(source,), name="Replay engine", daemon=True)
+        self._thread.start()
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def wait(self, timeout: typing.Optional[float] = None) -> ReplayReport:
+        """Wait for the replay started by :meth:`start` to end and return its
+        report, at most `timeout` seconds."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.report
+
+    def stop(self) -> ReplayReport:
+        """Stop the replay and return its report."""
+        self._stop_event.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        return self.report
+
+    def _messages(self, source: ReplaySource) -> typing.Iterator[RawMessage]:
+        if isinstance(source, (str, bytes)) or hasattr(source, "__fspath__"):
+            return iter(LogReader(source))
+        return iter(source)
+
+    def _run(self, source: ReplaySource) -> None:
+        report = self.report
+        started = time.perf_counter()
+        # the replay time of the first frame of the current pass
+        pass_start = started
+        loop = 0
+        try:
+            while not self._stop_event.is_set():
+                frames = report.frames
+                pass_end = self._replay_pass(source, pass_start, report)
+                if self._stop_event.is_set() or report.frames == frames:
+                    # an exhausted iterator replays nothing anymore
+                    break
+                report.loops += 1
+                loop += 1
+                if self.loops and loop >= self.loops:
+                    break
+                pass_start = max(pass_end, time.perf_counter())
+        finally:
+            report.duration = time.perf_counter() - started
+            if self._stop_event.is_set():
+                report.interrupted = True
+            logger.info(report.summary())
+
+    def _replay_pass(self, source: ReplaySource, pass_start: float, report: ReplayReport) -> float:
+        """Replay one pass of `source`, the first frame at `pass_start`.
+
+        :return: The deadline of the last frame.
+        """
+        speed = self.speed
+        skip = self.skip
+        batch_window = self.batch_window
+        max_batch = self.max_batch
+        messages = self._messages(source)
+        stop_event = self._stop_event
+
+        recorded_start = None
+        skipped = 0.0
+        deadline = pass_start
+        batch: typing.List[typing.Tuple[float, RawMessage, typing.Tuple["BusABC", ...]]] = []
+        # frames due before the horizon join the batch, also those overdue
+        horizon = 0.0
+
+        for message in messages:
+            if message.is_error_frame:
+                continue
+            if recorded_start is None:
+                recorded_start = message.timestamp
+            deadline = pass_start + (message.timestamp - recorded_start) / speed - skipped
+            if batch and (deadline > horizon or len(batch) >= max_batch):
+                self._send_batch(batch, report)
+                batch = []
+                if stop_event.is_set():
+                    return deadline
+            if not batch:
+                if skip and deadline - time.perf_counter() > skip:
+                    skipped += deadline - time.perf_counter() - skip
+                    deadline = time.perf_counter() + skip
+                if not self._wait_until(deadline):
+                    return deadline
+                horizon = max(deadline, time.perf_counter()) + batch_window
+            report.frames += 1
+            buses = self.buses_of(message.channel)
+            if not buses:
+                report.unmapped += 1
+                continue
+            batch.append((deadline, message, buses))
+        if batch:
+            self._send_batch(batch, report)
+        return deadline
+
+    def _wait_until(self, deadline: float) -> bool:
+        """Sleep until shortly before `deadline`, then spin.
+
+        :return: ``False`` if the replay was stopped meanwhile.
+        """
+        stop_event = self._stop_event
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return not stop_event.is_set()
+            if remaining > self.spin_threshold:
+                if stop_event.wait(remaining - self.spin_threshold):
+                    return False
+            else:
+                # let other threads run, e.g. the receiving ones
+                time.sleep(0)
+
+    def _send_batch(self,
+                    batch: typing.List[typing.Tuple[float, RawMessage, typing.Tuple["BusABC", ...]]],
+                    report: ReplayReport) -> None:
+        """Send the frames of a batch, in order per bus, and record their
+        deviation from the schedule."""
+        report.batches += 1
+        by_bus: typing.Dict["BusABC", typing.List[typing.Tuple[float, RawMessage]]] = dict()
+        for deadline, message, buses in batch:
+            if len(buses) == 1:
+                message.channel = buses[0].channel_info
+                by_bus.setdefault(buses[0], []).append((deadline, message))
+                continue
+            for bus in buses:
+                copied = RawMessage(timestamp=message.timestamp,
+                                    arbitration_id=message.arbitration_id,
+                                    is_extended_id=message.is_extended_id,
+                                    is_remote_frame=message.is_remote_frame,
+                                    is_error_frame=message.is_error_frame,
+                                    channel=bus.channel_info,
+                                    dlc=message.dlc,
+                                    data=message.data,
+                                    is_fd=message.is_fd,
+                                    is_rx=message.is_rx,
+                                    bitrate_switch=message.bitrate_switch,
+                                    error_state_indicator=message.error_state_indicator)
+                by_bus.setdefault(bus, []).append((deadline, copied))
+
+        deviation = report.deviation
+        tolerance = self.tolerance
+        for bus, entries in by_bus.items():
+            messages = [message for _, message in entries]
+            index = 0
+            while index < len(messages):
+                try:
+                    count = bus.send_many(messages[index:])
+                except Exception as exc:  # pylint: disable=broad-except
+                    # send_many() only raises for the first message
+                    report.errors += 1
+                    logger.error(f"Replay of {messages[index]} failed: {exc}")
+                    index += 1
+                    continue
+                if not count:
+                    report.errors += len(messages) - index
+                    break
+                sent = time.perf_counter()
+                for deadline, _ in entries[index:index + count]:
+                    late = sent - deadline
+                    deviation.add(late)
+                    if late > tolerance:
+                        report.late += 1
+                report.sent += count
+                index += count
@@ -0,0 +1,80 @@
+"""
+Contains :class:`ThreadedWriter`, which moves formatting, compression and
+file IO of any writer off the thread delivering the messages.
+"""
+
+from typing import Dict
+from typing import Optional
+
+from typing_extensions import Literal
+
+from jidutest_can.can.listener import Listener
+from jidutest_can.can.listener import QueuedListener
+
+
+class ThreadedWriter(QueuedListener):
+    """
+    Wraps a writer, e.g. a :class:`~can.Logger` or
+    :class:`~can.SizedRotatingLogger`, and hands it the received messages on
+    a dedicated writer thread.
+
+    :meth:`on_message_received` only appends the message to a bounded queue,
+    so the receive thread of the :class:`~can.Notifier` never waits for string
+    formatting, BLF container compression or the disk. The writer thread
+    drains the queue and hands it to the writer in batches through
+    ``on_messages_received()``.
+
+    When the queue is full, the `overflow` policy decides:
+
+    * ``"drop"``: the new message is discarded and counted in :attr:`dropped`
+    * ``"block"``: the caller waits until the writer thread made room,
+      counted in :attr:`blocked` and :attr:`blocked_time`
+
+    The wrapped writer must not be used directly while it is wrapped.
+    """
+
+    def __init__(
+        self,
+        writer: Listener,
+        max_queue_size: int = 1_000_000,
+        overflow: Literal["drop", "block"] = "drop",
+        batch_size: int = 4096,
+        flush_interval: float = 0.1,
+        name: Optional[str] = None,
+    ) -> None:
+        """
+        :param writer: The writer which serializes and writes the messages.
+        :param max_queue_size: Maximum number of queued messages.
+        :param overflow: ``"drop"`` or ``"block"``, see above.
+        :param batch_size: Maximum number of messages written per call of
+                           the writer.
+        :param flush_interval: Maximum time in seconds the writer thread
+                               sleeps before looking at the queue.
+        :param name: Name of the writer thread.
+        """
+        if overflow not in ("drop", "block"):
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        super().__init__(
+            writer,
+            max_queue_size=max_queue_size,
+            overflow="drop_newest" if overflow == "drop" else overflow,
+            batch_size=batch_size,
+            flush_interval=flush_interval,
+            name=name or f"can.ThreadedWriter for {type(writer).__name__}",
+        )
+
+    @property
+    def writer(self) -> Listener:
+        """The wrapped writer."""
+        return self.listener
+
+    @property
+    def written(self) -> int:
+        """Number of messages passed to the wrapped writer."""
+        return self.delivered
+
+    def statistics(self) -> Dict[str, float]:
+        """Return the counters of the pipeline as a dictionary."""
+        statistics = super().statistics()
+        statistics["written"] = statistics.pop("delivered")
+        return statistics
@@ -3,16 +3,25 @@ This module contains the implementation of `can.Listener` and some readers.
 """
 
 import sys
+import time
+import logging
 import warnings
 import asyncio
+import threading
+import collections
 from abc import ABCMeta, abstractmethod
 from queue import Queue, Empty
-from typing import Any, AsyncIterator, Awaitable, Optional
+from typing import Any, AsyncIterator, Awaitable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from typing_extensions import Literal
 
 from jidutest_can.can.message import RawMessage
 from jidutest_can.can.bus import BusABC
 
 
+logger = logging.getLogger(__name__)
+
+
 class Listener(metaclass=ABCMeta):
     """The basic listener that can be called directly to handle some
     CAN message::
@@ -39,6 +48,18 @@ class Listener(metaclass=ABCMeta):
         :param msg: the delivered message
         """
 
+    def on_messages_received(self, msgs: Sequence[RawMessage]) -> None:
+        """This method is called by the :class:`~can.Notifier` to handle all
+        messages received in one go, in order.
+
+        The default calls :meth:`on_message_received` for every message,
+        override it if a batch can be handled cheaper.
+
+        :param msgs: the delivered messages
+        """
+        for msg in msgs:
+            self.on_message_received(msg)
+
     def __call__(self, msg: RawMessage) -> None:
         self.on_message_received(msg)
 
@@ -176,3 +197,258 @@ class AsyncBufferedReader(Listener):  # pylint: disable=abstract-method
 
     def __anext__(self) -> Awaitable[RawMessage]:
         return self.buffer.get()
+
+
+#: Overflow policies of :class:`QueuedListener`
+OverflowPolicy = Literal["block", "drop_oldest", "drop_newest"]
+
+
+class QueuedListener(Listener):
+    """
+    Decouples a listener from the thread delivering the messages, usually
+    a receive thread of the :class:`~can.Notifier`.
+
+    :meth:`on_message_received` and :meth:`on_messages_received` only append
+    to a bounded queue, a worker thread of its own hands the messages in
+    batches to the wrapped `listener`. A slow listener therefore only falls
+    behind itself, it cannot stall reception or other listeners.
+
+    When the queue is full, the `overflow` policy decides:
+
+    * ``"block"``: the caller waits until the worker thread made room,
+      counted in :attr:`blocked` and :attr:`blocked_time`
+    * ``"drop_oldest"``: the oldest queued messages are discarded
+    * ``"drop_newest"``: the new messages are discarded
+
+    Discarded messages are counted in :attr:`dropped`.
+    """
+
+    def __init__(
+        self,
+        listener: Any,
+        max_queue_size: int = 100_000,
+        overflow: OverflowPolicy = "block",
+        batch_size: int = 4096,
+        flush_interval: float = 0.1,
+        name: Optional[str] = None,
+    ) -> None:
+        """
+        :param listener: A :class:`~can.Listener` or a callable receiving a
+                         :class:`~can.RawMessage`.
+        :param max_queue_size: Maximum number of queued messages.
+        :param overflow: ``"block"``, ``"drop_oldest"`` or ``"drop_newest"``,
+                         see above.
+        :param batch_size: Maximum number of messages delivered per call of
+                           the wrapped listener.
+        :param flush_interval: Maximum time in seconds the worker thread
+                               sleeps before looking at the queue.
+        :param name: Name of the worker thread.
+        """
+        super().__init__()
+        if overflow not in ("block", "drop_oldest", "drop_newest"):
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self.listener = listener
+        self.max_queue_size = max_queue_size
+        self.overflow = overflow
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        #: Number of messages handed to this listener
+        self.received = 0
+        #: Number of messages passed to the wrapped listener
+        self.delivered = 0
+        #: Number of messages discarded because the queue was full
+        self.dropped = 0
+        #: Number of times a caller had to wait for room in the queue
+        self.blocked = 0
+        #: Total time in seconds callers waited for room in the queue
+        self.blocked_time = 0.0
+        #: Largest number of queued messages seen by the worker thread
+        self.max_queue_depth = 0
+        #: Longest time in seconds a delivered message waited in the queue
+        self.max_lag = 0.0
+        #: Number of messages in batches the wrapped listener raised an exception for
+        self.errors = 0
+
+        self._on_messages_received = getattr(listener, "on_messages_received", None)
+        self._on_message_received = getattr(listener, "on_message_received", listener)
+        # entries are (time of enqueueing, message)
+        self._queue: Deque[Tuple[float, RawMessage]] = collections.deque()
+        self._wakeup = threading.Event()
+        self._space = threading.Condition(threading.Lock())
+        self._waiting = 0
+        self._closed = False
+        # stop() was called, the listener is stopped once the queue is delivered
+        self._stop_requested = False
+        self._listener_stopped = False
+        self._stop_lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self._run,
+            name=name or f"can.QueuedListener for {type(listener).__name__}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    @property
+    def queue_size(self) -> int:
+        """Number of messages waiting to be delivered."""
+        return len(self._queue)
+
+    @property
+    def lag(self) -> float:
+        """Time in seconds the oldest queued message has been waiting."""
+        try:
+            return time.perf_counter() - self._queue[0][0]
+        except IndexError:
+            return 0.0
+
+    def statistics(self) -> Dict[str, float]:
+        """Return the counters of this listener as a dictionary."""
+        return {
+            "received": self.received,
+            "delivered": self.delivered,
+            "queued": self.queue_size,
+            "dropped": self.dropped,
+            "blocked": self.blocked,
+            "blocked_time": self.blocked_time,
+            "max_queue_depth": self.max_queue_depth,
+            "lag": self.lag,
+            "max_lag": self.max_lag,
+            "errors": self.errors,
+        }
+
+    def on_message_received(self, msg: RawMessage) -> None:
+        if self._closed or len(self._queue) >= self.max_queue_size:
+            self.on_messages_received((msg,))
+            return
+        self.received += 1
+        self._queue.append((time.perf_counter(), msg))
+        if not self._wakeup.is_set():
+            self._wakeup.set()
+
+    def on_messages_received(self, msgs: Sequence[RawMessage]) -> None:
+        if self._closed:
+            return
+        self.received += len(msgs)
+        now = time.perf_counter()
+        queue = self._queue
+        start = 0
+        while start < len(msgs):
+            free = self.max_queue_size - len(queue)
+            if free <= 0:
+                if self.overflow == "drop_newest":
+                    self.dropped += len(msgs) - start
+                    break
+                if self.overflow == "block":
+                    self._wait_for_space()
+                    continue
+                # drop_oldest, the worker thread may empty the queue meanwhile
+                needed = min(len(msgs) - start, self.max_queue_size)
+                while len(queue) > self.max_queue_size - needed:
+                    try:
+                        queue.popleft()
+                    except IndexError:
+                        break
+                    self.dropped += 1
+                continue
+            queue.extend((now, msg) for msg in msgs[start:start + free])
+            start += free
+        if not self._wakeup.is_set():
+            self._wakeup.set()
+
+    def _wait_for_space(self) -> None:
+        self.blocked += 1
+        start = time.perf_counter()
+        with self._space:
+            self._waiting += 1
+            self._wakeup.set()
+            while len(self._queue) >= self.max_queue_size and not self._closed:
+                self._space.wait(self.flush_interval)
+            self._waiting -= 1
+        self.blocked_time += time.perf_counter() - start
+
+    def _run(self) -> None:
+        queue = self._queue
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            closed = self._closed
+            self.max_queue_depth = max(self.max_queue_depth, len(queue))
+            while queue:
+                entries = []
+                try:
+                    for _ in range(self.batch_size):
+                        entries.append(queue.popleft())
+                except IndexError:
+                    # drained, possibly by drop_oldest
+                    if not entries:
+                        break
+                self.max_lag = max(self.max_lag, time.perf_counter() - entries[0][0])
+                self._deliver([msg for _, msg in entries])
+                if self._waiting:
+                    with self._space:
+                        self._space.notify_all()
+            if closed:
+                break
+        if self._stop_requested:
+            self._stop_listener()
+
+    def _stop_listener(self) -> None:
+        with self._stop_lock:
+            if self._listener_stopped:
+                return
+            self._listener_stopped = True
+        getattr(self.listener, "stop", lambda: None)()
+
+    def _deliver(self, batch: List[RawMessage]) -> None:
+        try:
+            if self._on_messages_received is not None:
+                self._on_messages_received(batch)
+            else:
+                for msg in batch:
+                    self._on_message_received(msg)
+            self.delivered += len(batch)
+        except Exception as exc:  # pylint: disable=broad-except
+            if not self.errors:
+                logger.exception("%s: delivering messages failed: %s", self._thread.name, exc)
+            self.errors += len(batch)
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """Deliver all queued messages and end the worker thread, without
+        stopping the wrapped listener.
+
+        :param timeout: Maximum time in seconds to wait for the queue to be
+                        delivered, ``None`` waits until it is empty.
+        :return: ``True`` if all queued messages were delivered.
+        """
+        if not self._closed:
+            self._closed = True
+            self._wakeup.set()
+            with self._space:
+                self._space.notify_all()
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.warning("%s: %d messages were not delivered", self._thread.name, self.queue_size)
+            return False
+        return True
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Deliver all queued messages and stop the wrapped listener.
+
+        If the queue is not delivered within `timeout`, the worker thread
+        stops the wrapped listener once it is, e.g. so that a writer still
+        flushes and closes its file. Calling :meth:`stop` again waits for
+        the worker thread again.
+
+        :param timeout: See :meth:`close`.
+        """
+        # set before closing, the worker thread ends only once it is closed
+        self._stop_requested = True
+        if self.close(timeout):
+            self._stop_listener()
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}({self.listener!r}, delivered={self.delivered}, "
+            f"queued={self.queue_size}, dropped={self.dropped}, blocked={self.blocked})"
+        )
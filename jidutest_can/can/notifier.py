@@ -18,9 +18,13 @@ from typing import Set
 from typing import Dict
 from typing import List
 from typing import Optional
+from typing import Sequence
+from typing import Tuple
 from typing import Union
 
 from jidutest_can.can.interfaces import BusABC
+from jidutest_can.can.listener import OverflowPolicy
+from jidutest_can.can.listener import QueuedListener
 from jidutest_can.can.message import RawMessage
 from jidutest_can.can.tools import BUS_NOTIFIER_MAPPING
 
@@ -54,6 +58,18 @@ class Reader(metaclass=ABCMeta):
         :param msg: the delivered message
         """
 
+    def on_messages_received(self, msgs: Sequence[RawMessage]) -> None:
+        """This method is called by the :class:`~can.Notifier` to handle all
+        messages received in one go, in order.
+
+        The default calls :meth:`on_message_received` for every message,
+        override it if a batch can be handled cheaper.
+
+        :param msgs: the delivered messages
+        """
+        for msg in msgs:
+            self.on_message_received(msg)
+
     def __call__(self, msg: RawMessage) -> None:
         self.on_message_received(msg)
 
@@ -118,6 +134,20 @@ class BufferedReader(Reader):  # pylint: disable=abstract-method
         else:
             self.buffer.put(msg)
 
+    def on_messages_received(self, msgs: Sequence[RawMessage]) -> None:
+        """Append all messages to the buffer, taking its lock once.
+
+        :raises: BufferError
+            if the reader has already been stopped
+        """
+        if self.is_stopped:
+            raise RuntimeError("reader has already been stopped")
+        # the buffer is unbounded, so nothing can block here
+        with self.buffer.mutex:
+            self.buffer.queue.extend(msgs)
+            self.buffer.unfinished_tasks += len(msgs)
+            self.buffer.not_empty.notify(len(msgs))
+
     def get_message(self, timeout: float = 0.5) -> Optional[RawMessage]:
         """
         Attempts to retrieve the message that has been in the queue for the longest amount
@@ -204,6 +234,9 @@ class Notifier:
         listeners: Iterable[MessageRecipient],
         timeout: float = 1.0,
         loop: Optional[asyncio.AbstractEventLoop] = None,
+        isolated: bool = False,
+        max_queue_size: int = 100_000,
+        overflow: OverflowPolicy = "block",
     ) -> None:
         """Manages the distribution of :class:`~can.RawMessage` instances to listeners.
 
@@ -221,8 +254,33 @@ class Notifier:
             and return nothing.
         :param timeout: An optional maximum number of seconds to wait for any :class:`~can.RawMessage`.
         :param loop: An :mod:`asyncio` event loop to schedule the ``listeners`` in.
+        :param isolated:
+            If ``True``, every listener gets a bounded queue and a worker
+            thread of its own, see :class:`~can.QueuedListener`, so a slow
+            listener cannot stall reception or the other listeners. Can also
+            be chosen per listener with :meth:`add_listener`. Not supported
+            together with `loop`.
+        :param max_queue_size: Queue size of isolated listeners.
+        :param overflow:
+            What isolated listeners do when their queue is full: ``"block"``,
+            ``"drop_oldest"`` or ``"drop_newest"``.
+
+        Listeners implementing ``on_messages_received()``, like every
+        :class:`~can.Reader`, get all messages of one receive call in a single
+        call, other callables are called once per message. Use
+        :meth:`add_listener` and :meth:`remove_listener` to change the
+        listeners, the receive threads iterate over an immutable snapshot
+        which is only rebuilt by these methods.
         """
+        if loop is not None and isolated:
+            raise ValueError("isolated listeners are not supported with an asyncio loop")
         self.listeners: Set[MessageRecipient] = set(listeners)
+        self.isolated = isolated
+        self.max_queue_size = max_queue_size
+        self.overflow = overflow
+        self._listeners_lock = threading.Lock()
+        self._queues: Dict[MessageRecipient, QueuedListener] = dict()
+        self._recipients: Tuple[Tuple[MessageRecipient, Optional[Callable[[Sequence[RawMessage]], Any]]], ...] = ()
         self.timeout = timeout
         self._loop = loop
 
@@ -232,6 +290,11 @@ class Notifier:
         self._running = True
         self._lock = threading.Lock()
 
+        # the receive threads started by add_bus() deliver to the snapshot
+        # of the listeners, so it has to be complete before
+        for listener in self.listeners.copy():
+            self._register_listener(listener, isolated)
+
         self._readers: Dict[Union[BusABC, List[BusABC]], Union[int, threading.Thread]] = dict()
         self.buses = set(bus if isinstance(bus, (list, tuple, set)) else [bus])
         for each_bus in self.buses:
@@ -287,6 +350,11 @@ class Notifier:
             Should be longer than timeout given at instantiation.
         """
         self._running = False
+        # the cyclic send tasks loop their messages back to the listeners of
+        # the mapped notifier, which are stopped below
+        for bus in self.buses:
+            if BUS_NOTIFIER_MAPPING.get(bus) is self:
+                del BUS_NOTIFIER_MAPPING[bus]
         end_time = time.time() + timeout
         for reader in self._readers.values():
             if isinstance(reader, threading.Thread):
@@ -297,22 +365,25 @@ class Notifier:
                 # reader is a file descriptor
                 self._loop.remove_reader(reader)
         for listener in self.listeners.copy():
+            # an isolated listener is stopped after its queue is delivered
+            listener = self._queues.get(listener, listener)
             # Mypy prefers this over a hasattr(...) check
             getattr(listener, "stop", lambda: None)()
 
     def _rx_thread(self, bus: BusABC) -> None:
-        msg = None
+        batch: List[RawMessage] = []
         try:
             while self._running:
-                if msg is not None:
+                if batch:
+                    # the lock is taken once per batch instead of per message
                     with self._lock:
                         if self._loop is not None:
                             self._loop.call_soon_threadsafe(
-                                self._on_message_received, msg
+                                self._on_messages_received, batch
                             )
                         else:
-                            self._on_message_received(msg)
-                msg = bus.recv(self.timeout)
+                            self._on_messages_received(batch)
+                batch = bus.recv_batch(timeout=self.timeout)
                 # logger.info(f"Notifier recv msg: {msg}")
         except Exception as exc:  # pylint: disable=broad-except
             self.exceptions[bus] = exc
@@ -329,17 +400,43 @@ class Notifier:
                 logger.info("suppressed exception: %s", exc)
 
     def _on_message_available(self, bus: BusABC) -> None:
-        msg = bus.recv(0)
-        if msg is not None:
-            self._on_message_received(msg)
+        batch = bus.recv_batch(timeout=0)
+        if batch:
+            self._on_messages_received(batch)
 
     def _on_message_received(self, msg: RawMessage) -> None:
-        for callback in self.listeners.copy():
+        for callback, _ in self._recipients:
             res = callback(msg)
             if res is not None and self._loop is not None and asyncio.iscoroutine(res):
                 # Schedule coroutine
                 self._loop.create_task(res)
 
+    def _on_messages_received(self, msgs: Sequence[RawMessage]) -> None:
+        for callback, batch_callback in self._recipients:
+            if batch_callback is not None:
+                batch_callback(msgs)
+                continue
+            for msg in msgs:
+                res = callback(msg)
+                if res is not None and self._loop is not None and asyncio.iscoroutine(res):
+                    # Schedule coroutine
+                    self._loop.create_task(res)
+
+    def _refresh_recipients(self) -> None:
+        """Rebuild the snapshot of listeners used by the receive threads,
+        the caller must hold ``self._listeners_lock``."""
+        recipients = [self._queues.get(listener, listener) for listener in self.listeners]
+        self._recipients = tuple(
+            (recipient, getattr(recipient, "on_messages_received", None))
+            for recipient in recipients
+        )
+
+    def listener_statistics(self) -> Dict[MessageRecipient, Dict[str, float]]:
+        """Return the queue counters of every isolated listener, e.g. its
+        lag and the number of dropped messages, see
+        :meth:`~can.QueuedListener.statistics`."""
+        return {listener: queue.statistics() for listener, queue in self._queues.copy().items()}
+
     def _on_error(self, exc: Exception) -> bool:
         """Calls ``on_error()`` for all listeners if they implement it.
 
@@ -361,17 +458,37 @@ class Notifier:
 
         return was_handled
 
-    def add_listener(self, listener: MessageRecipient) -> None:
+    def add_listener(self, listener: MessageRecipient, isolated: Optional[bool] = None) -> None:
         """Add new Reader to the notification list.
         If it is already present, it will be called two times
         each time a message arrives.
 
         :param listener: Reader to be added to the list to be notified
+        :param isolated: Deliver to the listener through a queue and thread
+                         of its own, ``None`` uses the setting of the notifier.
         """
+        if isolated is None:
+            isolated = self.isolated
+        if isolated and self._loop is not None:
+            raise ValueError("isolated listeners are not supported with an asyncio loop")
         buses_without_reader = self.buses - self._readers.keys()
         for bus in buses_without_reader:
-            BUS_NOTIFIER_MAPPING[bus].add_listener(listener)
-        self.listeners.add(listener)
+            # the notifier receiving from the bus may be stopped already
+            if bus in BUS_NOTIFIER_MAPPING:
+                BUS_NOTIFIER_MAPPING[bus].add_listener(listener, isolated)
+        self._register_listener(listener, isolated)
+
+    def _register_listener(self, listener: MessageRecipient, isolated: bool) -> None:
+        with self._listeners_lock:
+            if isolated and listener not in self._queues:
+                self._queues[listener] = QueuedListener(
+                    listener,
+                    max_queue_size=self.max_queue_size,
+                    overflow=self.overflow,
+                    name=f"can.notifier.deliver to {type(listener).__name__}",
+                )
+            self.listeners.add(listener)
+            self._refresh_recipients()
 
     def remove_listener(self, listener: MessageRecipient) -> None:
         """Remove a listener from the notification list. This method
@@ -383,8 +500,16 @@ class Notifier:
         """
         buses_without_reader = self.buses - self._readers.keys()
         for bus in buses_without_reader:
-            BUS_NOTIFIER_MAPPING[bus].remove_listener(listener)
+            # the notifier receiving from the bus may be stopped already
+            if bus in BUS_NOTIFIER_MAPPING:
+                BUS_NOTIFIER_MAPPING[bus].remove_listener(listener)
+        with self._listeners_lock:
+            queue = self._queues.pop(listener, None)
+            if listener in self.listeners:
+                self.listeners.remove(listener)
+                self._refresh_recipients()
+        if queue is not None:
+            # the listener keeps running, only its queue is shut down
+            queue.close()
         if isinstance(listener, BufferedReader):
             listener.buffer.queue.clear()
-        if listener in self.listeners:
-            self.listeners.remove(listener)
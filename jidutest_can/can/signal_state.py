@@ -0,0 +1,242 @@
+"""
+This module contains :class:`SignalStateStore`, a listener that keeps the last
+payload of every arbitration ID and decodes it lazily, only when the payload
+changed since it was decoded last, so that reading the current value of a
+signal does not wait for the next frame.
+"""
+
+import logging
+import types
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Union
+
+from jidutest_can.can.listener import Listener
+from jidutest_can.can.message import RawMessage
+from jidutest_can.cantools.database import NamedSignalValue
+
+
+logger = logging.getLogger(__name__)
+
+
+class MessageState:
+    """The last received state of one arbitration ID.
+
+    The received payload and the decoded signals are kept as immutable
+    snapshots which are replaced as a whole, so the state can be read from any
+    thread while frames are received without a lock.
+
+    :attr frame_id: the arbitration ID
+    :attr message: the message in the database, ``None`` for unknown IDs
+    :attr count: number of received frames
+    """
+
+    __slots__ = ("frame_id", "message", "count", "_received", "_changed", "_decoded")
+
+    def __init__(self, frame_id: int, message: Any = None) -> None:
+        self.frame_id = frame_id
+        self.message = message
+        self.count = 0
+        #: (payload, timestamp) of the last frame
+        self._received: Tuple[bytes, float] = (b"", 0.0)
+        #: (payload, timestamp) of the last frame with a changed payload
+        self._changed: Tuple[bytes, float] = (b"", 0.0)
+        #: (payload, signals) of the last decoded payload
+        self._decoded: Optional[Tuple[bytes, Optional[Mapping[str, Any]]]] = None
+
+    def update(self, data: bytes, timestamp: float) -> None:
+        """Store a received payload."""
+        self.count += 1
+        if data != self._changed[0] or self.count == 1:
+            self._changed = (data, timestamp)
+        self._received = (data, timestamp)
+
+    @property
+    def data(self) -> bytes:
+        """The last received payload."""
+        return self._changed[0]
+
+    @property
+    def timestamp(self) -> float:
+        """The timestamp of the last received frame."""
+        return self._received[1]
+
+    @property
+    def changed_timestamp(self) -> float:
+        """The timestamp of the first frame carrying the current payload."""
+        return self._changed[1]
+
+    @property
+    def signals(self) -> Optional[Mapping[str, Any]]:
+        """The decoded signals of the last payload as a read-only mapping.
+
+        The payload is decoded on the first access after it changed, later
+        accesses return the same mapping. ``None`` for unknown IDs, before the
+        first frame and if the payload cannot be decoded.
+        """
+        data = self._changed[0]
+        decoded = self._decoded
+        if decoded is not None and decoded[0] is data:
+            return decoded[1]
+        if self.message is None or not self.count:
+            return None
+        try:
+            signals = types.MappingProxyType(self.message.decode(data))
+        except Exception as ex:
+            logger.debug(f"Unable to decode 0x{self.frame_id:x} with payload {data.hex()}: {ex}")
+            signals = None
+        self._decoded = (data, signals)
+        return signals
+
+    def __repr__(self) -> str:
+        return (f"MessageState(frame_id=0x{self.frame_id:x}, "
+                f"name={self.message.name if self.message is not None else None!r}, "
+                f"data={self.data.hex()!r}, count={self.count}, timestamp={self.timestamp}, "
+                f"changed_timestamp={self.changed_timestamp})")
+
+
+class SignalStateStore(Listener):
+    """Keeps the current state of every received arbitration ID.
+
+    Receiving a frame only stores its payload and timestamp, the signals are
+    decoded when they are read and only if the payload changed since the last
+    read. Reading a signal is a dictionary lookup then, independent of how
+    many frames were received in between::
+
+        store = SignalStateStore(db)
+        notifier = Notifier(bus, [store])
+        ...
+        speed = store.get_signal("VehicleSpeed")
+        state = store.get_message_state(0x123)
+
+    A signal name used by several messages is looked up in the message given
+    by `message`, or else in the one of them which was received last.
+    """
+
+    def __init__(self, db: Any) -> None:
+        """
+        :param db: The :class:`~jidutest_can.cantools.Database` to decode the
+                   received frames with.
+        """
+        super().__init__()
+        self._messages: Dict[int, Any] = dict()
+        #: signal name -> the messages carrying a signal of that name
+        self._signal_messages: Dict[str, Tuple[Any, ...]] = dict()
+        for message in db.messages:
+            self._messages.setdefault(message.frame_id, message)
+            for signal in message.signals:
+                self._signal_messages[signal.name] = self._signal_messages.get(signal.name, ()) + (message,)
+        duplicates = {name: [message.name for message in messages]
+                      for name, messages in self._signal_messages.items() if len(messages) > 1}
+        if duplicates:
+            logger.warning(f"The signals {duplicates} are carried by several messages, "
+                           f"pass the message to look them up unambiguously")
+        self._states: Dict[int, MessageState] = dict()
+
+    def on_message_received(self, msg: RawMessage) -> None:
+        self.on_messages_received((msg,))
+
+    def on_messages_received(self, msgs: Sequence[RawMessage]) -> None:
+        states = self._states
+        for msg in msgs:
+            if msg.is_error_frame or msg.is_remote_frame:
+                continue
+            state = states.get(msg.arbitration_id)
+            if state is None:
+                state = MessageState(msg.arbitration_id, self._messages.get(msg.arbitration_id))
+                states[msg.arbitration_id] = state
+            state.update(bytes(msg.data), msg.timestamp)
+
+    def get_message_state(self, frame_id: int) -> Optional[MessageState]:
+        """Return the state of an arbitration ID, ``None`` if no frame of it
+        was received yet.
+        """
+        return self._states.get(frame_id)
+
+    def get_signal_state(self, name: str, message: Union[str, int, None] = None) -> Optional[MessageState]:
+        """Return the state of the message carrying the signal `name`,
+        ``None`` if no frame of it was received yet.
+
+        :param name: The name of the signal.
+        :param message: The name or arbitration ID of the message carrying the
+                        signal. If ``None`` and several messages carry a signal
+                        called `name`, the one received last is used.
+        :raises KeyError: If the signal is not in the database or not in
+                          `message`.
+        """
+        messages = self._signal_messages[name]
+        if message is not None:
+            attribute = "name" if isinstance(message, str) else "frame_id"
+            for candidate in messages:
+                if getattr(candidate, attribute) == message:
+                    return self._states.get(candidate.frame_id)
+            raise KeyError(f"Signal {name} is not in message {message}")
+        if len(messages) == 1:
+            return self._states.get(messages[0].frame_id)
+        states = [self._states.get(candidate.frame_id) for candidate in messages]
+        states = [state for state in states if state is not None]
+        return max(states, key=lambda state: state.timestamp) if states else None
+
+    def get_signal(self,
+                   name: str,
+                   default: Any = None,
+                   decode_choices: bool = True,
+                   message: Union[str, int, None] = None) -> Any:
+        """Return the last received value of the signal `name`.
+
+        :param name: The name of the signal.
+        :param default: Returned if the signal was not received yet or the
+                        payload cannot be decoded.
+        :param decode_choices: Return the number instead of the
+                               :class:`~jidutest_can.cantools.database.NamedSignalValue`
+                               of signals with choices if ``False``.
+        :param message: The message carrying the signal, see
+                        :meth:`get_signal_state`.
+        :raises KeyError: If the signal is not in the database or not in
+                          `message`.
+        """
+        state = self.get_signal_state(name, message)
+        signals = state.signals if state is not None else None
+        if signals is None or name not in signals:
+            return default
+        value = signals[name]
+        if not decode_choices and isinstance(value, NamedSignalValue):
+            return value.value
+        return value
+
+    def get_signals(self,
+                    *names: str,
+                    decode_choices: bool = True,
+                    message: Union[str, int, None] = None) -> Dict[str, Any]:
+        """Return the last received values of the signals `names`, leaving out
+        the signals which were not received yet.
+
+        :param message: The message carrying the signals, see
+                        :meth:`get_signal_state`.
+        :raises KeyError: If a signal is not in the database or not in
+                          `message`.
+        """
+        missing = object()
+        values = dict()
+        for name in names:
+            value = self.get_signal(name, missing, decode_choices, message)
+            if value is not missing:
+                values[name] = value
+        return values
+
+    @property
+    def frame_ids(self) -> List[int]:
+        """The arbitration IDs received so far."""
+        return list(self._states)
+
+    def clear(self) -> None:
+        """Forget all received states."""
+        self._states = dict()
+
+    def stop(self) -> None:
+        pass
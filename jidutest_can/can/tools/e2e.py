@@ -1,5 +1,49 @@
-from crccheck.crc import Crc8GsmA as Crc
-from typing import Union, List, Tuple
+"""
+End-to-end protection of CAN frames: the CRC8 of the checksum (``Chks``)
+signals, the precompiled per-message :class:`E2EPlan` and the
+:class:`E2EPayloadGenerator` of cyclically sent frames.
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+from jidutest_can.cantools.database import NamedSignalValue
+from jidutest_can.cantools.database.template import MessageLayout
+
+logger = logging.getLogger(__name__)
+
+#: Generator polynomial of the CRC8 (CRC-8/GSM-A: init 0x00, not reflected,
+#: no final XOR).
+CRC8_POLYNOMIAL = 0x1D
+
+#: Number of values of the counter (``Cntr``) signals.
+COUNTER_MODULUS = 15
+
+
+def _make_crc8_table(polynomial: int) -> Tuple[int, ...]:
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = ((crc << 1) ^ polynomial) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+        table.append(crc)
+    return tuple(table)
+
+
+#: CRC8 of every single byte, see :data:`CRC8_POLYNOMIAL`.
+CRC8_TABLE = _make_crc8_table(CRC8_POLYNOMIAL)
+
+
+def crc8(data: Iterable[int], crc: int = 0) -> int:
+    """Calculate the CRC8 of `data`, continuing from `crc`.
+
+    :param data: The bytes to calculate the CRC of.
+    :param crc: The CRC of the preceding bytes.
+    """
+    table = CRC8_TABLE
+    for byte in data:
+        crc = table[crc ^ byte]
+    return crc
 
 
 def e2e_crc_data(data_id: int, counter: int, sig_value_length: Union[Tuple[int, int], List[Tuple[int, int]]]) -> int:
@@ -9,7 +53,226 @@ def e2e_crc_data(data_id: int, counter: int, sig_value_length: Union[Tuple[int,
     value_length_list = [sig_value_length] if isinstance(sig_value_length, tuple) else sig_value_length
     for value, length in value_length_list:
         crc_data += value.to_bytes(((length - 1) // 8) + 1, 'little')
-    return Crc.calc(crc_data)
+    return crc8(crc_data)
+
+
+class E2EField:
+    """
+    A data signal covered by the checksum of an :class:`E2EGroup`.
+    """
+
+    __slots__ = ("name", "signal", "size", "scale", "offset")
+
+    def __init__(self, signal: Any) -> None:
+        self.name: str = signal.name
+        self.signal = signal
+        #: Number of bytes the raw value takes in the CRC data.
+        self.size: int = ((signal.length - 1) // 8) + 1
+        self.scale = signal.scale
+        self.offset = signal.offset
+
+    def raw_value(self, signals: Mapping[str, Any]) -> int:
+        """
+        Return the raw value of the field in the physical `signals` as it
+        enters the CRC data, or the initial value of the signal if
+        `signals` does not contain it.
+        """
+        try:
+            value = signals[self.name]
+        except KeyError:
+            return int(self.signal.initial)
+        if isinstance(value, (str, NamedSignalValue)):
+            value = self.signal.choice_string_to_number(value)
+        return int((value - self.offset) / self.scale)
+
+
+class E2EGroup:
+    """
+    The checksum signal of a signal group, its counter signal and the data
+    signals it covers in CRC order, i.e. sorted by name.
+
+    :attr:`data_id` is ``None`` if the checksum signal has no valid data ID,
+    the reason is in :attr:`error` then.
+    """
+
+    __slots__ = ("chks_name", "cntr_name", "data_id", "fields", "signal_names", "error", "_crc_init")
+
+    def __init__(self, chks_signal: Any, signal_names: Iterable[str], signals: Mapping[str, Any]) -> None:
+        self.chks_name: str = chks_signal.name
+        self.cntr_name: str = chks_signal.name[:-4] + "Cntr"
+        #: All signal names of the signal group.
+        self.signal_names: Tuple[str, ...] = tuple(signal_names)
+        self.fields: Tuple[E2EField, ...] = tuple(
+            E2EField(signals[name]) for name in sorted(self.signal_names)
+            if not (name.endswith("Chks") or name.endswith("Cntr"))
+        )
+        self.data_id: Optional[int] = None
+        self.error: Optional[str] = None
+        self._crc_init = 0
+        try:
+            self.data_id = int(chks_signal.data_id, 16)
+        except TypeError:
+            self.error = f"The signal {chks_signal.name} does not contain data id for e2e"
+        except ValueError:
+            self.error = f"The data id of the signal {chks_signal.name} is {chks_signal.data_id}"
+        else:
+            # the data ID is the same for every frame
+            self._crc_init = crc8(self.data_id.to_bytes(2, "little"))
+
+    def checksum(self, counter: int, raw_values: Iterable[int]) -> int:
+        """
+        Calculate the checksum of a frame.
+
+        :param counter: The value of the counter signal.
+        :param raw_values: The raw values of :attr:`fields`, in their order.
+        :raises ValueError: If the group has no valid data ID.
+        """
+        if self.data_id is None:
+            raise ValueError(self.error)
+        table = CRC8_TABLE
+        crc = table[self._crc_init ^ counter]
+        for field, value in zip(self.fields, raw_values):
+            if field.size == 1:
+                if not 0 <= value <= 0xFF:
+                    raise OverflowError("int too big to convert")
+                crc = table[crc ^ value]
+            else:
+                for byte in value.to_bytes(field.size, "little"):
+                    crc = table[crc ^ byte]
+        return crc
+
+    def physical_checksum(self, counter: int, signals: Mapping[str, Any]) -> int:
+        """
+        Calculate the checksum of a frame given by its physical signal values,
+        see :meth:`E2EField.raw_value`.
+        """
+        return self.checksum(counter, [field.raw_value(signals) for field in self.fields])
+
+
+class E2EPlan:
+    """
+    The end-to-end protection of a message, compiled once from the
+    :class:`~jidutest_can.cantools.database.Message`.
+
+    Every checksum (``Chks``) signal of the message that belongs to a signal
+    group becomes an :class:`E2EGroup` holding its data ID, its counter signal
+    and the covered data signals in CRC order. Calculating the checksum of a
+    frame then only takes a table lookup per byte instead of looking up the
+    signal group, the signals and running a generic CRC implementation.
+    """
+
+    __slots__ = ("message_name", "groups", "_groups_by_chks")
+
+    def __init__(self, message: Any) -> None:
+        """
+        :param message: The database message to compile.
+        """
+        self.message_name: str = message.name
+        self.groups: List[E2EGroup] = []
+        signals = {signal.name: signal for signal in message.signals}
+        group_signal_names: Dict[str, List[str]] = {}
+        for signal_group in message.signal_groups or ():
+            for name in signal_group.signal_names:
+                group_signal_names.setdefault(name, signal_group.signal_names)
+        for chks_signal in message.chks_signals:
+            signal_names = group_signal_names.get(chks_signal.name)
+            if signal_names is None:
+                logger.debug(f"Signal {chks_signal.name} of message {message.name} is in no signal group.")
+                continue
+            try:
+                self.groups.append(E2EGroup(chks_signal, signal_names, signals))
+            except KeyError as e:
+                logger.error(f"Signal group of {chks_signal.name} in message {message.name} "
+                             f"contains the unknown signal {e}.")
+        self._groups_by_chks: Dict[str, E2EGroup] = {group.chks_name: group for group in self.groups}
+
+    def __bool__(self) -> bool:
+        return bool(self.groups)
+
+    def get_group(self, chks_name: str) -> Optional[E2EGroup]:
+        """
+        Return the group of the checksum signal `chks_name`, or ``None`` if it
+        is not protected.
+        """
+        return self._groups_by_chks.get(chks_name)
+
+    def __repr__(self) -> str:
+        return f"E2EPlan({self.message_name!r}, {[group.chks_name for group in self.groups]})"
+
+
+class E2EPayloadGenerator:
+    """
+    Updates the counter and checksum signals of a cyclically sent frame just
+    before each transmission, see the `payload_generator` of
+    :meth:`~can.BusABC.send_periodic`.
+
+    The first transmission keeps the counters of the frame, every further one
+    increments them (modulo :data:`COUNTER_MODULUS`). The checksums are
+    calculated from the current payload on every transmission, so the frame
+    is stored once instead of once per counter value, modified payloads are
+    protected from the next transmission on and the counters continue across
+    modifications. Only the bits of the counter and checksum signals are
+    patched, the payload is not encoded as a whole.
+    """
+
+    __slots__ = ("message_name", "groups", "_patches", "_counters")
+
+    def __init__(self, message: Any, plan: E2EPlan, chks_names: Optional[Iterable[str]] = None) -> None:
+        """
+        :param message: The database message of the frame.
+        :param plan: The E2E plan of `message`.
+        :param chks_names: The checksum signals to update, by default all
+                           groups of `plan`. Only the counter of groups without
+                           data ID is updated.
+        :raises ValueError: If the message has no compiled codec.
+        """
+        patches = MessageLayout.of(message).patches
+        if patches is None:
+            raise ValueError(f"The signals of message {message.name} can't be patched.")
+        self.message_name: str = message.name
+        if chks_names is None:
+            self.groups: List[E2EGroup] = list(plan.groups)
+        else:
+            self.groups = [group for group in map(plan.get_group, chks_names) if group is not None]
+        self.groups = [group for group in self.groups if group.cntr_name in patches]
+        self._patches = [
+            (patches[group.cntr_name],
+             patches[group.chks_name] if group.data_id is not None else None,
+             [patches[field.name] for field in group.fields])
+            for group in self.groups
+        ]
+        #: The counter sent last per group, ``None`` before the first frame.
+        self._counters: List[Optional[int]] = [None] * len(self.groups)
+
+    def __bool__(self) -> bool:
+        return bool(self.groups)
+
+    def __call__(self, message: Any) -> None:
+        """
+        Update the counters and checksums in the data of `message` in place.
+
+        :param message: The :class:`~can.RawMessage` to be sent.
+        """
+        data = message.data
+        counters = self._counters
+        for index, (group, (cntr_patch, chks_patch, field_patches)) in enumerate(zip(self.groups, self._patches)):
+            counter = counters[index]
+            if counter is None:
+                counter = cntr_patch.read_raw(data)
+            else:
+                counter = (counter + 1) % COUNTER_MODULUS
+                cntr_patch.write_raw(data, counter)
+            counters[index] = counter
+            if chks_patch is not None:
+                chks_patch.write_raw(data, group.checksum(counter, [patch.read_raw(data)
+                                                                    for patch in field_patches]))
+
+    def reset(self) -> None:
+        """Let the next frame keep its counters again."""
+        self._counters = [None] * len(self.groups)
+
+    def __repr__(self) -> str:
+        return f"E2EPayloadGenerator({self.message_name!r}, {[group.chks_name for group in self.groups]})"
 
 
 if __name__ == '__main__':
@@ -0,0 +1,423 @@
+"""
+This module contains :class:`FrameWaiter`, a reader that dispatches received
+messages to per arbitration ID subscriptions, so that callers can block on a
+condition variable until a matching message arrives instead of polling a
+shared buffer, and its :mod:`asyncio` counterpart :class:`AsyncFrameWaiter`.
+"""
+
+import asyncio
+import collections
+import threading
+import time
+from typing import Any
+from typing import Deque
+from typing import Dict
+from typing import FrozenSet
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from jidutest_can.can.message import RawMessage
+from jidutest_can.can.notifier import Reader
+
+
+#: Upper bound of a single condition wait, keeps blocking waits interruptible
+#: by Ctrl-C on platforms where lock waits are not.
+MAX_WAIT_SLICE = 0.5
+
+
+class FrameSubscription:
+    """A FIFO of the messages matching a set of arbitration IDs.
+
+    Subscriptions are created by :meth:`FrameWaiter.subscribe` and filled by
+    the receive thread of the :class:`~can.Notifier` the waiter is attached
+    to. They can be used as a context manager, leaving the context closes
+    the subscription::
+
+        with waiter.subscribe(0x123, 0x456) as subscription:
+            msg = subscription.get(timeout=1.0)
+
+    :attr frame_ids: the subscribed arbitration IDs, ``None`` for all messages
+    :attr dropped: number of messages discarded because the buffer was full
+    """
+
+    def __init__(self,
+                 waiter: "FrameWaiter",
+                 frame_ids: Optional[FrozenSet[int]],
+                 maxsize: int = 0) -> None:
+        """
+        :param waiter: The waiter which delivers messages to this subscription.
+        :param frame_ids: The arbitration IDs to collect, ``None`` for all.
+        :param maxsize: Maximum number of buffered messages, the oldest message
+                        is discarded when exceeded. ``0`` means unbounded.
+        """
+        self.frame_ids = frame_ids
+        self.maxsize = maxsize
+        self.dropped = 0
+        self._waiter = waiter
+        self._buffer: Deque[RawMessage] = collections.deque(maxlen=maxsize or None)
+        self._condition = threading.Condition(threading.Lock())
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def put(self, msg: RawMessage) -> None:
+        """Append a message and wake up one waiting consumer."""
+        with self._condition:
+            if self._closed:
+                return
+            if self.maxsize and len(self._buffer) == self.maxsize:
+                self.dropped += 1
+            self._buffer.append(msg)
+            self._condition.notify()
+
+    def get(self,
+            timeout: Optional[float] = None,
+            deadline: Optional[float] = None) -> Optional[RawMessage]:
+        """Remove and return the oldest buffered message, blocking until one
+        arrives.
+
+        :param timeout: Maximum number of seconds to wait, ``None`` waits forever.
+        :param deadline: Absolute :func:`time.monotonic` time to wait until. Takes
+                         precedence over `timeout` and allows several calls to
+                         share one deadline.
+        :return: The message, or ``None`` on timeout or if the subscription
+                 has been closed and the buffer is empty.
+        """
+        if deadline is None and timeout is not None:
+            deadline = time.monotonic() + timeout
+        with self._condition:
+            while not self._buffer:
+                if self._closed:
+                    return None
+                if deadline is None:
+                    self._condition.wait(MAX_WAIT_SLICE)
+                    continue
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._condition.wait(min(remaining, MAX_WAIT_SLICE))
+            return self._buffer.popleft()
+
+    def get_all(self) -> List[RawMessage]:
+        """Remove and return all buffered messages without blocking."""
+        with self._condition:
+            messages = list(self._buffer)
+            self._buffer.clear()
+        return messages
+
+    def qsize(self) -> int:
+        return len(self._buffer)
+
+    def close(self) -> None:
+        """Stop collecting messages and wake up all waiting consumers."""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        self._waiter.unsubscribe(self)
+
+    def __enter__(self) -> "FrameSubscription":
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        if self.frame_ids is None:
+            frame_ids = "*"
+        else:
+            frame_ids = ", ".join(hex(frame_id) for frame_id in sorted(self.frame_ids))
+        return f"FrameSubscription(frame_ids=[{frame_ids}], size={self.qsize()}, dropped={self.dropped})"
+
+
+class FrameWaiter(Reader):  # pylint: disable=abstract-method
+    """
+    A FrameWaiter is a :class:`~can.Reader` which hands every received
+    message only to the subscriptions interested in its arbitration ID.
+
+    Add a single waiter to a :class:`~can.Notifier` and create as many
+    :class:`FrameSubscription` objects as needed; the lookup per message is a
+    dictionary access, independent of the number of subscriptions on other
+    IDs. The subscription tables are replaced on change rather than mutated,
+    so the receive thread never needs a lock to read them.
+    """
+
+    _subscription_class = FrameSubscription
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._lock = threading.Lock()
+        self._by_frame_id: Dict[int, Tuple[FrameSubscription, ...]] = dict()
+        self._wildcards: Tuple[FrameSubscription, ...] = tuple()
+        self.is_stopped: bool = False
+
+    def on_message_received(self, msg: RawMessage) -> None:
+        for subscription in self._wildcards:
+            subscription.put(msg)
+        subscriptions = self._by_frame_id.get(msg.arbitration_id)
+        if subscriptions:
+            for subscription in subscriptions:
+                subscription.put(msg)
+
+    def subscribe(self, *frame_ids: int, maxsize: int = 0) -> FrameSubscription:
+        """Create a subscription for the given arbitration IDs.
+
+        :param frame_ids: Arbitration IDs to collect. Pass none to collect
+                          every received message.
+        :param maxsize: See :class:`FrameSubscription`.
+        :return: The new, already active, subscription.
+        """
+        subscription = self._subscription_class(self, frozenset(frame_ids) if frame_ids else None, maxsize)
+        with self._lock:
+            if self.is_stopped:
+                subscription._closed = True
+                return subscription
+            if subscription.frame_ids is None:
+                self._wildcards = self._wildcards + (subscription,)
+            else:
+                by_frame_id = dict(self._by_frame_id)
+                for frame_id in subscription.frame_ids:
+                    by_frame_id[frame_id] = by_frame_id.get(frame_id, tuple()) + (subscription,)
+                self._by_frame_id = by_frame_id
+        return subscription
+
+    def unsubscribe(self, subscription: FrameSubscription) -> None:
+        """Stop delivering messages to the given subscription."""
+        with self._lock:
+            if subscription.frame_ids is None:
+                self._wildcards = tuple(s for s in self._wildcards if s is not subscription)
+                return
+            by_frame_id = dict(self._by_frame_id)
+            for frame_id in subscription.frame_ids:
+                remaining = tuple(s for s in by_frame_id.get(frame_id, tuple()) if s is not subscription)
+                if remaining:
+                    by_frame_id[frame_id] = remaining
+                else:
+                    by_frame_id.pop(frame_id, None)
+            self._by_frame_id = by_frame_id
+
+    @property
+    def subscriptions(self) -> List[FrameSubscription]:
+        subscriptions = list(self._wildcards)
+        for frame_subscriptions in self._by_frame_id.values():
+            for subscription in frame_subscriptions:
+                if subscription not in subscriptions:
+                    subscriptions.append(subscription)
+        return subscriptions
+
+    def stop(self) -> None:
+        """Close all subscriptions and refuse new ones."""
+        with self._lock:
+            self.is_stopped = True
+        for subscription in self.subscriptions:
+            subscription.close()
+
+
+class AsyncFrameSubscription:
+    """The :mod:`asyncio` counterpart of :class:`FrameSubscription`.
+
+    Subscriptions are created by :meth:`AsyncFrameWaiter.subscribe` and filled
+    in the event loop of the waiter. :meth:`get` suspends the awaiting task
+    instead of blocking a thread::
+
+        with waiter.subscribe(0x123, 0x456) as subscription:
+            msg = await subscription.get(timeout=1.0)
+
+    The methods must be called from the thread running the event loop.
+
+    :attr frame_ids: the subscribed arbitration IDs, ``None`` for all messages
+    :attr dropped: number of messages discarded because the buffer was full
+    """
+
+    def __init__(self,
+                 waiter: "AsyncFrameWaiter",
+                 frame_ids: Optional[FrozenSet[int]],
+                 maxsize: int = 0) -> None:
+        """
+        :param waiter: The waiter which delivers messages to this subscription.
+        :param frame_ids: The arbitration IDs to collect, ``None`` for all.
+        :param maxsize: Maximum number of buffered messages, the oldest message
+                        is discarded when exceeded. ``0`` means unbounded.
+        """
+        self.frame_ids = frame_ids
+        self.maxsize = maxsize
+        self.dropped = 0
+        self._waiter = waiter
+        self._buffer: Deque[RawMessage] = collections.deque(maxlen=maxsize or None)
+        self._getters: Deque["asyncio.Future[None]"] = collections.deque()
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def put(self, msg: RawMessage) -> None:
+        """Append a message and wake up one waiting task."""
+        if self._closed:
+            return
+        if self.maxsize and len(self._buffer) == self.maxsize:
+            self.dropped += 1
+        self._buffer.append(msg)
+        self._wakeup_next()
+
+    def _wakeup_next(self) -> None:
+        while self._getters:
+            getter = self._getters.popleft()
+            if not getter.done():
+                getter.set_result(None)
+                return
+
+    async def get(self,
+                  timeout: Optional[float] = None,
+                  deadline: Optional[float] = None) -> Optional[RawMessage]:
+        """Remove and return the oldest buffered message, waiting until one
+        arrives.
+
+        :param timeout: Maximum number of seconds to wait, ``None`` waits forever.
+        :param deadline: Absolute :meth:`loop.time() <asyncio.loop.time>` to wait
+                         until. Takes precedence over `timeout` and allows
+                         several calls to share one deadline.
+        :return: The message, or ``None`` on timeout or if the subscription
+                 has been closed and the buffer is empty.
+        """
+        loop = asyncio.get_running_loop()
+        if deadline is None and timeout is not None:
+            deadline = loop.time() + timeout
+        while not self._buffer:
+            if self._closed:
+                return None
+            remaining = None
+            if deadline is not None:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return None
+            getter = loop.create_future()
+            self._getters.append(getter)
+            try:
+                await asyncio.wait_for(getter, remaining)
+            except asyncio.TimeoutError:
+                return None
+            except BaseException:
+                getter.cancel()
+                if not getter.cancelled() and self._buffer:
+                    # woken up but cancelled before taking the message
+                    self._wakeup_next()
+                raise
+        return self._buffer.popleft()
+
+    def get_all(self) -> List[RawMessage]:
+        """Remove and return all buffered messages without waiting."""
+        messages = list(self._buffer)
+        self._buffer.clear()
+        return messages
+
+    def qsize(self) -> int:
+        return len(self._buffer)
+
+    def close(self) -> None:
+        """Stop collecting messages and wake up all waiting tasks."""
+        if self._closed:
+            return
+        self._closed = True
+        while self._getters:
+            getter = self._getters.popleft()
+            if not getter.done():
+                getter.set_result(None)
+        self._waiter.unsubscribe(self)
+
+    def __enter__(self) -> "AsyncFrameSubscription":
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        if self.frame_ids is None:
+            frame_ids = "*"
+        else:
+            frame_ids = ", ".join(hex(frame_id) for frame_id in sorted(self.frame_ids))
+        return f"AsyncFrameSubscription(frame_ids=[{frame_ids}], size={self.qsize()}, dropped={self.dropped})"
+
+
+class AsyncFrameWaiter(FrameWaiter):  # pylint: disable=abstract-method
+    """
+    A :class:`FrameWaiter` whose subscriptions are awaited in an
+    :mod:`asyncio` event loop.
+
+    Messages received on another thread, e.g. the receive thread of a
+    :class:`~can.Notifier`, are handed to the event loop with a single
+    :meth:`~asyncio.loop.call_soon_threadsafe` per batch, so a burst of frames
+    costs one wake-up of the loop instead of one per frame. Messages delivered
+    on the loop thread itself are dispatched directly.
+    """
+
+    _subscription_class = AsyncFrameSubscription  # type: ignore[assignment]
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None,
+                 *args: Any, **kwargs: Any) -> None:
+        """
+        :param loop: The event loop the subscriptions are awaited in. Defaults
+                     to the running loop, so the waiter must then be created
+                     from a coroutine.
+        """
+        super().__init__(*args, **kwargs)
+        self._loop = loop or asyncio.get_running_loop()
+        #: Number of hand-overs from other threads to the event loop
+        self.handovers = 0
+
+    def _in_loop(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    def on_message_received(self, msg: RawMessage) -> None:
+        self.on_messages_received((msg,))
+
+    def on_messages_received(self, msgs: Sequence[RawMessage]) -> None:
+        if self._in_loop():
+            self._dispatch(msgs)
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._dispatch, msgs)
+        except RuntimeError:
+            # the event loop has been closed
+            return
+        self.handovers += 1
+
+    def _dispatch(self, msgs: Sequence[RawMessage]) -> None:
+        for msg in msgs:
+            for subscription in self._wildcards:
+                subscription.put(msg)
+            subscriptions = self._by_frame_id.get(msg.arbitration_id)
+            if subscriptions:
+                for subscription in subscriptions:
+                    subscription.put(msg)
+
+    def subscribe(self, *frame_ids: int, maxsize: int = 0) -> AsyncFrameSubscription:  # type: ignore[override]
+        """Create a subscription for the given arbitration IDs.
+
+        :param frame_ids: Arbitration IDs to collect. Pass none to collect
+                          every received message.
+        :param maxsize: See :class:`AsyncFrameSubscription`.
+        :return: The new, already active, subscription.
+        """
+        return super().subscribe(*frame_ids, maxsize=maxsize)  # type: ignore[return-value]
+
+    def stop(self) -> None:
+        """Close all subscriptions and refuse new ones. The subscriptions are
+        closed in the event loop when called from another thread."""
+        if self._in_loop() or self._loop.is_closed():
+            super().stop()
+            return
+        with self._lock:
+            self.is_stopped = True
+        try:
+            self._loop.call_soon_threadsafe(super().stop)
+        except RuntimeError:
+            pass
@@ -1,3 +1,5 @@
+from jidutest_can.canapp.restbus import RestBusSimulation
 from jidutest_can.canapp.controller import CanController
 from jidutest_can.canapp.manager import CanLogManager
 from jidutest_can.canapp.tools import CanTools
+from jidutest_can.canapp.async_controller import AsyncCanController
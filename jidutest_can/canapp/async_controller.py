@@ -0,0 +1,167 @@
+import asyncio
+import functools
+import logging
+import typing
+from typing import List
+from typing import Union
+from typing import Any
+from jidutest_can.can import CanOperationError
+from jidutest_can.can import RawMessage
+from jidutest_can.can import AsyncFrameWaiter
+from jidutest_can.canapp.controller import CanController
+
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncCanController(CanController):
+    """
+    asyncio版本的CanController，接收类接口均为协程，等待报文时只挂起当前任务而不阻塞线程，
+    一个事件循环中可以同时驱动多路总线。
+    接收线程收到的报文按批通过一次call_soon_threadsafe交给事件循环，不会每帧切换一次线程；
+    PCAN/SmartVCI的接收事件和同星的批量读取都经由Notifier的接收线程进入事件循环。
+    同步接口（如receive_messages）仍然可用，但会阻塞事件循环，协程中请使用对应的异步接口。
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """
+        功能说明：初始化对象，参数同CanController
+        异常说明：无
+        返回值：None
+        """
+        super().__init__(*args, **kwargs)
+        self.__loop: asyncio.AbstractEventLoop = None
+        self.__async_waiter: AsyncFrameWaiter = None
+
+    @property
+    def async_waiter(self) -> AsyncFrameWaiter:
+        return self.__async_waiter
+
+    async def connect(self) -> bool:
+        """
+        功能说明：连接控制器，打开硬件设备的阻塞操作在线程池中执行
+        参数说明: 无
+        异常说明：同CanController.connect
+        返回值：True/False
+        """
+        self.__loop = asyncio.get_running_loop()
+        return await self.__loop.run_in_executor(None, CanController.connect, self)
+
+    async def disconnect(self) -> None:
+        """
+        功能说明：断开控制器，等待接收线程退出的阻塞操作在线程池中执行
+        参数说明：无
+        异常说明：无
+        返回值：None
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, CanController.disconnect, self)
+
+    def start_receiving(self) -> bool:
+        loop = self.__loop
+        if loop is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                raise CanOperationError("No event loop to deliver the messages to, please connect with "
+                                        "'await controller.connect()' inside a running event loop") from None
+            self.__loop = loop
+        super().start_receiving()
+        self.__async_waiter = AsyncFrameWaiter(loop)
+        self.notifier.add_listener(self.__async_waiter)
+        return True
+
+    def __check_receiving(self) -> None:
+        if not (self.bus and self.notifier and self.__async_waiter):
+            raise CanOperationError(f"The BUS is not instantiated.Please call the 'connect' method "
+                                    f"to instantiate the BUS and try again")
+
+    async def send_signals(self, *signals: dict, **kwargs: Any) -> None:
+        """
+        功能说明：开始周期性发送信号，可发送一个或多个信号，编码和注册周期任务在线程池中执行，
+                 周期发送由调度线程完成，不占用事件循环
+        参数说明：
+            :param signals: 需要发送的信号和对应值组成的字典， 例如： {signal_name: signal_value}
+            :param kwargs: 关键字参数，例如：signal_name=signal_value
+        异常说明：同CanController.send_signals
+        返回值：None
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, functools.partial(CanController.send_signals, self, *signals, **kwargs))
+
+    async def receive_signals(self, *signals: str, duration: float, **kwargs: Any) -> typing.Optional[List[dict]]:
+        """
+        功能说明：持续接收信号，可接收一个或多个信号
+        参数说明：
+            :param signals: 想要接收的信号名，格式为sgn1, sgn2, 注意必须传至少一个信号名
+            :param duration: 接收信号的最长时长
+            :param kwargs: 目前是可以传一个num=xx，如num=1000, 表示接收到1000条messages就停止接收，也用于后续扩展
+        异常说明：无
+        返回值：signal_list 接收到的信号列表，格式为[{sgn_name1: sgn_value1}, {sgn_name2: sgn_value2},...]
+        """
+        self.__check_receiving()
+        sgn_set = set(signals)
+        signal_list = []
+        expected_messages = self._expected_messages_of_signals(sgn_set)
+        if not expected_messages:
+            return None
+        logger.info("Start receiving signals...")
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + duration if duration else None
+        num = kwargs.get("num")
+        count = 0
+        received_keys = set()
+        with self.__async_waiter.subscribe(*expected_messages) as subscription:
+            while True:
+                raw_message = await subscription.get(deadline=deadline)
+                if raw_message is None:
+                    break
+                count += 1
+                self._collect_signals(expected_messages, raw_message, sgn_set, signal_list, received_keys)
+                if num and count == num:
+                    break
+        logger.info(f"Received signals: {signal_list}")
+        return signal_list
+
+    async def wait_for_signal(self, signal: str, value: Any = None, timeout: float = None) -> Any:
+        """
+        功能说明：等待信号出现（或等于期望值），收到后立即返回，等待期间只挂起当前任务
+        参数说明：
+            :param signal: 信号名
+            :param value: 期望的信号值，None则收到该信号的任意值就返回
+            :param timeout: 等待的最长时长，None则一直等待
+        异常说明：
+            :exception KeyError: 数据库中找不到该信号
+        返回值：收到的信号值，超时则返回None
+        """
+        self.__check_receiving()
+        message = self.db.get_message_by_signal(signal)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout if timeout is not None else None
+        with self.__async_waiter.subscribe(message.frame_id) as subscription:
+            while True:
+                raw_message = await subscription.get(deadline=deadline)
+                if raw_message is None:
+                    logger.info(f"Wait for signal {signal} == {value} timeout")
+                    return None
+                matched, received_value = self._match_signal(message, raw_message, signal, value)
+                if matched:
+                    return received_value
+
+    async def receive_message_once(self, can_id: Union[int, str] = None, timeout: float = None
+                                   ) -> typing.Optional[RawMessage]:
+        """
+        功能说明：接收一个报文，接收到预期报文后就停止接收，默认值为None，则接收到第一个报文就停止接收
+        参数说明：
+            :param can_id: 想要接收的报文的id
+            :param timeout: 接收报文的时长
+        异常说明：无
+        返回值：received_raw_message 接收到的裸数据，超时则返回None
+        """
+        self.__check_receiving()
+        if isinstance(can_id, str):
+            can_id = int(can_id, 16)
+        with self.__async_waiter.subscribe(*([can_id] if can_id else [])) as subscription:
+            received_raw_message = await subscription.get(timeout)
+        logger.info(f"Received raw message: {received_raw_message}")
+        return received_raw_message
@@ -1,4 +1,3 @@
-import copy
 import logging
 import queue
 import typing
@@ -9,7 +8,9 @@ from typing import List
 from typing import Union
 from typing import Any
 from jidutest_can.cantools.database.signal import NamedSignalValue
-from jidutest_can.can.tools.e2e import e2e_crc_data
+from jidutest_can.can.tools.e2e import COUNTER_MODULUS
+from jidutest_can.can.tools.e2e import E2EPayloadGenerator
+from jidutest_can.can.tools.e2e import E2EPlan
 from jidutest_can.can import CanBus
 from jidutest_can.can.interfaces import BusABC
 from jidutest_can.can import CanOperationError
@@ -20,10 +21,15 @@ from jidutest_can.can import PCANFD_500000_5000000
 from jidutest_can.can import RawMessage
 from jidutest_can.can import BufferedReader
 from jidutest_can.can import Notifier
-from jidutest_can.cantools import load_file
+from jidutest_can.can import FrameWaiter
+from jidutest_can.can import MessageState
+from jidutest_can.can import SignalStateStore
+from jidutest_can.cantools import load_shared
 from jidutest_can.cantools import BusConfig
 from jidutest_can.cantools import Database
 from jidutest_can.cantools import Message
+from jidutest_can.cantools import MessageTemplate
+from jidutest_can.canapp.restbus import RestBusSimulation
 
 
 logger = logging.getLogger(__name__)
@@ -46,7 +52,7 @@ class CanController(object):
             :param name: 控制器名字，用于从db中获取对应can bus,如果名字不符，默认获取第一个，并给出警告，不影响程序正常运行
             :param interface: 控制器采用的硬件设备类型（如PEAK公司的pcan）,目前只支持PCAN
             :param channel: 控制器使用的硬件设备通道号（1, 2, ... , max）
-            :param db_path: dbc文件路径
+            :param db_path: dbc文件路径，同一文件在进程内只解析一次，由所有控制器共享（只读），解析结果缓存在磁盘中
             :param bus: bus对象，当db_path有值时，忽略此参数
             db_path和bus参数必传其一
         异常说明：无
@@ -64,7 +70,7 @@ class CanController(object):
         self.__channel = channel
         self.__db_path = db_path
         if db_path:
-            self.__db = load_file(self.__db_path)
+            self.__db = load_shared(self.__db_path)
             if self.__interface not in self.INTERFACES:
                 raise AttributeError(f"Argument 'interface' choice can only in {self.INTERFACES} . "
                                      f"Please check if the input parameters are incorrect.")
@@ -75,6 +81,11 @@ class CanController(object):
         self.__notifier = None
         self.__connected = False
         self.__listener: BufferedReader = None
+        self.__waiter: FrameWaiter = None
+        self.__signal_state: SignalStateStore = None
+        self.__e2e_plans: typing.Dict[str, E2EPlan] = dict()
+        self.__templates: typing.Dict[str, MessageTemplate] = dict()
+        self.__rest_bus_simulations: List[RestBusSimulation] = list()
         self.init_counter = True
 
     @property
@@ -109,6 +120,14 @@ class CanController(object):
     def notifier(self) -> Notifier:
         return self.__notifier
 
+    @property
+    def waiter(self) -> FrameWaiter:
+        return self.__waiter
+
+    @property
+    def signal_state(self) -> SignalStateStore:
+        return self.__signal_state
+
     def connect(self) -> bool:
         """
         功能说明：连接控制器
@@ -216,15 +235,15 @@ class CanController(object):
         msg_sgn_dict = self._divide_signal_names_values_into_groups(signals)
         for msg_name, sgn_dict in msg_sgn_dict.items():
             message = self.__db.get_message_by_name(msg_name)
-            sgn_dict = self.__update_signals_without_e2e(message, sgn_dict)
-            sgn_dict = self.__update_signals_with_e2e(message, sgn_dict)
+            template = self.__get_template(message, sgn_dict)
+            self.__update_template_with_e2e(message, template)
             raw_message = RawMessage(arbitration_id=message.frame_id,
                                      is_rx=False,
                                      channel=self.bus.channel_info,
                                      is_remote_frame=False,
                                      is_fd=message.is_fd,
                                      is_extended_id=message.is_extended_frame,
-                                     data=message.encode(data=sgn_dict))
+                                     data=template.data)
             logger.info(f"Sending raw message: {raw_message}")
             try:
                 self.bus.send(raw_message)
@@ -251,26 +270,58 @@ class CanController(object):
         for msg_name, sgn_dict in msg_sgn_dict.items():
             message = self.__db.get_message_by_name(msg_name)
             cycle_time = message.cycle_time / 1000 if message.send_type == "cyclic" else 0.1
-            sgn_dict = self.__update_signals_without_e2e(message, sgn_dict)
-            raw_messages = list()
+            template = self.__get_template(message, sgn_dict)
             self.init_counter = True
-            for i in range(15):
-                sgn_dict = self.__update_signals_with_e2e(message, sgn_dict)
-                self.init_counter = False
-                raw_message = RawMessage(arbitration_id=message.frame_id,
-                                         is_rx=False,
-                                         channel=self.bus.channel_info,
-                                         is_remote_frame=False,
-                                         is_fd=message.is_fd,
-                                         is_extended_id=message.is_extended_frame,
-                                         data=message.encode(data=sgn_dict))
-                logger.info(f"Sending raw message: {raw_message}")
-                raw_messages.append(raw_message)
+            self.__update_template_with_e2e(message, template)
+            self.init_counter = False
             try:
-                self.__bus.send_periodic(msgs=raw_messages, period=cycle_time)
+                self.__send_template_periodic(message, template, cycle_time)
             except Exception as ex:
                 logger.error(f"Because {ex}, send message failed,please try again.")
 
+    def __send_template_periodic(self, message: Message, template: MessageTemplate, cycle_time: float) -> None:
+        """
+        功能说明：周期性发送报文载荷模板。报文只保存一帧，Cntr和Chks信号由E2EPayloadGenerator在每次发送前更新，
+                 修改信号后下一帧即生效，Cntr连续；接口自行发送周期报文（不支持生成器）时，为每个Cntr值预先生成一帧
+        参数说明：
+            :param message: Message类型，从can数据库中解析到的can Frame对象
+            :param template: 报文的载荷模板，E2E信号已更新为第一帧的值
+            :param cycle_time: 发送周期，单位为秒
+        异常说明：发送失败
+        返回值：None
+        """
+        raw_message = RawMessage(arbitration_id=message.frame_id,
+                                 is_rx=False,
+                                 channel=self.bus.channel_info,
+                                 is_remote_frame=False,
+                                 is_fd=message.is_fd,
+                                 is_extended_id=message.is_extended_frame,
+                                 data=template.data)
+        logger.info(f"Sending raw message: {raw_message}")
+        chks_names = [sgn.name for sgn in message.chks_signals if sgn.name not in self.__sent_signals]
+        try:
+            generator = E2EPayloadGenerator(message, self.__get_e2e_plan(message), chks_names)
+        except ValueError as ex:
+            logger.debug(ex)
+        else:
+            try:
+                self.__bus.send_periodic(msgs=raw_message, period=cycle_time, name=message.name,
+                                         payload_generator=generator if generator else None)
+                return
+            except NotImplementedError as ex:
+                logger.debug(ex)
+        raw_messages = [raw_message]
+        for i in range(1, COUNTER_MODULUS):
+            self.__update_template_with_e2e(message, template)
+            raw_messages.append(RawMessage(arbitration_id=message.frame_id,
+                                           is_rx=False,
+                                           channel=self.bus.channel_info,
+                                           is_remote_frame=False,
+                                           is_fd=message.is_fd,
+                                           is_extended_id=message.is_extended_frame,
+                                           data=template.data))
+        self.__bus.send_periodic(msgs=raw_messages, period=cycle_time, name=message.name)
+
     def send_messages_once(self,
                            *messages: dict,
                            is_fd: bool = False,
@@ -369,6 +420,26 @@ class CanController(object):
                     logger.error(f"Send message failed, please try again")
                 cycle_time = old_cycle_time
 
+    def start_rest_bus_simulation(self, *nodes: str) -> RestBusSimulation:
+        """
+        功能说明：开始剩余总线仿真，周期性发送数据库中指定节点的全部发送报文（按各自的周期时间，带初始值和E2E），
+                 全部报文由总线的周期发送调度器统一驱动，stop_sending时停止
+        参数说明：
+            :param nodes: 需要仿真的节点名，例如："ECU1", "ECU2"
+        异常说明：
+            :exception CanOperationError: 总线未实例化
+            :exception ValueError: 没有传入节点名或者节点不在数据库中
+        返回值：RestBusSimulation对象，用于修改信号、启用/禁用单个报文和停止仿真
+        """
+        if not self.__bus:
+            raise CanOperationError(f"The BUS is not instantiated.Please call the 'connect' method "
+                                    f"to instantiate the BUS and try again")
+        simulation = RestBusSimulation(self.__bus, self.__db, *nodes,
+                                       bus_name=self.__bus_config.name if self.__bus_config else None)
+        simulation.start()
+        self.__rest_bus_simulations.append(simulation)
+        return simulation
+
     def stop_sending(self) -> None:
         """
         功能说明：停止发送报文或信号
@@ -380,6 +451,9 @@ class CanController(object):
             self.__sending_messages.clear()
             self.__sending_raw_datas.clear()
             self.sending_dict_datas.clear()
+            for simulation in self.__rest_bus_simulations:
+                simulation.stop()
+            self.__rest_bus_simulations.clear()
             self.bus.stop_all_periodic_tasks()
             logger.info("Stop sending data")
         else:
@@ -391,7 +465,7 @@ class CanController(object):
         功能说明：接收同一个报文中的一个/多个信号一次，接收到预期信号后就停止接收
         参数说明：
             :param signals: 想要接收的同一个报文中的信号名
-            :param timeout: 接收信号的超时时间
+            :param timeout: 接收信号的超时时间，None或0则一直等待
         异常说明：无
         返回值：received_sgn_dict 接收到的信号字典，格式为{sgn_name, sgn_value}
         """
@@ -400,53 +474,30 @@ class CanController(object):
                                     f"to instantiate the BUS and try again")
         sgn_set = set(signals)
         new_sgn_list = []
-        message_list = []
-        listener = BufferedReader()
-        self.__notifier.add_listener(listener)
+        message_set = set()
         for sgn in sgn_set:
             try:
                 message = self.__db.get_message_by_signal(sgn)
-                message_list.append(message)
-            except:
+            except KeyError:
                 logger.error(f"Can't find the message of sgn: "
                              f"{sgn} in database {self.__db_path}, stop receiving.")
-                listener.buffer.queue.clear()
                 return None
-            else:
-                new_sgn_list.append(sgn)
-        message_set = set(message_list)
+            message_set.add(message)
+            new_sgn_list.append(sgn)
         if len(message_set) != 1:
             logger.error("Signals should be in same message.")
-            listener.buffer.queue.clear()
             return None
-        new_message_list = list(message_set)
+        message = message_set.pop()
         logger.info(f"Expected signals: {new_sgn_list}")
         logger.info("Start receiving signals...")
         received_sgn_dict = dict()
-        start_time = time.time()
-        while True:
-            raw_message = listener.get_message()
-            if not raw_message:
-                if timeout:
-                    if time.time() - start_time > timeout:
-                        break
-                continue
-            if new_message_list[0].frame_id == raw_message.arbitration_id:
-                sgn_dict = new_message_list[0].decode(raw_message.data)
-                logger.debug(f"Received message dict:{sgn_dict}")
-                for name, value in sgn_dict.items():
-                    for sgn in sgn_set:
-                        if sgn == name:
-                            sgn_object = self.__db.get_signal_by_name(name)
-                            if sgn_object.choices:
-                                value = sgn_object.choice_string_to_number(value)
-                            received_sgn_dict.update({name: value})
-                break
-            if timeout:
-                end_time = time.time()
-                if end_time - start_time > timeout:
-                    break
-        self.__notifier.remove_listener(listener)
+        with self.__waiter.subscribe(message.frame_id) as subscription:
+            # 与之前的轮询实现一致，timeout为0时一直等待
+            raw_message = subscription.get(timeout or None)
+        if raw_message:
+            sgn_dict = message.decode(raw_message.data)
+            logger.debug(f"Received message dict:{sgn_dict}")
+            received_sgn_dict = self._pick_signals(message, sgn_dict, sgn_set)
         logger.info(f"Received signals: {received_sgn_dict}")
         return received_sgn_dict
 
@@ -464,91 +515,66 @@ class CanController(object):
             raise CanOperationError(f"The BUS is not instantiated.Please call the 'connect' method "
                                     f"to instantiate the BUS and try again")
         sgn_set = set(signals)
-        listener = BufferedReader()
-        self.__notifier.add_listener(listener)
         raw_message_list = []
         signal_list = []
-        message_list = []
-        exp_sgn_list = []
-        if not sgn_set:
-            logger.error(
-                "No signal name has been received, please make sure you've passed in at least one siganl name.")
-            listener.buffer.queue.clear()
+        expected_messages = self._expected_messages_of_signals(sgn_set)
+        if not expected_messages:
             return None
-        for sgn in sgn_set:
-            try:
-                message = self.__db.get_message_by_signal(sgn)
-            except:
-                logger.error(f"Can't find the message of sgn: "
-                             f"{sgn} in database {self.__db_path}")
-            else:
-                message_list.append(message)
-                exp_sgn_list.append(sgn)
-        if not message_list:
-            logger.error("None of your signal names is valid, stop receiving.")
-            listener.buffer.queue.clear()
-            return None
-        logger.info(f"Expected signals: {exp_sgn_list}")
         logger.info("Start receiving signals...")
-        start_time = time.time()
+        deadline = time.monotonic() + duration if duration else None
+        num = kwargs.get("num")
         count = 0
-        try:
-            while True:
-                raw_message = listener.get_message()
-                if not raw_message:
-                    if duration:
-                        if time.time() - start_time > duration:
-                            break
-                    continue
-                count += 1
-                for message in message_list:
-                    received_sgn_dict = {}
-                    if message.frame_id == raw_message.arbitration_id:
-                        logger.debug(f"Receive RawMessage: {raw_message}")
-                        if raw_message not in raw_message_list:
-                            raw_message_list.append(raw_message)
-                        try:
-                            sgn_dict = message.decode(raw_message.data)
-                        except Exception as ex:
-                            logger.error(f"Unable to parse message:{raw_message} \npossible mismatch between "
-                                         f"type of can channel {raw_message.channel} and dbc: {self.db_path}")
-                            continue
-                        logger.debug(f"Received message dict:{sgn_dict}")
-
-                        for name, value in sgn_dict.items():
-
-                            for sgn in exp_sgn_list:
-                                if sgn == name:
-                                    sgn_object = self.__db.get_signal_by_name(name)
-                                    if sgn_object.choices:
-                                        value = sgn_object.choice_string_to_number(value)
-                                    received_sgn_dict.update({name: value})
-                    if received_sgn_dict and received_sgn_dict not in signal_list:
-                        signal_list.append(received_sgn_dict)
-                end_time = time.time()
-                if duration:
-                    if end_time - start_time > duration:
+        received_keys = set()
+        with self.__waiter.subscribe(*expected_messages) as subscription:
+            try:
+                while True:
+                    raw_message = subscription.get(deadline=deadline)
+                    if raw_message is None:
                         break
-                if kwargs.get("num"):
-                    if count == kwargs.get("num"):
+                    count += 1
+                    raw_message_list.append(raw_message)
+                    self._collect_signals(expected_messages, raw_message, sgn_set, signal_list, received_keys)
+                    if num and count == num:
                         break
-        except KeyboardInterrupt:
-            self.__notifier.remove_listener(listener)
-            logger.debug(f"Received raw messages: {raw_message_list}")
-            logger.info(f"Received signals: {signal_list}")
-            return signal_list
-        self.__notifier.remove_listener(listener)
+            except KeyboardInterrupt:
+                pass
         logger.debug(f"Received raw messages: {raw_message_list}")
         logger.info(f"Received signals: {signal_list}")
         return signal_list
 
+    def wait_for_signal(self, signal: str, value: Any = None, timeout: float = None) -> Any:
+        """
+        功能说明：等待信号出现（或等于期望值），收到后立即返回，不占用CPU轮询
+        参数说明：
+            :param signal: 信号名
+            :param value: 期望的信号值，None则收到该信号的任意值就返回
+            :param timeout: 等待的最长时长，None则一直等待
+        异常说明：
+            :exception KeyError: 数据库中找不到该信号
+        返回值：收到的信号值，超时则返回None
+        """
+        if not (self.__bus and self.__notifier):
+            raise CanOperationError(f"The BUS is not instantiated.Please call the 'connect' method "
+                                    f"to instantiate the BUS and try again")
+        message = self.__db.get_message_by_signal(signal)
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self.__waiter.subscribe(message.frame_id) as subscription:
+            while True:
+                raw_message = subscription.get(deadline=deadline)
+                if raw_message is None:
+                    logger.info(f"Wait for signal {signal} == {value} timeout")
+                    return None
+                matched, received_value = self._match_signal(message, raw_message, signal, value)
+                if matched:
+                    return received_value
+
     def receive_message_once(self, can_id: Union[int, str] = None, timeout: float = None
                              ) -> typing.Optional[RawMessage]:
         """
         功能说明：接收一个报文，接收到预期报文后就停止接收，默认值为None，则接收到第一个报文就停止接收
         参数说明：
             :param can_id: 想要接收的报文的id
-            :param timeout: 接收报文的时长
+            :param timeout: 接收报文的时长，None或0则一直等待
         异常说明：无
         返回值：received_raw_message 接收到的裸数据
         """
@@ -561,31 +587,9 @@ class CanController(object):
             except:
                 can_id = can_id
 
-        listener = BufferedReader()
-        self.__notifier.add_listener(listener)
-        received_raw_message = None
-        start_time = time.time()
-        while True:
-
-            raw_message = listener.get_message()
-            if not raw_message:
-                if timeout:
-                    if time.time() - start_time > timeout:
-                        break
-                continue
-            else:
-                if not can_id:
-                    received_raw_message = raw_message
-                    break
-
-                if raw_message.arbitration_id == can_id:
-                    received_raw_message = raw_message
-                    break
-
-            if timeout:
-                if time.time() - start_time > timeout:
-                    break
-        self.__notifier.remove_listener(listener)
+        with self.__waiter.subscribe(*([can_id] if can_id else [])) as subscription:
+            # 与之前的轮询实现一致，timeout为0时一直等待
+            received_raw_message = subscription.get(timeout or None)
         logger.info(f"Received raw message: {received_raw_message}")
         return received_raw_message
 
@@ -609,38 +613,183 @@ class CanController(object):
                 can_id_list.append(int(can_id, 16))
             else:
                 can_id_list.append(int(can_id))
-        listener = BufferedReader()
-        self.__notifier.add_listener(listener)
+        deadline = time.monotonic() + duration if duration else None
+        num = kwargs.get("num")
         count = 0
         raw_message_list = set()
-        start_time = time.time()
-        while True:
-            raw_message = listener.get_message()
-            if not raw_message:
-                if duration:
-                    if time.time() - start_time > duration:
-                        break
-                continue
-            count += 1
-            if can_id_list:
-                for can_id in can_id_list:
-                    if raw_message.arbitration_id == can_id:
-                        logger.info(f"Received raw message: {raw_message}")
-                        raw_message_list.add(raw_message)
-            else:
+        with self.__waiter.subscribe(*can_id_list) as subscription:
+            while True:
+                raw_message = subscription.get(deadline=deadline)
+                if raw_message is None:
+                    break
+                count += 1
                 logger.info(f"Received raw message: {raw_message}")
                 raw_message_list.add(raw_message)
-
-            end_time = time.time()
-            if duration:
-                if end_time - start_time > duration:
-                    break
-            if kwargs.get("num"):
-                if count == kwargs.get("num"):
+                if num and count == num:
                     break
-        self.__notifier.remove_listener(listener)
         return raw_message_list
 
+    def get_signal(self, signal: str, default: Any = None, message: Union[str, int] = None) -> Any:
+        """
+        功能说明：获取信号的当前值，即最近收到的报文中该信号的值，不等待新的报文。
+                报文只在内容变化后第一次读取时解码，内容不变时直接返回上次解码的结果
+        参数说明：
+            :param signal: 信号名
+            :param default: 尚未收到该信号或报文无法解析时的返回值
+            :param message: 信号所在报文的名称或id，多个报文包含同名信号时用于指定报文，
+                            为None时取这些报文中最近收到的一个
+        异常说明：
+            :exception KeyError: 数据库中找不到该信号，或指定的报文中没有该信号
+        返回值：信号的当前值，带枚举值的信号返回数值
+        """
+        self.__check_signal_state()
+        return self.__signal_state.get_signal(signal, default, decode_choices=False, message=message)
+
+    def get_signals(self, *signals: str, message: Union[str, int] = None) -> dict:
+        """
+        功能说明：获取一个或多个信号的当前值，不等待新的报文
+        参数说明：
+            :param signals: 信号名，格式为sgn1, sgn2
+            :param message: 信号所在报文的名称或id，见get_signal
+        异常说明：
+            :exception KeyError: 数据库中找不到信号，或指定的报文中没有信号
+        返回值：已收到的信号字典，格式为{sgn_name: sgn_value}，尚未收到的信号不在其中
+        """
+        self.__check_signal_state()
+        return self.__signal_state.get_signals(*signals, decode_choices=False, message=message)
+
+    def get_message_state(self, can_id: Union[int, str]) -> typing.Optional[MessageState]:
+        """
+        功能说明：获取报文的当前状态，包括最近的报文内容、接收时间戳、内容最近一次变化的时间戳和接收次数
+        参数说明：
+            :param can_id: 报文的id
+        异常说明：无
+        返回值：MessageState对象，尚未收到该报文则返回None
+        """
+        self.__check_signal_state()
+        if isinstance(can_id, str):
+            can_id = int(can_id, 16)
+        return self.__signal_state.get_message_state(can_id)
+
+    def __check_signal_state(self) -> None:
+        if not (self.__bus and self.__notifier and self.__signal_state):
+            raise CanOperationError(f"The BUS is not instantiated.Please call the 'connect' method "
+                                    f"to instantiate the BUS and try again")
+
+    def _expected_messages_of_signals(self, sgn_set: typing.Set[str]) -> typing.Optional[typing.Dict[int, Message]]:
+        """
+        功能说明：查找持续接收的信号所在的报文，找不到的信号记录错误后忽略，同步和异步接口共用
+        参数说明：
+            :param sgn_set: 想要接收的信号名集合
+        异常说明：无
+        返回值：帧ID与Frame对象组成的字典，没有传入信号或信号都无效时返回None
+        """
+        if not sgn_set:
+            logger.error(
+                "No signal name has been received, please make sure you've passed in at least one siganl name.")
+            return None
+        expected_messages: typing.Dict[int, Message] = dict()
+        exp_sgn_list = []
+        for sgn in sgn_set:
+            try:
+                message = self.__db.get_message_by_signal(sgn)
+            except KeyError:
+                logger.error(f"Can't find the message of sgn: "
+                             f"{sgn} in database {self.__db_path}")
+            else:
+                expected_messages[message.frame_id] = message
+                exp_sgn_list.append(sgn)
+        if not expected_messages:
+            logger.error("None of your signal names is valid, stop receiving.")
+            return None
+        logger.info(f"Expected signals: {exp_sgn_list}")
+        return expected_messages
+
+    def _decode_signals(self, message: Message, raw_message: RawMessage,
+                        names: typing.Iterable[str]) -> typing.Optional[dict]:
+        """
+        功能说明：解码报文并挑选出期望的信号，同步和异步接口共用
+        参数说明：
+            :param message: 报文对应的Frame对象
+            :param raw_message: 接收到的裸数据
+            :param names: 期望的信号名
+        异常说明：无
+        返回值：期望的信号字典，报文无法解析时记录错误并返回None
+        """
+        try:
+            sgn_dict = message.decode(raw_message.data)
+        except Exception:
+            logger.error(f"Unable to parse message:{raw_message} \npossible mismatch between "
+                         f"type of can channel {raw_message.channel} and dbc: {self.db_path}")
+            return None
+        logger.debug(f"Received message dict:{sgn_dict}")
+        return self._pick_signals(message, sgn_dict, names)
+
+    def _collect_signals(self, expected_messages: typing.Dict[int, Message], raw_message: RawMessage,
+                         sgn_set: typing.Set[str], signal_list: List[dict], received_keys: set) -> None:
+        """
+        功能说明：持续接收信号时处理一帧报文，信号值组合第一次出现时追加到signal_list，同步和异步接口共用
+        参数说明：
+            :param expected_messages: _expected_messages_of_signals的返回值
+            :param raw_message: 接收到的裸数据
+            :param sgn_set: 想要接收的信号名集合
+            :param signal_list: 接收到的信号列表
+            :param received_keys: 已经收到的信号值组合
+        异常说明：无
+        返回值：None
+        """
+        message = expected_messages[raw_message.arbitration_id]
+        logger.debug(f"Receive RawMessage: {raw_message}")
+        received_sgn_dict = self._decode_signals(message, raw_message, sgn_set)
+        if not received_sgn_dict:
+            return
+        received_key = tuple(received_sgn_dict.items())
+        if received_key not in received_keys:
+            received_keys.add(received_key)
+            signal_list.append(received_sgn_dict)
+
+    def _match_signal(self, message: Message, raw_message: RawMessage, signal: str,
+                      value: Any) -> typing.Tuple[bool, Any]:
+        """
+        功能说明：等待信号时判断一帧报文中的信号是否满足期望，同步和异步接口共用
+        参数说明：
+            :param message: 信号所在的Frame对象
+            :param raw_message: 接收到的裸数据
+            :param signal: 信号名
+            :param value: 期望的信号值，None则任意值都满足
+        异常说明：无
+        返回值：(是否满足, 收到的信号值)
+        """
+        received = self._decode_signals(message, raw_message, (signal,))
+        if received is None:
+            return False, None
+        received_value = received.get(signal)
+        if value is None or received_value == value:
+            logger.info(f"Received signal {signal}: {received_value}")
+            return True, received_value
+        return False, received_value
+
+    def _pick_signals(self, message: Message, sgn_dict: dict, names: typing.Iterable[str]) -> dict:
+        """
+        功能说明：从解码后的信号字典中挑选出期望的信号，带枚举值的信号转换为数值
+        参数说明：
+            :param message: 信号所在的Frame对象
+            :param sgn_dict: Frame解码后的信号字典
+            :param names: 期望的信号名
+        异常说明：无
+        返回值：期望的信号字典，格式为{sgn_name: sgn_value}
+        """
+        picked_sgn_dict = dict()
+        for name in names:
+            if name not in sgn_dict:
+                continue
+            value = sgn_dict[name]
+            sgn_object = message.get_signal_by_name(name)
+            if sgn_object.choices:
+                value = sgn_object.choice_string_to_number(value)
+            picked_sgn_dict[name] = value
+        return picked_sgn_dict
+
     def modify_sending_signals(self, *signals: dict, **kwargs: Any) -> None:
         """
         功能说明：修改周期性信号
@@ -654,18 +803,24 @@ class CanController(object):
             raise ValueError("At least one msg can_id-data pair should be passed in.")
         signals = signals + (kwargs,)
         msg_sgn_dict = self._divide_signal_names_values_into_groups(signals)
-        for task in self.bus.periodic_tasks:
-            raw_messages = list()
-            for raw_message in copy.deepcopy(task.messages):
-                for msg_name, sgn_dict in msg_sgn_dict.items():
-                    message = self.__db.get_message_by_name(msg_name)
-                    if message.frame_id == task.arbitration_id:
-                        full_signal_dict = message.decode(raw_message.data)
-                        full_signal_dict.update(sgn_dict)
-                        raw_message.data = message.encode(data=full_signal_dict)
-                        raw_messages.append(raw_message)
-                        logger.info(f"Modify sending raw message: {raw_message}")
-            task.modify_data(raw_messages)
+        for msg_name, sgn_dict in msg_sgn_dict.items():
+            message = self.__db.get_message_by_name(msg_name)
+            tasks = self.bus.task_registry.get_all(message.frame_id)
+            if not tasks:
+                logger.warning(f"Message {msg_name} is not being sent, can't modify signals: {sgn_dict}")
+                continue
+            for task in tasks:
+                # the frames of a task usually share most payloads, e.g. all frames without E2E
+                modified_payloads = dict()
+                payloads = list()
+                for data in task.payloads:
+                    if data not in modified_payloads:
+                        template = MessageTemplate(message, data)
+                        template.update(sgn_dict)
+                        modified_payloads[data] = template.data
+                    payloads.append(modified_payloads[data])
+                task.modify_payloads(payloads)
+                logger.info(f"Modify sending raw message: {task.messages[0]}")
 
     def modify_sending_signals_callback(self, *signals: dict, **kwargs: Any) -> None:
         """
@@ -689,22 +844,18 @@ class CanController(object):
     def _divide_signal_names_values_into_groups(self, signals: typing.Tuple[dict]) -> dict:
         msg_sgn_dict = dict()
         for signal in signals:
-            msg_name_set = set()
+            grouped_sgn_dict = dict()
             self.__sent_signals.update(signal)
-            for sgn_name in signal.keys():
+            for sgn_name, sgn_value in signal.items():
                 try:
                     message = self.__db.get_message_by_signal(sgn_name)
-                    msg_name_set.add(message.name)
-                except:
+                except KeyError:
                     logger.error(f"Can't find the message with Signal: "
                                  f"{sgn_name} in database {self.__db_path}")
+                    continue
+                grouped_sgn_dict.setdefault(message.name, dict())[sgn_name] = sgn_value
 
-            for msg_name in msg_name_set:
-                new_sgn_dict = dict()
-                for sgn_name, sgn_value in signal.items():
-                    message = self.__db.get_message_by_signal(sgn_name)
-                    if msg_name == message.name:
-                        new_sgn_dict.update({sgn_name: sgn_value})
+            for msg_name, new_sgn_dict in grouped_sgn_dict.items():
                 logger.info(f"Send message: {msg_name}, signals: {new_sgn_dict}")
                 msg_sgn_dict.update({msg_name: new_sgn_dict})
 
@@ -841,57 +992,102 @@ class CanController(object):
         返回值：返回更新后的该Frame下所有信号字典，
                格式：{signal_name1: signal_value1,signal_name2: signal_value2,...}
         """
+        plan = self.__get_e2e_plan(message)
         for sgn_name in sgn_dict.keys():
             if sgn_name.endswith("Chks") and sgn_name not in self.__sent_signals:
-                signal_group = message.get_signal_group_by_signal_name(sgn_name)
-                if not signal_group:
+                group = plan.get_group(sgn_name)
+                if not group:
                     logger.error(f"Signal:{sgn_name} not found signal group in {self.__db_path}.")
-                signal_names = signal_group.signal_names
-                chks_sgn = message.get_signal_by_name(sgn_name)
-                cntr_sgn_name = sgn_name[:-4] + "Cntr"
-                counter = sgn_dict.get(cntr_sgn_name)
+                    continue
+                counter = sgn_dict.get(group.cntr_name)
                 if counter is None:
-                    logger.error(f"{sgn_dict} not have {cntr_sgn_name} signal, please check and try again.")
+                    logger.error(f"{sgn_dict} not have {group.cntr_name} signal, please check and try again.")
                     continue
                 if counter == 0 and self.init_counter:
                     counter = -1
                 counter += 1
-                counter = int(counter % 15)
-                sgn_dict[cntr_sgn_name] = counter
-                data_id_hex = chks_sgn.data_id
-                try:
-                    data_id = int(data_id_hex, 16)
-                except TypeError:
-                    if set(signal_names) & self.__sent_signals:
-                        logger.warning(f"The signal {chks_sgn} does not contain data id for e2e,"
+                counter = int(counter % COUNTER_MODULUS)
+                sgn_dict[group.cntr_name] = counter
+                if group.data_id is None:
+                    if not self.__sent_signals.isdisjoint(group.signal_names):
+                        logger.warning(f"{group.error},"
                                        f"Please check whether the sdb file is correct and try again,"
                                        f"The value of this {sgn_name} signal remains unchanged here")
                     continue
-                except ValueError:
-                    if set(signal_names) & self.__sent_signals:
-                        logger.error(f"The data id of this signal {chks_sgn} is {data_id_hex},"
-                                     f"Please check whether the sdb file is correct and try again,"
-                                     f"The value of this {sgn_name} signal remains unchanged here")
-                    continue
-                sig_value_length = list()
-                signal_names.sort()
-                for signal_name in signal_names:
-                    sgn = message.get_signal_by_name(signal_name)
-                    if signal_name.endswith("Chks") or signal_name.endswith("Cntr"):
-                        continue
-                    if signal_name in sgn_dict.keys():
-                        value = sgn_dict[signal_name]
-                        if isinstance(value, (str, NamedSignalValue)):
-                            value = sgn.choice_string_to_number(value)
-                        value = (value - sgn.offset) / sgn.scale
-                    else:
-                        value = sgn.initial
-                    sig_value_length.append((int(value), sgn.length))
-                checksum = e2e_crc_data(data_id=data_id, counter=counter, sig_value_length=sig_value_length)
-
-                sgn_dict[sgn_name] = checksum
+                sgn_dict[sgn_name] = group.physical_checksum(counter, sgn_dict)
         return sgn_dict
 
+    def __get_template(self, message: Message, sgn_dict: dict) -> MessageTemplate:
+        """
+        功能说明：获取报文的载荷模板，模板初始为默认载荷（_UB信号为1，其余信号为初始值，每个报文只编码一次），
+                 再只修改传入的信号所在的位
+        参数说明：
+            :param message: Message类型，从can数据库中解析到的can Frame对象
+            :param sgn_dict: dict类型，格式为：{signal_name: signal_value}，数值为原始值（_UB信号除外），也可为枚举名
+        异常说明：信号值超出范围时抛出EncodeError
+        返回值：MessageTemplate对象，由调用者独占
+        """
+        template = self.__templates.get(message.name)
+        if template is None:
+            data = message.encode(self.__update_signals_without_e2e(message, dict()), strict=False)
+            template = self.__templates[message.name] = MessageTemplate(message, data)
+        template = template.copy()
+        ub_sgn_dict = {name: value for name, value in sgn_dict.items() if name.endswith("_UB")}
+        template.update({name: value for name, value in sgn_dict.items() if name not in ub_sgn_dict},
+                        scaling=False)
+        template.update(ub_sgn_dict)
+        return template
+
+    def __update_template_with_e2e(self, message: Message, template: MessageTemplate) -> None:
+        """
+        功能说明：更新载荷模板中未由用户指定的Chks信号及其Cntr信号，Cntr加1，Chks按E2E计划重新计算
+        参数说明：
+            :param message: Message类型，从can数据库中解析到的can Frame对象
+            :param template: 报文的载荷模板
+        异常说明：无
+        返回值：None
+        """
+        plan = self.__get_e2e_plan(message)
+        for chks_signal in message.chks_signals:
+            sgn_name = chks_signal.name
+            if sgn_name in self.__sent_signals:
+                continue
+            group = plan.get_group(sgn_name)
+            if not group:
+                logger.error(f"Signal:{sgn_name} not found signal group in {self.__db_path}.")
+                continue
+            try:
+                counter = template.get_raw(group.cntr_name)
+            except KeyError:
+                logger.error(f"{message.name} not have {group.cntr_name} signal, please check and try again.")
+                continue
+            if counter == 0 and self.init_counter:
+                counter = -1
+            counter += 1
+            counter = int(counter % COUNTER_MODULUS)
+            template.set_raw(group.cntr_name, counter)
+            if group.data_id is None:
+                if not self.__sent_signals.isdisjoint(group.signal_names):
+                    logger.warning(f"{group.error},"
+                                   f"Please check whether the sdb file is correct and try again,"
+                                   f"The value of this {sgn_name} signal remains unchanged here")
+                continue
+            template.set_raw(sgn_name, group.checksum(counter, [template.get_raw(field.name)
+                                                                for field in group.fields]))
+
+    def __get_e2e_plan(self, message: Message) -> E2EPlan:
+        """
+        功能说明：获取报文的E2E计划（data id、按CRC顺序排列的信号和CRC8查找表），每个报文只编译一次
+        参数说明：
+            :param message: Message类型，从can数据库中解析到的can Frame对象
+        异常说明：无
+        返回值：E2EPlan对象
+        """
+        plan = self.__e2e_plans.get(message.name)
+        if plan is None:
+            plan = self.__e2e_plans[message.name] = E2EPlan(message)
+        return plan
+
     def __set_data(self, a_can):
         """
         待使用回调函数修改数据时调试
@@ -961,9 +1157,9 @@ class CanController(object):
                     frame = self.db.get_message_by_frame_id(raw_message.arbitration_id)
                     sgn_dict = msg_sgn_dict.get(frame.name)
                     if sgn_dict:
-                        full_signal_dict = frame.decode(raw_message.data)
-                        full_signal_dict.update(sgn_dict)
-                        raw_message.data = frame.encode(data=full_signal_dict)
+                        template = MessageTemplate(frame, raw_message.data)
+                        template.update(sgn_dict)
+                        raw_message.data = template.data
                         logger.info(f"Modify ecu sending raw message: {raw_message}")
                 except Exception as ex:
                     if raw_message.arbitration_id == 1:
@@ -976,7 +1172,9 @@ class CanController(object):
         threading.Thread(name=f"canapp.controller.modify_ecu_sending for bus '{bus.channel_info}'", target=send_handler, daemon=True).start()
 
     def start_receiving(self) -> bool:
-        self.__notifier = Notifier(self.__bus, [])
+        self.__waiter = FrameWaiter()
+        self.__signal_state = SignalStateStore(self.__db)
+        self.__notifier = Notifier(self.__bus, [self.__waiter, self.__signal_state])
         return True
 
     def stop_receiving(self) -> bool:
@@ -9,11 +9,17 @@ from jidutest_can.can import Notifier
 from jidutest_can.can import Printer
 from jidutest_can.can import SizedRotatingLogger
 from jidutest_can.can import LogReader
-from jidutest_can.can import MessageSync
-from jidutest_can.cantools import load_file
+from jidutest_can.can import ParallelBLFReader
+from jidutest_can.can import ReplayEngine
+from jidutest_can.can import ReplayReport
+from jidutest_can.can import ThreadedWriter
+from jidutest_can.cantools import load_shared
 from jidutest_can.can.interfaces import BusABC
-from jidutest_can.can.interfaces.util import channel2int
+from jidutest_can.cantools.database import DecodeCache
 from jidutest_can.cantools.database import NamedSignalValue
+from jidutest_can.cantools.database.batch import BatchDecoder
+from jidutest_can.cantools.database.batch import NpzColumnWriter
+from jidutest_can.cantools.database.batch import TIMESTAMP_COLUMN
 
 
 logger = logging.getLogger(__name__)
@@ -35,23 +41,45 @@ class CanLogManager(object):
         返回值：None
         """
         self.notifier = Notifier(bus, [])
-        self.logger_listener: SizedRotatingLogger = None
+        self.logger_listener: typing.Union[SizedRotatingLogger, ThreadedWriter] = None
         self.printer_listener: Printer = None
 
-    def start_logging(self, file: typing.Union[pathlib.Path, str], max_bytes: int = 0) -> None:
+    def start_logging(
+        self,
+        file: typing.Union[pathlib.Path, str],
+        max_bytes: int = 0,
+        threaded: bool = True,
+        max_queue_size: int = 1_000_000,
+    ) -> None:
         """
         功能说明：开始录制数据
         参数说明：
             :param file: 需要保存录制的数据的文件名, 文件格式为*.blf, *.asc, *.csv等格式
             :param max_bytes: 保存的一个文件的最大size，超过后会新建一个文件继续保存，
                               单位为byte，默认值0则表示无穷大，保存在一个文件中
+            :param threaded: 为True时在单独的线程中格式化、压缩和写入文件，接收线程只负责入队
+            :param max_queue_size: threaded为True时待写入报文队列的最大长度，队列满时丢弃新报文，
+                                   丢弃的数量见logging_statistics()
         异常说明：无
         返回值：None
         """
         logger.info("Start logging data.")
         self.logger_listener = SizedRotatingLogger(file, max_bytes)
+        if threaded:
+            self.logger_listener = ThreadedWriter(self.logger_listener, max_queue_size=max_queue_size)
         self.notifier.add_listener(self.logger_listener)
 
+    def logging_statistics(self) -> typing.Dict[str, float]:
+        """
+        功能说明：获取录制队列的统计信息（已接收、已写入、队列中、丢弃的报文数等）
+        参数说明：无
+        异常说明：无
+        返回值：统计信息字典，未使用threaded录制时返回空字典
+        """
+        if isinstance(self.logger_listener, ThreadedWriter):
+            return self.logger_listener.statistics()
+        return {}
+
     def stop_logging(self) -> None:
         """
         功能说明：停止录制数据
@@ -65,28 +93,25 @@ class CanLogManager(object):
             self.logger_listener.stop()
         self.notifier.stop()
 
-    def replay_data(self, file: typing.Union[pathlib.Path, str]) -> None:
+    def replay_data(self,
+                    file: typing.Union[pathlib.Path, str],
+                    speed: float = 1.0,
+                    loops: int = 1,
+                    channel_map: typing.Dict[typing.Any, BusABC] = None,
+                    ) -> ReplayReport:
         """
-        功能说明：回放数据
+        功能说明：回放数据，按录制的时间发送报文，到期时间相近（0.2ms内）的报文按Bus批量发送
         参数说明：
             :param file: 需要回访数据的文件名，文件格式为*.blf, *.asc, *.csv等格式
-        异常说明：
-            :KeyboardInterrupt: 键盘中断时继续回放
-        返回值：None
+            :param speed: 回放速度倍数，例如2.0为两倍速
+            :param loops: 回放次数，0表示一直循环回放直到键盘中断
+            :param channel_map: 录制通道到Bus对象的映射，未映射的通道按通道号匹配Bus
+        异常说明：键盘中断时停止回放，返回已回放部分的报告
+        返回值：ReplayReport对象，包含发送的帧数、错误数和实际与计划发送时间的偏差统计
         """
-        reader = LogReader(file)
-        in_sync = MessageSync(reader)
+        engine = ReplayEngine(list(self.notifier.buses), channel_map=channel_map, speed=speed, loops=loops)
         logger.info("Start replaying data.")
-        try:
-            for message in in_sync:
-                if message.is_error_frame:
-                    continue
-                for bus in self.notifier.buses:
-                    if channel2int(bus.channel_info) == channel2int(message.channel):
-                        message.channel = bus.channel_info
-                        bus.send(message)
-        except KeyboardInterrupt:
-            pass
+        return engine.replay(file)
 
     @staticmethod
     def read_log(file: typing.Union[pathlib.Path, str]) -> None:
@@ -130,15 +155,38 @@ class CanLogManager(object):
         self.notifier.stop()
 
     @staticmethod
-    def log_convert(input_file, output_file, file_size) -> None:
+    def open_log_reader(file: typing.Union[pathlib.Path, str], jobs: int = 1,
+                        frame_ids: typing.Optional[typing.Set[int]] = None,
+                        frame_id_mask: int = 0xffffffff):
+        """
+        功能说明：打开log文件读取数据，jobs不为1且文件为*.blf格式时，由多个进程并行解压、解析数据，
+                 并在子进程中按帧ID过滤，其余格式不过滤
+        参数说明：
+            :param file: 需要读取数据的文件名，文件格式为*.blf, *.asc, *.csv等格式
+            :param jobs: 并行解析的进程数，0表示使用全部CPU，1表示不并行
+            :param frame_ids: 并行解析时需要保留的帧ID集合（已按掩码处理），None则不过滤
+            :param frame_id_mask: 帧ID掩码
+        异常说明：无
+        返回值：MessageReader对象
+        """
+        if jobs != 1 and pathlib.PurePath(file).suffix.lower() == ".blf":
+            return ParallelBLFReader(file, jobs=jobs or None, frame_ids=frame_ids, frame_id_mask=frame_id_mask)
+        return LogReader(file)
+
+    @staticmethod
+    def log_convert(input_file, output_file, file_size, jobs: int = 1) -> None:
         """
         功能说明：转换log文件格式
-        参数说明：无
+        参数说明：
+            :param input_file: 需要转换的文件名
+            :param output_file: 转换后的文件名
+            :param file_size: 转换后每个文件的最大size，单位为byte，0表示不切分
+            :param jobs: 读取*.blf文件时并行解析的进程数，0表示使用全部CPU
         异常说明：无
         返回值：None
         """
         logger.info("Start converting log file.")
-        with LogReader(input_file) as reader:
+        with CanLogManager.open_log_reader(input_file, jobs) as reader:
 
             if file_size:
                 _logger = SizedRotatingLogger(
@@ -155,45 +203,253 @@ class CanLogManager(object):
                     sys.exit(1)
 
     @staticmethod
-    def log_parse(log_file, db_path, dest_file) -> None:
+    def log_parse(log_file,
+                  db_path,
+                  dest_file,
+                  output_format: str = "json",
+                  chunk_size: int = 100000,
+                  messages: typing.Optional[typing.Iterable[typing.Union[int, str]]] = None,
+                  signals: typing.Optional[typing.Iterable[str]] = None,
+                  window: typing.Optional[float] = None,
+                  jobs: int = 1,
+                  frame_id_mask: typing.Optional[int] = None) -> None:
         """
         功能说明：解析log数据
-        参数说明：无
-        异常说明：无
+        参数说明：
+            :param log_file: 需要解析的log文件名，文件格式为*.blf, *.asc, *.csv等格式
+            :param db_path: 数据库文件路径，如*.dbc
+            :param dest_file: 解析结果保存的文件名
+            :param output_format: 输出格式，"json"为按时间戳组织的json文件，
+                                  "jsonl"为边解析边写入的json lines文件，每帧（或每个时间窗口）一行，内存占用恒定，
+                                  "npz"为按报文和信号分列的numpy列式文件（需要安装numpy），
+                                  每列的名称为"<报文名>/<信号名>"，另有"<报文名>/timestamp"列
+            :param chunk_size: "npz"格式下每批解码的帧数，决定内存占用的上限
+            :param messages: 只解析这些报文，元素为报文名或帧ID，None则不过滤
+            :param signals: 只输出这些信号，不包含这些信号的报文不会被解码，None则不过滤
+            :param window: "jsonl"格式下的时间窗口，单位s，每个窗口输出一行，
+                           内容为窗口内每个报文最后一次的信号值；None则每帧输出一行
+            :param jobs: 读取*.blf文件时并行解析的进程数，0表示使用全部CPU
+            :param frame_id_mask: 帧ID掩码，帧ID与掩码按位与后再查找报文，例如J1939中忽略源地址，None则不使用掩码
+        异常说明：
+            :ValueError: 不支持的输出格式，或过滤条件中的报文、信号在数据库中不存在
         返回值：None
         """
         logger.info("Start parsing log file.")
-        db = load_file(db_path)
+        db = load_shared(db_path, frame_id_mask=frame_id_mask)
+        frame_ids, signal_names = CanLogManager._resolve_parse_filter(db, messages, signals)
+        if output_format == "npz":
+            CanLogManager._log_parse_columns(log_file, db, dest_file, chunk_size, frame_ids, signal_names, jobs)
+            return
+        if output_format == "jsonl":
+            CanLogManager._log_parse_lines(log_file, db_path, db, dest_file, frame_ids, signal_names, window, jobs)
+            return
+        if output_format != "json":
+            raise ValueError(f"Unsupported output format: {output_format}")
         parsed_dict = dict()
-        with LogReader(log_file) as reader, open(dest_file, mode="w", encoding="utf-8") as output:
+        cache = DecodeCache(copy=False)
+        with CanLogManager.open_log_reader(log_file, jobs, frame_ids, db.frame_id_mask) as reader, \
+                open(dest_file, mode="w", encoding="utf-8") as output:
             try:
-                for m in reader:
-                    message_dict = dict()
-                    try:
-                        frame = db.get_message_by_frame_id(m.arbitration_id)
-                        signal_dict = frame.decode(m.data)
-                        for name, value in signal_dict.items():
-                            if isinstance(value, NamedSignalValue):
-                                signal_dict[name] = str(value)
-                        message_dict[hex(m.arbitration_id)] = str(m)
-                        message_dict[frame.name] = signal_dict
-                        parsed_dict[m.timestamp] = message_dict
-                    except Exception as ex:
-                        message_dict[hex(m.arbitration_id)] = str(m)
-                        if m.is_error_frame:
-                            message_dict["Error Frame"] = f"{m.timestamp} | can error | Error Frame"
-                        elif m.arbitration_id == 1:
-                            logger.warning(f"Unable to parse message:{m}")
-                        elif isinstance(ex, (KeyError, bitstruct.Error)):
-                            logger.error(f"Unable to parse message:{m} \npossible mismatch between "
-                                         f"type of can channel {m.channel} in the log: {log_file} and dbc: {db_path}")
-                        else:
-                            logger.exception(ex)
-                        parsed_dict[m.timestamp] = message_dict
+                for m in CanLogManager._filter_frames(reader, frame_ids, db.frame_id_mask):
+                    parsed_dict[m.timestamp] = CanLogManager._parse_frame(m, db, log_file, db_path, signal_names, cache)
                 output.write(json.dumps(parsed_dict, indent=4, sort_keys=True, ensure_ascii=False))
             except KeyboardInterrupt:
                 sys.exit(1)
 
+    @staticmethod
+    def _resolve_parse_filter(db, messages, signals) -> typing.Tuple[typing.Optional[typing.Set[int]],
+                                                                     typing.Optional[typing.Set[str]]]:
+        """
+        功能说明：将报文、信号过滤条件转换为需要解析的帧ID集合和需要输出的信号名集合，帧ID已按数据库的帧ID掩码处理
+        参数说明：
+            :param db: Database对象
+            :param messages: 报文名或帧ID，None则不过滤
+            :param signals: 信号名，None则不过滤
+        异常说明：
+            :ValueError: 报文或信号在数据库中不存在
+        返回值：(帧ID集合, 信号名集合)，不过滤时对应的值为None
+        """
+        frame_ids = None
+        signal_names = None
+        mask = db.frame_id_mask
+        if messages:
+            frame_ids = set()
+            for message in messages:
+                try:
+                    if isinstance(message, int):
+                        frame_ids.add(db.get_message_by_frame_id(message).frame_id & mask)
+                    else:
+                        frame_ids.add(db.get_message_by_name(message).frame_id & mask)
+                except KeyError:
+                    raise ValueError(f"Message {message} is not in the database") from None
+        if signals:
+            signal_names = set(signals)
+            signal_frame_ids = {message.frame_id & mask for message in db.messages
+                                if any(signal.name in signal_names for signal in message.signals)}
+            unknown = signal_names - {signal.name for signal in db.signals}
+            if unknown:
+                raise ValueError(f"Signals {sorted(unknown)} are not in the database")
+            frame_ids = signal_frame_ids if frame_ids is None else frame_ids & signal_frame_ids
+        return frame_ids, signal_names
+
+    @staticmethod
+    def _filter_frames(reader, frame_ids: typing.Optional[typing.Set[int]],
+                       frame_id_mask: int = 0xffffffff) -> typing.Iterator:
+        """
+        功能说明：按帧ID过滤log中的帧，帧ID与掩码按位与后在集合中即保留，过滤条件存在时错误帧也会被过滤
+        参数说明：
+            :param reader: LogReader对象
+            :param frame_ids: 需要保留的帧ID集合（已按掩码处理），None则不过滤
+            :param frame_id_mask: 帧ID掩码
+        异常说明：无
+        返回值：帧的迭代器
+        """
+        if frame_ids is None:
+            return iter(reader)
+        return (m for m in reader if not m.is_error_frame and (m.arbitration_id & frame_id_mask) in frame_ids)
+
+    @staticmethod
+    def _parse_frame(m, db, log_file, db_path, signal_names: typing.Optional[typing.Set[str]] = None,
+                     cache: typing.Optional[DecodeCache] = None) -> dict:
+        """
+        功能说明：解析一帧数据
+        参数说明：
+            :param m: 需要解析的帧
+            :param db: Database对象
+            :param log_file: log文件名，用于日志提示
+            :param db_path: 数据库文件路径，用于日志提示
+            :param signal_names: 需要输出的信号名集合，None则输出全部信号
+            :param cache: 解码缓存，内容相同的帧只解码一次，None则每帧都解码
+        异常说明：无
+        返回值：{帧ID: 帧的字符串, 报文名: {信号名: 信号值}}，解析失败时不包含报文名
+        """
+        message_dict = dict()
+        try:
+            frame = db.get_message_by_frame_id(m.arbitration_id)
+            if cache is not None:
+                decoded = cache.decode(frame, m.data)
+            else:
+                decoded = frame.decode(m.data)
+            signal_dict = {name: str(value) if isinstance(value, NamedSignalValue) else value
+                           for name, value in decoded.items()
+                           if signal_names is None or name in signal_names}
+            message_dict[hex(m.arbitration_id)] = str(m)
+            message_dict[frame.name] = signal_dict
+        except Exception as ex:
+            message_dict[hex(m.arbitration_id)] = str(m)
+            if m.is_error_frame:
+                message_dict["Error Frame"] = f"{m.timestamp} | can error | Error Frame"
+            elif m.arbitration_id == 1:
+                logger.warning(f"Unable to parse message:{m}")
+            elif isinstance(ex, (KeyError, bitstruct.Error)):
+                logger.error(f"Unable to parse message:{m} \npossible mismatch between "
+                             f"type of can channel {m.channel} in the log: {log_file} and dbc: {db_path}")
+            else:
+                logger.exception(ex)
+        return message_dict
+
+    @staticmethod
+    def _log_parse_lines(log_file,
+                         db_path,
+                         db,
+                         dest_file,
+                         frame_ids: typing.Optional[typing.Set[int]],
+                         signal_names: typing.Optional[typing.Set[str]],
+                         window: typing.Optional[float],
+                         jobs: int = 1) -> None:
+        """
+        功能说明：边读取边解析log数据，并以json lines格式逐行写入文件，内存占用与log大小无关。
+                 不按窗口输出时每帧一行：{"timestamp": 时间戳, 帧ID: 帧的字符串, 报文名: {信号名: 信号值}}；
+                 按窗口输出时每个窗口一行：{"timestamp": 窗口起始时间, "messages": {报文名: {信号名: 信号值}}}
+        参数说明：
+            :param log_file: 需要解析的log文件名
+            :param db_path: 数据库文件路径，用于日志提示
+            :param db: Database对象
+            :param dest_file: json lines文件名
+            :param frame_ids: 需要解析的帧ID集合，None则不过滤
+            :param signal_names: 需要输出的信号名集合，None则输出全部信号
+            :param window: 时间窗口，单位s，None则每帧输出一行
+            :param jobs: 读取*.blf文件时并行解析的进程数
+        异常说明：无
+        返回值：None
+        """
+        window_start = None
+        window_messages = dict()
+        cache = DecodeCache(copy=False)
+        with CanLogManager.open_log_reader(log_file, jobs, frame_ids, db.frame_id_mask) as reader, \
+                open(dest_file, mode="w", encoding="utf-8") as output:
+
+            def write_record(record: dict) -> None:
+                output.write(json.dumps(record, ensure_ascii=False))
+                output.write("\n")
+
+            try:
+                for m in CanLogManager._filter_frames(reader, frame_ids, db.frame_id_mask):
+                    message_dict = CanLogManager._parse_frame(m, db, log_file, db_path, signal_names, cache)
+                    if window is None:
+                        write_record({"timestamp": m.timestamp, **message_dict})
+                        continue
+                    if window_start is None:
+                        window_start = m.timestamp
+                    elif m.timestamp >= window_start + window:
+                        if window_messages:
+                            write_record({"timestamp": window_start, "messages": window_messages})
+                            window_messages = dict()
+                        window_start += ((m.timestamp - window_start) // window) * window
+                    for name, value in message_dict.items():
+                        if isinstance(value, dict):
+                            window_messages.setdefault(name, dict()).update(value)
+                if window_messages:
+                    write_record({"timestamp": window_start, "messages": window_messages})
+            except KeyboardInterrupt:
+                sys.exit(1)
+
+    @staticmethod
+    def _log_parse_columns(log_file,
+                           db,
+                           dest_file,
+                           chunk_size: int,
+                           frame_ids: typing.Optional[typing.Set[int]] = None,
+                           signal_names: typing.Optional[typing.Set[str]] = None,
+                           jobs: int = 1) -> None:
+        """
+        功能说明：分批将log数据按报文ID分组、向量化解码，并逐批写入npz列式文件，
+                 内存中最多只保留chunk_size帧数据
+        参数说明：
+            :param log_file: 需要解析的log文件名
+            :param db: Database对象
+            :param dest_file: npz文件名
+            :param chunk_size: 每批解码的帧数
+            :param frame_ids: 需要解析的帧ID集合，None则不过滤
+            :param signal_names: 需要输出的信号名集合，None则输出全部信号
+            :param jobs: 读取*.blf文件时并行解析的进程数
+        异常说明：无
+        返回值：None
+        """
+        decoder = BatchDecoder(db)
+
+        def flush() -> None:
+            result = decoder.flush()
+            if signal_names is not None:
+                for columns in result.values():
+                    for name in list(columns):
+                        if name != TIMESTAMP_COLUMN and name not in signal_names:
+                            del columns[name]
+            writer.write(result)
+
+        with CanLogManager.open_log_reader(log_file, jobs, frame_ids, db.frame_id_mask) as reader, \
+                NpzColumnWriter(dest_file) as writer:
+            try:
+                for index, m in enumerate(CanLogManager._filter_frames(reader, frame_ids, db.frame_id_mask), 1):
+                    decoder.add(m)
+                    if index % chunk_size == 0:
+                        flush()
+                flush()
+            except KeyboardInterrupt:
+                sys.exit(1)
+        if decoder.skipped:
+            logger.warning(f"{decoder.skipped} frames in {log_file} were skipped: unknown id, error frame or too short")
+
 
 class CanTools(object):
     """
@@ -0,0 +1,368 @@
+import logging
+import threading
+import typing
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from jidutest_can.can import RawMessage
+from jidutest_can.can.bcm import CyclicSendTaskABC
+from jidutest_can.can.bcm import JitterStatistics
+from jidutest_can.can.interfaces import BusABC
+from jidutest_can.can.tools.e2e import E2EPayloadGenerator
+from jidutest_can.can.tools.e2e import E2EPlan
+from jidutest_can.cantools import Database
+from jidutest_can.cantools import Message
+from jidutest_can.cantools import MessageTemplate
+
+
+logger = logging.getLogger(__name__)
+
+
+def is_cyclic(message: Message) -> bool:
+    """
+    功能说明：判断报文是否周期发送，有周期时间且发送类型为空或包含cyclic（不区分大小写，如Cyclic、CyclicIfActive）
+    参数说明：
+        :param message: Message类型，从can数据库中解析到的can Frame对象
+    异常说明：无
+    返回值：True/False
+    """
+    if not message.cycle_time:
+        return False
+    return message.send_type is None or "cyclic" in message.send_type.lower()
+
+
+class SimulatedMessage(object):
+    """
+    剩余总线仿真中的一个发送报文：当前载荷模板、E2E生成器和周期任务。
+    载荷初始为各信号的初始值，_UB信号为1；Cntr和Chks信号在每次发送前由E2E生成器更新。
+    """
+
+    def __init__(self, message: Message) -> None:
+        """
+        功能说明：初始化对象
+        参数说明：
+            :param message: Message类型，从can数据库中解析到的can Frame对象
+        异常说明：无
+        返回值：None
+        """
+        self.message = message
+        self.template = MessageTemplate(message)
+        ub_sgn_dict = {sgn.name: 1 for sgn in message.signals if sgn.name.endswith("_UB")}
+        if ub_sgn_dict:
+            self.template.update(ub_sgn_dict, scaling=False)
+        self.period: Optional[float] = message.cycle_time / 1000 if is_cyclic(message) else None
+        self.enabled = True
+        self.task: Optional[CyclicSendTaskABC] = None
+        self.generator: Optional[E2EPayloadGenerator] = None
+        try:
+            generator = E2EPayloadGenerator(message, E2EPlan(message))
+        except ValueError as ex:
+            logger.warning(f"{ex} The E2E signals of {message.name} are not updated.")
+        else:
+            if generator:
+                self.generator = generator
+        # the generator is called by the scheduler thread and by trigger()
+        self.__generator_lock = threading.Lock()
+
+    @property
+    def name(self) -> str:
+        return self.message.name
+
+    def generate(self, raw_message: RawMessage) -> None:
+        """
+        功能说明：发送前更新报文的Cntr和Chks信号
+        参数说明：
+            :param raw_message: 即将发送的报文，数据被原地修改
+        异常说明：无
+        返回值：None
+        """
+        with self.__generator_lock:
+            self.generator(raw_message)
+
+    def create_raw_message(self, channel: Any) -> RawMessage:
+        """
+        功能说明：以当前载荷创建报文
+        参数说明：
+            :param channel: 报文的通道
+        异常说明：无
+        返回值：RawMessage对象
+        """
+        return RawMessage(arbitration_id=self.message.frame_id,
+                          is_rx=False,
+                          channel=channel,
+                          is_remote_frame=False,
+                          is_fd=self.message.is_fd,
+                          is_extended_id=self.message.is_extended_frame,
+                          data=self.template.data)
+
+    def __repr__(self) -> str:
+        return (f"SimulatedMessage({self.name!r}, period={self.period}, enabled={self.enabled}, "
+                f"running={self.task is not None})")
+
+
+class RestBusSimulation(object):
+    """
+    基于数据库的剩余总线仿真：模拟一个或多个不在总线上的ECU，周期性发送这些节点在数据库中的全部发送报文。
+    周期报文按各自的周期时间发送，全部由总线的周期发送调度器（单线程）驱动，不会每个报文一个线程；
+    E2E报文只保存一帧，Cntr和Chks信号在每次发送前更新。非周期（事件）报文不自动发送，可用trigger发送一帧。
+
+    使用示例：
+        simulation = RestBusSimulation(bus, db, "ECU1", "ECU2")
+        simulation.start()
+        simulation.set_signals(VehicleSpeed=50)
+        simulation.disable("ECU1_Status")
+        simulation.stop()
+    """
+
+    def __init__(self,
+                 bus: BusABC,
+                 db: Database,
+                 *nodes: str,
+                 bus_name: Optional[str] = None
+                 ) -> None:
+        """
+        功能说明：初始化对象，为节点的每个发送报文编译载荷模板和E2E生成器，不开始发送
+        参数说明：
+            :param bus: 发送报文的总线
+            :param db: can数据库
+            :param nodes: 需要仿真的节点名
+            :param bus_name: 只仿真此总线上的报文，为None时不区分总线
+        异常说明：
+            :exception ValueError: 没有传入节点名或者节点不在数据库中
+        返回值：None
+        """
+        if not nodes:
+            raise ValueError("At least one node name should be passed in.")
+        node_names = {node.name for node in db.nodes}
+        for message in db.messages:
+            node_names.update(message.senders)
+        unknown_nodes = [node for node in nodes if node not in node_names]
+        if unknown_nodes:
+            raise ValueError(f"Can't find the nodes {unknown_nodes} in database.")
+        self.__bus = bus
+        self.__db = db
+        self.__nodes = tuple(nodes)
+        self.__lock = threading.RLock()
+        self.__running = False
+        self.__messages: Dict[str, SimulatedMessage] = dict()
+        self.__signal_messages: Dict[str, SimulatedMessage] = dict()
+        for message in db.messages:
+            if message.is_container or not set(self.__nodes).intersection(message.senders):
+                continue
+            if bus_name is not None and message.bus_name not in (None, bus_name):
+                continue
+            simulated = SimulatedMessage(message)
+            self.__messages[message.name] = simulated
+            for sgn in message.signals:
+                self.__signal_messages.setdefault(sgn.name, simulated)
+        logger.info(f"Rest bus simulation of {list(self.__nodes)}: {len(self.__messages)} messages, "
+                    f"{len(self.cyclic_messages)} cyclic")
+
+    @property
+    def bus(self) -> BusABC:
+        return self.__bus
+
+    @property
+    def db(self) -> Database:
+        return self.__db
+
+    @property
+    def nodes(self) -> typing.Tuple[str, ...]:
+        return self.__nodes
+
+    @property
+    def messages(self) -> Dict[str, SimulatedMessage]:
+        """仿真的全部报文，格式为{message_name: SimulatedMessage}"""
+        return dict(self.__messages)
+
+    @property
+    def cyclic_messages(self) -> List[str]:
+        """周期发送的报文名"""
+        return [name for name, simulated in self.__messages.items() if simulated.period]
+
+    @property
+    def is_running(self) -> bool:
+        return self.__running
+
+    def get_message(self, name: str) -> SimulatedMessage:
+        """
+        功能说明：获取仿真的报文
+        参数说明：
+            :param name: 报文名
+        异常说明：
+            :exception KeyError: 报文不是仿真节点的发送报文
+        返回值：SimulatedMessage对象
+        """
+        try:
+            return self.__messages[name]
+        except KeyError:
+            raise KeyError(f"Message {name} is not sent by {list(self.__nodes)}") from None
+
+    def start(self) -> None:
+        """
+        功能说明：开始仿真，周期性发送全部启用的周期报文，已开始时不做处理
+        参数说明：无
+        异常说明：无
+        返回值：None
+        """
+        with self.__lock:
+            if self.__running:
+                return
+            self.__running = True
+            for simulated in self.__messages.values():
+                if simulated.enabled:
+                    self.__start_message(simulated)
+
+    def stop(self) -> None:
+        """
+        功能说明：停止仿真，停止发送全部报文，信号值和E2E计数器保留，再次start时继续
+        参数说明：无
+        异常说明：无
+        返回值：None
+        """
+        with self.__lock:
+            self.__running = False
+            for simulated in self.__messages.values():
+                self.__stop_message(simulated)
+
+    def enable(self, *names: str) -> None:
+        """
+        功能说明：启用报文，仿真运行时立即开始发送
+        参数说明：
+            :param names: 报文名，为空时启用全部报文
+        异常说明：
+            :exception KeyError: 报文不是仿真节点的发送报文
+        返回值：None
+        """
+        with self.__lock:
+            for simulated in self.__select(names):
+                simulated.enabled = True
+                if self.__running:
+                    self.__start_message(simulated)
+
+    def disable(self, *names: str) -> None:
+        """
+        功能说明：禁用报文，立即停止发送，例如模拟报文丢失
+        参数说明：
+            :param names: 报文名，为空时禁用全部报文
+        异常说明：
+            :exception KeyError: 报文不是仿真节点的发送报文
+        返回值：None
+        """
+        with self.__lock:
+            for simulated in self.__select(names):
+                simulated.enabled = False
+                self.__stop_message(simulated)
+
+    def is_enabled(self, name: str) -> bool:
+        return self.get_message(name).enabled
+
+    def set_signals(self, *signals: dict, **kwargs: Any) -> None:
+        """
+        功能说明：修改仿真报文的信号值，只修改信号所在的位，下一帧即生效
+        参数说明：
+            :param signals: 信号和对应物理值组成的字典，例如：{signal_name: signal_value}，也可为枚举名
+            :param kwargs: 关键字参数，例如：signal_name=signal_value
+        异常说明：
+            :exception KeyError: 信号不在仿真节点的发送报文中
+            :exception EncodeError: 信号值超出范围
+        返回值：None
+        """
+        msg_sgn_dict: Dict[str, dict] = dict()
+        for sgn_dict in signals + (kwargs,):
+            for sgn_name, sgn_value in sgn_dict.items():
+                simulated = self.__signal_messages.get(sgn_name)
+                if simulated is None:
+                    raise KeyError(f"Signal {sgn_name} is not sent by {list(self.__nodes)}")
+                msg_sgn_dict.setdefault(simulated.name, dict())[sgn_name] = sgn_value
+        with self.__lock:
+            for msg_name, sgn_dict in msg_sgn_dict.items():
+                simulated = self.__messages[msg_name]
+                simulated.template.update(sgn_dict)
+                if simulated.task is not None:
+                    simulated.task.modify_payloads(simulated.template.data)
+                logger.debug(f"Modify simulated message: {msg_name}, signals: {sgn_dict}")
+
+    def get_signals(self, *names: str) -> dict:
+        """
+        功能说明：获取仿真报文当前发送的信号物理值，不含E2E生成器更新的Cntr和Chks信号
+        参数说明：
+            :param names: 信号名
+        异常说明：
+            :exception KeyError: 信号不在仿真节点的发送报文中
+        返回值：信号字典，格式为{sgn_name: sgn_value}
+        """
+        sgn_dict = dict()
+        for name in names:
+            simulated = self.__signal_messages.get(name)
+            if simulated is None:
+                raise KeyError(f"Signal {name} is not sent by {list(self.__nodes)}")
+            sgn_dict[name] = simulated.template[name]
+        return sgn_dict
+
+    def trigger(self, *names: str) -> None:
+        """
+        功能说明：以当前信号值立即发送一帧，用于事件报文，周期报文的周期不受影响
+        参数说明：
+            :param names: 报文名
+        异常说明：
+            :exception KeyError: 报文不是仿真节点的发送报文
+            :exception CanOperationError: 发送失败
+        返回值：None
+        """
+        for name in names:
+            simulated = self.get_message(name)
+            raw_message = simulated.create_raw_message(self.__bus.channel_info)
+            if simulated.generator is not None:
+                simulated.generate(raw_message)
+            self.__bus.send(raw_message)
+            logger.debug(f"Trigger simulated message: {raw_message}")
+
+    def statistics(self) -> Dict[str, JitterStatistics]:
+        """
+        功能说明：获取正在发送的周期报文的发送时间偏差统计
+        参数说明：无
+        异常说明：无
+        返回值：字典，格式为{message_name: JitterStatistics}
+        """
+        with self.__lock:
+            return {name: simulated.task.statistics for name, simulated in self.__messages.items()
+                    if simulated.task is not None and hasattr(simulated.task, "statistics")}
+
+    def __select(self, names: typing.Iterable[str]) -> List[SimulatedMessage]:
+        if not names:
+            return list(self.__messages.values())
+        return [self.get_message(name) for name in names]
+
+    def __start_message(self, simulated: SimulatedMessage) -> None:
+        if simulated.task is not None or not simulated.period:
+            return
+        payload_generator = simulated.generate if simulated.generator is not None else None
+        try:
+            simulated.task = self.__bus.send_periodic(msgs=simulated.create_raw_message(self.__bus.channel_info),
+                                                      period=simulated.period,
+                                                      name=simulated.name,
+                                                      payload_generator=payload_generator)
+        except NotImplementedError:
+            # the interface sends periodic messages by itself
+            logger.warning(f"The E2E signals of {simulated.name} are not updated by {self.__bus}.")
+            simulated.task = self.__bus.send_periodic(msgs=simulated.create_raw_message(self.__bus.channel_info),
+                                                      period=simulated.period,
+                                                      name=simulated.name)
+
+    def __stop_message(self, simulated: SimulatedMessage) -> None:
+        if simulated.task is not None:
+            simulated.task.stop()
+            simulated.task = None
+
+    def __enter__(self) -> "RestBusSimulation":
+        self.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+    def __repr__(self) -> str:
+        return (f"RestBusSimulation(nodes={list(self.__nodes)}, messages={len(self.__messages)}, "
+                f"running={self.__running})")
@@ -1,7 +1,12 @@
 from jidutest_can.cantools.loader import Database
 from jidutest_can.cantools.loader import load_file
 from jidutest_can.cantools.loader import UnsupportedDatabaseFormatError
+from jidutest_can.cantools.registry import DatabaseRegistry
+from jidutest_can.cantools.registry import get_registry
+from jidutest_can.cantools.registry import load_shared
 from jidutest_can.cantools.database import BusConfig
+from jidutest_can.cantools.database import DecodeCache
 from jidutest_can.cantools.database import Message
+from jidutest_can.cantools.database import MessageTemplate
 from jidutest_can.cantools.database import Signal
 from jidutest_can.cantools.database import SignalGroup
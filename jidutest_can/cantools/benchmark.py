@@ -0,0 +1,160 @@
+# Compare load time and peak memory of the database parsers.
+
+import gc
+import multiprocessing
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+
+from jidutest_can.cantools.compat import fopen
+from jidutest_can.cantools.formats import arxml
+from jidutest_can.cantools.formats import dbc
+from jidutest_can.cantools.formats.db import InternalDatabase
+from jidutest_can.cantools.loader import _resolve_database_format_and_encoding
+from jidutest_can.cantools.tools import StringPathLike
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+class LoadBenchmark(NamedTuple):
+    """The result of loading a database file with one parser.
+
+    """
+
+    parser: str
+    #: Best load time of all repetitions in seconds.
+    seconds: float
+    #: Peak of the memory allocated by Python while loading, in bytes.
+    peak_memory: int
+    #: Peak resident set size of the measuring process in bytes, ``None``
+    #: where unavailable.
+    peak_rss: Optional[int]
+    messages: int
+
+
+def _read(filename: StringPathLike, encoding: str) -> str:
+    with fopen(filename, 'r', encoding=encoding) as fin:
+        return fin.read()
+
+
+def _load_dbc_fast(filename: StringPathLike, encoding: str) -> InternalDatabase:
+    return dbc.load_string(_read(filename, encoding))
+
+
+def _load_dbc_grammar(filename: StringPathLike, encoding: str) -> InternalDatabase:
+    return dbc.load_string(_read(filename, encoding), fast=False)
+
+
+def _load_arxml_tree(filename: StringPathLike, encoding: str) -> InternalDatabase:
+    return arxml.load_string(_read(filename, encoding))
+
+
+def _load_arxml_low_memory(filename: StringPathLike, encoding: str) -> InternalDatabase:
+    with fopen(filename, 'r', encoding=encoding) as fin:
+        return arxml.load(fin, low_memory=True)
+
+
+#: The parsers per database format, the first one is the default.
+PARSERS: Dict[str, Dict[str, Callable[[StringPathLike, str], InternalDatabase]]] = {
+    'arxml': {
+        'tree': _load_arxml_tree,
+        'low-memory': _load_arxml_low_memory,
+    },
+    'dbc': {
+        'fast': _load_dbc_fast,
+        'grammar': _load_dbc_grammar,
+    },
+}
+
+
+def _max_rss() -> Optional[int]:
+    if resource is None:
+        return None
+
+    # kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _measure(database_format: str,
+             parser: str,
+             filename: StringPathLike,
+             encoding: str,
+             repeat: int) -> LoadBenchmark:
+    load = PARSERS[database_format][parser]
+    seconds = []
+
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        load(filename, encoding)
+        seconds.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+
+    try:
+        database = load(filename, encoding)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return LoadBenchmark(parser,
+                         min(seconds),
+                         peak_memory,
+                         _max_rss(),
+                         len(database.messages))
+
+
+def benchmark_load(filename: StringPathLike,
+                   database_format: Optional[str] = None,
+                   encoding: Optional[str] = None,
+                   repeat: int = 3,
+                   parsers: Optional[Iterable[str]] = None) -> List[LoadBenchmark]:
+    """Load given file `repeat` times with every parser of its format, or
+    the given `parsers`, and return the results.
+
+    Every parser is measured in a fresh process, so the peak memory of
+    one parser does not include the leftovers of another.
+
+    """
+
+    database_format, encoding = _resolve_database_format_and_encoding(
+        database_format,
+        encoding,
+        filename)
+
+    try:
+        available = PARSERS[database_format]
+    except KeyError:
+        raise ValueError(
+            "No parsers to compare for database format '{}'.".format(database_format))
+
+    if parsers is None:
+        parsers = list(available)
+
+    results = []
+
+    for parser in parsers:
+        if parser not in available:
+            raise ValueError(
+                "Unknown parser '{}', expected one of {}.".format(parser, list(available)))
+
+        with ProcessPoolExecutor(max_workers=1,
+                                 mp_context=multiprocessing.get_context('spawn')) as executor:
+            results.append(executor.submit(_measure,
+                                           database_format,
+                                           parser,
+                                           filename,
+                                           encoding,
+                                           repeat).result())
+
+    return results
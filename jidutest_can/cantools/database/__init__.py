@@ -2,6 +2,7 @@ from jidutest_can.cantools.database.attribute_definition import AttributeDefinit
 from jidutest_can.cantools.database.attribute import Attribute
 from jidutest_can.cantools.database.bus import BusConfig
 from jidutest_can.cantools.database.environment_variable import EnvironmentVariable
+from jidutest_can.cantools.database.decode_cache import DecodeCache
 
 from jidutest_can.cantools.database.errors import Error
 from jidutest_can.cantools.database.errors import ParseError
@@ -16,6 +17,7 @@ from jidutest_can.cantools.database.signal import NamedSignalValue
 from jidutest_can.cantools.database.signal import Signal
 
 from jidutest_can.cantools.database.signal_group import SignalGroup
+from jidutest_can.cantools.database.template import MessageTemplate
 
 from jidutest_can.cantools.database.utils import format_and
 from jidutest_can.cantools.database.utils import prune_database_choices
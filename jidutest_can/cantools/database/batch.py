@@ -0,0 +1,393 @@
+# Columnar bulk decoding of many frames at once.
+
+import os
+import shutil
+import tempfile
+import zipfile
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import TYPE_CHECKING
+
+from jidutest_can.cantools.database.codec import CompiledNode
+from jidutest_can.cantools.database.codec import FieldPlan
+from jidutest_can.cantools.tools.typechecking import StringPathLike
+if TYPE_CHECKING:
+    from jidutest_can.cantools.db import Database
+    from jidutest_can.cantools.database.message import Message
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+#: Column holding the frame timestamps in every decoded message.
+TIMESTAMP_COLUMN = 'timestamp'
+
+Columns = Dict[str, Any]
+BatchResult = Dict[str, Columns]
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError('Batch decoding requires numpy, install it with '
+                          '"pip install numpy".')
+
+
+class _MessagePlan(object):
+    """The columns and compiled signal plans of one message.
+
+    """
+
+    def __init__(self, message: 'Message', scaling: bool) -> None:
+        compiled_codec = message.compiled_codec
+
+        if compiled_codec is None:
+            raise ValueError(f'Message "{message.name}" has no compiled codec.')
+
+        self.message = message
+        self.length = message.length
+        self.root = compiled_codec.root
+        self.scaling = scaling
+        self.dtypes: Dict[str, Any] = {TIMESTAMP_COLUMN: np.dtype(np.float64)}
+        self._collect_dtypes(self.root, multiplexed=False)
+
+    def _collect_dtypes(self, node: CompiledNode, multiplexed: bool) -> None:
+        for field in node.fields:
+            if multiplexed or field.float_format is not None:
+                # multiplexed signals are NaN in frames not carrying them
+                dtype = np.float64
+            elif self.scaling and not field.is_identity and not _has_integer_scaling(field):
+                dtype = np.float64
+            elif field.sign_bit or field.mask.bit_length() < 64:
+                dtype = np.int64
+            else:
+                dtype = np.uint64
+
+            self.dtypes.setdefault(field.name, np.dtype(dtype))
+
+        for _, children in node.multiplexers.values():
+            for child in children.values():
+                self._collect_dtypes(child, multiplexed=True)
+
+    def decode(self, timestamps: List[float], payloads: bytearray) -> Columns:
+        rows = len(timestamps)
+        matrix = np.frombuffer(bytes(payloads), dtype=np.uint8).reshape(rows, self.length)
+        columns: Columns = {TIMESTAMP_COLUMN: np.array(timestamps, dtype=np.float64)}
+
+        for name, dtype in self.dtypes.items():
+            if name not in columns:
+                if dtype == np.float64:
+                    columns[name] = np.full(rows, np.nan)
+                else:
+                    columns[name] = np.zeros(rows, dtype=dtype)
+
+        self._decode_node(self.root, matrix, None, columns)
+
+        return columns
+
+    def _decode_node(self,
+                     node: CompiledNode,
+                     matrix: Any,
+                     rows: Optional[Any],
+                     columns: Columns) -> None:
+        raw_values = {}
+
+        for field in node.fields:
+            raw = _extract_field(matrix, field, self.length)
+            raw_values[field.name] = raw
+            column = columns[field.name]
+            value = _convert_field(raw, field, self.scaling)
+
+            if rows is None:
+                column[:] = value
+            else:
+                column[rows] = value
+
+        for name, (signal, children) in node.multiplexers.items():
+            raw = raw_values[name]
+            mux = _convert_field(raw, _field_by_name(node, name), self.scaling)
+
+            if signal.choices:
+                # choice values are mapped back to the raw number, as
+                # Message.decode() does
+                mux = np.where(np.isin(raw, list(signal.choices)), raw, mux)
+
+            mux = np.trunc(mux).astype(np.int64)
+
+            for mux_id, child in children.items():
+                selected = np.flatnonzero(mux == mux_id)
+
+                if len(selected) == 0:
+                    continue
+
+                if rows is not None:
+                    child_rows = rows[selected]
+                else:
+                    child_rows = selected
+
+                self._decode_node(child, matrix[selected], child_rows, columns)
+
+
+def _field_by_name(node: CompiledNode, name: str) -> FieldPlan:
+    for field in node.fields:
+        if field.name == name:
+            return field
+
+    raise KeyError(name)
+
+
+def _extract_field(matrix: Any, field: FieldPlan, length: int) -> Any:
+    """Return the raw bits of given field for every row of `matrix` as
+    ``uint64`` array.
+
+    """
+
+    bit_length = field.mask.bit_length()
+    first_byte, bit_offset = divmod(field.shift, 8)
+    last_byte = (field.shift + bit_length - 1) // 8
+
+    # byte indices ordered from the least to the most significant byte
+    if field.is_big_endian:
+        byte_indices = [length - 1 - index for index in range(first_byte, last_byte + 1)]
+    else:
+        byte_indices = list(range(first_byte, last_byte + 1))
+
+    if len(byte_indices) <= 8:
+        value = np.zeros(len(matrix), dtype=np.uint64)
+
+        for position, byte_index in enumerate(byte_indices):
+            value |= matrix[:, byte_index].astype(np.uint64) << np.uint64(8 * position)
+
+        return (value >> np.uint64(bit_offset)) & np.uint64(field.mask)
+
+    # a 58 to 64 bits long field which is not byte aligned spans 9 bytes
+    byteorder = 'big' if field.is_big_endian else 'little'
+    start = min(byte_indices)
+    stop = max(byte_indices) + 1
+
+    return np.array([(int.from_bytes(row[start:stop].tobytes(), byteorder) >> bit_offset) & field.mask
+                     for row in matrix],
+                    dtype=np.uint64)
+
+
+def _has_integer_scaling(field: FieldPlan) -> bool:
+    """Integer scale and offset keep integer values integers, as
+    ``int64`` columns as long as the raw value fits.
+
+    """
+
+    return (field.float_format is None
+            and (field.sign_bit or field.mask.bit_length() < 64)
+            and type(field.scale) is int
+            and type(field.offset) is int)
+
+
+def _convert_field(raw: Any, field: FieldPlan, scaling: bool) -> Any:
+    bit_length = field.mask.bit_length()
+
+    if field.float_format is not None:
+        float_types = {16: (np.uint16, np.float16),
+                       32: (np.uint32, np.float32),
+                       64: (np.uint64, np.float64)}
+        int_type, float_type = float_types[bit_length]
+
+        # NaN and infinite payloads are valid values, not an error, and
+        # scaling them may overflow to infinity as Message.decode() does
+        with np.errstate(invalid='ignore', over='ignore'):
+            value = raw.astype(int_type).view(float_type).astype(np.float64)
+
+            if scaling:
+                value = field.scale * value + field.offset
+
+        return value
+
+    if field.sign_bit:
+        value = raw.astype(np.int64)
+
+        if bit_length < 64:
+            value = np.where(raw & np.uint64(field.sign_bit),
+                             value - np.int64(1 << bit_length),
+                             value)
+    elif bit_length < 64:
+        value = raw.astype(np.int64)
+    else:
+        value = raw
+
+    if scaling and not field.is_identity:
+        if _has_integer_scaling(field):
+            return value * np.int64(field.scale) + np.int64(field.offset)
+
+        return field.scale * value.astype(np.float64) + field.offset
+
+    return value
+
+
+class BatchDecoder(object):
+    """Decode many frames at once into one NumPy array per signal.
+
+    Frames are grouped by arbitration ID with :meth:`add()` and decoded
+    group by group in one vectorized pass when :meth:`flush()` is called.
+    The result maps every message name to its columns: a ``timestamp``
+    array and one array per signal. Scaled and float signals are
+    ``float64`` arrays; multiplexed signals are ``NaN`` in frames that do
+    not carry them, including frames with an unknown multiplexer id.
+    Choices are not applied, columns always hold numbers.
+
+    Frames with unknown arbitration IDs, container messages, error frames
+    and frames shorter than their message are skipped and counted in
+    :attr:`skipped`.
+
+    NumPy is required.
+
+    """
+
+    def __init__(self, database: 'Database', scaling: bool = True) -> None:
+        _require_numpy()
+        self._database = database
+        self._scaling = scaling
+        self._plans: Dict[int, Optional[_MessagePlan]] = {}
+        self._pending: Dict[int, Tuple[List[float], bytearray]] = {}
+        self.skipped = 0
+
+    def _plan(self, frame_id: int) -> Optional[_MessagePlan]:
+        try:
+            return self._plans[frame_id]
+        except KeyError:
+            pass
+
+        try:
+            message = self._database.get_message_by_frame_id(frame_id)
+        except KeyError:
+            message = None
+
+        if message is None or message.is_container or message.compiled_codec is None:
+            plan = None
+        else:
+            plan = _MessagePlan(message, self._scaling)
+
+        self._plans[frame_id] = plan
+
+        return plan
+
+    def add(self, frame: Any) -> bool:
+        """Queue a frame for decoding. `frame` is any object with
+        ``arbitration_id``, ``data`` and ``timestamp`` attributes, for
+        example a :class:`~jidutest_can.can.RawMessage`. Returns ``False``
+        if the frame is skipped.
+
+        """
+
+        frame_id = frame.arbitration_id
+        plan = self._plan(frame_id)
+        data = frame.data
+
+        if (plan is None
+                or getattr(frame, 'is_error_frame', False)
+                or len(data) < plan.length):
+            self.skipped += 1
+
+            return False
+
+        try:
+            timestamps, payloads = self._pending[frame_id]
+        except KeyError:
+            timestamps, payloads = self._pending[frame_id] = ([], bytearray())
+
+        timestamps.append(frame.timestamp)
+        payloads += data[:plan.length]
+
+        return True
+
+    def flush(self) -> BatchResult:
+        """Decode all queued frames and return their columns.
+
+        """
+
+        result: BatchResult = {}
+        pending, self._pending = self._pending, {}
+
+        for frame_id, (timestamps, payloads) in pending.items():
+            plan = self._plans[frame_id]
+            columns = plan.decode(timestamps, payloads)
+            name = plan.message.name
+
+            if name in result:
+                # several frame ids of the same message, e.g. with a
+                # frame id mask
+                for column, values in columns.items():
+                    result[name][column] = np.concatenate((result[name][column], values))
+            else:
+                result[name] = columns
+
+        return result
+
+    def decode(self, frames: Iterable[Any]) -> BatchResult:
+        """Decode all given frames, see :meth:`add()`.
+
+        """
+
+        for frame in frames:
+            self.add(frame)
+
+        return self.flush()
+
+
+class NpzColumnWriter(object):
+    """Write decoded columns chunk by chunk into a NumPy ``.npz`` file.
+
+    Every :meth:`write()` appends the columns to temporary files, only
+    :meth:`close()` assembles the archive, so memory use is bounded by the
+    size of one chunk. The archive holds one array per column, named
+    ``<message name>/<column name>``, and can be read with
+    :func:`numpy.load`.
+
+    """
+
+    def __init__(self, filename: StringPathLike) -> None:
+        _require_numpy()
+        self._filename = filename
+        self._directory = tempfile.mkdtemp(prefix='jidutest_can_columns_')
+        self._columns: Dict[str, Tuple[str, Any, int]] = {}
+
+    def write(self, result: BatchResult) -> None:
+        for message_name, columns in result.items():
+            for column_name, values in columns.items():
+                key = f'{message_name}/{column_name}'
+
+                try:
+                    path, dtype, size = self._columns[key]
+                except KeyError:
+                    path = os.path.join(self._directory, f'{len(self._columns)}.bin')
+                    dtype = values.dtype
+                    size = 0
+
+                with open(path, 'ab') as fout:
+                    fout.write(np.ascontiguousarray(values, dtype=dtype).tobytes())
+
+                self._columns[key] = (path, dtype, size + len(values))
+
+    def close(self) -> None:
+        try:
+            with zipfile.ZipFile(self._filename, mode='w', allowZip64=True) as archive:
+                for key, (path, dtype, size) in self._columns.items():
+                    with archive.open(f'{key}.npy', mode='w', force_zip64=True) as fout:
+                        np.lib.format.write_array_header_1_0(
+                            fout,
+                            {'descr': np.lib.format.dtype_to_descr(dtype),
+                             'fortran_order': False,
+                             'shape': (size,)})
+
+                        with open(path, 'rb') as fin:
+                            shutil.copyfileobj(fin, fout)
+        finally:
+            shutil.rmtree(self._directory, ignore_errors=True)
+
+    def __enter__(self) -> 'NpzColumnWriter':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
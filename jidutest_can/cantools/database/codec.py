@@ -0,0 +1,330 @@
+# A compiled signal codec.
+
+import struct
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+
+from jidutest_can.cantools.database.signal import NamedSignalValue
+from jidutest_can.cantools.database.signal import Signal
+from jidutest_can.cantools.database.utils import start_bit
+from jidutest_can.cantools.tools.typechecking import Codec
+from jidutest_can.cantools.tools.typechecking import Choices
+from jidutest_can.cantools.tools.typechecking import SignalDictType
+
+
+_FLOAT_FORMATS = {
+    16: struct.Struct('>e'),
+    32: struct.Struct('>f'),
+    64: struct.Struct('>d'),
+}
+
+
+class FieldPlan(NamedTuple):
+    """The precomputed extraction plan of a single signal.
+
+    The payload is seen as two integers: the bytes read as big endian
+    integer for big endian signals and read as little endian integer for
+    little endian signals. In both, the raw value of the signal is
+    ``(payload >> shift) & mask``.
+    """
+
+    name: str
+    is_big_endian: bool
+    shift: int
+    mask: int
+    #: Sign bit of a signed integer signal, ``0`` for unsigned and floats.
+    sign_bit: int
+    #: Struct used to reinterpret the raw bits of a float signal.
+    float_format: Optional[struct.Struct]
+    scale: float
+    offset: float
+    #: ``True`` if ``scale * value + offset`` is known to return `value`.
+    is_identity: bool
+    choices: Optional[Choices]
+    signal: Signal
+
+
+class CompiledNode(object):
+    """The compiled counterpart of a :class:`Codec` tree node.
+
+    """
+
+    __slots__ = ('fields', 'multiplexers', 'padding_mask', 'has_little_endian')
+
+    def __init__(self,
+                 fields: List[FieldPlan],
+                 multiplexers: Dict[str, Tuple[Signal, Dict[int, 'CompiledNode']]],
+                 padding_mask: int) -> None:
+        self.fields = fields
+        self.multiplexers = multiplexers
+        self.padding_mask = padding_mask
+        self.has_little_endian = (
+            any(not field.is_big_endian for field in fields)
+            or any(child.has_little_endian
+                   for _, children in multiplexers.values()
+                   for child in children.values()))
+
+
+class CompiledCodec(object):
+    """Shift, mask and scale tables of all signals of a message, including
+    its multiplexed subtrees.
+
+    Decoding and encoding work on the payload as a Python integer instead
+    of packing and unpacking bitstruct formats per call. The results are
+    identical to :func:`~cantools.database.utils.decode_data` and
+    :func:`~cantools.database.utils.encode_data`. Values the fast path
+    cannot represent (out of range values, unknown choices, ...) raise an
+    exception, the caller is expected to fall back to the generic codec
+    which then reports the error.
+
+    The tables are a snapshot of the signals; call
+    :meth:`Message.refresh()` after modifying a signal.
+
+    """
+
+    def __init__(self, root: CompiledNode, length: int) -> None:
+        self._root = root
+        self._length = length
+
+    @property
+    def root(self) -> CompiledNode:
+        """The compiled root node.
+
+        """
+
+        return self._root
+
+    @property
+    def length(self) -> int:
+        """The payload length in bytes.
+
+        """
+
+        return self._length
+
+    @classmethod
+    def from_codec(cls, codec: Codec, length: int) -> Optional['CompiledCodec']:
+        """Compile given codec tree. Returns ``None`` if any signal cannot
+        be represented, for example a float signal with an unusual
+        length.
+
+        """
+
+        try:
+            root = cls._compile_node(codec, 8 * length)
+        except ValueError:
+            return None
+
+        return cls(root, length)
+
+    @classmethod
+    def _compile_node(cls, codec: Codec, bit_length: int) -> CompiledNode:
+        fields = [cls._compile_field(signal, bit_length)
+                  for signal in codec['signals']]
+        signals = {signal.name: signal for signal in codec['signals']}
+        multiplexers = {
+            name: (signals[name],
+                   {mux: cls._compile_node(child, bit_length)
+                    for mux, child in children.items()})
+            for name, children in codec['multiplexers'].items()
+        }
+
+        return CompiledNode(fields,
+                            multiplexers,
+                            codec['formats'].padding_mask)
+
+    @staticmethod
+    def _compile_field(signal: Signal, bit_length: int) -> FieldPlan:
+        length = signal.length
+
+        if signal.byte_order == 'big_endian':
+            shift = bit_length - start_bit(signal) - length
+            is_big_endian = True
+        else:
+            shift = signal.start
+            is_big_endian = False
+
+        if length <= 0 or shift < 0 or shift + length > bit_length:
+            raise ValueError(f'signal {signal.name} does not fit')
+
+        if signal.is_float:
+            if length not in _FLOAT_FORMATS:
+                raise ValueError(f'unsupported float length {length}')
+
+            float_format = _FLOAT_FORMATS[length]
+            sign_bit = 0
+        else:
+            float_format = None
+            sign_bit = (1 << (length - 1)) if signal.is_signed else 0
+
+        scale = signal.scale
+        offset = signal.offset
+        # Integer identity scaling leaves integers untouched. Floats are
+        # excluded, ``1 * -0.0 + 0`` is ``0.0``.
+        is_identity = (not signal.is_float
+                       and type(scale) is int and scale == 1
+                       and type(offset) is int and offset == 0)
+
+        return FieldPlan(signal.name,
+                         is_big_endian,
+                         shift,
+                         (1 << length) - 1,
+                         sign_bit,
+                         float_format,
+                         scale,
+                         offset,
+                         is_identity,
+                         signal.choices,
+                         signal)
+
+    def decode(self,
+               data: bytes,
+               decode_choices: bool = True,
+               scaling: bool = True) -> SignalDictType:
+        """Decode given payload, which must be exactly :attr:`length`
+        bytes long.
+
+        """
+
+        if len(data) != self._length:
+            raise ValueError(f'expected {self._length} bytes, got {len(data)}')
+
+        big = int.from_bytes(data, 'big')
+
+        if self._root.has_little_endian:
+            little = int.from_bytes(data, 'little')
+        else:
+            little = 0
+
+        decoded: SignalDictType = {}
+        self._decode_node(self._root, big, little, decode_choices, scaling, decoded)
+
+        return decoded
+
+    def decode_int(self,
+                   payload: int,
+                   decode_choices: bool = True,
+                   scaling: bool = True) -> SignalDictType:
+        """Decode the payload given as big endian integer, i.e.
+        ``int.from_bytes(data, 'big')``.
+
+        """
+
+        if self._root.has_little_endian:
+            little = int.from_bytes(payload.to_bytes(self._length, 'big'), 'little')
+        else:
+            little = 0
+
+        decoded: SignalDictType = {}
+        self._decode_node(self._root, payload, little, decode_choices, scaling, decoded)
+
+        return decoded
+
+    def _decode_node(self,
+                     node: CompiledNode,
+                     big: int,
+                     little: int,
+                     decode_choices: bool,
+                     scaling: bool,
+                     decoded: SignalDictType) -> None:
+        # The plans are unpacked instead of accessed by attribute, this
+        # loop runs once per signal of every decoded frame.
+        for (name, is_big_endian, shift, mask, sign_bit, float_format,
+             scale, offset, is_identity, choices, _) in node.fields:
+            value = ((big if is_big_endian else little) >> shift) & mask
+
+            if float_format is not None:
+                value = float_format.unpack(value.to_bytes(float_format.size, 'big'))[0]
+            elif value & sign_bit:
+                value -= mask + 1
+
+            if decode_choices and choices is not None:
+                try:
+                    decoded[name] = choices[value]
+                    continue
+                except (KeyError, TypeError):
+                    pass
+
+            if scaling and not is_identity:
+                decoded[name] = scale * value + offset
+            else:
+                decoded[name] = value
+
+        for name, (signal, children) in node.multiplexers.items():
+            mux = _mux_number(signal, decoded[name])
+            self._decode_node(children[mux],
+                              big,
+                              little,
+                              decode_choices,
+                              scaling,
+                              decoded)
+
+    def encode(self, data: SignalDictType, scaling: bool = True) -> Tuple[int, int]:
+        """Encode given signal values. Returns the payload as big endian
+        integer and the mask of the bits not used by any encoded signal.
+
+        """
+
+        big = 0
+        little = 0
+        padding_mask = -1
+        node = self._root
+
+        nodes = [node]
+
+        while nodes:
+            node = nodes.pop()
+            padding_mask &= node.padding_mask
+
+            for field in node.fields:
+                raw = _encode_field(field, data[field.name], scaling)
+
+                if field.is_big_endian:
+                    big |= raw << field.shift
+                else:
+                    little |= raw << field.shift
+
+            for name, (signal, children) in node.multiplexers.items():
+                nodes.append(children[_mux_number(signal, data[name])])
+
+        if little:
+            big |= int.from_bytes(little.to_bytes(self._length, 'little'), 'big')
+
+        return big, padding_mask
+
+
+def _mux_number(signal: Signal, value) -> int:
+    if isinstance(value, (str, NamedSignalValue)):
+        return signal.choice_string_to_number(str(value))
+
+    return int(value)
+
+
+def _encode_field(field: FieldPlan, value, scaling: bool) -> int:
+    if isinstance(value, (float, int)):
+        if scaling and not (field.offset == 0 and field.scale == 1):
+            value = (value - field.offset) / field.scale
+
+        if field.float_format is not None:
+            return int.from_bytes(field.float_format.pack(float(value)), 'big')
+
+        value = round(value)
+    else:
+        value = field.signal.choice_string_to_number(str(value))
+
+        if field.float_format is not None:
+            return int.from_bytes(field.float_format.pack(float(value)), 'big')
+
+    if field.sign_bit:
+        if not -field.sign_bit <= value < field.sign_bit:
+            raise ValueError(f'{field.name} out of range')
+
+        return value & field.mask
+
+    if not 0 <= value <= field.mask:
+        raise ValueError(f'{field.name} out of range')
+
+    return value
@@ -0,0 +1,207 @@
+# A bounded cache of decoded payloads.
+
+import sys
+import threading
+import types
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Dict
+from typing import Hashable
+from typing import Optional
+from typing import Tuple
+
+from jidutest_can.cantools.tools.typechecking import DecodeResultType
+
+if TYPE_CHECKING:
+    from jidutest_can.cantools.database.message import Message
+
+
+#: Default maximum number of cached payloads.
+DEFAULT_MAXSIZE = 4096
+
+#: Estimated size in bytes of one decoded signal in the cache, see
+#: :class:`DecodeCache`.
+_SIGNAL_SIZE = 100
+
+_Key = Tuple[Hashable, ...]
+
+
+class DecodeCache(object):
+    """A least recently used cache of decoded payloads.
+
+    Cyclic frames usually repeat the same payload for a long time, so
+    the result of decoding a payload is kept and returned again when the
+    same message is decoded from the same bytes with the same options.
+    Only successfully decoded payloads are cached, container messages
+    decoded with `decode_containers` are not cached at all.
+
+    The cache is bounded to `maxsize` payloads and, if given, to an
+    estimated `max_bytes` bytes. The least recently used payloads are
+    evicted first.
+
+    If `copy` is ``True`` every hit returns a new dictionary, which the
+    caller may modify. Otherwise all hits return the same read-only
+    mapping, which saves the copy.
+
+    The cache is thread-safe and can be shared by the messages of
+    several databases, see
+    :meth:`Database.enable_decode_cache()<.Database.enable_decode_cache>`.
+
+    >>> cache = DecodeCache(maxsize=1024)
+    >>> cache.decode(db.get_message_by_name('Foo'), b'\\x01\\x45\\x23\\x00\\x11')
+    {'Bar': 1, 'Fum': 5.0}
+    >>> cache.statistics()['misses']
+    1
+
+    """
+
+    def __init__(self,
+                 maxsize: int = DEFAULT_MAXSIZE,
+                 max_bytes: Optional[int] = None,
+                 copy: bool = True) -> None:
+        if maxsize < 1:
+            raise ValueError(f'The cache size must be positive, not {maxsize}.')
+
+        self._maxsize = maxsize
+        self._max_bytes = max_bytes
+        self._copy = copy
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[_Key, Tuple[types.MappingProxyType, int]]' = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def maxsize(self) -> int:
+        """The maximum number of cached payloads.
+
+        """
+
+        return self._maxsize
+
+    @property
+    def max_bytes(self) -> Optional[int]:
+        """The maximum estimated size of the cache in bytes, or ``None``.
+
+        """
+
+        return self._max_bytes
+
+    @property
+    def copy(self) -> bool:
+        """``True`` if hits return a new dictionary.
+
+        """
+
+        return self._copy
+
+    @property
+    def size(self) -> int:
+        """The estimated size of the cached payloads in bytes.
+
+        """
+
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def decode(self,
+               message: 'Message',
+               data: bytes,
+               decode_choices: bool = True,
+               scaling: bool = True,
+               decode_containers: bool = False,
+               allow_truncated: bool = False
+               ) -> DecodeResultType:
+        """Decode given data as `message`, see
+        :meth:`Message.decode()<.Message.decode>`, returning the cached
+        result if `message` was decoded from the same bytes with the same
+        options before.
+
+        """
+
+        if decode_containers and message.is_container:
+            return message.decode_container(data,
+                                            decode_choices,
+                                            scaling,
+                                            allow_truncated)
+
+        data = bytes(data)
+        key = (message, data, decode_choices, scaling, allow_truncated)
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+
+        if entry is not None:
+            return dict(entry[0]) if self._copy else entry[0]
+
+        decoded = message.decode_simple(data,
+                                        decode_choices,
+                                        scaling,
+                                        allow_truncated)
+        # the decoded dictionary is not shared with the caller
+        signals = types.MappingProxyType(dict(decoded) if self._copy else decoded)
+        size = sys.getsizeof(data) + _SIGNAL_SIZE * (len(decoded) + 1)
+
+        with self._lock:
+            self.misses += 1
+
+            if key not in self._entries:
+                self._entries[key] = (signals, size)
+                self._size += size
+                self._evict()
+
+        return decoded if self._copy else signals
+
+    def _evict(self) -> None:
+        entries = self._entries
+
+        while len(entries) > self._maxsize or (self._max_bytes is not None
+                                               and self._size > self._max_bytes
+                                               and len(entries) > 1):
+            _, (_, size) = entries.popitem(last=False)
+            self._size -= size
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all cached payloads, the statistics are kept.
+
+        """
+
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def statistics(self) -> Dict[str, Any]:
+        """Return the counters of the cache as a dictionary.
+
+        """
+
+        lookups = self.hits + self.misses
+
+        return {
+            'entries': len(self._entries),
+            'size': self._size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+    def __reduce__(self):
+        # the cached payloads and the lock are not pickled
+        return (DecodeCache, (self._maxsize, self._max_bytes, self._copy))
+
+    def __repr__(self) -> str:
+        return (f'DecodeCache(maxsize={self._maxsize}, '
+                f'max_bytes={self._max_bytes}, '
+                f'entries={len(self._entries)}, '
+                f'hits={self.hits}, '
+                f'misses={self.misses})')
@@ -1,11 +1,11 @@
 # A CAN message.
 
 import logging
-from copy import deepcopy
-from typing import List, Optional, Union, Dict, TYPE_CHECKING, Set, Tuple, cast
+from typing import Any, List, Optional, Union, Dict, TYPE_CHECKING, Set, Tuple, cast
 
 from jidutest_can.cantools.database.signal import NamedSignalValue, Signal
 from jidutest_can.cantools.database.signal_group import SignalGroup
+from jidutest_can.cantools.database.codec import CompiledCodec
 from jidutest_can.cantools.database.utils import format_or, start_bit
 from jidutest_can.cantools.database.utils import encode_data, decode_data
 from jidutest_can.cantools.database.utils import create_encode_decode_formats
@@ -23,6 +23,7 @@ from jidutest_can.cantools.tools.typechecking import ContainerUnpackResultType
 from jidutest_can.cantools.tools.typechecking import ContainerUnpackListType
 from jidutest_can.cantools.tools.typechecking import DecodeResultType
 if TYPE_CHECKING:
+    from jidutest_can.cantools.database.decode_cache import DecodeCache
     from jidutest_can.cantools.formats.arxml import AutosarMessageSpecifics
     from jidutest_can.cantools.formats.dbc import DbcSpecifics
 
@@ -43,6 +44,16 @@ class Message(object):
     `sort_signals = lambda signals: list(sorted(signals, key=lambda sig: sig.name))`
     """
 
+    #: Build a :class:`CompiledCodec` in :meth:`refresh()` and use it to
+    #: encode and decode full length payloads. Set to ``False`` (on the
+    #: class or an instance, followed by :meth:`refresh()`) to always use
+    #: the generic bitstruct based codec.
+    use_compiled_codec: bool = True
+
+    # a class attribute, so messages pickled before the cache existed
+    # have it as well
+    _decode_cache: Optional['DecodeCache'] = None
+
     def __init__(self,
                  frame_id: int,
                  name: str,
@@ -119,6 +130,7 @@ class Message(object):
         self._bus_name = bus_name
         self._signal_groups = signal_groups
         self._codecs: Optional[Codec] = None
+        self._compiled_codec: Optional[CompiledCodec] = None
         self._signal_tree: Optional[List[Union[str, List[str]]]] = None
         self._strict = strict
         self._protocol = protocol
@@ -521,6 +533,30 @@ class Message(object):
     def protocol(self, value: Optional[str]) -> None:
         self._protocol = value
 
+    @property
+    def compiled_codec(self) -> Optional[CompiledCodec]:
+        """The compiled codec of the message, or ``None`` if it is disabled
+        or the signal layout cannot be compiled.
+
+        """
+
+        return self._compiled_codec
+
+    @property
+    def decode_cache(self) -> Optional['DecodeCache']:
+        """The :class:`~cantools.database.DecodeCache` used by
+        :meth:`decode()`, or ``None`` if payloads are decoded every
+        time. The cache does not change the decoded values, so it may
+        be set on the messages of a frozen database as well.
+
+        """
+
+        return self._decode_cache
+
+    @decode_cache.setter
+    def decode_cache(self, value: Optional['DecodeCache']) -> None:
+        self._decode_cache = value
+
     @property
     def signal_tree(self):
         """All signal names and multiplexer ids as a tree. Multiplexer signals
@@ -958,9 +994,20 @@ class Message(object):
         if self._codecs is None:
             raise ValueError('Codec is not initialized.')
 
-        encoded, padding_mask, all_signals = self._encode(self._codecs,
-                                                          cast(SignalDictType, data),
-                                                          scaling)
+        encoded = None
+
+        if self._compiled_codec is not None:
+            try:
+                encoded, padding_mask = self._compiled_codec.encode(cast(SignalDictType, data),
+                                                                    scaling)
+            except Exception:
+                # let the generic codec encode the value or report the error
+                encoded = None
+
+        if encoded is None:
+            encoded, padding_mask, _ = self._encode(self._codecs,
+                                                    cast(SignalDictType, data),
+                                                    scaling)
 
         if padding:
             padding_pattern = int.from_bytes([self._unused_bit_pattern] * self._length, "big")
@@ -1103,8 +1150,19 @@ class Message(object):
         ``False``, `DecodeError` will be raised when trying to decode
         incomplete messages.
 
+        If the message has a :attr:`decode_cache`, a payload decoded
+        before with the same options is returned from the cache.
+
         """
 
+        if self._decode_cache is not None:
+            return self._decode_cache.decode(self,
+                                             data,
+                                             decode_choices,
+                                             scaling,
+                                             decode_containers,
+                                             allow_truncated)
+
         if decode_containers and self.is_container:
             return self.decode_container(data,
                                          decode_choices,
@@ -1136,6 +1194,13 @@ class Message(object):
 
         data = data[:self._length]
 
+        if self._compiled_codec is not None and len(data) == self._length:
+            try:
+                return self._compiled_codec.decode(data, decode_choices, scaling)
+            except Exception:
+                # let the generic codec decode the value or report the error
+                pass
+
         return self._decode(self._codecs,
                             data,
                             decode_choices,
@@ -1240,27 +1305,18 @@ class Message(object):
         return bool(self._codecs['multiplexers'])
 
     def _check_signal(self, message_bits, signal):
-        signal_bits = signal.length * [signal.name]
-
+        # Offsets of the signal bits in message_bits, which is ordered
+        # as the bits of the payload read as big endian integer.
         if signal.byte_order == 'big_endian':
-            padding = start_bit(signal) * [None]
-            signal_bits = padding + signal_bits
+            first = max(start_bit(signal), 0)
+            end = first + signal.length
+            offsets = range(first, end)
         else:
-            signal_bits += signal.start * [None]
-
-            if len(signal_bits) < len(message_bits):
-                padding = (len(message_bits) - len(signal_bits)) * [None]
-                reversed_signal_bits = padding + signal_bits
-            else:
-                reversed_signal_bits = signal_bits
-
-            signal_bits = []
-
-            for i in range(0, len(reversed_signal_bits), 8):
-                signal_bits = reversed_signal_bits[i:i + 8] + signal_bits
+            end = signal.start + signal.length
+            offsets = sorted(bit ^ 7 for bit in range(signal.start, end))
 
         # Check that the signal fits in the message.
-        if len(signal_bits) > len(message_bits):
+        if end > len(message_bits):
             raise Error(
                 'The signal {} does not fit in message {}.'.format(
                     signal.name,
@@ -1268,26 +1324,25 @@ class Message(object):
 
         # Check that the signal does not overlap with other
         # signals.
-        for offset, signal_bit in enumerate(signal_bits):
-            if signal_bit is not None:
-                if message_bits[offset] is not None:
-                    raise Error(
-                        'The signals {} and {} are overlapping in message {}.'.format(
-                            signal.name,
-                            message_bits[offset],
-                            self.name))
+        for offset in offsets:
+            if message_bits[offset] is not None:
+                raise Error(
+                    'The signals {} and {} are overlapping in message {}.'.format(
+                        signal.name,
+                        message_bits[offset],
+                        self.name))
 
-                message_bits[offset] = signal.name
+            message_bits[offset] = signal.name
 
     def _check_mux(self, message_bits, mux):
         signal_name, children = list(mux.items())[0]
         self._check_signal(message_bits,
                            self.get_signal_by_name(signal_name))
-        children_message_bits = deepcopy(message_bits)
+        children_message_bits = list(message_bits)
 
         for multiplexer_id in sorted(children):
             child_tree = children[multiplexer_id]
-            child_message_bits = deepcopy(children_message_bits)
+            child_message_bits = list(children_message_bits)
             self._check_signal_tree(child_message_bits, child_tree)
 
             for i, child_bit in enumerate(child_message_bits):
@@ -1312,6 +1367,20 @@ class Message(object):
                         signal.length,
                         self.name))
 
+    def __getstate__(self) -> Dict[str, Any]:
+        # The compiled codec holds struct.Struct objects, which cannot be
+        # pickled. It is compiled again when unpickling.
+        state = self.__dict__.copy()
+        state['_compiled_codec'] = None
+
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+
+        if self.use_compiled_codec and self._codecs is not None:
+            self._compiled_codec = CompiledCodec.from_codec(self._codecs, self._length)
+
     def refresh(self, strict: Optional[bool] = None) -> None:
         """Refresh the internal message state.
 
@@ -1324,6 +1393,10 @@ class Message(object):
 
         self._check_signal_lengths()
         self._codecs = self._create_codec()
+        if self.use_compiled_codec:
+            self._compiled_codec = CompiledCodec.from_codec(self._codecs, self._length)
+        else:
+            self._compiled_codec = None
         self._signal_tree = self._create_signal_tree(self._codecs)
         self._signal_dict = {signal.name: signal for signal in self._signals}
 
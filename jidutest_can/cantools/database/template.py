@@ -0,0 +1,427 @@
+# The payload of a message, patched signal by signal.
+
+import threading
+import weakref
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import Mapping
+from typing import NamedTuple
+from typing import Optional
+from typing import Union
+
+from jidutest_can.cantools.database.codec import CompiledNode
+from jidutest_can.cantools.database.codec import FieldPlan
+from jidutest_can.cantools.database.codec import _encode_field
+from jidutest_can.cantools.database.errors import EncodeError
+from jidutest_can.cantools.database.signal import NamedSignalValue
+from jidutest_can.cantools.database.signal import Signal
+
+if TYPE_CHECKING:
+    from jidutest_can.cantools.database.message import Message
+
+
+class SignalPatch(NamedTuple):
+    """Where a signal is in the payload: the bytes ``start`` up to
+    ``end`` read as integer in ``byteorder`` hold the raw value of the
+    signal at ``(chunk >> shift) & field.mask``.
+
+    """
+
+    field: FieldPlan
+    start: int
+    end: int
+    byteorder: str
+    shift: int
+    #: The bits of the chunk not belonging to the signal.
+    keep: int
+
+    def read(self, data: Union[bytes, bytearray]) -> int:
+        """Return the bits of the signal in `data` as unsigned integer.
+
+        """
+
+        chunk = int.from_bytes(data[self.start:self.end], self.byteorder)
+
+        return (chunk >> self.shift) & self.field.mask
+
+    def write(self, data: bytearray, bits: int) -> None:
+        """Replace the bits of the signal in `data` by `bits`, which must
+        fit into the signal.
+
+        """
+
+        chunk = int.from_bytes(data[self.start:self.end], self.byteorder)
+        chunk = (chunk & self.keep) | (bits << self.shift)
+        data[self.start:self.end] = chunk.to_bytes(self.end - self.start, self.byteorder)
+
+    def read_raw(self, data: Union[bytes, bytearray]) -> Union[int, float]:
+        """Return the raw value of the signal in `data`.
+
+        """
+
+        field = self.field
+        value = self.read(data)
+
+        if field.float_format is not None:
+            return field.float_format.unpack(value.to_bytes(field.float_format.size, 'big'))[0]
+
+        if value & field.sign_bit:
+            value -= field.mask + 1
+
+        return value
+
+    def write_raw(self, data: bytearray, raw: Union[int, float]) -> None:
+        """Set the raw value of the signal in `data`.
+
+        :raises ValueError: If the value does not fit into the signal.
+
+        """
+
+        self.write(data, _encode_field(self.field, raw, False))
+
+
+def _create_patch(field: FieldPlan, length: int) -> SignalPatch:
+    bit_length = field.mask.bit_length()
+
+    if field.is_big_endian:
+        # bit 0 of the big endian integer is the last bit of the last byte
+        end = length - field.shift // 8
+        start = length - (field.shift + bit_length - 1) // 8 - 1
+        shift = field.shift - 8 * (length - end)
+        byteorder = 'big'
+    else:
+        start = field.shift // 8
+        end = (field.shift + bit_length - 1) // 8 + 1
+        shift = field.shift - 8 * start
+        byteorder = 'little'
+
+    chunk_mask = (1 << (8 * (end - start))) - 1
+
+    return SignalPatch(field,
+                       start,
+                       end,
+                       byteorder,
+                       shift,
+                       chunk_mask & ~(field.mask << shift))
+
+
+class MessageLayout(object):
+    """The :class:`SignalPatch` of every signal of a message, including
+    the multiplexed ones, and its initial payload. Use :meth:`of()` to
+    get the shared layout of a message.
+
+    """
+
+    _layouts: 'weakref.WeakKeyDictionary[Message, MessageLayout]' = weakref.WeakKeyDictionary()
+    _layouts_lock = threading.Lock()
+
+    def __init__(self, message: 'Message') -> None:
+        if message.is_container:
+            raise ValueError(f'Message "{message.name}" is a container.')
+
+        self._message = message
+        self._codec = message.compiled_codec
+        self._patches: Optional[Dict[str, SignalPatch]] = None
+
+        if self._codec is not None:
+            self._patches = {}
+            self._add_patches(self._codec.root, self._codec.length)
+
+        self.initial = self._create_initial()
+
+    @classmethod
+    def of(cls, message: 'Message') -> 'MessageLayout':
+        """Return the layout of given message, created once per message
+        and recreated after :meth:`Message.refresh()<.Message.refresh>`.
+
+        """
+
+        layout = cls._layouts.get(message)
+
+        if layout is None or layout._codec is not message.compiled_codec:
+            with cls._layouts_lock:
+                layout = cls(message)
+                cls._layouts[message] = layout
+
+        return layout
+
+    @property
+    def message(self) -> 'Message':
+        return self._message
+
+    @property
+    def patches(self) -> Optional[Dict[str, SignalPatch]]:
+        """The patches by signal name, ``None`` if the message has no
+        compiled codec and payloads are encoded as a whole.
+
+        """
+
+        return self._patches
+
+    def _add_patches(self, node: CompiledNode, length: int) -> None:
+        for field in node.fields:
+            self._patches[field.name] = _create_patch(field, length)
+
+        for _, children in node.multiplexers.values():
+            for child in children.values():
+                self._add_patches(child, length)
+
+    def _create_initial(self) -> bytes:
+        data = bytearray(self._message.length)
+
+        if self._codec is not None:
+            self._write_initial(self._codec.root, data)
+
+        return bytes(data)
+
+    def _write_initial(self, node: CompiledNode, data: bytearray) -> None:
+        # Only the signals of the branches selected by the initial values
+        # of the multiplexers, the other branches overlap them.
+        for field in node.fields:
+            initial = field.signal.initial
+
+            if not initial:
+                continue
+
+            if not isinstance(initial, int):
+                initial = float(initial)
+
+            try:
+                self._patches[field.name].write_raw(data, initial)
+            except ValueError:
+                # an initial value out of range is left as zero
+                pass
+
+        for name, (_, children) in node.multiplexers.items():
+            child = children.get(self._patches[name].read_raw(data))
+
+            if child is not None:
+                self._write_initial(child, data)
+
+def _check_value(signal: Signal, value: Any, scaling: bool, message_name: str) -> None:
+    # the checks of Message.encode(strict=True) for a single signal
+    if isinstance(value, (str, NamedSignalValue)):
+        try:
+            number = signal.choice_string_to_number(str(value))
+        except KeyError:
+            number = None
+
+        if number is None:
+            raise EncodeError(f'Invalid value specified for signal '
+                              f'"{signal.name}": "{value}"')
+
+        return
+
+    if signal.minimum is not None:
+        minimum = signal.minimum
+
+        if not scaling:
+            minimum = (signal.minimum - signal.offset) / signal.scale
+
+        if value < minimum - signal.scale * 1e-6:
+            raise EncodeError(
+                f'Expected signal "{signal.name}" value greater than '
+                f'or equal to {minimum} in message "{message_name}", '
+                f'but got {value}.')
+
+    if signal.maximum is not None:
+        maximum = signal.maximum
+
+        if not scaling:
+            maximum = (signal.maximum - signal.offset) / signal.scale
+
+        if value > maximum + signal.scale * 1e-6:
+            raise EncodeError(
+                f'Expected signal "{signal.name}" value less than or '
+                f'equal to {maximum} in message "{message_name}", '
+                f'but got {value}.')
+
+
+class MessageTemplate(object):
+    """The current payload of a message, updated signal by signal.
+
+    Setting a signal only rewrites the bytes it occupies, using the
+    precomputed :class:`SignalPatch` of the signal, instead of encoding
+    all signals of the message. Updating `k` signals of a message thus
+    costs `O(k)`, independent of the number of signals of the message.
+
+    The payload starts as `data`, by default the initial values of all
+    signals. If `strict` is ``True`` set values must be within the
+    ranges of their signals, as for
+    :meth:`Message.encode()<.Message.encode>`.
+
+    Messages without compiled codec, see
+    :attr:`Message.compiled_codec<.Message.compiled_codec>`, are decoded
+    and encoded as a whole on every update instead.
+
+    >>> template = MessageTemplate(db.get_message_by_name('Foo'))
+    >>> template.update({'Bar': 1, 'Fum': 5.0})
+    >>> template.data
+    b'\\x01\\x45\\x23\\x00\\x11'
+    >>> template['Bar'] = 2
+
+    """
+
+    def __init__(self,
+                 message: 'Message',
+                 data: Optional[Union[bytes, bytearray]] = None,
+                 strict: bool = True) -> None:
+        self._layout = MessageLayout.of(message)
+        self._message = message
+        self._strict = strict
+        self._lock = threading.Lock()
+
+        if data is None:
+            data = self._layout.initial
+        elif len(data) != message.length:
+            raise ValueError(f'Expected {message.length} bytes for message '
+                             f'"{message.name}", got {len(data)}.')
+
+        self._data = bytearray(data)
+
+    @property
+    def message(self) -> 'Message':
+        return self._message
+
+    @property
+    def data(self) -> bytes:
+        """The current payload.
+
+        """
+
+        with self._lock:
+            return bytes(self._data)
+
+    @data.setter
+    def data(self, value: Union[bytes, bytearray]) -> None:
+        if len(value) != self._message.length:
+            raise ValueError(f'Expected {self._message.length} bytes for message '
+                             f'"{self._message.name}", got {len(value)}.')
+
+        with self._lock:
+            self._data[:] = value
+
+    def __bytes__(self) -> bytes:
+        return self.data
+
+    def update(self,
+               signals: Mapping[str, Any],
+               scaling: bool = True) -> None:
+        """Set given signals, all other signals keep their values.
+
+        If `scaling` is ``False`` the values are raw values. Choices may
+        be given as strings in both cases.
+
+        :raises KeyError: If a signal is not in the message.
+        :raises EncodeError: If a value cannot be encoded.
+
+        """
+
+        patches = self._layout.patches
+
+        if patches is None:
+            self._update_all(signals, scaling)
+
+            return
+
+        raws = []
+
+        for name, value in signals.items():
+            patch = patches[name]
+
+            if self._strict:
+                _check_value(patch.field.signal, value, scaling, self._message.name)
+
+            try:
+                raws.append((patch, _encode_field(patch.field, value, scaling)))
+            except (ValueError, TypeError, KeyError) as e:
+                raise EncodeError(f'Unable to encode the value {value!r} of signal '
+                                  f'"{name}" in message "{self._message.name}": {e}') from None
+
+        # all values are encoded before the payload is touched, so a
+        # failing update leaves it unchanged
+        with self._lock:
+            for patch, raw in raws:
+                patch.write(self._data, raw)
+
+    def _update_all(self, signals: Mapping[str, Any], scaling: bool) -> None:
+        with self._lock:
+            decoded = self._message.decode(bytes(self._data),
+                                           decode_choices=False,
+                                           scaling=scaling)
+
+            for name in signals:
+                if name not in decoded:
+                    raise KeyError(name)
+
+            decoded.update(signals)
+            self._data[:] = self._message.encode(decoded,
+                                                 scaling=scaling,
+                                                 strict=self._strict)
+
+    def __setitem__(self, name: str, value: Any) -> None:
+        self.update({name: value})
+
+    def set_raw(self, name: str, raw: Union[int, float]) -> None:
+        """Set the raw value of given signal.
+
+        """
+
+        self.update({name: raw}, scaling=False)
+
+    def get_raw(self, name: str) -> Union[int, float]:
+        """Return the raw value of given signal.
+
+        :raises KeyError: If the signal is not in the message.
+
+        """
+
+        patches = self._layout.patches
+
+        if patches is None:
+            return self._message.decode(self.data,
+                                        decode_choices=False,
+                                        scaling=False)[name]
+
+        patch = patches[name]
+
+        with self._lock:
+            return patch.read_raw(self._data)
+
+    def __getitem__(self, name: str) -> Any:
+        """Return the scaled value of given signal, without choices.
+
+        """
+
+        raw = self.get_raw(name)
+        signal = self._message.get_signal_by_name(name)
+
+        if signal.scale == 1 and signal.offset == 0:
+            return raw
+
+        return signal.scale * raw + signal.offset
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(signal.name for signal in self._message.signals)
+
+    def decode(self,
+               decode_choices: bool = True,
+               scaling: bool = True) -> Dict[str, Any]:
+        """Decode the current payload, see
+        :meth:`Message.decode()<.Message.decode>`.
+
+        """
+
+        return self._message.decode(self.data, decode_choices, scaling)
+
+    def copy(self) -> 'MessageTemplate':
+        """Return an independent template with the same payload.
+
+        """
+
+        return MessageTemplate(self._message, self.data, self._strict)
+
+    def __repr__(self) -> str:
+        return f"MessageTemplate('{self._message.name}', {self.data.hex()})"
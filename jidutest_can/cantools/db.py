@@ -1,5 +1,7 @@
 import logging
+from typing import Any
 from typing import Dict
+from typing import Iterable
 from typing import List
 from typing import Optional
 from typing import TextIO
@@ -8,13 +10,19 @@ from typing import Union
 from jidutest_can.cantools.compat import fopen
 from jidutest_can.cantools.database import BusConfig
 from jidutest_can.cantools.database import DecodeError
+from jidutest_can.cantools.database import Error
 from jidutest_can.cantools.database import Message
 from jidutest_can.cantools.database import Node
 from jidutest_can.cantools.database import Signal
 from jidutest_can.cantools.database import SORT_SIGNALS_DEFAULT
 from jidutest_can.cantools.database import sort_signals_by_start_bit
 from jidutest_can.cantools.database import type_sort_signals
+from jidutest_can.cantools.database.batch import BatchDecoder
+from jidutest_can.cantools.database.batch import BatchResult
+from jidutest_can.cantools.database.decode_cache import DEFAULT_MAXSIZE
+from jidutest_can.cantools.database.decode_cache import DecodeCache
 from jidutest_can.cantools.formats import AutosarDatabaseSpecifics
+from jidutest_can.cantools.formats import arxml_load
 from jidutest_can.cantools.formats import arxml_load_string
 from jidutest_can.cantools.formats import dbc_dump_string
 from jidutest_can.cantools.formats import dbc_load_string
@@ -66,6 +74,9 @@ class Database(object):
         self._buses = buses or []
         self._name_to_message: Dict[str, Message] = {}
         self._frame_id_to_message: Dict[int, Message] = {}
+        self._name_to_signal: Dict[str, Signal] = {}
+        self._signal_to_message: Dict[Signal, Message] = {}
+        self._casefold_name_to_signals: Dict[str, List[Signal]] = {}
         self._version = version
         self._dbc = dbc_specifics
         self._autosar = autosar_specifics
@@ -76,6 +87,7 @@ class Database(object):
         self._frame_id_mask = frame_id_mask
         self._strict = strict
         self._sort_signals = sort_signals
+        self._frozen = False
         self.refresh()
 
     @property
@@ -92,10 +104,11 @@ class Database(object):
 
     @property
     def signals(self) -> List[Signal]:
-        _signals = set()
-        for message in self.messages:
-            _signals.update(message.signals)
-        return _signals
+        """A set of all signals of all messages in the database.
+
+        """
+
+        return set(self._signal_to_message)
 
     @property
     def nodes(self) -> List[Node]:
@@ -113,6 +126,15 @@ class Database(object):
 
         return self._buses
 
+    @property
+    def frame_id_mask(self) -> int:
+        """The mask applied to frame ids before they are looked up by
+        :meth:`.get_message_by_frame_id()`.
+
+        """
+
+        return self._frame_id_mask
+
     @property
     def version(self) -> Optional[str]:
         """The database version, or ``None`` if unavailable.
@@ -123,6 +145,7 @@ class Database(object):
 
     @version.setter
     def version(self, value: Optional[str]) -> None:
+        self._check_not_frozen()
         self._version = value
 
     @property
@@ -135,6 +158,7 @@ class Database(object):
 
     @dbc.setter
     def dbc(self, value: Optional[DbcSpecifics]) -> None:
+        self._check_not_frozen()
         self._dbc = value
 
     @property
@@ -147,28 +171,45 @@ class Database(object):
 
     @autosar.setter
     def autosar(self, value: Optional[AutosarDatabaseSpecifics]) -> None:
+        self._check_not_frozen()
         self._autosar = value
 
-    def add_arxml(self, fp: TextIO) -> None:
+    def add_arxml(self, fp: TextIO, low_memory: bool = False) -> None:
         """Read and parse ARXML data from given file-like object and add the
         parsed data to the database.
 
+        If `low_memory` is ``True``, the data is parsed incrementally and
+        the elements which are not needed for CAN, e.g. software
+        components, are dropped while parsing. This lowers the peak memory
+        of large system descriptions at the cost of a slower parse.
+
         """
 
-        self.add_arxml_string(fp.read())
+        if not low_memory:
+            self.add_arxml_string(fp.read())
+
+            return
+
+        self._check_not_frozen()
+        self._add_arxml_database(arxml_load(fp,
+                                            self._strict,
+                                            sort_signals=self._sort_signals,
+                                            low_memory=True))
 
     def add_arxml_file(self,
                        filename: StringPathLike,
-                       encoding: str = 'utf-8') -> None:
+                       encoding: str = 'utf-8',
+                       low_memory: bool = False) -> None:
         """Open, read and parse ARXML data from given file and add the parsed
         data to the database.
 
-        `encoding` specifies the file encoding.
+        `encoding` specifies the file encoding. See :meth:`add_arxml()`
+        for `low_memory`.
 
         """
 
         with fopen(filename, 'r', encoding=encoding) as fin:
-            self.add_arxml(fin)
+            self.add_arxml(fin, low_memory)
 
     def add_arxml_string(self, string: str) -> None:
         """Parse given ARXML data string and add the parsed data to the
@@ -176,8 +217,12 @@ class Database(object):
 
         """
 
-        database = arxml_load_string(string, self._strict, sort_signals=self._sort_signals)
+        self._check_not_frozen()
+        self._add_arxml_database(arxml_load_string(string,
+                                                   self._strict,
+                                                   sort_signals=self._sort_signals))
 
+    def _add_arxml_database(self, database: InternalDatabase) -> None:
         self._messages += database.messages
         self._nodes = database.nodes
         self._buses = database.buses
@@ -224,6 +269,7 @@ class Database(object):
 
         """
 
+        self._check_not_frozen()
         database = dbc_load_string(string, self._strict, sort_signals=self._sort_signals)
 
         self._messages += database.messages
@@ -260,6 +306,7 @@ class Database(object):
 
         """
 
+        self._check_not_frozen()
         database = kcd_load_string(string, self._strict, sort_signals=self._sort_signals)
 
         self._messages += database.messages
@@ -296,6 +343,7 @@ class Database(object):
 
         """
 
+        self._check_not_frozen()
         database = sym_load_string(string, self._strict, sort_signals=self._sort_signals)
 
         self._messages += database.messages
@@ -329,6 +377,17 @@ class Database(object):
         self._name_to_message[message.name] = message
         self._frame_id_to_message[masked_frame_id] = message
 
+        if self.decode_cache is not None:
+            message.decode_cache = self.decode_cache
+
+        for signal in message.signals:
+            self._signal_to_message[signal] = message
+            # the first message defining a signal name wins, duplicated
+            # names in later messages are still reachable by object
+            self._name_to_signal.setdefault(signal.name, signal)
+            self._casefold_name_to_signals.setdefault(
+                signal.name.casefold(), []).append(signal)
+
     def as_dbc_string(self, *, sort_signals: type_sort_signals = SORT_SIGNALS_DEFAULT) -> str:
         """Return the database as a string formatted as a DBC file.
 
@@ -392,13 +451,18 @@ class Database(object):
         return self._frame_id_to_message[frame_id & self._frame_id_mask]
 
     def get_message_by_signal(self, sgn: Union[str, Signal]) -> Message:
+        """Find the message object containing given signal `sgn`, given
+        either as signal name or as signal object.
+
+        """
+
         if isinstance(sgn, str):
             sgn = self.get_signal_by_name(sgn)
-        for message in self.messages:
-            if sgn in message.signals:
-                return message
 
-        raise KeyError(sgn)
+        try:
+            return self._signal_to_message[sgn]
+        except KeyError:
+            raise KeyError(sgn) from None
 
     def get_node_by_name(self, name: str) -> Node:
         """Find the node object for given name `name`.
@@ -429,10 +493,14 @@ class Database(object):
         raise KeyError(name)
 
     def get_signal_by_name(self, name: str) -> Signal:
-        for signal in self.signals:
-            if name == signal.name:
-                return signal
-            elif name.lower() == signal.name.lower():
+        """Find the signal object for given name `name`.
+
+        """
+
+        try:
+            return self._name_to_signal[name]
+        except KeyError:
+            for signal in self._casefold_name_to_signals.get(name.casefold(), []):
                 logger.warning(f"The expected signal name:{name} differs in case "
                                f"from the signal name:{signal.name} in the database {self.version}")
 
@@ -530,6 +598,80 @@ class Database(object):
                               scaling,
                               allow_truncated=allow_truncated)
 
+    def decode_batch(self,
+                     frames: Iterable[Any],
+                     scaling: bool = True) -> BatchResult:
+        """Decode many frames at once into NumPy columns. Returns a
+        dictionary mapping message names to dictionaries of a
+        ``timestamp`` array and one array per signal.
+
+        `frames` is an iterable of objects with ``arbitration_id``,
+        ``data`` and ``timestamp`` attributes, for example the messages
+        of a :class:`~jidutest_can.can.LogReader`. Frames are grouped by
+        arbitration ID and each group is decoded in one vectorized pass.
+        Choices are not applied. See
+        :class:`~jidutest_can.cantools.database.batch.BatchDecoder` for
+        the details and for decoding chunk by chunk.
+
+        This method requires NumPy.
+
+        >>> columns = db.decode_batch(LogReader('trace.blf'))
+        >>> columns['Foo']['Bar']
+        array([1, 1, 2])
+
+        """
+
+        return BatchDecoder(self, scaling).decode(frames)
+
+    @property
+    def decode_cache(self) -> Optional[DecodeCache]:
+        """The decode cache of the messages, or ``None``, see
+        :meth:`enable_decode_cache()`.
+
+        """
+
+        return getattr(self, '_decode_cache', None)
+
+    def enable_decode_cache(self,
+                            maxsize: int = DEFAULT_MAXSIZE,
+                            max_bytes: Optional[int] = None,
+                            copy: bool = True) -> DecodeCache:
+        """Cache the decoded payloads of all messages in a new
+        :class:`~cantools.database.DecodeCache` and return it. Decoding
+        a payload seen before, by :meth:`decode_message()` or
+        :meth:`Message.decode()<.Message.decode>`, then returns the
+        cached result. See the cache for the arguments.
+
+        The cache does not change the decoded values, so it may be
+        enabled on a frozen database as well, where it is shared by all
+        users of the database.
+
+        >>> cache = db.enable_decode_cache(maxsize=10000)
+        >>> db.decode_message('Foo', b'\x01\x45\x23\x00\x11')
+        {'Bar': 1, 'Fum': 5.0}
+        >>> cache.statistics()['hits']
+        0
+
+        """
+
+        cache = DecodeCache(maxsize, max_bytes, copy)
+        self._set_decode_cache(cache)
+
+        return cache
+
+    def disable_decode_cache(self) -> None:
+        """Decode all payloads again, dropping the decode cache.
+
+        """
+
+        self._set_decode_cache(None)
+
+    def _set_decode_cache(self, cache: Optional[DecodeCache]) -> None:
+        self._decode_cache = cache
+
+        for message in self._messages:
+            message.decode_cache = cache
+
     def refresh(self) -> None:
         """Refresh the internal database state.
 
@@ -539,13 +681,42 @@ class Database(object):
 
         """
 
+        self._check_not_frozen()
         self._name_to_message = {}
         self._frame_id_to_message = {}
+        self._name_to_signal = {}
+        self._signal_to_message = {}
+        self._casefold_name_to_signals = {}
 
         for message in self._messages:
             message.refresh(self._strict)
             self._add_message(message)
 
+    @property
+    def is_frozen(self) -> bool:
+        """``True`` if the database is read-only, see :meth:`freeze()`.
+
+        """
+
+        return getattr(self, '_frozen', False)
+
+    def freeze(self) -> None:
+        """Make the database read-only. Adding data, setting properties
+        and :meth:`refresh()` raise an :class:`Error` afterwards.
+
+        Frozen databases are shared, for example by
+        :func:`~cantools.database.load_shared()`. Messages and signals
+        are not copied, they must not be modified either.
+
+        """
+
+        self._frozen = True
+
+    def _check_not_frozen(self) -> None:
+        if self.is_frozen:
+            raise Error('The database is frozen and shared, load a private '
+                        'copy with load_file() to modify it.')
+
     def __repr__(self) -> str:
         lines = ["version('{}')".format(self._version), '']
 
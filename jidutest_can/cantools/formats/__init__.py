@@ -1,4 +1,5 @@
 from jidutest_can.cantools.formats.arxml import AutosarDatabaseSpecifics
+from jidutest_can.cantools.formats.arxml import load as arxml_load
 from jidutest_can.cantools.formats.arxml import load_string as arxml_load_string
 
 from jidutest_can.cantools.formats.dbc_specifics import DbcSpecifics
@@ -1,3 +1,4 @@
+import io
 import re
 from typing import Any
 from xml.etree import ElementTree
@@ -12,6 +13,7 @@ from jidutest_can.cantools.formats.arxml.message_specifics import AutosarMessage
 from jidutest_can.cantools.formats.arxml.node_specifics import AutosarNodeSpecifics
 from jidutest_can.cantools.formats.arxml.secoc_properties import AutosarSecOCProperties
 from jidutest_can.cantools.formats.arxml.system_loader import SystemLoader
+from jidutest_can.cantools.formats.arxml.utils import iterparse_arxml
 
 
 def is_ecu_extract(root: Any # For whatever reason, mypy does not
@@ -38,15 +40,9 @@ def is_ecu_extract(root: Any # For whatever reason, mypy does not
     return ecuc_value_collection is not None
 
 
-def load_string(string:str,
-                strict:bool=True,
-                sort_signals:type_sort_signals=sort_signals_by_start_bit):
-    """Parse given ARXML format string.
-
-    """
-
-    root = ElementTree.fromstring(string)
-
+def _load_root(root: Any,
+               strict: bool,
+               sort_signals: type_sort_signals):
     m = re.match(r'{(.*)}AUTOSAR', root.tag)
     if not m:
         raise ValueError(f"No XML namespace specified or illegal root tag name '{root.tag}'")
@@ -71,3 +67,43 @@ def load_string(string:str,
         return EcuExtractLoader(root, strict, sort_signals).load()
     else:
         return SystemLoader(root, strict, sort_signals).load()
+
+
+def load_string(string:str,
+                strict:bool=True,
+                sort_signals:type_sort_signals=sort_signals_by_start_bit,
+                low_memory:bool=False):
+    """Parse given ARXML format string.
+
+    See :func:`load()` for `low_memory`.
+
+    """
+
+    if low_memory:
+        root = iterparse_arxml(io.StringIO(string))
+    else:
+        root = ElementTree.fromstring(string)
+
+    return _load_root(root, strict, sort_signals)
+
+
+def load(fp:Any,
+         strict:bool=True,
+         sort_signals:type_sort_signals=sort_signals_by_start_bit,
+         low_memory:bool=False):
+    """Parse ARXML data from given file-like object.
+
+    If `low_memory` is ``True``, the file is parsed incrementally and
+    the elements which are not needed to load CAN messages, e.g.
+    software components, are dropped while parsing. This lowers the
+    peak memory of large system descriptions at the cost of a slower
+    parse.
+
+    """
+
+    if low_memory:
+        root = iterparse_arxml(fp)
+    else:
+        root = ElementTree.fromstring(fp.read())
+
+    return _load_root(root, strict, sort_signals)
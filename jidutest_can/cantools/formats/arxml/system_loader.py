@@ -99,6 +99,15 @@ class SystemLoader(object):
             raise ValueError('This class only supports AUTOSAR '
                              'versions 3 and 4')
 
+        # tag name -> children dictionaries of the XML elements visited so
+        # far, see _get_child_map()
+        self._child_maps = {}
+
+        # PDU path -> messages featuring the PDU, see
+        # __get_messages_of_pdu()
+        self._pdu_messages = None
+        self._pdu_messages_of = None
+
         self._create_arxml_reference_dicts()
 
     def autosar_version_newer(self, major, minor=None, patch=None):
@@ -315,22 +324,46 @@ class SystemLoader(object):
 
             self._load_senders_and_receivers(sub_package_list, messages)
 
-    # given a list of Message objects and an reference to a PDU by its absolute ARXML path,
-    # return the subset of messages of the list which feature the specified PDU.
-    def __get_messages_of_pdu(self, msg_list, pdu_path):
-        pdu_messages = \
-            [ x for x in msg_list if pdu_path in x.autosar.pdu_paths ]
+    def __index_messages_by_pdu(self, msg_list):
+        """Create the PDU path -> messages dictionary of a list of messages
+
+        The messages of the list come first, followed by the messages
+        featured by its container frames.
+        """
+
+        messages = {}
+        contained_messages = {}
+
+        for message in msg_list:
+            for pdu_path in dict.fromkeys(message.autosar.pdu_paths):
+                messages.setdefault(pdu_path, []).append(message)
 
         # add all messages featured by container frames
         for message in msg_list:
             if message.contained_messages is None:
                 continue
 
-            pdu_messages.extend(
-                [
-                    x for x in message.contained_messages
-                          if pdu_path in x.autosar.pdu_paths
-                 ])
+            for contained_message in message.contained_messages:
+                for pdu_path in \
+                        dict.fromkeys(contained_message.autosar.pdu_paths):
+                    contained_messages.setdefault(pdu_path, []) \
+                                      .append(contained_message)
+
+        for pdu_path, pdu_messages in contained_messages.items():
+            messages.setdefault(pdu_path, []).extend(pdu_messages)
+
+        self._pdu_messages = messages
+        self._pdu_messages_of = msg_list
+
+    # given a list of Message objects and an reference to a PDU by its absolute ARXML path,
+    # return the subset of messages of the list which feature the specified PDU.
+    def __get_messages_of_pdu(self, msg_list, pdu_path):
+        # the list of messages is indexed once instead of searching
+        # it for every PDU of every ECU
+        if msg_list is not self._pdu_messages_of:
+            self.__index_messages_by_pdu(msg_list)
+
+        pdu_messages = list(self._pdu_messages.get(pdu_path, []))
 
         if len(pdu_messages) < 1:
             # hm: the data set seems to be inconsistent
@@ -2072,6 +2105,12 @@ class SystemLoader(object):
         # given a package name, produce a refbase label to ARXML path dictionary
         self._package_refbase_paths = {}
 
+        # the fully qualified tag names are used directly because
+        # ElementTree resolves them without going through XPath
+        short_name_tag = f'{{{self.xml_namespace}}}SHORT-NAME'
+        package_tag = f'{{{self.xml_namespace}}}AR-PACKAGE'
+        refbase_tag = f'{{{self.xml_namespace}}}REFERENCE-BASE'
+
         def add_sub_references(elem, elem_path, cur_package_path=""):
             """Recursively add all ARXML references contained within an XML
             element to the dictionaries to handle ARXML references"""
@@ -2079,7 +2118,7 @@ class SystemLoader(object):
             # check if a short name has been attached to the current
             # element. If yes update the ARXML path for this element
             # and its children
-            short_name = elem.find(f'ns:SHORT-NAME', self._xml_namespaces)
+            short_name = elem.find(short_name_tag)
 
             if short_name is not None:
                 short_name = short_name.text
@@ -2096,11 +2135,11 @@ class SystemLoader(object):
 
             # if the current element is a package, update the ARXML
             # package path
-            if elem.tag == f'{{{self.xml_namespace}}}AR-PACKAGE':
+            if elem.tag == package_tag:
                 cur_package_path = f'{cur_package_path}/{short_name}'
 
             # handle reference bases (for relative references)
-            if elem.tag == f'{{{self.xml_namespace}}}REFERENCE-BASE':
+            if elem.tag == refbase_tag:
                 refbase_name = elem.find('./ns:SHORT-LABEL',
                                          self._xml_namespaces).text.strip()
                 refbase_path = elem.find('./ns:PACKAGE-REF',
@@ -2149,6 +2188,42 @@ class SystemLoader(object):
         self._arxml_path_to_node = {}
         add_sub_references(self._root, '')
 
+    def _get_child_map(self, elem):
+        """Return the children of an XML element by their tag name
+
+        The tag names do not include the XML namespace. A child called
+        '{child_tag_name}-REF' is listed under its own tag name and
+        under '{child_tag_name}', so the children of both kinds can be
+        looked up at once in document order. The dictionary is created
+        on the first request and then reused, i.e., looking up the
+        children of an element with many children is constant-time.
+        """
+
+        child_map = self._child_maps.get(elem)
+
+        if child_map is not None:
+            return child_map
+
+        child_map = {}
+        ns_prefix = f'{{{self.xml_namespace}}}'
+        ns_prefix_len = len(ns_prefix)
+
+        for child_elem in elem:
+            tag = child_elem.tag
+
+            if not isinstance(tag, str) or not tag.startswith(ns_prefix):
+                continue
+
+            tag = tag[ns_prefix_len:]
+            child_map.setdefault(tag, []).append(child_elem)
+
+            if tag.endswith('-REF'):
+                child_map.setdefault(tag[:-4], []).append(child_elem)
+
+        self._child_maps[elem] = child_map
+
+        return child_map
+
     def _get_arxml_children(self, base_elems, children_location):
         """Locate a set of ElementTree child nodes at a given location.
 
@@ -2219,16 +2294,19 @@ class SystemLoader(object):
             # traverse the specified path one level deeper
             result = []
 
+            ctt = f'{{{self.xml_namespace}}}{child_tag_name}'
+
             for base_elem in base_elems:
                 local_result = []
 
-                for child_elem in base_elem:
-                    ctt = f'{{{self.xml_namespace}}}{child_tag_name}'
-                    cttr = f'{{{self.xml_namespace}}}{child_tag_name}-REF'
+                # the children called either '{child_tag_name}' or
+                # '{child_tag_name}-REF'
+                for child_elem in \
+                        self._get_child_map(base_elem).get(child_tag_name, []):
 
                     if child_elem.tag == ctt:
                         local_result.append(child_elem)
-                    elif child_elem.tag == cttr:
+                    else:
                         tmp = self._follow_arxml_reference(
                             base_elem=base_elem,
                             arxml_path=child_elem.text,
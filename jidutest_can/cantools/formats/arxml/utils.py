@@ -1,6 +1,61 @@
 # utility functions that are helpful when dealing with ARXML files
 from xml.etree import ElementTree
-from typing import Union, List
+from typing import Any, Dict, Optional, Set, Union, List
+
+
+# the XML elements which are not required to load a CAN database,
+# given as the tag names of their parents and themselves without XML
+# namespace. 'None' matches any parent. these elements are dropped
+# by iterparse_arxml()
+PRUNED_ELEMENTS: Dict[Optional[str], Set[str]] = {
+    'ELEMENTS': {
+        # software components and their interfaces
+        'APPLICATION-SW-COMPONENT-TYPE',
+        'COMPLEX-DEVICE-DRIVER-SW-COMPONENT-TYPE',
+        'COMPOSITION-SW-COMPONENT-TYPE',
+        'ECU-ABSTRACTION-SW-COMPONENT-TYPE',
+        'NV-BLOCK-SW-COMPONENT-TYPE',
+        'PARAMETER-SW-COMPONENT-TYPE',
+        'SENSOR-ACTUATOR-SW-COMPONENT-TYPE',
+        'SERVICE-PROXY-SW-COMPONENT-TYPE',
+        'SERVICE-SW-COMPONENT-TYPE',
+        'SWC-IMPLEMENTATION',
+        'CLIENT-SERVER-INTERFACE',
+        'MODE-SWITCH-INTERFACE',
+        'NV-DATA-INTERFACE',
+        'PARAMETER-INTERFACE',
+        'SENDER-RECEIVER-INTERFACE',
+        'TRIGGER-INTERFACE',
+        'MODE-DECLARATION-GROUP',
+        'PORT-INTERFACE-MAPPING-SET',
+
+        # application and implementation data types
+        'APPLICATION-ARRAY-DATA-TYPE',
+        'APPLICATION-PRIMITIVE-DATA-TYPE',
+        'APPLICATION-RECORD-DATA-TYPE',
+        'DATA-TYPE-MAPPING-SET',
+        'IMPLEMENTATION-DATA-TYPE',
+
+        # the other bus systems
+        'ETHERNET-CLUSTER',
+        'FLEXRAY-CLUSTER',
+        'LIN-CLUSTER',
+        'FLEXRAY-FRAME',
+        'LIN-EVENT-TRIGGERED-FRAME',
+        'LIN-SPORADIC-FRAME',
+        'LIN-UNCONDITIONAL-FRAME',
+        'SOMEIP-SERVICE-INTERFACE-DEPLOYMENT',
+    },
+    'SYSTEM': {
+        'FIBEX-ELEMENTS',
+        'MAPPINGS',
+        'ROOT-SOFTWARE-COMPOSITIONS',
+    },
+    None: {
+        'ADMIN-DATA',
+        'INTRODUCTION',
+    },
+}
 
 
 def parse_number_string(in_string : str, allow_float : bool=False) \
@@ -44,3 +99,65 @@ def parse_number_string(in_string : str, allow_float : bool=False) \
         return int(in_string, 8)
 
     return int(in_string, 0) # autodetect the base
+
+
+def iterparse_arxml(source: Any) -> ElementTree.Element:
+    """Parse an ARXML file incrementally and return its root element
+
+    In contrast to ElementTree.parse(), the elements listed by
+    PRUNED_ELEMENTS are discarded as soon as they have been parsed
+    and the whitespace between the elements is not stored. For large
+    system descriptions, this means that the complete document never
+    needs to be kept in memory. `source` is a file name or a file
+    object.
+    """
+
+    pruned_any = PRUNED_ELEMENTS[None]
+    parents: List[ElementTree.Element] = []
+    pruned_parents = set()
+    pruned = set()
+    root = None
+
+    for event, elem in ElementTree.iterparse(source, events=('start', 'end')):
+        if event == 'start':
+            parents.append(elem)
+            continue
+
+        parents.pop()
+
+        # remove the (empty) elements pruned from the children of the
+        # current element. this cannot be done when they are pruned
+        # because the parser may already have appended further
+        # children to the element
+        if elem in pruned_parents:
+            pruned_parents.remove(elem)
+            children = []
+
+            for child in elem:
+                if child in pruned:
+                    pruned.remove(child)
+                else:
+                    children.append(child)
+
+            elem[:] = children
+
+        if elem.tail is not None and elem.tail.isspace():
+            elem.tail = None
+
+        if len(elem) > 0 and elem.text is not None and elem.text.isspace():
+            elem.text = None
+
+        if not parents:
+            root = elem
+            continue
+
+        parent = parents[-1]
+        tag = elem.tag.rpartition('}')[2]
+
+        if tag in pruned_any \
+           or tag in PRUNED_ELEMENTS.get(parent.tag.rpartition('}')[2], ()):
+            elem.clear()
+            pruned.add(elem)
+            pruned_parents.add(parent)
+
+    return root
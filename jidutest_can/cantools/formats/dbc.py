@@ -129,6 +129,45 @@ ATTRIBUTE_DEFINITION_LONG_SIGNAL_NAME = AttributeDefinition(
     type_name='STRING')
 
 
+KEYWORDS = set([
+    'BA_',
+    'BA_DEF_',
+    'BA_DEF_DEF_',
+    'BA_DEF_DEF_REL_',
+    'BA_DEF_REL_',
+    'BA_DEF_SGTYPE_',
+    'BA_REL_',
+    'BA_SGTYPE_',
+    'BO_',
+    'BO_TX_BU_',
+    'BS_',
+    'BU_',
+    'BU_BO_REL_',
+    'BU_EV_REL_',
+    'BU_SG_REL_',
+    'CAT_',
+    'CAT_DEF_',
+    'CM_',
+    'ENVVAR_DATA_',
+    'EV_',
+    'EV_DATA_',
+    'FILTER',
+    'NS_',
+    'NS_DESC_',
+    'SG_',
+    'SG_MUL_VAL_',
+    'SGTYPE_',
+    'SGTYPE_VAL_',
+    'SIG_GROUP_',
+    'SIG_TYPE_REF_',
+    'SIG_VALTYPE_',
+    'SIGTYPE_VALTYPE_',
+    'VAL_',
+    'VAL_TABLE_',
+    'VERSION'
+])
+
+
 def to_int(value):
     return int(Decimal(value))
 
@@ -136,44 +175,6 @@ def to_int(value):
 class Parser(_Parser):
 
     def tokenize(self, string):
-        keywords = set([
-            'BA_',
-            'BA_DEF_',
-            'BA_DEF_DEF_',
-            'BA_DEF_DEF_REL_',
-            'BA_DEF_REL_',
-            'BA_DEF_SGTYPE_',
-            'BA_REL_',
-            'BA_SGTYPE_',
-            'BO_',
-            'BO_TX_BU_',
-            'BS_',
-            'BU_',
-            'BU_BO_REL_',
-            'BU_EV_REL_',
-            'BU_SG_REL_',
-            'CAT_',
-            'CAT_DEF_',
-            'CM_',
-            'ENVVAR_DATA_',
-            'EV_',
-            'EV_DATA_',
-            'FILTER',
-            'NS_',
-            'NS_DESC_',
-            'SG_',
-            'SG_MUL_VAL_',
-            'SGTYPE_',
-            'SGTYPE_VAL_',
-            'SIG_GROUP_',
-            'SIG_TYPE_REF_',
-            'SIG_VALTYPE_',
-            'SIGTYPE_VALTYPE_',
-            'VAL_',
-            'VAL_TABLE_',
-            'VERSION'
-        ])
-
         names = {
             'LPAREN': '(',
             'RPAREN': ')',
@@ -218,7 +219,7 @@ class Parser(_Parser):
             elif kind != 'MISMATCH':
                 value = mo.group(kind)
 
-                if value in keywords:
+                if value in KEYWORDS:
                     kind = value
 
                 if kind in names:
@@ -355,6 +356,316 @@ class Parser(_Parser):
                 version))
 
 
+class FastParser(object):
+    """A single pass parser of the common DBC statements.
+
+    Every statement is matched by one precompiled regular expression
+    instead of tokenizing the whole file and running the generic
+    grammar. The result has the same layout as the result of
+    :class:`Parser`, so both share the loaders below.
+
+    :meth:`parse()` returns ``None`` for constructs it does not handle,
+    e.g. environment variables, relation attributes, extended
+    multiplexing or syntax errors. The caller falls back to
+    :class:`Parser` which then parses the whole file or reports the
+    error.
+
+    """
+
+    _S = r'[ \t\r\n]*'
+    _SKIP = re.compile(r'(?:[ \t\r\n]+|//[^\n]*(?:\n|$))*')
+    _KEYWORD = re.compile(r'[A-Za-z0-9_]+')
+
+    def __init__(self):
+        s = self._S
+        number = r'[-+]?\d+\.?\d*(?:[eE][+-]?\d+)?(?![\d.])'
+        word = r'[A-Za-z_][A-Za-z0-9_]*(?![A-Za-z0-9_])'
+        string = r'"(?:\\"|[^"])*?"'
+        not_keyword = '(?!(?:{})(?![A-Za-z0-9_]))'.format(
+            '|'.join(sorted(KEYWORDS, key=len, reverse=True)))
+
+        def kw(keyword):
+            return keyword + '(?![A-Za-z0-9_])'
+
+        def compile_(*parts):
+            return re.compile(s.join(parts))
+
+        n = '({})'.format(number)
+        w = '({})'.format(word)
+        t = '({})'.format(string)
+        self._number_re = re.compile(number)
+        self._word_re = re.compile(word)
+        self._string_re = re.compile(string)
+        self._pair_re = compile_(n, t)
+        self._statements = {
+            'VERSION': (compile_(kw('VERSION'), t), self._version),
+            'NS_': (compile_(kw('NS_'), ':', r'((?:{}{}(?!{}:))*)'.format(s, word, s)),
+                    self._ignored),
+            'BS_': (compile_(kw('BS_'), ':'), self._ignored),
+            'BU_': (compile_(kw('BU_'), ':', r'((?:{}{}{})*)'.format(s, not_keyword, word)),
+                    self._nodes),
+            # messages and their signals are handled in parse()
+            'BO_': (compile_(kw('BO_'), n, w, ':', n, w), None),
+            'CM_': (compile_(kw('CM_'),
+                             r'(?:({}){}{}|({}){}{}|({}){}{}|({}){}{}|{})'.format(
+                                 kw('SG_'), s, s.join((n, w, t)),
+                                 kw('BO_'), s, s.join((n, t)),
+                                 kw('EV_'), s, s.join((w, t)),
+                                 kw('BU_'), s, s.join((w, t)),
+                                 t),
+                             ';'),
+                    self._comment),
+            'BA_DEF_': (compile_(kw('BA_DEF_'),
+                                 r'(?:({}|{}|{}|{}){})?'.format(
+                                     kw('SG_'), kw('BO_'), kw('EV_'), kw('BU_'), s),
+                                 t,
+                                 w,
+                                 r'({0}(?:{1},{1}{0})*|(?:{2}(?:{1}{2})*)?)'.format(
+                                     string, s, number),
+                                 ';'),
+                        self._attribute_definition),
+            'BA_DEF_DEF_': (compile_(kw('BA_DEF_DEF_'), t, '(?:{}|{})'.format(n, t), ';'),
+                            self._attribute_definition_default),
+            'BA_': (compile_(kw('BA_'),
+                             t,
+                             r'(?:(?:({}){}{}|({}){}{}|({}){}{}|({}){}{}){})?'.format(
+                                 kw('BO_'), s, n,
+                                 kw('SG_'), s, s.join((n, w)),
+                                 kw('BU_'), s, w,
+                                 kw('EV_'), s, w,
+                                 s),
+                             '(?:{}|{})'.format(n, t),
+                             ';'),
+                    self._attribute),
+            'VAL_': (compile_(kw('VAL_'),
+                              '(?:{}{})?'.format(n, s),
+                              w,
+                              r'((?:{0}{1}{0}{2})*)'.format(s, number, string),
+                              ';'),
+                     self._choice),
+            'VAL_TABLE_': (compile_(kw('VAL_TABLE_'),
+                                    w,
+                                    r'((?:{0}{1}{0}{2})*)'.format(s, number, string),
+                                    ';'),
+                           self._value_table),
+            'SIG_VALTYPE_': (compile_(kw('SIG_VALTYPE_'), n, w, ':', n, ';'),
+                             self._signal_type),
+            'SIG_GROUP_': (compile_(kw('SIG_GROUP_'), n, w, n, ':',
+                                    r'((?:{}{})*)'.format(s, word),
+                                    ';'),
+                           self._signal_group),
+            'BO_TX_BU_': (compile_(kw('BO_TX_BU_'), n, ':',
+                                   r'({0}(?:{1},{1}{0})*)'.format(word, s),
+                                   ';'),
+                          self._message_add_sender)
+        }
+        self._signal_re = compile_(kw('SG_'),
+                                   w,
+                                   '(?:{})?'.format(w),
+                                   ':',
+                                   n, r'\|', n, '@', n, '([+-])',
+                                   r'\(', n, ',', n, r'\)',
+                                   r'\[', n, r'\|', n, r'\]',
+                                   t,
+                                   r'({0}(?:{1},{1}{0})*)'.format(word, s))
+
+    @staticmethod
+    def _unquote(value):
+        return value[1:-1].replace('\\"', '"')
+
+    def _strings(self, value):
+        return [self._unquote(item) for item in self._string_re.findall(value)]
+
+    def _pairs(self, value):
+        return [[number, self._unquote(text)]
+                for number, text in self._pair_re.findall(value)]
+
+    def parse(self, string):
+        """Parse given string. Returns a dictionary of statements with the
+        layout of :class:`Parser`, or ``None`` if the string contains a
+        construct not handled by this parser.
+
+        """
+
+        tokens = defaultdict(list)
+        skip = self._SKIP.match
+        keyword_match = self._KEYWORD.match
+        statements = self._statements
+        pos = skip(string).end()
+        length = len(string)
+
+        while pos < length:
+            mo = keyword_match(string, pos)
+
+            if mo is None:
+                return None
+
+            try:
+                regex, load = statements[mo.group()]
+            except KeyError:
+                return None
+
+            mo = regex.match(string, pos)
+
+            if mo is None:
+                return None
+
+            pos = skip(string, mo.end()).end()
+
+            if load is None:
+                pos = self._message(string, mo, pos, tokens)
+            else:
+                load(mo, tokens)
+
+        if not tokens:
+            return None
+
+        return dict(tokens)
+
+    def _ignored(self, mo, tokens):
+        pass
+
+    def _version(self, mo, tokens):
+        tokens['VERSION'].append(['VERSION', self._unquote(mo.group(1))])
+
+    def _nodes(self, mo, tokens):
+        tokens['BU_'].append(['BU_', ':', self._word_re.findall(mo.group(1))])
+
+    def _message(self, string, mo, pos, tokens):
+        frame_id, name, length, sender = mo.groups()
+        signals = []
+        signal_match = self._signal_re.match
+        skip = self._SKIP.match
+
+        while True:
+            signal_mo = signal_match(string, pos)
+
+            if signal_mo is None:
+                break
+
+            (signal_name, mux, start, length_, byte_order, sign, scale, offset,
+             minimum, maximum, unit, receivers) = signal_mo.groups()
+            signals.append([
+                'SG_',
+                [signal_name] if mux is None else [signal_name, mux],
+                ':',
+                start, '|', length_, '@', byte_order, sign,
+                '(', scale, ',', offset, ')',
+                '[', minimum, '|', maximum, ']',
+                self._unquote(unit),
+                self._word_re.findall(receivers)
+            ])
+            pos = skip(string, signal_mo.end()).end()
+
+        tokens['BO_'].append(['BO_', frame_id, name, ':', length, sender, signals])
+
+        return pos
+
+    def _comment(self, mo, tokens):
+        (sg, sg_frame_id, sg_name, sg_text,
+         bo, bo_frame_id, bo_text,
+         ev, ev_name, ev_text,
+         bu, bu_name, bu_text,
+         text) = mo.groups()
+
+        if sg is not None:
+            item = ['SG_', sg_frame_id, sg_name, self._unquote(sg_text)]
+        elif bo is not None:
+            item = ['BO_', bo_frame_id, self._unquote(bo_text)]
+        elif ev is not None:
+            item = ['EV_', ev_name, self._unquote(ev_text)]
+        elif bu is not None:
+            item = ['BU_', bu_name, self._unquote(bu_text)]
+        else:
+            item = self._unquote(text)
+
+        tokens['CM_'].append(['CM_', item, ';'])
+
+    def _attribute_definition(self, mo, tokens):
+        kind, name, type_name, values = mo.groups()
+
+        if values.startswith('"'):
+            values = self._strings(values)
+        else:
+            values = self._number_re.findall(values)
+
+        tokens['BA_DEF_'].append(['BA_DEF_',
+                                  [] if kind is None else [kind],
+                                  self._unquote(name),
+                                  type_name,
+                                  [values],
+                                  ';'])
+
+    def _attribute_definition_default(self, mo, tokens):
+        name, number, text = mo.groups()
+        tokens['BA_DEF_DEF_'].append(['BA_DEF_DEF_',
+                                      self._unquote(name),
+                                      number if text is None else self._unquote(text),
+                                      ';'])
+
+    def _attribute(self, mo, tokens):
+        (name,
+         bo, bo_frame_id,
+         sg, sg_frame_id, sg_name,
+         bu, bu_name,
+         ev, ev_name,
+         number, text) = mo.groups()
+
+        if bo is not None:
+            items = [['BO_', bo_frame_id]]
+        elif sg is not None:
+            items = [['SG_', sg_frame_id, sg_name]]
+        elif bu is not None:
+            items = [['BU_', bu_name]]
+        elif ev is not None:
+            items = [['EV_', ev_name]]
+        else:
+            items = []
+
+        tokens['BA_'].append(['BA_',
+                              self._unquote(name),
+                              items,
+                              number if text is None else self._unquote(text),
+                              ';'])
+
+    def _choice(self, mo, tokens):
+        frame_id, name, pairs = mo.groups()
+        tokens['VAL_'].append(['VAL_',
+                               [] if frame_id is None else [frame_id],
+                               name,
+                               self._pairs(pairs),
+                               ';'])
+
+    def _value_table(self, mo, tokens):
+        name, pairs = mo.groups()
+        tokens['VAL_TABLE_'].append(['VAL_TABLE_', name, self._pairs(pairs), ';'])
+
+    def _signal_type(self, mo, tokens):
+        frame_id, name, signal_type = mo.groups()
+        tokens['SIG_VALTYPE_'].append(['SIG_VALTYPE_', frame_id, name, ':', signal_type, ';'])
+
+    def _signal_group(self, mo, tokens):
+        frame_id, name, repetitions, signal_names = mo.groups()
+        tokens['SIG_GROUP_'].append(['SIG_GROUP_',
+                                     frame_id,
+                                     name,
+                                     repetitions,
+                                     ':',
+                                     self._word_re.findall(signal_names),
+                                     ';'])
+
+    def _message_add_sender(self, mo, tokens):
+        frame_id, senders = mo.groups()
+        tokens['BO_TX_BU_'].append(['BO_TX_BU_',
+                                    frame_id,
+                                    ':',
+                                    self._word_re.findall(senders),
+                                    ';'])
+
+
+_FAST_PARSER = FastParser()
+
+
 class DbcSpecifics(object):
 
     def __init__(self,
@@ -482,8 +793,14 @@ def get_dbc_frame_id(message):
 
 
 def _get_node_name(attributes, name):
+    # called for every sender and receiver, most nodes have no long name
+    node_attributes = attributes.get('node', {}).get(name)
+
+    if not node_attributes:
+        return name
+
     try:
-        return attributes['node'][name]['SystemNodeLongSymbol'].value
+        return node_attributes['SystemNodeLongSymbol'].value
     except (KeyError, TypeError):
         return name
 
@@ -1353,15 +1670,18 @@ def _load_signals(tokens,
     except KeyError:
         pass
 
+    # looked up once, the helpers below are called several times per signal
+    try:
+        signal_attributes = attributes[frame_id_dbc]['signal']
+    except KeyError:
+        signal_attributes = {}
+
     def get_attributes(frame_id_dbc, signal):
         """Get attributes for given signal.
 
         """
 
-        try:
-            return attributes[frame_id_dbc]['signal'][signal]
-        except KeyError:
-            return None
+        return signal_attributes.get(signal)
 
     def get_comment(frame_id_dbc, signal):
         """Get comment for given signal.
@@ -2047,12 +2367,20 @@ def get_definitions_rel_dict(definitions, defaults):
 
 
 def load_string(string: str, strict: bool = True,
-                sort_signals: type_sort_signals = sort_signals_by_start_bit) -> InternalDatabase:
+                sort_signals: type_sort_signals = sort_signals_by_start_bit,
+                fast: bool = True) -> InternalDatabase:
     """Parse given string.
 
+    The common statements are parsed by :class:`FastParser`, the generic
+    grammar of :class:`Parser` is used if `fast` is ``False`` or the
+    string contains anything else.
+
     """
 
-    tokens = Parser().parse(string)
+    tokens = _FAST_PARSER.parse(string) if fast else None
+
+    if tokens is None:
+        tokens = Parser().parse(string)
 
     comments = _load_comments(tokens)
     definitions = _load_attribute_definitions(tokens)
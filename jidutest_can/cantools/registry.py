@@ -0,0 +1,335 @@
+# A process-wide registry of shared, read-only databases.
+
+import logging
+import os
+import threading
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import diskcache
+
+from jidutest_can.cantools.database import sort_signals_by_start_bit
+from jidutest_can.cantools.database import type_sort_signals
+from jidutest_can.cantools.db import Database
+from jidutest_can.cantools.loader import _resolve_database_format_and_encoding
+from jidutest_can.cantools.loader import load_file
+from jidutest_can.cantools.tools import StringPathLike
+from jidutest_can.package import __version__
+
+
+LOGGER = logging.getLogger(__name__)
+
+#: Environment variable overriding the default cache directory. An
+#: empty value disables the persistent cache.
+CACHE_DIR_ENVIRONMENT_VARIABLE = 'JIDUTEST_CAN_CACHE_DIR'
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'),
+                                 '.cache',
+                                 'jidutest_can',
+                                 'databases')
+
+#: Default upper bound of the persistent cache in bytes, the least
+#: recently used databases are evicted when exceeded.
+DEFAULT_CACHE_SIZE_LIMIT = 512 * 1024 * 1024
+
+#: Bumped when the pickled layout of the database classes changes.
+_CACHE_FORMAT = 2
+
+_Key = Tuple[Any, ...]
+
+
+def _sort_signals_name(sort_signals: type_sort_signals) -> Optional[str]:
+    """Return a name identifying given sort function across processes, or
+    ``None`` if there is none, e.g. for a lambda.
+
+    """
+
+    if sort_signals is None:
+        return 'None'
+
+    module = getattr(sort_signals, '__module__', None)
+    qualname = getattr(sort_signals, '__qualname__', None)
+
+    if module is None or qualname is None or '<' in qualname:
+        return None
+
+    return f'{module}.{qualname}'
+
+
+class DatabaseRegistry(object):
+    """Load every database file once and share it.
+
+    :meth:`load_file()` returns the same frozen
+    :class:`Database<.Database>` for the same file and load options, so
+    many controllers on the same file parse it once. A file is identified
+    by its path, modification time and size; a modified file is parsed
+    again and replaces the stale entry.
+
+    Parsed databases are additionally pickled into a persistent cache in
+    `cache_dir`, bounded to `size_limit` bytes. Loading is serialized per
+    file, within the process by a lock and across processes by a lock in
+    the cache, so concurrently starting test workers parse a file once
+    and read it from the cache afterwards. Give `cache_dir` as ``None`` to
+    disable the persistent cache.
+
+    """
+
+    def __init__(self,
+                 cache_dir: Optional[str] = None,
+                 size_limit: int = DEFAULT_CACHE_SIZE_LIMIT,
+                 lock_expire: float = 600.0) -> None:
+        self._cache_dir = cache_dir
+        self._size_limit = size_limit
+        self._lock_expire = lock_expire
+        self._cache: Optional[diskcache.Cache] = None
+        self._lock = threading.Lock()
+        self._key_locks: Dict[_Key, threading.Lock] = {}
+        self._databases: Dict[_Key, Database] = {}
+        self.hits = 0
+        self.cache_hits = 0
+        self.misses = 0
+
+    @property
+    def cache_dir(self) -> Optional[str]:
+        """The directory of the persistent cache, or ``None``.
+
+        """
+
+        return self._cache_dir
+
+    def load_file(self,
+                  filename: StringPathLike,
+                  database_format: Optional[str] = None,
+                  encoding: Optional[str] = None,
+                  frame_id_mask: Optional[int] = None,
+                  prune_choices: bool = False,
+                  strict: bool = True,
+                  sort_signals: type_sort_signals = sort_signals_by_start_bit,
+                  ) -> Database:
+        """Return the shared database of given file, see
+        :func:`~cantools.database.load_file()` for the arguments.
+
+        The returned database is frozen, see
+        :meth:`Database.freeze()<.Database.freeze>`. Use
+        :func:`~cantools.database.load_file()` to get a private copy to
+        modify.
+
+        """
+
+        database_format, encoding = _resolve_database_format_and_encoding(
+            database_format,
+            encoding,
+            filename)
+        path = os.path.realpath(filename)
+        stat = os.stat(path)
+        options = (database_format,
+                   encoding,
+                   frame_id_mask,
+                   prune_choices,
+                   strict,
+                   sort_signals)
+        key = (path, stat.st_mtime_ns, stat.st_size) + options
+
+        try:
+            database = self._databases[key]
+        except KeyError:
+            pass
+        else:
+            self.hits += 1
+
+            return database
+
+        with self._key_lock(key):
+            database = self._databases.get(key)
+
+            if database is not None:
+                self.hits += 1
+
+                return database
+
+            database = self._load(key)
+            database.freeze()
+
+            with self._lock:
+                # drop databases of previous versions of the file
+                for stale_key in [stale_key for stale_key in self._databases
+                                  if stale_key[0] == path and stale_key[3:] == options]:
+                    del self._databases[stale_key]
+
+                self._databases[key] = database
+
+        return database
+
+    def warm_up(self,
+                filenames: Iterable[StringPathLike],
+                **kwargs: Any) -> List[Database]:
+        """Load given files ahead of time, for example before creating the
+        controllers of a test bench. `kwargs` are passed to
+        :meth:`load_file()`.
+
+        """
+
+        return [self.load_file(filename, **kwargs) for filename in filenames]
+
+    def clear(self, persistent: bool = False) -> None:
+        """Forget all shared databases. The persistent cache is cleared as
+        well if `persistent` is ``True``.
+
+        """
+
+        with self._lock:
+            self._databases.clear()
+            self._key_locks.clear()
+
+        if persistent and self._disk_cache() is not None:
+            self._cache.clear()
+
+    def close(self) -> None:
+        """Close the persistent cache. It is reopened on demand.
+
+        """
+
+        with self._lock:
+            if self._cache is not None:
+                self._cache.close()
+                self._cache = None
+
+    def statistics(self) -> Dict[str, int]:
+        """Return the counters of the registry as a dictionary.
+
+        """
+
+        return {
+            'databases': len(self._databases),
+            'hits': self.hits,
+            'cache_hits': self.cache_hits,
+            'misses': self.misses,
+        }
+
+    def _key_lock(self, key: _Key) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _disk_cache(self) -> Optional[diskcache.Cache]:
+        if self._cache_dir is None:
+            return None
+
+        with self._lock:
+            if self._cache is None:
+                try:
+                    self._cache = diskcache.Cache(
+                        self._cache_dir,
+                        size_limit=self._size_limit,
+                        eviction_policy='least-recently-used')
+                except Exception as e:
+                    LOGGER.warning('Disabling the database cache in "%s": %s',
+                                   self._cache_dir,
+                                   e)
+                    self._cache_dir = None
+
+            return self._cache
+
+    def _parse(self, key: _Key) -> Database:
+        self.misses += 1
+        (path, _, _, database_format, encoding, frame_id_mask, prune_choices,
+         strict, sort_signals) = key
+
+        return load_file(path,
+                         database_format,
+                         encoding,
+                         frame_id_mask,
+                         prune_choices,
+                         strict,
+                         sort_signals=sort_signals)
+
+    def _load(self, key: _Key) -> Database:
+        cache = self._disk_cache()
+        sort_signals_name = _sort_signals_name(key[-1])
+
+        if cache is None or sort_signals_name is None:
+            return self._parse(key)
+
+        cache_key = repr(key[:-1] + (sort_signals_name, __version__, _CACHE_FORMAT))
+
+        try:
+            lock = diskcache.Lock(cache,
+                                  f'lock:{cache_key}',
+                                  expire=self._lock_expire)
+            lock.acquire()
+        except Exception as e:
+            LOGGER.warning('Unable to lock the database cache: %s', e)
+
+            return self._parse(key)
+
+        try:
+            try:
+                database = cache.get(cache_key)
+            except Exception as e:
+                # e.g. a pickle of an incompatible version
+                LOGGER.warning('Ignoring the cached database of "%s": %s',
+                               key[0],
+                               e)
+                database = None
+
+            if isinstance(database, Database):
+                self.cache_hits += 1
+
+                return database
+
+            database = self._parse(key)
+
+            try:
+                cache.set(cache_key, database)
+            except Exception as e:
+                LOGGER.warning('Unable to cache the database of "%s": %s',
+                               key[0],
+                               e)
+
+            return database
+        finally:
+            try:
+                lock.release()
+            except Exception:
+                pass
+
+
+_registry: Optional[DatabaseRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> DatabaseRegistry:
+    """Return the process-wide registry used by :func:`load_shared()`.
+
+    Its persistent cache is in :data:`DEFAULT_CACHE_DIR`, or in the
+    directory given by the environment variable
+    ``JIDUTEST_CAN_CACHE_DIR``. Set the variable to an empty string to
+    disable the persistent cache.
+
+    """
+
+    global _registry
+
+    with _registry_lock:
+        if _registry is None:
+            cache_dir = os.environ.get(CACHE_DIR_ENVIRONMENT_VARIABLE,
+                                       DEFAULT_CACHE_DIR)
+            _registry = DatabaseRegistry(cache_dir or None)
+
+        return _registry
+
+
+def load_shared(filename: StringPathLike, **kwargs: Any) -> Database:
+    """Return the shared, frozen database of given file from the
+    process-wide registry, see :meth:`DatabaseRegistry.load_file()`.
+
+    >>> db = cantools.database.load_shared('foo.dbc')
+    >>> db is cantools.database.load_shared('foo.dbc')
+    True
+
+    """
+
+    return get_registry().load_file(filename, **kwargs)
@@ -1,6 +1,7 @@
 import logging
 import sys
 import argparse
+from jidutest_can.cantools.benchmark import benchmark_load
 from jidutest_can.script.__main__ import MainParser
 from jidutest_can.script.tools import set_log
 from jidutest_can.script.tools import convert_frame_id_or_name
@@ -37,3 +38,21 @@ def show_db(args: argparse.Namespace) -> None:
             print_db_signal(db_object, msg_sgn)
         else:
             logger.warning(rgb_red(f"Database {args.db_path} hasn't the signal {msg_sgn} \n"))
+
+
+@MainParser.RegisterSubparser("bench-db", [
+    {"arg_name": "db_path", "type": str, "help": "Database file path"},
+    {"arg_name": "--parsers", "type": str, "help": "Parsers to compare, default all parsers of the format",
+     "nargs": "*"},
+    {"arg_name": "--repeat", "type": int, "help": "Number of loads per parser", "default": 3},
+    {"arg_name": "--debug", "type": int, "help": "Enable or disable debug level", "default": 0, "choices": [0, 1]},
+],
+    "compare load time and peak memory of the database parsers")
+def bench_db(args: argparse.Namespace) -> None:
+    set_log(args.debug)
+    results = benchmark_load(args.db_path, repeat=args.repeat, parsers=args.parsers or None)
+    sys.stdout.write(f"{'parser':<12}{'messages':>10}{'time/s':>10}{'peak/MiB':>12}{'rss/MiB':>10}\n")
+    for result in results:
+        peak_rss = "-" if result.peak_rss is None else f"{result.peak_rss / 2 ** 20:.1f}"
+        sys.stdout.write(f"{result.parser:<12}{result.messages:>10}{result.seconds:>10.3f}"
+                         f"{result.peak_memory / 2 ** 20:>12.1f}{peak_rss:>10}\n")
@@ -0,0 +1,68 @@
+import sys
+import time
+import signal
+import logging
+import argparse
+from jidutest_can.script.__main__ import MainParser
+from jidutest_can.can import E2EMonitor
+from jidutest_can.can import Notifier
+from jidutest_can.can import PCANFD_500000_2000000
+from jidutest_can.script.tools import set_log
+from jidutest_can.script.tools import rgb_red
+from jidutest_can.script.tools import create_bus
+from jidutest_can.script.tools import get_db_by_file
+
+
+logger = logging.getLogger(__name__)
+
+
+@MainParser.RegisterSubparser("e2e-mon", [
+    {"arg_name": "interface", "type": str, "help": "CAN device vendor id, eg: pcan", "choices": ["pcan", "tosun", "smartvci"]},
+    {"arg_name": "channel", "type": int, "help": "CAN device channel, eg: 1"},
+    {"arg_name": "db_path", "type": str, "help": "CAN database file path, eg: XXX.dbc"},
+    {"arg_name": "--fd", "type": int, "help": "CAN channel type, 0: CAN, 1: CANFD", "default": 0, "choices": [0, 1]},
+    {"arg_name": "--bitrate", "type": int, "help": "CAN bitrate, unit: kbps", "default": 500},
+    {"arg_name": "--timeout-factor", "type": float, "help": "Timeout of a message in multiples of its cycle time",
+     "default": 2.0},
+    {"arg_name": "--interval", "type": int, "help": "Print the summary every interval, unit: s, 0: only at the end",
+     "default": 0},
+    {"arg_name": "--duration", "type": int, "help": "Stop monitoring until duration, unit: s", "default": None},
+    {"arg_name": "--debug", "type": int, "help": "Enable or disable debug level", "default": 0, "choices": [0, 1]},
+],
+    "Check the checksum and counter of E2E protected messages")
+def e2e_monitor(args: argparse.Namespace) -> None:
+    set_log(args.debug)
+    db_object = get_db_by_file(args.db_path)
+    monitor = E2EMonitor(db_object, timeout_factor=args.timeout_factor)
+    if not monitor.frame_ids:
+        sys.exit(rgb_red(f"Database {args.db_path} has no E2E protected message \n"))
+
+    bus_params = dict()
+    if args.fd:
+        bus_params.update({"fd": True})
+        bus_params.update(PCANFD_500000_2000000)
+    else:
+        bus_params.update({"bitrate": args.bitrate * 1000})
+    bus = create_bus(interface=args.interface, channel=args.channel, **bus_params)
+    notifier = Notifier(bus, [monitor])
+
+    def stop_monitoring() -> None:
+        notifier.stop()
+        bus.shutdown()
+        sys.stdout.write(f"{monitor.summary()}\n")
+
+    def interrupt(signum, frame) -> None:
+        stop_monitoring()
+        logger.warning(f"Receive signal 'Ctrl + C', end the application\n")
+        sys.exit(1)
+
+    signal.signal(signal.SIGINT, interrupt)
+
+    start_time = time.time()
+    last_summary = start_time
+    while args.duration is None or time.time() - start_time < args.duration:
+        time.sleep(0.1)
+        if args.interval and time.time() - last_summary >= args.interval:
+            last_summary = time.time()
+            sys.stdout.write(f"{monitor.summary()}\n\n")
+    stop_monitoring()
@@ -95,6 +95,8 @@ def start_logging(args: argparse.Namespace) -> None:
     {"arg_name": "filename", "type": str, "help": "The name/path of file to log data."},
     {"arg_name": "--fd", "type": int, "help": "CAN channel type, 0: CAN, 1: CANFD", "default": 0, "choices": [0, 1]},
     {"arg_name": "--bitrate", "type": int, "help": "CAN bitrate, unit: kbps", "default": 500},
+    {"arg_name": "--speed", "type": float, "help": "Replay speed relative to the recording, eg: 2.0", "default": 1.0},
+    {"arg_name": "--loops", "type": int, "help": "Number of replays, 0: until 'Ctrl + C'", "default": 1},
     {"arg_name": "--debug", "type": int, "help": "Enable or disable debug level", "default": 0, "choices": [0, 1]},
 ], "Replay CAN messages from a file")
 def replay_data(args: argparse.Namespace) -> None:
@@ -107,19 +109,18 @@ def replay_data(args: argparse.Namespace) -> None:
         bus_params.update({"bitrate": args.bitrate * 1000})
     bus = create_bus(interface=args.interface, channel=args.channel, **bus_params)
     manager = CanLogManager(bus)
-    manager.replay_data(args.filename)
-
-    def stop_replaying(signum, frame) -> None:
-        logger.warning(f"Receive signal 'Ctrl + C', end the application\n")
-        sys.exit(1)
-
-    signal.signal(signal.SIGINT, stop_replaying)
+    # 'Ctrl + C' stops the replay, the report is printed nevertheless
+    report = manager.replay_data(args.filename, speed=args.speed, loops=args.loops)
+    sys.stdout.write(f"{report.summary()}\n")
+    bus.shutdown()
 
 
 @MainParser.RegisterSubparser("log-convert", [
     {"arg_name": "source_file", "type": str, "help": "Source file path that need to be converted, eg: xxx.blf"},
     {"arg_name": "dest_file", "type": str, "help": "Destination file path after conversion, eg: xxx.asc"},
     {"arg_name": "--size", "type": int, "help": "Destination file slice size after conversion, unit:KB", "default": 0},
+    {"arg_name": "--jobs", "type": int, "help":
+        "Number of processes parsing a blf source file in parallel, 0: one per CPU", "default": 1},
     {"arg_name": "--debug", "type": int, "help": "Enable or disable debug level", "default": 0, "choices": [0, 1]},
 ], "Convert log file format to another file format")
 def log_convert(args: argparse.Namespace) -> None:
@@ -130,7 +131,7 @@ def log_convert(args: argparse.Namespace) -> None:
     else:
         size = args.size * 1024
     try:
-        CanLogManager.log_convert(args.source_file, args.dest_file, size)
+        CanLogManager.log_convert(args.source_file, args.dest_file, size, args.jobs)
     except KeyboardInterrupt:
         logger.warning(f"Receive signal 'Ctrl + C', end the application\n")
         sys.exit(1)
@@ -155,13 +156,31 @@ def read_log(args: argparse.Namespace) -> None:
     {"arg_name": "log_file", "type": str, "help": "Log file path that need to be parse, eg: xxx.blf"},
     {"arg_name": "db_path", "type": str, "help": "CAN database file path, eg: XXX.dbc"},
     {"arg_name": "--dest_file", "type": str, "help": "Destination file path after parsed, eg: xxx.json", "default": None},
+    {"arg_name": "--format", "type": str, "help":
+        "Output format, json: one document keyed by timestamp, "
+        "jsonl: one line per frame (or per --window) written while parsing, "
+        "npz: numpy columns per message and signal (requires numpy)",
+     "default": "json", "choices": ["json", "jsonl", "npz"]},
+    {"arg_name": "--messages", "type": str, "help":
+        "Only parse these messages, names or can ids, eg: 0x123 Msg2", "nargs": "*", "default": None},
+    {"arg_name": "--signals", "type": str, "help":
+        "Only output these signals, other messages are not decoded, eg: n1 n2", "nargs": "*", "default": None},
+    {"arg_name": "--window", "type": float, "help":
+        "jsonl only, write the last values of every message once per time window, unit: s", "default": None},
+    {"arg_name": "--jobs", "type": int, "help":
+        "Number of processes parsing a blf log file in parallel, 0: one per CPU", "default": 1},
+    {"arg_name": "--frame_id_mask", "type": str, "help":
+        "Mask applied to can ids before looking up messages, eg: 0x3ffff00", "default": None},
     {"arg_name": "--debug", "type": int, "help": "Enable or disable debug level", "default": 0, "choices": [0, 1]},
 ], "Log file parsed by dbc.")
 def log_parse(args: argparse.Namespace) -> None:
     set_log(args.debug)
     try:
-        dest_file = args.dest_file or args.log_file.split(".")[0] + ".json"
-        CanLogManager.log_parse(args.log_file, args.db_path, dest_file)
+        dest_file = args.dest_file or args.log_file.split(".")[0] + "." + args.format
+        messages = [convert_frame_id_or_name(message) for message in args.messages] if args.messages else None
+        CanLogManager.log_parse(args.log_file, args.db_path, dest_file, args.format,
+                                messages=messages, signals=args.signals, window=args.window, jobs=args.jobs,
+                                frame_id_mask=int(args.frame_id_mask, 0) if args.frame_id_mask else None)
     except KeyboardInterrupt:
         logger.warning(f"Receive signal 'Ctrl + C', end the application\n")
         sys.exit(1)
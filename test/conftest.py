@@ -2,10 +2,12 @@ import typing
 from enum import Enum
 import pytest
 from jidutest_can import CanController
-from jidutest_can.resource import CanSdbSystem
 
 
 def get_item_by_option_or_ini(name: str, pytestconfig: pytest.Config):
+    # imported here, the unit tests run without the SDB resources
+    from jidutest_can.resource import CanSdbSystem
+
     all_can_config = eval(pytestconfig.getini("can"))
     can_sdb_system = CanSdbSystem()
     ini_value = all_can_config.get(name)
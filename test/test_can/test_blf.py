@@ -0,0 +1,98 @@
+import concurrent.futures
+import io
+import pathlib
+import typing
+import pytest
+from jidutest_can.can import BLFWriter
+from jidutest_can.can import ParallelBLFReader
+from jidutest_can.can import RawMessage
+from jidutest_can.can.io.blf import BLFReader
+from jidutest_can.can.io.blf import index_containers
+
+
+def write_log(path: pathlib.Path, messages: typing.Iterable[RawMessage]) -> pathlib.Path:
+    # small containers, so that the messages are spread over many chunks
+    with BLFWriter(path, max_container_size=1024) as writer:
+        for msg in messages:
+            writer.on_message_received(msg)
+    return path
+
+
+def frames(count: int, start: float = 0.0) -> typing.List[RawMessage]:
+    return [
+        RawMessage(timestamp=start + index * 0.001, arbitration_id=0x100 + index % 8, data=bytes([index % 256] * 8),
+                   channel=1, is_fd=bool(index % 3 == 0), is_rx=bool(index % 2))
+        for index in range(count)
+    ]
+
+
+def assert_same(actual: typing.List[RawMessage], expected: typing.List[RawMessage]) -> None:
+    assert len(actual) == len(expected)
+    for a, b in zip(actual, expected):
+        assert a.equals(b), (a, b)
+
+
+@pytest.fixture
+def log_file(tmp_path: pathlib.Path) -> pathlib.Path:
+    messages = frames(2000)
+    messages.insert(1000, RawMessage(timestamp=messages[999].timestamp, is_error_frame=True, channel=1))
+    return write_log(tmp_path / "trace.blf", messages)
+
+
+def test_parallel_equals_sequential(log_file: pathlib.Path) -> None:
+    expected = list(BLFReader(log_file))
+    actual = list(ParallelBLFReader(log_file, jobs=2, containers_per_chunk=1))
+    assert_same(actual, expected)
+    assert sum(msg.is_error_frame for msg in actual) == 1
+
+
+def test_merge_overlapping_chunks(tmp_path: pathlib.Path) -> None:
+    messages = frames(2000)
+    # every seventh message was logged late, up to the next containers
+    for index, msg in enumerate(messages):
+        if index % 7 == 0:
+            msg.timestamp += 0.03
+    path = write_log(tmp_path / "overlapping.blf", messages)
+    expected = sorted(BLFReader(path), key=lambda msg: msg.timestamp)
+    assert_same(list(ParallelBLFReader(path, jobs=2, containers_per_chunk=1)), expected)
+
+
+def test_jump_back_in_time(tmp_path: pathlib.Path) -> None:
+    # the second half of the file was logged earlier than the first one
+    path = write_log(tmp_path / "unordered.blf", frames(1000, start=10.0) + frames(1000, start=5.0))
+    timestamps = [msg.timestamp for msg in ParallelBLFReader(path, jobs=2, containers_per_chunk=1)]
+    assert sorted(timestamps) == sorted(msg.timestamp for msg in BLFReader(path))
+
+
+def test_messages_are_streamed(log_file: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    submitted = []
+
+    class Executor(concurrent.futures.ProcessPoolExecutor):
+        def submit(self, *args: typing.Any, **kwargs: typing.Any) -> concurrent.futures.Future:
+            submitted.append(args)
+            return super().submit(*args, **kwargs)
+
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", Executor)
+    with open(log_file, "rb") as file:
+        chunks = len(index_containers(file))
+    reader = ParallelBLFReader(log_file, jobs=2, containers_per_chunk=1)
+    messages = iter(reader)
+    next(messages)
+    # the first message is yielded while only a few chunks are parsed
+    assert len(submitted) <= 4 < chunks
+    messages.close()
+    assert len(submitted) <= 4
+
+
+def test_filter_in_workers(log_file: pathlib.Path) -> None:
+    expected = [msg for msg in BLFReader(log_file) if not msg.is_error_frame and msg.arbitration_id in (0x101, 0x105)]
+    actual = list(ParallelBLFReader(log_file, jobs=2, containers_per_chunk=1, frame_ids=[0x001], frame_id_mask=0x3))
+    assert_same(actual, expected)
+
+
+def test_file_object_is_read_sequentially(log_file: pathlib.Path) -> None:
+    expected = [msg for msg in BLFReader(log_file) if msg.arbitration_id == 0x102 and not msg.is_error_frame]
+    with open(log_file, "rb") as file:
+        reader = ParallelBLFReader(io.BytesIO(file.read()), jobs=2, frame_ids={0x102})
+        assert reader.filename is None
+        assert_same(list(reader), expected)
@@ -0,0 +1,34 @@
+import typing
+import pytest
+from jidutest_can.can import RawMessage
+from jidutest_can.can.interfaces.virtual import VirtualBus
+
+
+@pytest.fixture
+def buses() -> typing.Iterator[typing.Tuple[VirtualBus, VirtualBus]]:
+    sender = VirtualBus(channel="test_bus")
+    receiver = VirtualBus(channel="test_bus")
+    yield sender, receiver
+    sender.shutdown()
+    receiver.shutdown()
+
+
+def test_recv_batch_returns_available_messages(buses) -> None:
+    sender, receiver = buses
+    for index in range(5):
+        sender.send(RawMessage(arbitration_id=0x100 + index))
+    assert [msg.arbitration_id for msg in receiver.recv_batch(max_messages=3, timeout=0)] == [0x100, 0x101, 0x102]
+    assert [msg.arbitration_id for msg in receiver.recv_batch(timeout=0)] == [0x103, 0x104]
+
+
+def test_recv_batch_timeout(buses) -> None:
+    _, receiver = buses
+    assert receiver.recv_batch(timeout=0.01) == []
+
+
+def test_recv_batch_applies_filters(buses) -> None:
+    sender, receiver = buses
+    receiver.set_filters([{"can_id": 0x200, "can_mask": 0x7FF}])
+    for arbitration_id in (0x100, 0x200, 0x101, 0x200):
+        sender.send(RawMessage(arbitration_id=arbitration_id))
+    assert [msg.arbitration_id for msg in receiver.recv_batch(timeout=0.1)] == [0x200, 0x200]
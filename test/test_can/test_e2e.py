@@ -0,0 +1,175 @@
+import pathlib
+import random
+import time
+import typing
+import pytest
+from crccheck.crc import Crc8GsmA
+from jidutest_can.can import RawMessage
+from jidutest_can.can.tools.e2e import CRC8_TABLE
+from jidutest_can.can.tools.e2e import E2EPayloadGenerator
+from jidutest_can.can.tools.e2e import E2EPlan
+from jidutest_can.can.tools.e2e import crc8
+from jidutest_can.can.tools.e2e import e2e_crc_data
+from jidutest_can.cantools import Database
+from .util import RecordingBus
+
+
+DBC_PATH = pathlib.Path(__file__).parent.parent / "resource" / "e2e.dbc"
+
+
+@pytest.fixture(scope="module")
+def db() -> Database:
+    database = Database()
+    database.add_dbc_file(DBC_PATH)
+    return database
+
+
+def test_crc8_table() -> None:
+    assert len(CRC8_TABLE) == 256
+    assert CRC8_TABLE[:3] == (0x00, 0x1D, 0x3A)
+
+
+def test_crc8_equals_crccheck() -> None:
+    # the check value of CRC-8/GSM-A
+    assert crc8(b"123456789") == 0x37
+    rng = random.Random(17)
+    for length in range(1, 32):
+        data = bytes(rng.randrange(256) for _ in range(length))
+        assert crc8(data) == Crc8GsmA.calc(data)
+        # continuing from the CRC of a prefix
+        assert crc8(data[length // 2:], crc8(data[:length // 2])) == Crc8GsmA.calc(data)
+
+
+def test_e2e_crc_data() -> None:
+    expected = Crc8GsmA.calc(bytes([0x3C, 0x04, 5, 0x34, 0x12, 0x02]))
+    assert e2e_crc_data(0x43C, 5, [(0x1234, 12), (2, 3)]) == expected
+    assert e2e_crc_data(0x43C, 5, (0x1234, 16)) == Crc8GsmA.calc(bytes([0x3C, 0x04, 5, 0x34, 0x12]))
+
+
+def test_plan(db: Database) -> None:
+    plan = E2EPlan(db.get_message_by_name("Msg1"))
+    assert plan
+    assert [group.chks_name for group in plan.groups] == ["Grp1Chks", "Grp2Chks"]
+    group = plan.get_group("Grp1Chks")
+    assert group.cntr_name == "Grp1Cntr"
+    assert group.data_id == 0x43C
+    # the covered signals in CRC order, i.e. sorted by name
+    assert [field.name for field in group.fields] == ["Flag", "Mode", "Speed"]
+    assert [field.size for field in group.fields] == [1, 1, 2]
+    assert [field.name for field in plan.get_group("Grp2Chks").fields] == ["Wide"]
+    assert plan.get_group("Speed") is None
+
+
+def test_physical_checksum(db: Database) -> None:
+    group = E2EPlan(db.get_message_by_name("Msg1")).get_group("Grp1Chks")
+    signals = {"Speed": 100, "Mode": "Auto", "Flag": 1}
+    # Speed: (100 - -10) / 0.5 = 220
+    expected = e2e_crc_data(0x43C, 3, [(1, 1), (2, 3), (220, 12)])
+    assert group.physical_checksum(3, signals) == expected
+    assert group.checksum(3, [1, 2, 220]) == expected
+    with pytest.raises(OverflowError):
+        group.checksum(3, [256, 2, 220])
+
+
+def test_group_without_data_id(db: Database) -> None:
+    plan = E2EPlan(db.get_message_by_name("Msg2"))
+    group = plan.get_group("NoIdChks")
+    assert group.data_id is None
+    assert "NoIdChks" in group.error
+    with pytest.raises(ValueError):
+        group.checksum(0, [0])
+
+
+def frame(message, **signals: typing.Any) -> RawMessage:
+    values = {signal.name: 0 for signal in message.signals}
+    values.update(signals)
+    return RawMessage(arbitration_id=message.frame_id, is_extended_id=False,
+                      data=message.encode(values, scaling=False))
+
+
+def assert_protected(message, data: bytes, group_name: str = "Grp1Chks") -> int:
+    """Assert the checksum of the group in `data` is valid and return its counter."""
+    group = E2EPlan(message).get_group(group_name)
+    raw = message.decode(data, decode_choices=False, scaling=False)
+    counter = raw[group.cntr_name]
+    assert raw[group.chks_name] == group.checksum(counter, [raw[field.name] for field in group.fields])
+    return counter
+
+
+def test_payload_generator(db: Database) -> None:
+    message = db.get_message_by_name("Msg1")
+    generator = E2EPayloadGenerator(message, E2EPlan(message))
+    assert generator
+    msg = frame(message, Grp1Cntr=13, Grp2Cntr=3, Speed=100)
+    counters = []
+    for _ in range(4):
+        generator(msg)
+        counters.append(assert_protected(message, msg.data))
+        assert_protected(message, msg.data, "Grp2Chks")
+    # the first frame keeps its counter
+    assert counters == [13, 14, 0, 1]
+    # a modified payload is protected by the next transmission
+    msg.data = bytearray(frame(message, Grp1Cntr=5, Speed=200).data)
+    generator(msg)
+    assert assert_protected(message, msg.data) == 2
+    generator.reset()
+    generator(msg)
+    assert assert_protected(message, msg.data) == 2
+
+
+def test_payload_generator_of_some_groups(db: Database) -> None:
+    message = db.get_message_by_name("Msg1")
+    generator = E2EPayloadGenerator(message, E2EPlan(message), ["Grp2Chks", "Unknown"])
+    assert [group.chks_name for group in generator.groups] == ["Grp2Chks"]
+    msg = frame(message, Grp1Cntr=7)
+    generator(msg)
+    generator(msg)
+    raw = message.decode(msg.data, decode_choices=False, scaling=False)
+    assert (raw["Grp1Cntr"], raw["Grp1Chks"], raw["Grp2Cntr"]) == (7, 0, 1)
+
+
+def test_payload_generator_without_data_id(db: Database) -> None:
+    message = db.get_message_by_name("Msg2")
+    generator = E2EPayloadGenerator(message, E2EPlan(message))
+    msg = frame(message, NoIdChks=0x55)
+    generator(msg)
+    generator(msg)
+    raw = message.decode(msg.data, decode_choices=False, scaling=False)
+    # only the counter is updated
+    assert (raw["NoIdCntr"], raw["NoIdChks"]) == (1, 0x55)
+
+
+def test_send_periodic_with_payload_generator(db: Database) -> None:
+    message = db.get_message_by_name("Msg1")
+    bus = RecordingBus()
+    try:
+        task = bus.send_periodic(frame(message, Speed=100), 0.005,
+                                 payload_generator=E2EPayloadGenerator(message, E2EPlan(message)))
+        assert bus.wait_for(20)
+        task.modify_payloads(frame(message, Speed=300).data)
+        assert bus.wait_for(40)
+        task.stop()
+    finally:
+        bus.shutdown()
+    counters = [assert_protected(message, msg.data) for msg in bus.messages]
+    # the counters continue across the modification
+    assert counters == [index % 15 for index in range(len(counters))]
+    assert message.decode(bus.messages[-1].data, scaling=False)["Speed"] == 300
+
+
+def test_payload_generator_error_stops_the_task() -> None:
+    def fail(msg: RawMessage) -> None:
+        raise ValueError("generator failed")
+
+    bus = RecordingBus()
+    try:
+        task = bus.send_periodic(RawMessage(arbitration_id=0x100), 0.005, payload_generator=fail)
+        deadline = time.monotonic() + 5
+        while task.exception is None and time.monotonic() < deadline:
+            time.sleep(0.005)
+        assert isinstance(task.exception, ValueError)
+        time.sleep(0.05)
+        assert task.stopped
+        assert bus.sent == []
+    finally:
+        bus.shutdown()
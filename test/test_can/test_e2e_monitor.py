@@ -0,0 +1,135 @@
+import pathlib
+import time
+import typing
+import pytest
+from jidutest_can.can import E2EMonitor
+from jidutest_can.can import RawMessage
+from jidutest_can.can.tools.e2e import E2EPlan
+from jidutest_can.cantools import Database
+
+
+DBC_PATH = pathlib.Path(__file__).parent.parent / "resource" / "e2e.dbc"
+
+SIGNED_DBC = '''VERSION ""
+
+BU_: ECU1
+
+BO_ 512 Signed: 8 ECU1
+ SG_ SgnChks : 7|8@0+ (1,0) [0|255] "" Vector__XXX
+ SG_ SgnCntr : 11|4@0+ (1,0) [0|14] "" Vector__XXX
+ SG_ Value : 23|8@0- (1,0) [-128|127] "" Vector__XXX
+
+BO_ 513 Float: 8 ECU1
+ SG_ FltChks : 7|8@0+ (1,0) [0|255] "" Vector__XXX
+ SG_ FltCntr : 11|4@0+ (1,0) [0|14] "" Vector__XXX
+ SG_ Value : 32|32@1- (1,0) [0|0] "" Vector__XXX
+
+BA_DEF_ SG_ "GenSigDataID" STRING ;
+BA_DEF_DEF_ "GenSigDataID" "";
+BA_ "GenSigDataID" SG_ 512 SgnChks "0x20";
+BA_ "GenSigDataID" SG_ 513 FltChks "0x21";
+SIG_VALTYPE_ 513 Value : 1;
+SIG_GROUP_ 512 Grp1 1 : SgnChks SgnCntr Value;
+SIG_GROUP_ 513 Grp2 1 : FltChks FltCntr Value;
+'''
+
+
+@pytest.fixture(scope="module")
+def db() -> Database:
+    database = Database()
+    database.add_dbc_file(DBC_PATH)
+    return database
+
+
+def protected(message, counter: int, timestamp: float = 0.0, crc_offset: int = 0,
+              **signals: typing.Any) -> RawMessage:
+    """Return a frame of `message` with a valid counter and checksum, unless
+    `crc_offset` is given."""
+    values = {signal.name: 0 for signal in message.signals}
+    values.update(signals)
+    for group in E2EPlan(message).groups:
+        values[group.cntr_name] = counter
+        if group.data_id is not None:
+            raw_values = [values[field.name] for field in group.fields]
+            values[group.chks_name] = (group.checksum(counter, raw_values) + crc_offset) % 256
+    return RawMessage(timestamp=timestamp, arbitration_id=message.frame_id,
+                      data=message.encode(values, scaling=False))
+
+
+def test_valid_frames(db: Database) -> None:
+    msg1 = db.get_message_by_name("Msg1")
+    monitor = E2EMonitor(db)
+    assert sorted(monitor.frame_ids) == [0x100, 0x101]
+    monitor.on_messages_received([protected(msg1, counter % 15, Speed=counter) for counter in range(20)])
+    statistics = monitor.get_statistics(0x100)
+    assert statistics.frames == 20
+    assert statistics.errors == 0
+    assert list(monitor.statistics()) == [0x100]
+
+
+def test_errors(db: Database) -> None:
+    msg1 = db.get_message_by_name("Msg1")
+    monitor = E2EMonitor(db)
+    monitor.on_messages_received([
+        protected(msg1, 0),
+        protected(msg1, 1, crc_offset=1),
+        protected(msg1, 1),
+        protected(msg1, 4),
+        RawMessage(arbitration_id=0x100, data=b"\x00"),
+        RawMessage(arbitration_id=0x300, data=bytes(8)),
+    ])
+    statistics = monitor.get_statistics(0x100)
+    # both checksums of the frame are wrong
+    assert statistics.crc_errors == 2
+    assert statistics.repeats == 2
+    assert statistics.counter_jumps == 2
+    assert statistics.decode_errors == 1
+    assert monitor.errors == statistics.errors == 7
+    assert "Msg1" in monitor.summary()
+    monitor.reset()
+    assert monitor.errors == 0
+
+
+def test_timeout_between_frames(db: Database) -> None:
+    msg1 = db.get_message_by_name("Msg1")
+    monitor = E2EMonitor(db, timeouts={0x100: 0.05})
+    monitor.on_messages_received([protected(msg1, 0, 1.0), protected(msg1, 1, 1.01), protected(msg1, 2, 1.2)])
+    assert monitor.get_statistics(0x100).timeouts == 1
+
+
+def test_timeout_of_silent_message(db: Database) -> None:
+    msg1 = db.get_message_by_name("Msg1")
+    monitor = E2EMonitor(db, timeouts={0x100: 0.05})
+    # not received yet, no timeout
+    time.sleep(0.1)
+    assert monitor.errors == 0
+    monitor.on_message_received(protected(msg1, 0, 1.0))
+    time.sleep(0.1)
+    # counted once, no matter how often it is checked
+    monitor.check_timeouts()
+    assert monitor.get_statistics(0x100).timeouts == 1
+    assert monitor.statistics()[0x100].timeouts == 1
+    # the late frame ends the gap without counting it again
+    monitor.on_message_received(protected(msg1, 1, 2.0))
+    assert monitor.get_statistics(0x100).timeouts == 1
+    time.sleep(0.1)
+    assert monitor.get_statistics(0x100).timeouts == 2
+
+
+def test_signed_and_float_fields() -> None:
+    database = Database()
+    database.add_dbc_string(SIGNED_DBC)
+    monitor = E2EMonitor(database)
+    signed = database.get_message_by_name("Signed")
+    float_message = database.get_message_by_name("Float")
+    monitor.on_messages_received([
+        protected(signed, 0, Value=5),
+        # the raw value -1 has no unsigned byte in the CRC data
+        RawMessage(arbitration_id=0x200, data=signed.encode({"SgnChks": 0, "SgnCntr": 1, "Value": -1})),
+        RawMessage(arbitration_id=0x201, data=float_message.encode({"FltChks": 0, "FltCntr": 0, "Value": 1.5})),
+    ])
+    statistics = monitor.get_statistics(0x200)
+    assert (statistics.crc_errors, statistics.decode_errors) == (0, 1)
+    # the checksums covering float signals are not checked
+    statistics = monitor.get_statistics(0x201)
+    assert (statistics.frames, statistics.errors) == (1, 0)
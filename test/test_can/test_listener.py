@@ -0,0 +1,144 @@
+import asyncio
+import itertools
+import threading
+import typing
+import pytest
+from jidutest_can.can import QueuedListener
+from jidutest_can.can import RawMessage
+from jidutest_can.can.interfaces.virtual import VirtualBus
+from jidutest_can.can.notifier import BufferedReader
+from jidutest_can.can.notifier import Notifier
+
+_channels = itertools.count()
+
+
+class BlockedListener:
+    """Callable listener which waits for `release` before taking a message."""
+
+    def __init__(self) -> None:
+        self.release = threading.Event()
+        self.received: typing.List[int] = []
+        self.stopped = False
+
+    def __call__(self, msg: RawMessage) -> None:
+        self.release.wait(5)
+        self.received.append(msg.data[0])
+
+    def stop(self) -> None:
+        self.stopped = True
+
+
+def frames(count: int) -> typing.List[RawMessage]:
+    return [RawMessage(arbitration_id=0x100, data=[index]) for index in range(count)]
+
+
+def test_delivers_in_order() -> None:
+    received = []
+    queued = QueuedListener(received.append, batch_size=3)
+    queued.on_messages_received(frames(10))
+    assert queued.close(1)
+    assert [msg.data[0] for msg in received] == list(range(10))
+    assert queued.statistics()["delivered"] == 10
+
+
+def test_drop_newest() -> None:
+    listener = BlockedListener()
+    queued = QueuedListener(listener, max_queue_size=5, overflow="drop_newest")
+    queued.on_messages_received(frames(20))
+    listener.release.set()
+    queued.stop(1)
+    assert listener.received == list(range(5))
+    assert queued.dropped == 15
+    assert listener.stopped
+
+
+def test_drop_oldest() -> None:
+    listener = BlockedListener()
+    queued = QueuedListener(listener, max_queue_size=5, overflow="drop_oldest")
+    queued.on_messages_received(frames(20))
+    listener.release.set()
+    queued.stop(1)
+    assert listener.received == list(range(15, 20))
+    assert queued.dropped == 15
+
+
+def test_block() -> None:
+    listener = BlockedListener()
+    queued = QueuedListener(listener, max_queue_size=5, overflow="block")
+    timer = threading.Timer(0.1, listener.release.set)
+    timer.start()
+    queued.on_messages_received(frames(20))
+    queued.stop(1)
+    timer.join()
+    assert listener.received == list(range(20))
+    assert queued.dropped == 0
+    assert queued.blocked > 0
+    assert queued.max_queue_depth <= 5
+
+
+def test_errors_are_counted() -> None:
+    def fail(msg: RawMessage) -> None:
+        raise RuntimeError("listener failed")
+
+    queued = QueuedListener(fail)
+    queued.on_messages_received(frames(3))
+    queued.close(1)
+    assert queued.errors == 3
+    assert queued.delivered == 0
+
+
+def test_unknown_overflow() -> None:
+    with pytest.raises(ValueError):
+        QueuedListener(print, overflow="drop")
+
+
+@pytest.fixture
+def buses() -> typing.Iterator[typing.Tuple[VirtualBus, VirtualBus]]:
+    channel = f"test_listener_{next(_channels)}"
+    sender = VirtualBus(channel=channel)
+    receiver = VirtualBus(channel=channel)
+    yield sender, receiver
+    sender.shutdown()
+    receiver.shutdown()
+
+
+def test_slow_listener_does_not_stall_others(buses) -> None:
+    sender, receiver = buses
+    slow = BlockedListener()
+    fast = BufferedReader()
+    notifier = Notifier(receiver, [slow, fast], timeout=0.05, isolated=True)
+    for msg in frames(10):
+        sender.send(msg)
+    # the slow listener has not taken a single message yet
+    assert [fast.get_message(1).data[0] for _ in range(10)] == list(range(10))
+    assert slow.received == []
+    statistics = notifier.listener_statistics()
+    assert statistics[fast]["delivered"] == 10
+    assert statistics[slow]["delivered"] == 0
+    slow.release.set()
+    notifier.stop()
+    assert slow.received == list(range(10))
+    assert slow.stopped
+
+
+def test_remove_isolated_listener(buses) -> None:
+    sender, receiver = buses
+    reader = BufferedReader()
+    notifier = Notifier(receiver, [], timeout=0.05)
+    notifier.add_listener(reader, isolated=True)
+    assert reader in notifier.listener_statistics()
+    notifier.remove_listener(reader)
+    assert notifier.listener_statistics() == {}
+    # the queue is closed but the listener keeps working
+    assert not reader.is_stopped
+    notifier.stop()
+
+
+def test_isolated_with_loop(buses) -> None:
+    _, receiver = buses
+    loop = asyncio.new_event_loop()
+    try:
+        with pytest.raises(ValueError):
+            Notifier(receiver, [], loop=loop, isolated=True)
+    finally:
+        loop.close()
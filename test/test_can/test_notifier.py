@@ -0,0 +1,105 @@
+import io
+import itertools
+import typing
+import pytest
+from jidutest_can.can import RawMessage
+from jidutest_can.can.interfaces.virtual import VirtualBus
+from jidutest_can.can.io.printer import Printer
+from jidutest_can.can.notifier import BufferedReader
+from jidutest_can.can.notifier import Notifier
+from jidutest_can.can.notifier import Reader
+
+_channels = itertools.count()
+
+
+class BatchReader(Reader):
+    """Records the batches handed to it."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.batches: typing.List[typing.List[RawMessage]] = []
+
+    def on_message_received(self, msg: RawMessage) -> None:
+        self.batches.append([msg])
+
+    def on_messages_received(self, msgs: typing.Sequence[RawMessage]) -> None:
+        self.batches.append(list(msgs))
+
+    @property
+    def messages(self) -> typing.List[RawMessage]:
+        return [msg for batch in self.batches for msg in batch]
+
+
+@pytest.fixture
+def buses() -> typing.Iterator[typing.Tuple[VirtualBus, VirtualBus]]:
+    # a channel per test, the notifier refuses a second receive thread per channel
+    channel = f"test_notifier_{next(_channels)}"
+    sender = VirtualBus(channel=channel)
+    receiver = VirtualBus(channel=channel)
+    yield sender, receiver
+    sender.shutdown()
+    receiver.shutdown()
+
+
+def send(bus: VirtualBus, count: int, start: int = 0) -> None:
+    for index in range(start, start + count):
+        bus.send(RawMessage(arbitration_id=0x100, data=[index]))
+
+
+def wait_for_messages(reader: BufferedReader, count: int) -> typing.List[int]:
+    received = []
+    while len(received) < count:
+        msg = reader.get_message(1)
+        if msg is None:
+            break
+        received.append(msg.data[0])
+    return received
+
+
+def test_batches_are_delivered_in_one_call(buses) -> None:
+    sender, receiver = buses
+    # queued before the receive thread starts, so they are read as one batch
+    send(sender, 5)
+    reader = BatchReader()
+    buffered = BufferedReader()
+    notifier = Notifier(receiver, [reader, buffered], timeout=0.05)
+    assert wait_for_messages(buffered, 5) == list(range(5))
+    notifier.stop()
+    assert [len(batch) for batch in reader.batches] == [5]
+    assert [msg.data[0] for msg in reader.messages] == list(range(5))
+
+
+def test_callables_are_called_per_message(buses) -> None:
+    sender, receiver = buses
+    send(sender, 3)
+    calls = []
+    buffered = BufferedReader()
+    notifier = Notifier(receiver, [calls.append, buffered], timeout=0.05)
+    wait_for_messages(buffered, 3)
+    notifier.stop()
+    assert [msg.data[0] for msg in calls] == [0, 1, 2]
+
+
+def test_add_and_remove_listener(buses) -> None:
+    sender, receiver = buses
+    first = BufferedReader()
+    notifier = Notifier(receiver, [first], timeout=0.05)
+    second = BufferedReader()
+    notifier.add_listener(second)
+    send(sender, 2)
+    assert wait_for_messages(first, 2) == [0, 1]
+    assert wait_for_messages(second, 2) == [0, 1]
+    notifier.remove_listener(second)
+    send(sender, 2, start=2)
+    assert wait_for_messages(first, 2) == [2, 3]
+    assert second.get_message(0.1) is None
+    notifier.stop()
+
+
+def test_printer_writes_a_batch() -> None:
+    output = io.StringIO()
+    printer = Printer(output)
+    printer.on_messages_received([RawMessage(arbitration_id=0x100 + index) for index in range(3)])
+    lines = output.getvalue().splitlines()
+    assert len(lines) == 3
+    assert ["10" + str(index) in line for index, line in enumerate(lines)] == [True] * 3
@@ -0,0 +1,106 @@
+import collections
+import importlib
+import typing
+import pytest
+from jidutest_can.can import RawMessage
+
+
+def import_backend(name: str):
+    try:
+        return importlib.import_module(f"jidutest_can.can.interfaces.{name}")
+    except OSError:
+        # the SmartVCI constants live next to the TOSUN driver library
+        return None
+
+
+BACKENDS = {
+    "pcan": (import_backend("pcan.pcan"), "PcanBus", "PCANBasic"),
+    "smartvci": (import_backend("smartvci.smartvci"), "SmartVCIBus", "SmartVCIBasic"),
+}
+
+
+class FakeBasic:
+    """Stands in for the PCAN-Basic driver of a bus, serving the frames of
+    `rx` and recording the written frames."""
+
+    def __init__(self, module) -> None:
+        self.module = module
+        self.rx: typing.Deque[typing.Tuple[int, bytes]] = collections.deque()
+        self.written: typing.List[typing.Tuple[int, int, bytes]] = []
+
+    def Initialize(self, *args) -> int:
+        return self.module.PCAN_ERROR_OK
+
+    InitializeFD = Initialize
+    SetValue = Initialize
+    Uninitialize = Initialize
+
+    def GetValue(self, channel, parameter) -> tuple:
+        if parameter == self.module.PCAN_API_VERSION:
+            return self.module.PCAN_ERROR_OK, b"4.6.0"
+        return self.module.PCAN_ERROR_OK, 0
+
+    def GetErrorText(self, error, language=0) -> tuple:
+        return self.module.PCAN_ERROR_OK, b"error"
+
+    def Read(self, channel, message, timestamp) -> tuple:
+        if not self.rx:
+            return self.module.PCAN_ERROR_QRCVEMPTY, message, timestamp
+        arbitration_id, data = self.rx.popleft()
+        message.ID = arbitration_id
+        message.MSGTYPE = self.module.PCAN_MESSAGE_STANDARD.value
+        message.LEN = len(data)
+        message.DATA[:len(data)] = data
+        return self.module.PCAN_ERROR_OK, message, timestamp
+
+    def Write(self, channel, message) -> int:
+        self.written.append((message.ID, message.LEN, bytes(message.DATA)))
+        return self.module.PCAN_ERROR_OK
+
+
+@pytest.fixture(params=sorted(BACKENDS))
+def bus(request, monkeypatch: pytest.MonkeyPatch):
+    module, bus_class, basic_class = BACKENDS[request.param]
+    if module is None:
+        pytest.skip(f"The {request.param} backend cannot be imported")
+    monkeypatch.setattr(module, basic_class, lambda: FakeBasic(module))
+    # poll instead of waiting for the receive event of the driver
+    monkeypatch.setattr(module, "HAS_EVENTS", False)
+    bus = getattr(module, bus_class)(channel=1)
+    yield bus
+    bus.shutdown()
+
+
+def test_recv(bus) -> None:
+    bus.m_objPCANBasic.rx.extend([(0x100, b"\x01\x02"), (0x200, b"\x03")])
+    msg = bus.recv(0)
+    assert isinstance(msg, RawMessage)
+    assert (msg.arbitration_id, bytes(msg.data)) == (0x100, b"\x01\x02")
+    msg = bus.recv(0)
+    assert (msg.arbitration_id, bytes(msg.data)) == (0x200, b"\x03")
+    assert bus.recv(0.01) is None
+
+
+def test_recv_batch(bus) -> None:
+    bus.m_objPCANBasic.rx.extend((0x100 + index, bytes([index])) for index in range(5))
+    bus.set_filters([{"can_id": 0x100, "can_mask": 0x7F9}])
+    batch = bus.recv_batch(timeout=0)
+    assert [msg.arbitration_id for msg in batch] == [0x100, 0x102, 0x104]
+    assert bus.recv_batch(timeout=0) == []
+
+
+def test_send_clears_previous_payload(bus) -> None:
+    bus.send(RawMessage(arbitration_id=0x100, is_extended_id=False, data=bytes(range(1, 9))))
+    bus.send(RawMessage(arbitration_id=0x101, is_extended_id=False, data=b"\xff\xfe"))
+    bus.send(RawMessage(arbitration_id=0x102, is_extended_id=False, is_remote_frame=True, dlc=4))
+    assert bus.m_objPCANBasic.written == [
+        (0x100, 8, bytes(range(1, 9))),
+        (0x101, 2, b"\xff\xfe" + bytes(6)),
+        (0x102, 4, bytes(8)),
+    ]
+
+
+def test_send_many(bus) -> None:
+    msgs = [RawMessage(arbitration_id=0x100 + index, is_extended_id=False, data=[index]) for index in range(3)]
+    assert bus.send_many(msgs) == 3
+    assert [written[0] for written in bus.m_objPCANBasic.written] == [0x100, 0x101, 0x102]
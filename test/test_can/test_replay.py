@@ -0,0 +1,142 @@
+import pathlib
+import time
+import typing
+import pytest
+from jidutest_can.can import BLFWriter
+from jidutest_can.can import RawMessage
+from jidutest_can.can import ReplayEngine
+from .util import RecordingBus
+
+
+def frames(count: int, period: float = 0.002, channel: typing.Any = 1) -> typing.List[RawMessage]:
+    return [
+        RawMessage(timestamp=100.0 + index * period, arbitration_id=0x100 + index, data=bytes([index % 256]),
+                   channel=channel)
+        for index in range(count)
+    ]
+
+
+def send_times(bus: RecordingBus) -> typing.List[float]:
+    with bus.lock:
+        return [sent - bus.sent[0][0] for sent, _ in bus.sent]
+
+
+def test_replays_at_the_recorded_times() -> None:
+    bus = RecordingBus()
+    report = ReplayEngine(bus).replay(frames(20, 0.005))
+    assert [msg.arbitration_id for msg in bus.messages] == [0x100 + index for index in range(20)]
+    assert (report.frames, report.sent, report.errors, report.unmapped, report.loops) == (20, 20, 0, 0, 1)
+    assert not report.interrupted
+    assert report.deviation.as_dict()["count"] == 20
+    assert report.duration == pytest.approx(0.095, abs=0.05)
+    for index, sent in enumerate(send_times(bus)):
+        assert sent == pytest.approx(index * 0.005, abs=0.005)
+    assert "Replayed 20 frames" in report.summary()
+    assert report.as_dict()["deviation"]["count"] == 20
+
+
+def test_speed_and_loops() -> None:
+    bus = RecordingBus()
+    report = ReplayEngine(bus, speed=2.0, loops=3).replay(frames(10, 0.01))
+    assert report.loops == 3
+    assert report.sent == 30
+    # a pass lasts 45 ms at twice the speed, the next one starts after its last frame
+    assert send_times(bus)[-1] == pytest.approx(3 * 0.045, abs=0.02)
+    with pytest.raises(ValueError):
+        ReplayEngine(bus, speed=0)
+    with pytest.raises(ValueError):
+        ReplayEngine(bus, loops=-1)
+
+
+def test_iterator_replays_once() -> None:
+    bus = RecordingBus()
+    report = ReplayEngine(bus, loops=0).replay(iter(frames(5, 0.001)))
+    assert (report.loops, report.sent) == (1, 5)
+
+
+def test_batches_close_frames() -> None:
+    bus = RecordingBus()
+    # three bursts of frames recorded 50 us apart
+    messages = [RawMessage(timestamp=burst * 0.01 + index * 0.00005, arbitration_id=index, channel=1)
+                for burst in range(3) for index in range(4)]
+    report = ReplayEngine(bus).replay(messages)
+    assert report.sent == 12
+    assert report.batches == 3
+    assert ReplayEngine(bus, max_batch=2).replay(messages).batches == 6
+
+
+def test_channel_map() -> None:
+    first, second = RecordingBus("PCAN_USBBUS1"), RecordingBus("PCAN_USBBUS2")
+    spare = RecordingBus("spare")
+    messages = frames(2, channel=1) + frames(2, channel="can2") + frames(2, channel="vcan") + frames(2, channel=7)
+    for index, msg in enumerate(messages):
+        msg.timestamp = index * 0.001
+    engine = ReplayEngine([first, second, spare], channel_map={"vcan": spare})
+    report = engine.replay(messages)
+    assert (report.frames, report.sent, report.unmapped) == (8, 6, 2)
+    assert engine.buses_of(1) == (first,)
+    assert engine.buses_of("can2") == (second,)
+    assert engine.buses_of(7) == ()
+    # the frames are sent on the channel of their bus
+    assert [msg.channel for msg in second.messages] == ["PCAN_USBBUS2"] * 2
+    assert len(spare.messages) == 2
+
+
+def test_frame_sent_on_several_buses() -> None:
+    first, second = RecordingBus("PCAN_USBBUS1"), RecordingBus("PCAN_USBBUS1")
+    report = ReplayEngine([first, second]).replay(frames(3))
+    assert report.sent == 6
+    assert [msg.arbitration_id for msg in first.messages] == [msg.arbitration_id for msg in second.messages]
+
+
+def test_send_errors() -> None:
+    bus = RecordingBus(fail=lambda msg: msg.arbitration_id == 0x101)
+    report = ReplayEngine(bus).replay(frames(4))
+    assert (report.frames, report.sent, report.errors) == (4, 3, 1)
+    assert [msg.arbitration_id for msg in bus.messages] == [0x100, 0x102, 0x103]
+
+
+def test_error_frames_are_skipped() -> None:
+    bus = RecordingBus()
+    messages = frames(3)
+    messages[1].is_error_frame = True
+    report = ReplayEngine(bus).replay(messages)
+    assert (report.frames, report.sent) == (2, 2)
+
+
+def test_skips_long_pauses() -> None:
+    bus = RecordingBus()
+    messages = frames(2)
+    messages[1].timestamp += 60
+    started = time.perf_counter()
+    report = ReplayEngine(bus, skip=0.02).replay(messages)
+    assert report.sent == 2
+    assert time.perf_counter() - started < 1
+
+
+def test_start_and_stop() -> None:
+    bus = RecordingBus()
+    engine = ReplayEngine(bus, loops=0)
+    engine.start(frames(10, 0.005))
+    assert engine.is_running
+    with pytest.raises(RuntimeError):
+        engine.start(frames(1))
+    assert bus.wait_for(15)
+    report = engine.stop()
+    assert not engine.is_running
+    assert report.interrupted
+    assert report.sent == len(bus.messages)
+    engine = ReplayEngine(bus)
+    engine.start(frames(3))
+    assert engine.wait(5).sent == 3
+
+
+def test_replays_log_files(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "trace.blf"
+    with BLFWriter(path) as writer:
+        for msg in frames(5):
+            writer.on_message_received(msg)
+    bus = RecordingBus()
+    report = ReplayEngine(bus).replay(path)
+    assert report.sent == 5
+    assert [bytes(msg.data) for msg in bus.messages] == [bytes([index]) for index in range(5)]
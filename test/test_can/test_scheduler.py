@@ -0,0 +1,149 @@
+import time
+import typing
+import pytest
+from jidutest_can.can import BufferedReader
+from jidutest_can.can import CyclicSendScheduler
+from jidutest_can.can import Notifier
+from jidutest_can.can import RawMessage
+from jidutest_can.can.bcm import JitterStatistics
+from jidutest_can.can.bcm import ScheduledCyclicSendTask
+from jidutest_can.can.tools import BUS_NOTIFIER_MAPPING
+from .util import RecordingBus
+
+
+@pytest.fixture
+def scheduler() -> typing.Iterator[CyclicSendScheduler]:
+    scheduler = CyclicSendScheduler(name="Test scheduler")
+    yield scheduler
+    scheduler.stop()
+
+
+@pytest.fixture
+def bus(scheduler: CyclicSendScheduler) -> typing.Iterator[RecordingBus]:
+    bus = RecordingBus()
+    bus.cyclic_scheduler = scheduler
+    yield bus
+    bus.shutdown()
+
+
+def test_send_periodic_uses_scheduler(bus: RecordingBus, scheduler: CyclicSendScheduler) -> None:
+    task = bus.send_periodic(RawMessage(arbitration_id=0x100), 0.01)
+    assert isinstance(task, ScheduledCyclicSendTask)
+    assert scheduler.tasks == [task]
+    assert bus.wait_for(5)
+    task.stop()
+
+
+def test_period(bus: RecordingBus) -> None:
+    task = bus.send_periodic(RawMessage(arbitration_id=0x100), 0.01)
+    time.sleep(0.3)
+    task.stop()
+    # loose bounds, the test machine may be busy
+    assert 15 <= len(bus.sent) <= 32
+    assert task.statistics.count == len(bus.sent)
+
+
+def test_messages_are_sent_in_turn(bus: RecordingBus) -> None:
+    task = bus.send_periodic([RawMessage(arbitration_id=0x100, data=[index]) for index in range(3)], 0.005)
+    assert bus.wait_for(6)
+    task.stop()
+    assert [msg.data[0] for msg in bus.messages[:6]] == [0, 1, 2, 0, 1, 2]
+
+
+def test_many_tasks_share_one_thread(bus: RecordingBus, scheduler: CyclicSendScheduler) -> None:
+    tasks = [bus.send_periodic(RawMessage(arbitration_id=frame_id), 0.01) for frame_id in range(50)]
+    assert len(scheduler.tasks) == 50
+    assert bus.wait_for(150)
+    for task in tasks:
+        task.stop()
+    assert {msg.arbitration_id for msg in bus.messages} == set(range(50))
+
+
+def test_stop_and_restart(bus: RecordingBus) -> None:
+    task = bus.send_periodic(RawMessage(arbitration_id=0x100), 0.01)
+    assert bus.wait_for(2)
+    task.stop()
+    time.sleep(0.05)
+    count = len(bus.sent)
+    time.sleep(0.05)
+    assert len(bus.sent) == count
+    task.start()
+    assert bus.wait_for(count + 2)
+    task.stop()
+
+
+def test_duration(bus: RecordingBus) -> None:
+    task = bus.send_periodic(RawMessage(arbitration_id=0x100), 0.01, duration=0.05)
+    time.sleep(0.2)
+    assert task.stopped
+    assert len(bus.sent) <= 8
+
+
+def test_modify_data(bus: RecordingBus) -> None:
+    task = bus.send_periodic(RawMessage(arbitration_id=0x100, data=[1]), 0.005)
+    assert bus.wait_for(1)
+    task.modify_data(RawMessage(arbitration_id=0x100, data=[2]))
+    count = len(bus.sent)
+    assert bus.wait_for(count + 2)
+    task.stop()
+    assert bus.messages[-1].data == bytearray([2])
+
+
+def test_send_error_stops_task(scheduler: CyclicSendScheduler) -> None:
+    bus = RecordingBus(fail=lambda msg: msg.arbitration_id == 0x101)
+    bus.cyclic_scheduler = scheduler
+    failing = bus.send_periodic(RawMessage(arbitration_id=0x101), 0.01)
+    working = bus.send_periodic(RawMessage(arbitration_id=0x100), 0.01)
+    assert bus.wait_for(3)
+    assert failing.stopped
+    assert isinstance(failing.exception, OSError)
+    assert not working.stopped
+    bus.shutdown()
+
+
+
+def test_failing_listener_does_not_stop_other_buses(scheduler: CyclicSendScheduler) -> None:
+    failing_bus, other_bus = RecordingBus("PCAN_USBBUS1"), RecordingBus("PCAN_USBBUS2")
+    failing_bus.cyclic_scheduler = other_bus.cyclic_scheduler = scheduler
+    reader = BufferedReader()
+    notifier = Notifier(failing_bus, [reader])
+    # a stopped reader raises for every looped back message
+    reader.stop()
+    failing = failing_bus.send_periodic(RawMessage(arbitration_id=0x100), 0.005)
+    other = other_bus.send_periodic(RawMessage(arbitration_id=0x200), 0.005)
+    try:
+        assert failing_bus.wait_for(5)
+        sent = len(other_bus.sent)
+        assert other_bus.wait_for(sent + 5)
+        assert not failing.stopped
+        assert failing.statistics.count >= 5
+    finally:
+        failing.stop()
+        other.stop()
+        notifier.stop()
+        failing_bus.shutdown()
+        other_bus.shutdown()
+
+
+def test_stopped_notifier_receives_no_loopback(bus: RecordingBus) -> None:
+    reader = BufferedReader()
+    notifier = Notifier(bus, [reader])
+    assert BUS_NOTIFIER_MAPPING[bus] is notifier
+    notifier.stop()
+    assert bus not in BUS_NOTIFIER_MAPPING
+    task = bus.send_periodic(RawMessage(arbitration_id=0x100), 0.005)
+    assert bus.wait_for(3)
+    task.stop()
+    assert reader.get_message(0) is None
+
+def test_jitter_statistics() -> None:
+    statistics = JitterStatistics()
+    for deviation in (0.001, 0.003, -0.001):
+        statistics.add(deviation)
+    assert statistics.count == 3
+    assert statistics.mean == pytest.approx(0.001)
+    assert statistics.as_dict()["min"] == -0.001
+    assert statistics.as_dict()["max"] == 0.003
+    assert statistics.std == pytest.approx((8e-6 / 3) ** 0.5)
+    statistics.reset()
+    assert statistics.as_dict()["max"] == 0.0
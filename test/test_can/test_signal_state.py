@@ -0,0 +1,86 @@
+import logging
+import pathlib
+import pytest
+from jidutest_can.can import RawMessage
+from jidutest_can.can import SignalStateStore
+from jidutest_can.cantools import Database
+
+
+DBC_PATH = pathlib.Path(__file__).parent.parent / "resource" / "e2e.dbc"
+
+DUPLICATED_DBC = '''VERSION ""
+
+BU_: ECU1
+
+BO_ 256 Front: 8 ECU1
+ SG_ Speed : 0|8@1+ (1,0) [0|255] "" Vector__XXX
+
+BO_ 257 Rear: 8 ECU1
+ SG_ Speed : 0|8@1+ (2,0) [0|510] "" Vector__XXX
+'''
+
+
+@pytest.fixture(scope="module")
+def db() -> Database:
+    database = Database()
+    database.add_dbc_file(DBC_PATH)
+    return database
+
+
+def msg1(db: Database, timestamp: float = 0.0, **signals) -> RawMessage:
+    message = db.get_message_by_name("Msg1")
+    values = {signal.name: 0 for signal in message.signals}
+    values.update(signals)
+    return RawMessage(timestamp=timestamp, arbitration_id=message.frame_id, data=message.encode(values))
+
+
+def test_get_signal(db: Database) -> None:
+    store = SignalStateStore(db)
+    assert store.get_signal("Speed") is None
+    assert store.get_signal("Speed", default=-1) == -1
+    store.on_messages_received([msg1(db, 1.0, Speed=20, Mode=2), RawMessage(arbitration_id=0x300)])
+    assert store.get_signal("Speed") == 20
+    assert store.get_signal("Mode") == "Auto"
+    assert store.get_signal("Mode", decode_choices=False) == 2
+    assert store.get_signals("Speed", "Other") == {"Speed": 20}
+    assert sorted(store.frame_ids) == [0x100, 0x300]
+    # unknown IDs are kept but not decoded
+    assert store.get_message_state(0x300).signals is None
+    with pytest.raises(KeyError):
+        store.get_signal("Unknown")
+
+
+def test_decodes_changed_payloads_only(db: Database) -> None:
+    store = SignalStateStore(db)
+    store.on_messages_received([msg1(db, 1.0, Speed=20), msg1(db, 2.0, Speed=20)])
+    state = store.get_message_state(0x100)
+    signals = state.signals
+    assert (state.count, state.timestamp, state.changed_timestamp) == (2, 2.0, 1.0)
+    store.on_message_received(msg1(db, 3.0, Speed=20))
+    # the same payload is not decoded again
+    assert state.signals is signals
+    store.on_message_received(msg1(db, 4.0, Speed=30))
+    assert state.changed_timestamp == 4.0
+    assert state.signals["Speed"] == 30
+    with pytest.raises(TypeError):
+        state.signals["Speed"] = 40
+    store.clear()
+    assert store.get_message_state(0x100) is None
+
+
+def test_duplicated_signal_names(caplog: pytest.LogCaptureFixture) -> None:
+    database = Database()
+    database.add_dbc_string(DUPLICATED_DBC)
+    with caplog.at_level(logging.WARNING):
+        store = SignalStateStore(database)
+    assert "Speed" in caplog.text
+    store.on_message_received(RawMessage(timestamp=1.0, arbitration_id=0x101, data=[5] + [0] * 7))
+    assert store.get_signal("Speed", message="Front") is None
+    assert store.get_signal("Speed", message=0x101) == 10
+    # the message received last wins
+    assert store.get_signal("Speed") == 10
+    store.on_message_received(RawMessage(timestamp=2.0, arbitration_id=0x100, data=[7] + [0] * 7))
+    assert store.get_signal("Speed") == 7
+    assert store.get_signals("Speed", message="Rear") == {"Speed": 10}
+    with pytest.raises(KeyError):
+        store.get_signal("Speed", message="Middle")
@@ -0,0 +1,122 @@
+import threading
+import typing
+import pytest
+from jidutest_can.can import PeriodicTaskRegistry
+from jidutest_can.can import RawMessage
+from .util import RecordingBus
+
+
+class Task:
+    """Stands in for a cyclic send task."""
+
+    def __init__(self, arbitration_id: int) -> None:
+        self.arbitration_id = arbitration_id
+
+
+@pytest.fixture
+def bus() -> typing.Iterator[RecordingBus]:
+    bus = RecordingBus()
+    yield bus
+    bus.shutdown()
+
+
+def test_register() -> None:
+    registry = PeriodicTaskRegistry()
+    first, second, other = Task(0x100), Task(0x100), Task(0x200)
+    registry.register(first, "Msg1")
+    registry.register(second)
+    registry.register(other)
+    assert registry.get(0x100) is second
+    assert registry.get_all(0x100) == [first, second]
+    assert registry.get_by_name("Msg1") is second
+    assert registry.get(0x300) is None
+    assert registry.get_by_name("Unknown") is None
+    assert sorted(registry.frame_ids) == [0x100, 0x200]
+    assert 0x200 in registry
+    assert len(registry) == 3
+    # registering a task again makes it the last one
+    registry.register(first)
+    assert registry.get_all(0x100) == [second, first]
+
+
+def test_unregister() -> None:
+    registry = PeriodicTaskRegistry()
+    first, second = Task(0x100), Task(0x100)
+    registry.register(first, "Msg1")
+    registry.register(second)
+    registry.unregister(first)
+    assert registry.get_by_name("Msg1") is second
+    registry.unregister(second)
+    registry.unregister(second)
+    assert 0x100 not in registry
+    assert registry.get_by_name("Msg1") is None
+    registry.register(first)
+    registry.clear()
+    assert len(registry) == 0
+
+
+def test_get_all_returns_a_snapshot() -> None:
+    registry = PeriodicTaskRegistry()
+    task = Task(0x100)
+    registry.register(task)
+    tasks = registry.get_all(0x100)
+    registry.unregister(task)
+    assert tasks == [task]
+
+
+def test_concurrent_access() -> None:
+    registry = PeriodicTaskRegistry()
+    errors = []
+    done = threading.Event()
+
+    def read() -> None:
+        try:
+            while not done.is_set():
+                for task in registry.get_all(0x100):
+                    assert task.arbitration_id == 0x100
+                registry.get(0x100)
+                registry.get_by_name("Msg1")
+                len(registry)
+        except Exception as ex:
+            errors.append(ex)
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    for _ in range(2000):
+        task = Task(0x100)
+        registry.register(task, "Msg1")
+        registry.unregister(task)
+    done.set()
+    for reader in readers:
+        reader.join()
+    assert errors == []
+
+
+def test_bus_registers_its_tasks(bus: RecordingBus) -> None:
+    task = bus.send_periodic(RawMessage(arbitration_id=0x100, data=[1]), 0.01, name="Msg1")
+    assert bus.task_registry.get(0x100) is task
+    assert bus.task_registry.get_by_name("Msg1") is task
+    assert bus.wait_for(1)
+    task.modify_payloads(b"\x02")
+    assert task.payloads == (b"\x02",)
+    sent = len(bus.sent)
+    assert bus.wait_for(sent + 2)
+    assert bus.messages[-1].data == b"\x02"
+    task.stop()
+    assert bus.task_registry.get(0x100) is None
+    unstored = bus.send_periodic(RawMessage(arbitration_id=0x200), 0.01, store_task=False)
+    assert 0x200 not in bus.task_registry
+    unstored.stop()
+
+
+def test_modify_payloads_of_several_messages(bus: RecordingBus) -> None:
+    task = bus.send_periodic([RawMessage(arbitration_id=0x100, data=[index]) for index in range(2)], 0.01)
+    messages = task.messages
+    task.modify_payloads([b"\x05", b"\x06"])
+    assert task.payloads == (b"\x05", b"\x06")
+    # the previous messages are replaced, not modified
+    assert [bytes(msg.data) for msg in messages] == [b"\x00", b"\x01"]
+    with pytest.raises(ValueError):
+        task.modify_payloads([b"\x05"])
+    task.stop()
@@ -0,0 +1,125 @@
+import pathlib
+import threading
+import time
+import typing
+import pytest
+from jidutest_can.can import BLFWriter
+from jidutest_can.can import Listener
+from jidutest_can.can import LogReader
+from jidutest_can.can import RawMessage
+from jidutest_can.can import ThreadedWriter
+
+
+class SlowWriter(Listener):
+    """Writer which only writes after `release` was set."""
+
+    def __init__(self) -> None:
+        self.release = threading.Event()
+        self.batches: typing.List[typing.List[RawMessage]] = []
+        self.stopped = False
+
+    def on_message_received(self, msg: RawMessage) -> None:
+        self.on_messages_received([msg])
+
+    def on_messages_received(self, msgs: typing.Sequence[RawMessage]) -> None:
+        self.release.wait(5)
+        self.batches.append(list(msgs))
+
+    def stop(self) -> None:
+        self.stopped = True
+
+    @property
+    def messages(self) -> typing.List[RawMessage]:
+        return [msg for batch in self.batches for msg in batch]
+
+
+def frames(count: int) -> typing.List[RawMessage]:
+    return [RawMessage(timestamp=index * 0.001, arbitration_id=0x100, data=[index % 256]) for index in range(count)]
+
+
+def test_write_blf(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "trace.blf"
+    writer = ThreadedWriter(BLFWriter(path))
+    messages = frames(1000)
+    for msg in messages:
+        writer.on_message_received(msg)
+    writer.stop()
+    assert writer.written == 1000
+    assert writer.statistics()["written"] == 1000
+    assert "delivered" not in writer.statistics()
+    assert [msg.data for msg in LogReader(path)] == [msg.data for msg in messages]
+
+
+def test_batches() -> None:
+    slow = SlowWriter()
+    writer = ThreadedWriter(slow, batch_size=100)
+    for msg in frames(250):
+        writer.on_message_received(msg)
+    slow.release.set()
+    writer.stop()
+    assert slow.stopped
+    assert [msg.data[0] for msg in slow.messages] == [index % 256 for index in range(250)]
+    assert max(len(batch) for batch in slow.batches) <= 100
+
+
+def test_drop_when_full() -> None:
+    slow = SlowWriter()
+    writer = ThreadedWriter(slow, max_queue_size=10, overflow="drop")
+    for msg in frames(100):
+        writer.on_message_received(msg)
+    slow.release.set()
+    writer.stop()
+    statistics = writer.statistics()
+    assert statistics["received"] == 100
+    assert statistics["dropped"] > 0
+    assert statistics["written"] + statistics["dropped"] == 100
+    assert len(slow.messages) == statistics["written"]
+
+
+def test_block_when_full() -> None:
+    slow = SlowWriter()
+    writer = ThreadedWriter(slow, max_queue_size=10, overflow="block")
+    timer = threading.Timer(0.1, slow.release.set)
+    timer.start()
+    for msg in frames(100):
+        writer.on_message_received(msg)
+    writer.stop()
+    timer.join()
+    assert writer.dropped == 0
+    assert writer.blocked > 0
+    assert writer.blocked_time > 0
+    assert len(slow.messages) == 100
+
+
+def test_unknown_overflow() -> None:
+    with pytest.raises(ValueError):
+        ThreadedWriter(SlowWriter(), overflow="drop_oldest")
+
+
+def test_stop_timeout() -> None:
+    slow = SlowWriter()
+    writer = ThreadedWriter(slow)
+    for msg in frames(10):
+        writer.on_message_received(msg)
+    writer.stop(timeout=0.05)
+    assert not slow.stopped
+    # a later stop() waits for the writer thread again
+    slow.release.set()
+    writer.stop()
+    assert slow.stopped
+    assert len(slow.messages) == 10
+
+
+def test_writer_is_stopped_after_timeout() -> None:
+    slow = SlowWriter()
+    writer = ThreadedWriter(slow)
+    for msg in frames(10):
+        writer.on_message_received(msg)
+    writer.stop(timeout=0.05)
+    slow.release.set()
+    # without a later stop(), the writer thread stops the writer when done
+    deadline = time.monotonic() + 5
+    while not slow.stopped and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert slow.stopped
+    assert len(slow.messages) == 10
@@ -0,0 +1,79 @@
+import typing
+import pytest
+from jidutest_can.can import RawMessage
+
+try:
+    from jidutest_can.can.interfaces.tosun import tosun
+except OSError:
+    pytest.skip("The TOSUN driver library is not available", allow_module_level=True)
+
+
+class FakeDriver:
+    """Stands in for receive_canfd_msgs, returning the frames of `reads` one
+    driver call after another."""
+
+    def __init__(self, reads: typing.List[typing.List[int]]) -> None:
+        self.reads = list(reads)
+        self.calls = 0
+
+    def __call__(self, handle, buffer, buffer_size, channel, mode) -> int:
+        self.calls += 1
+        identifiers = self.reads.pop(0) if self.reads else []
+        size = buffer_size._obj
+        assert size.value == len(buffer)
+        identifiers = identifiers[:size.value]
+        for index, identifier in enumerate(identifiers):
+            buffer[index].FIdentifier = identifier
+            buffer[index].FDLC = 1
+            buffer[index].FData[0] = index
+            buffer[index].FTimeUs = identifier
+        size.value = len(identifiers)
+        return 0
+
+
+@pytest.fixture
+def make_bus(monkeypatch: pytest.MonkeyPatch) -> typing.Callable[..., "tosun.ToSunBus"]:
+    def get_device_info(self) -> list:
+        self.channels = [1]
+        return [["TOSUN", "TC1016", "0", [1]]]
+
+    monkeypatch.setattr(tosun.ToSunBus, "initialize", lambda self: None)
+    monkeypatch.setattr(tosun.ToSunBus, "scan_device", lambda self: 1)
+    monkeypatch.setattr(tosun.ToSunBus, "get_device_info", get_device_info)
+
+    def make_bus(reads: typing.List[typing.List[int]], **kwargs) -> tosun.ToSunBus:
+        monkeypatch.setattr(tosun, "receive_canfd_msgs", FakeDriver(reads))
+        # show: skip connecting to the device
+        return tosun.ToSunBus(channel=1, show=True, **kwargs)
+
+    return make_bus
+
+
+def test_recv_reads_batches(make_bus) -> None:
+    bus = make_bus([[0x100, 0x101, 0x102]], rx_batch_size=8)
+    assert [bus.recv(0).arbitration_id for _ in range(3)] == [0x100, 0x101, 0x102]
+    # one driver call for all three frames
+    assert tosun.receive_canfd_msgs.calls == 1
+    assert bus.recv(0) is None
+
+
+def test_recv_batch(make_bus) -> None:
+    bus = make_bus([list(range(0x100, 0x105)), [0x200]], rx_batch_size=4)
+    batch = bus.recv_batch(timeout=0)
+    assert [msg.arbitration_id for msg in batch] == [0x100, 0x101, 0x102, 0x103]
+    assert all(isinstance(msg, RawMessage) and msg.channel == "TOSUN_CANBUS1" for msg in batch)
+    assert [msg.arbitration_id for msg in bus.recv_batch(max_messages=2, timeout=0)] == [0x200]
+
+
+def test_recv_batch_applies_filters(make_bus) -> None:
+    bus = make_bus([[0x100, 0x200, 0x101]], can_filters=[{"can_id": 0x100, "can_mask": 0x700}])
+    assert [msg.arbitration_id for msg in bus.recv_batch(timeout=0)] == [0x100, 0x101]
+
+
+def test_recv_backs_off_until_timeout(make_bus, monkeypatch: pytest.MonkeyPatch) -> None:
+    sleeps = []
+    monkeypatch.setattr(tosun.time, "sleep", sleeps.append)
+    bus = make_bus([[], [], [], [0x100]])
+    assert bus.recv(1).arbitration_id == 0x100
+    assert sleeps == [tosun.RX_BACKOFF_MIN, 2 * tosun.RX_BACKOFF_MIN, 4 * tosun.RX_BACKOFF_MIN]
+    assert bus.recv_batch(timeout=0) == []
@@ -0,0 +1,67 @@
+import threading
+import time
+from jidutest_can.can import FrameWaiter
+from jidutest_can.can import RawMessage
+
+
+def test_subscription_gets_matching_frames_only() -> None:
+    waiter = FrameWaiter()
+    with waiter.subscribe(0x100, 0x101) as subscription:
+        waiter.on_message_received(RawMessage(arbitration_id=0x100))
+        waiter.on_message_received(RawMessage(arbitration_id=0x200))
+        waiter.on_message_received(RawMessage(arbitration_id=0x101))
+        assert [msg.arbitration_id for msg in subscription.get_all()] == [0x100, 0x101]
+
+
+def test_wildcard_subscription() -> None:
+    waiter = FrameWaiter()
+    with waiter.subscribe() as subscription:
+        waiter.on_message_received(RawMessage(arbitration_id=0x7FF))
+        assert subscription.get(timeout=0).arbitration_id == 0x7FF
+
+
+def test_get_times_out() -> None:
+    waiter = FrameWaiter()
+    with waiter.subscribe(0x100) as subscription:
+        started = time.monotonic()
+        assert subscription.get(timeout=0.05) is None
+        assert time.monotonic() - started >= 0.05
+
+
+def test_get_wakes_up_on_frame() -> None:
+    waiter = FrameWaiter()
+    subscription = waiter.subscribe(0x100)
+    timer = threading.Timer(0.05, waiter.on_message_received, (RawMessage(arbitration_id=0x100),))
+    timer.start()
+    try:
+        assert subscription.get(timeout=5).arbitration_id == 0x100
+    finally:
+        timer.cancel()
+        subscription.close()
+
+
+def test_bounded_subscription_drops_oldest() -> None:
+    waiter = FrameWaiter()
+    with waiter.subscribe(0x100, maxsize=2) as subscription:
+        for index in range(3):
+            waiter.on_message_received(RawMessage(arbitration_id=0x100, data=[index]))
+        assert subscription.dropped == 1
+        assert [msg.data[0] for msg in subscription.get_all()] == [1, 2]
+
+
+def test_close_unsubscribes_and_wakes_up() -> None:
+    waiter = FrameWaiter()
+    subscription = waiter.subscribe(0x100)
+    threading.Timer(0.05, subscription.close).start()
+    assert subscription.get() is None
+    assert waiter.subscriptions == []
+    waiter.on_message_received(RawMessage(arbitration_id=0x100))
+    assert subscription.qsize() == 0
+
+
+def test_stop_refuses_new_subscriptions() -> None:
+    waiter = FrameWaiter()
+    subscription = waiter.subscribe(0x100)
+    waiter.stop()
+    assert subscription.closed
+    assert waiter.subscribe(0x100).closed
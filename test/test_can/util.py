@@ -0,0 +1,50 @@
+import threading
+import time
+import typing
+from jidutest_can.can import RawMessage
+from jidutest_can.can.interfaces import BusABC
+
+
+class RecordingBus(BusABC):
+    """A bus which records the sent messages with the time they were sent
+    and receives nothing."""
+
+    def __init__(self, channel: typing.Any = "PCAN_USBBUS1",
+                 fail: typing.Optional[typing.Callable[[RawMessage], bool]] = None, **kwargs: typing.Any) -> None:
+        """
+        :param channel: The channel info of the bus.
+        :param fail: Sending raises an :class:`OSError` for the messages it
+                     returns ``True`` for.
+        """
+        super().__init__(channel=channel, **kwargs)
+        self.channel_info = channel
+        self.fail = fail
+        self.sent: typing.List[typing.Tuple[float, RawMessage]] = []
+        self.lock = threading.Lock()
+
+    def send(self, msg: RawMessage, timeout: typing.Optional[float] = None) -> None:
+        if self.fail is not None and self.fail(msg):
+            raise OSError(f"Unable to send 0x{msg.arbitration_id:X}")
+        with self.lock:
+            self.sent.append((time.perf_counter(), RawMessage(
+                timestamp=msg.timestamp, arbitration_id=msg.arbitration_id, is_extended_id=msg.is_extended_id,
+                channel=msg.channel, data=bytes(msg.data), is_fd=msg.is_fd)))
+
+    def _recv_internal(self, timeout: typing.Optional[float]) -> typing.Tuple[None, bool]:
+        if timeout:
+            time.sleep(min(timeout, 0.01))
+        return None, False
+
+    @property
+    def messages(self) -> typing.List[RawMessage]:
+        with self.lock:
+            return [msg for _, msg in self.sent]
+
+    def wait_for(self, count: int, timeout: float = 5.0) -> bool:
+        """Wait until at least `count` messages were sent."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if len(self.sent) >= count:
+                return True
+            time.sleep(0.005)
+        return False
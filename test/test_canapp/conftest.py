@@ -0,0 +1,21 @@
+import os
+import typing
+import pytest
+from jidutest_can.cantools import registry
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database_cache_dir(tmp_path_factory: pytest.TempPathFactory) -> typing.Iterator[str]:
+    """The controllers share their databases through a registry whose cache
+    is kept out of the home directory of the user."""
+    cache_dir = str(tmp_path_factory.mktemp("databases"))
+    previous = os.environ.get(registry.CACHE_DIR_ENVIRONMENT_VARIABLE)
+    os.environ[registry.CACHE_DIR_ENVIRONMENT_VARIABLE] = cache_dir
+    registry._registry = None
+    yield cache_dir
+    registry.get_registry().close()
+    registry._registry = None
+    if previous is None:
+        del os.environ[registry.CACHE_DIR_ENVIRONMENT_VARIABLE]
+    else:
+        os.environ[registry.CACHE_DIR_ENVIRONMENT_VARIABLE] = previous
@@ -0,0 +1,101 @@
+import asyncio
+import pathlib
+import typing
+import pytest
+from jidutest_can.can import CanOperationError
+from jidutest_can.can import RawMessage
+from jidutest_can.can.interfaces.virtual import VirtualBus
+from jidutest_can.canapp import AsyncCanController
+
+
+DBC_PATH = pathlib.Path(__file__).parent.parent / "resource" / "e2e.dbc"
+CHANNEL = "test_async_controller"
+
+
+@pytest.fixture
+def peer() -> typing.Iterator[VirtualBus]:
+    bus = VirtualBus(channel=CHANNEL)
+    yield bus
+    bus.shutdown()
+
+
+def run(peer: VirtualBus, test: typing.Callable[[AsyncCanController], typing.Awaitable[typing.Any]]) -> typing.Any:
+    """Run `test` with a connected controller inside a new event loop."""
+    async def main() -> typing.Any:
+        controller = AsyncCanController("test", "pcan", 1, db_path=DBC_PATH, bus=VirtualBus(channel=CHANNEL))
+        await controller.connect()
+        try:
+            return await test(controller)
+        finally:
+            await controller.disconnect()
+
+    return asyncio.run(main())
+
+
+def msg1(controller: AsyncCanController, **signals: typing.Any) -> RawMessage:
+    message = controller.db.get_message_by_name("Msg1")
+    values = {signal.name: 0 for signal in message.signals}
+    values.update(signals)
+    return RawMessage(arbitration_id=message.frame_id, data=message.encode(values))
+
+
+def send_later(peer: VirtualBus, *msgs: RawMessage, delay: float = 0.05) -> None:
+    def send() -> None:
+        for msg in msgs:
+            peer.send(msg)
+
+    asyncio.get_running_loop().call_later(delay, send)
+
+
+def test_receive_signals(peer: VirtualBus) -> None:
+    async def test(controller: AsyncCanController) -> typing.Any:
+        send_later(peer, msg1(controller, Speed=10), msg1(controller, Speed=10), msg1(controller, Speed=20))
+        return await controller.receive_signals("Speed", "Unknown", duration=5, num=3)
+
+    assert run(peer, test) == [{"Speed": 10}, {"Speed": 20}]
+
+
+def test_receive_signals_without_valid_signal(peer: VirtualBus) -> None:
+    async def test(controller: AsyncCanController) -> typing.Any:
+        return await controller.receive_signals("Unknown", duration=0.05)
+
+    assert run(peer, test) is None
+
+
+def test_wait_for_signal(peer: VirtualBus) -> None:
+    async def test(controller: AsyncCanController) -> typing.Any:
+        send_later(peer, msg1(controller, Mode=1), msg1(controller, Mode=2))
+        return await controller.wait_for_signal("Mode", 2, timeout=5)
+
+    assert run(peer, test) == 2
+
+
+def test_wait_for_signals_concurrently(peer: VirtualBus) -> None:
+    async def test(controller: AsyncCanController) -> typing.Any:
+        send_later(peer, msg1(controller, Speed=20), RawMessage(arbitration_id=0x101, data=bytes(8)))
+        return await asyncio.gather(
+            controller.wait_for_signal("Speed", timeout=5),
+            controller.wait_for_signal("Other", timeout=5),
+            controller.wait_for_signal("Flag", 1, timeout=0.2),
+        )
+
+    assert run(peer, test) == [20, 0, None]
+
+
+def test_send_signals(peer: VirtualBus) -> None:
+    async def test(controller: AsyncCanController) -> typing.Any:
+        await controller.send_signals(Speed=30)
+        raw_message = peer.recv(5)
+        controller.stop_sending()
+        # the values sent are raw values
+        return controller.db.get_message_by_name("Msg1").decode(raw_message.data, scaling=False)["Speed"]
+
+    assert run(peer, test) == 30
+
+
+def test_start_receiving_without_event_loop() -> None:
+    bus = VirtualBus(channel=CHANNEL)
+    controller = AsyncCanController("test", "pcan", 1, db_path=DBC_PATH, bus=bus)
+    with pytest.raises(CanOperationError):
+        controller.start_receiving()
+    bus.shutdown()
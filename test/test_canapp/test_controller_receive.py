@@ -0,0 +1,108 @@
+import pathlib
+import threading
+import time
+import typing
+import pytest
+from jidutest_can.can import RawMessage
+from jidutest_can.can.interfaces.virtual import VirtualBus
+from jidutest_can.canapp import CanController
+
+
+DBC_PATH = pathlib.Path(__file__).parent.parent / "resource" / "e2e.dbc"
+
+
+@pytest.fixture
+def peer() -> typing.Iterator[VirtualBus]:
+    bus = VirtualBus(channel="test_controller_receive")
+    yield bus
+    bus.shutdown()
+
+
+@pytest.fixture
+def controller(peer: VirtualBus) -> typing.Iterator[CanController]:
+    controller = CanController("test", "pcan", 1, db_path=DBC_PATH,
+                               bus=VirtualBus(channel="test_controller_receive"))
+    controller.connect()
+    yield controller
+    controller.disconnect()
+
+
+def send_later(peer: VirtualBus, *msgs: RawMessage, delay: float = 0.05) -> threading.Timer:
+    def send() -> None:
+        for msg in msgs:
+            peer.send(msg)
+
+    timer = threading.Timer(delay, send)
+    timer.start()
+    return timer
+
+
+def msg1(controller: CanController, **signals: typing.Any) -> RawMessage:
+    message = controller.db.get_message_by_name("Msg1")
+    values = {signal.name: 0 for signal in message.signals}
+    values.update(signals)
+    return RawMessage(arbitration_id=message.frame_id, data=message.encode(values))
+
+
+def test_receive_message_once(controller: CanController, peer: VirtualBus) -> None:
+    send_later(peer, RawMessage(arbitration_id=0x200), RawMessage(arbitration_id=0x101))
+    assert controller.receive_message_once(0x101, timeout=5).arbitration_id == 0x101
+
+
+def test_receive_message_once_timeout(controller: CanController) -> None:
+    assert controller.receive_message_once(0x101, timeout=0.05) is None
+
+
+def test_receive_once_timeout_zero_waits(controller: CanController, peer: VirtualBus) -> None:
+    # as before the subscriptions, a timeout of 0 waits until the message arrives
+    send_later(peer, RawMessage(arbitration_id=0x101), delay=0.2)
+    assert controller.receive_message_once(0x101, timeout=0).arbitration_id == 0x101
+    send_later(peer, msg1(controller, Speed=100), delay=0.2)
+    assert controller.receive_signals_once("Speed", timeout=0) == {"Speed": 100}
+
+
+def test_receive_messages_with_num(controller: CanController, peer: VirtualBus) -> None:
+    send_later(peer, *[RawMessage(arbitration_id=0x100, data=[index]) for index in range(5)])
+    messages = controller.receive_messages("0x100", duration=5, num=3)
+    assert len(messages) == 3
+
+
+def test_receive_signals_once(controller: CanController, peer: VirtualBus) -> None:
+    send_later(peer, msg1(controller, Speed=100, Mode=2))
+    assert controller.receive_signals_once("Speed", "Mode", timeout=5) == {"Speed": 100, "Mode": 2}
+
+
+def test_receive_signals_once_of_different_messages(controller: CanController) -> None:
+    assert controller.receive_signals_once("Speed", "Other", timeout=0.05) is None
+
+
+def test_receive_signals_skips_repeated_values(controller: CanController, peer: VirtualBus) -> None:
+    send_later(peer, msg1(controller, Speed=10), msg1(controller, Speed=10), msg1(controller, Speed=20))
+    signals = controller.receive_signals("Speed", duration=5, num=3)
+    assert signals == [{"Speed": 10}, {"Speed": 20}]
+
+
+def test_wait_for_signal_value(controller: CanController, peer: VirtualBus) -> None:
+    send_later(peer, msg1(controller, Mode=1), msg1(controller, Mode=2))
+    assert controller.wait_for_signal("Mode", 2, timeout=5) == 2
+
+
+def test_wait_for_signal_timeout(controller: CanController) -> None:
+    assert controller.wait_for_signal("Speed", timeout=0.05) is None
+
+
+def test_wait_for_unknown_signal(controller: CanController) -> None:
+    with pytest.raises(KeyError):
+        controller.wait_for_signal("Unknown", timeout=0.05)
+
+
+def test_get_signal(controller: CanController, peer: VirtualBus) -> None:
+    assert controller.get_signal("Speed", default=-1) == -1
+    peer.send(msg1(controller, Speed=30, Mode=1))
+    deadline = time.time() + 5
+    while controller.get_message_state(0x100) is None and time.time() < deadline:
+        time.sleep(0.01)
+    assert controller.get_signal("Speed") == 30
+    assert controller.get_signal("Mode", message="Msg1") == 1
+    assert controller.get_signals("Speed", "Other") == {"Speed": 30}
+    assert controller.get_message_state("0x100").count == 1
@@ -0,0 +1,74 @@
+import pathlib
+import typing
+import pytest
+from jidutest_can.can import RawMessage
+from jidutest_can.can.tools.e2e import E2EPlan
+from jidutest_can.can.interfaces.virtual import VirtualBus
+from jidutest_can.canapp import CanController
+
+
+DBC_PATH = pathlib.Path(__file__).parent.parent / "resource" / "e2e.dbc"
+CHANNEL = "test_controller_send"
+
+
+@pytest.fixture
+def peer() -> typing.Iterator[VirtualBus]:
+    bus = VirtualBus(channel=CHANNEL)
+    yield bus
+    bus.shutdown()
+
+
+@pytest.fixture
+def controller(peer: VirtualBus) -> typing.Iterator[CanController]:
+    controller = CanController("test", "pcan", 1, db_path=DBC_PATH, bus=VirtualBus(channel=CHANNEL))
+    controller.connect()
+    yield controller
+    controller.stop_sending()
+    controller.disconnect()
+
+
+def receive(controller: CanController, peer: VirtualBus, frame_id: int, count: int) -> typing.List[dict]:
+    """Return the raw signals of the next `count` frames of `frame_id` sent
+    to `peer`."""
+    message = controller.db.get_message_by_frame_id(frame_id)
+    decoded = []
+    while len(decoded) < count:
+        msg: typing.Optional[RawMessage] = peer.recv(5)
+        assert msg is not None
+        if msg.arbitration_id == frame_id:
+            decoded.append(message.decode(msg.data, decode_choices=False, scaling=False))
+    return decoded
+
+
+def test_modify_sending_signals(controller: CanController, peer: VirtualBus) -> None:
+    controller.send_signals(Speed=30)
+    assert receive(controller, peer, 0x100, 1)[0]["Speed"] == 30
+    # unlike send_signals(), modify_sending_signals() takes physical values
+    controller.modify_sending_signals(Speed=40, Mode=1)
+    # frames queued before the modification may still carry the old value
+    signals = receive(controller, peer, 0x100, 5)[-1]
+    assert (signals["Speed"], signals["Mode"]) == ((40 + 10) / 0.5, 1)
+    assert len(controller.bus.task_registry.get_all(0x100)) == 1
+
+
+def test_modify_signals_not_being_sent(controller: CanController) -> None:
+    controller.modify_sending_signals(Other=1)
+    assert 0x101 not in controller.bus.task_registry
+
+
+def test_e2e_protection_across_modifications(controller: CanController, peer: VirtualBus) -> None:
+    message = controller.db.get_message_by_name("Msg1")
+    plan = E2EPlan(message)
+    controller.send_signals(Speed=30)
+    frames = receive(controller, peer, 0x100, 3)
+    controller.modify_sending_signals(Speed=40)
+    frames += receive(controller, peer, 0x100, 5)
+    for signals in frames:
+        for group in plan.groups:
+            counter = signals[group.cntr_name]
+            assert signals[group.chks_name] == group.checksum(counter, [signals[field.name] for field in group.fields])
+    counters = [signals["Grp1Cntr"] for signals in frames]
+    # one frame is stored, the counters continue across the modification
+    assert counters == [(counters[0] + index) % 15 for index in range(len(counters))]
+    assert len(controller.bus.task_registry.get(0x100).messages) == 1
+    assert frames[-1]["Speed"] == 100
@@ -0,0 +1,109 @@
+import json
+import pathlib
+import pytest
+from jidutest_can.can import BLFWriter
+from jidutest_can.can import LogReader
+from jidutest_can.can import RawMessage
+from jidutest_can.canapp import CanLogManager
+from jidutest_can.cantools import load_file
+
+
+DBC_PATH = pathlib.Path(__file__).parent.parent / "resource" / "e2e.dbc"
+
+
+@pytest.fixture
+def log_file(tmp_path: pathlib.Path) -> pathlib.Path:
+    db = load_file(DBC_PATH)
+    msg1 = db.get_message_by_name("Msg1")
+    msg2 = db.get_message_by_name("Msg2")
+    path = tmp_path / "trace.blf"
+    with BLFWriter(path) as writer:
+        for index in range(10):
+            signals = {signal.name: 0 for signal in msg1.signals}
+            signals["Speed"] = index
+            writer.on_message_received(RawMessage(timestamp=1.0 + index * 0.1, arbitration_id=msg1.frame_id,
+                                                  data=msg1.encode(signals)))
+            writer.on_message_received(RawMessage(timestamp=1.05 + index * 0.1, arbitration_id=msg2.frame_id,
+                                                  data=msg2.encode({"NoIdChks": 0, "NoIdCntr": 0, "Other": index})))
+        # Msg1 with an extra bit above the mask, see test_frame_id_mask
+        writer.on_message_received(RawMessage(timestamp=3.0, arbitration_id=0x500, data=bytes(8)))
+    return path
+
+
+def read_lines(path: pathlib.Path) -> list:
+    with open(path, encoding="utf-8") as lines:
+        return [json.loads(line) for line in lines]
+
+
+def test_json(log_file: pathlib.Path, tmp_path: pathlib.Path) -> None:
+    dest_file = tmp_path / "trace.json"
+    CanLogManager.log_parse(log_file, DBC_PATH, dest_file)
+    with open(dest_file, encoding="utf-8") as output:
+        parsed = json.load(output)
+    # BLF stores timestamps relative to the first frame
+    timestamps = [str(m.timestamp) for m in LogReader(log_file)]
+    assert list(parsed) == timestamps
+    assert parsed[timestamps[2]]["Msg1"]["Speed"] == 1
+    assert parsed[timestamps[3]]["Msg2"]["Other"] == 1
+
+
+def test_jsonl_with_message_filter(log_file: pathlib.Path, tmp_path: pathlib.Path) -> None:
+    dest_file = tmp_path / "trace.jsonl"
+    CanLogManager.log_parse(log_file, DBC_PATH, dest_file, "jsonl", messages=["Msg2"])
+    records = read_lines(dest_file)
+    assert [record["Msg2"]["Other"] for record in records] == list(range(10))
+    assert all("Msg1" not in record for record in records)
+
+
+def test_jsonl_with_signal_filter(log_file: pathlib.Path, tmp_path: pathlib.Path) -> None:
+    dest_file = tmp_path / "trace.jsonl"
+    CanLogManager.log_parse(log_file, DBC_PATH, dest_file, "jsonl", messages=[0x100], signals=["Speed"])
+    records = read_lines(dest_file)
+    assert [record["Msg1"] for record in records] == [{"Speed": index} for index in range(10)]
+
+
+def test_jsonl_window(log_file: pathlib.Path, tmp_path: pathlib.Path) -> None:
+    dest_file = tmp_path / "trace.jsonl"
+    CanLogManager.log_parse(log_file, DBC_PATH, dest_file, "jsonl", signals=["Speed", "Other"], window=0.5)
+    records = read_lines(dest_file)
+    start = next(iter(LogReader(log_file))).timestamp
+    assert [record["timestamp"] for record in records] == pytest.approx([start, start + 0.5])
+    assert records[0]["messages"] == {"Msg1": {"Speed": 4}, "Msg2": {"Other": 4}}
+    assert records[1]["messages"] == {"Msg1": {"Speed": 9}, "Msg2": {"Other": 9}}
+
+
+def test_unknown_filter(log_file: pathlib.Path, tmp_path: pathlib.Path) -> None:
+    with pytest.raises(ValueError):
+        CanLogManager.log_parse(log_file, DBC_PATH, tmp_path / "trace.jsonl", "jsonl", messages=["Unknown"])
+    with pytest.raises(ValueError):
+        CanLogManager.log_parse(log_file, DBC_PATH, tmp_path / "trace.jsonl", "jsonl", signals=["Unknown"])
+
+
+def test_frame_id_mask(log_file: pathlib.Path, tmp_path: pathlib.Path) -> None:
+    dest_file = tmp_path / "trace.jsonl"
+    CanLogManager.log_parse(log_file, DBC_PATH, dest_file, "jsonl", messages=["Msg1"], frame_id_mask=0x3FF)
+    records = read_lines(dest_file)
+    assert len(records) == 11
+    assert records[-1]["0x500"]
+    assert records[-1]["Msg1"]["Speed"] == -10
+
+    dest_file = tmp_path / "unmasked.jsonl"
+    CanLogManager.log_parse(log_file, DBC_PATH, dest_file, "jsonl", messages=["Msg1"])
+    assert len(read_lines(dest_file)) == 10
+
+
+def test_parallel_jobs(log_file: pathlib.Path, tmp_path: pathlib.Path) -> None:
+    CanLogManager.log_parse(log_file, DBC_PATH, tmp_path / "sequential.jsonl", "jsonl", messages=["Msg1"],
+                            frame_id_mask=0x3FF)
+    CanLogManager.log_parse(log_file, DBC_PATH, tmp_path / "parallel.jsonl", "jsonl", messages=["Msg1"],
+                            frame_id_mask=0x3FF, jobs=2)
+    assert read_lines(tmp_path / "parallel.jsonl") == read_lines(tmp_path / "sequential.jsonl")
+
+
+def test_npz_with_signal_filter(log_file: pathlib.Path, tmp_path: pathlib.Path) -> None:
+    np = pytest.importorskip("numpy")
+    dest_file = tmp_path / "trace.npz"
+    CanLogManager.log_parse(log_file, DBC_PATH, dest_file, "npz", chunk_size=4, signals=["Other"])
+    with np.load(dest_file) as columns:
+        assert sorted(columns.files) == ["Msg2/Other", "Msg2/timestamp"]
+        np.testing.assert_array_equal(columns["Msg2/Other"], np.arange(10))
@@ -0,0 +1,170 @@
+import typing
+import pytest
+from jidutest_can.can import RawMessage
+from jidutest_can.can.tools.e2e import E2EPlan
+from jidutest_can.canapp import CanController
+from jidutest_can.canapp import RestBusSimulation
+from jidutest_can.cantools import Database
+from jidutest_can.cantools.database import EncodeError
+from test.test_can.util import RecordingBus
+
+
+RESTBUS_DBC = '''VERSION ""
+
+BU_: ECU1 ECU2 ECU3
+
+BO_ 256 Status: 8 ECU1
+ SG_ StatusChks : 7|8@0+ (1,0) [0|255] "" ECU3
+ SG_ StatusCntr : 11|4@0+ (1,0) [0|14] "" ECU3
+ SG_ Speed : 23|12@0+ (0.5,-10) [-10|2037.5] "km/h" ECU3
+ SG_ Speed_UB : 24|1@1+ (1,0) [0|1] "" ECU3
+ SG_ Level : 32|8@1+ (1,0) [0|255] "" ECU3
+
+BO_ 257 Event: 8 ECU1
+ SG_ Button : 0|8@1+ (1,0) [0|255] "" ECU3
+
+BO_ 258 Fast: 8 ECU2
+ SG_ Mode : 0|8@1+ (1,0) [0|3] "" ECU3
+
+BO_ 259 Other: 8 ECU3
+ SG_ Value : 0|8@1+ (1,0) [0|255] "" ECU1
+
+BA_DEF_ BO_ "GenMsgCycleTime" INT 0 10000;
+BA_DEF_ BO_ "GenMsgSendType" ENUM "Cyclic","Event";
+BA_DEF_ SG_ "GenSigStartValue" FLOAT 0 100000;
+BA_DEF_ SG_ "GenSigDataID" STRING ;
+BA_DEF_DEF_ "GenMsgCycleTime" 0;
+BA_DEF_DEF_ "GenMsgSendType" "Cyclic";
+BA_DEF_DEF_ "GenSigStartValue" 0;
+BA_DEF_DEF_ "GenSigDataID" "";
+BA_ "GenMsgCycleTime" BO_ 256 10;
+BA_ "GenMsgCycleTime" BO_ 257 10;
+BA_ "GenMsgSendType" BO_ 257 1;
+BA_ "GenMsgCycleTime" BO_ 258 5;
+BA_ "GenMsgCycleTime" BO_ 259 10;
+BA_ "GenSigStartValue" SG_ 256 Level 42;
+BA_ "GenSigDataID" SG_ 256 StatusChks "0x30";
+VAL_ 258 Mode 0 "Off" 1 "On" ;
+SIG_GROUP_ 256 Grp 1 : StatusChks StatusCntr Speed Speed_UB Level;
+'''
+
+
+@pytest.fixture(scope="module")
+def db() -> Database:
+    database = Database()
+    database.add_dbc_string(RESTBUS_DBC)
+    return database
+
+
+@pytest.fixture
+def bus() -> typing.Iterator[RecordingBus]:
+    bus = RecordingBus()
+    yield bus
+    bus.shutdown()
+
+
+def frames_of(bus: RecordingBus, frame_id: int) -> typing.List[RawMessage]:
+    return [msg for msg in bus.messages if msg.arbitration_id == frame_id]
+
+
+def test_messages(bus: RecordingBus, db: Database) -> None:
+    simulation = RestBusSimulation(bus, db, "ECU1", "ECU2")
+    assert sorted(simulation.messages) == ["Event", "Fast", "Status"]
+    assert sorted(simulation.cyclic_messages) == ["Fast", "Status"]
+    assert simulation.get_message("Status").period == 0.01
+    assert simulation.get_message("Status").generator
+    assert simulation.get_message("Fast").generator is None
+    with pytest.raises(KeyError):
+        simulation.get_message("Other")
+    with pytest.raises(ValueError):
+        RestBusSimulation(bus, db, "ECU4")
+    with pytest.raises(ValueError):
+        RestBusSimulation(bus, db)
+
+
+def test_sends_cyclic_messages(bus: RecordingBus, db: Database) -> None:
+    with RestBusSimulation(bus, db, "ECU1", "ECU2") as simulation:
+        assert simulation.is_running
+        assert bus.wait_for(30)
+    assert not simulation.is_running
+    assert bus.task_registry.frame_ids == []
+    assert frames_of(bus, 0x101) == []
+    assert frames_of(bus, 0x103) == []
+    status = db.get_message_by_name("Status")
+    group = E2EPlan(status).groups[0]
+    frames = frames_of(bus, 0x100)
+    assert frames
+    for index, msg in enumerate(frames):
+        raw = status.decode(msg.data, decode_choices=False, scaling=False)
+        # the initial values, _UB signals set to 1
+        assert (raw["Level"], raw["Speed_UB"]) == (42, 1)
+        assert raw["StatusCntr"] == index % 15
+        assert raw["StatusChks"] == group.checksum(raw["StatusCntr"],
+                                                   [raw[field.name] for field in group.fields])
+    assert frames_of(bus, 0x102)
+
+
+def test_set_signals(bus: RecordingBus, db: Database) -> None:
+    simulation = RestBusSimulation(bus, db, "ECU1", "ECU2")
+    simulation.start()
+    simulation.set_signals({"Speed": 100}, Mode="On")
+    assert simulation.get_signals("Speed", "Mode") == {"Speed": 100, "Mode": 1}
+    sent = len(bus.sent)
+    assert bus.wait_for(sent + 10)
+    simulation.stop()
+    assert db.get_message_by_name("Status").decode(frames_of(bus, 0x100)[-1].data)["Speed"] == 100
+    assert frames_of(bus, 0x102)[-1].data[0] == 1
+    with pytest.raises(KeyError):
+        simulation.set_signals(Value=1)
+    with pytest.raises(EncodeError):
+        simulation.set_signals(Mode=10)
+    with pytest.raises(KeyError):
+        simulation.get_signals("Value")
+
+
+def test_enable_and_disable(bus: RecordingBus, db: Database) -> None:
+    simulation = RestBusSimulation(bus, db, "ECU1", "ECU2")
+    simulation.disable("Fast")
+    assert not simulation.is_enabled("Fast")
+    simulation.start()
+    assert bus.wait_for(5)
+    assert bus.task_registry.frame_ids == [0x100]
+    simulation.enable("Fast")
+    assert sorted(bus.task_registry.frame_ids) == [0x100, 0x102]
+    simulation.disable()
+    assert bus.task_registry.frame_ids == []
+    simulation.stop()
+    # disabled messages are not started again
+    simulation.start()
+    assert bus.task_registry.frame_ids == []
+    simulation.stop()
+
+
+def test_trigger(bus: RecordingBus, db: Database) -> None:
+    simulation = RestBusSimulation(bus, db, "ECU1")
+    simulation.set_signals(Button=7)
+    simulation.trigger("Event", "Status", "Status")
+    assert [msg.arbitration_id for msg in bus.messages] == [0x101, 0x100, 0x100]
+    assert bus.messages[0].data[0] == 7
+    status = db.get_message_by_name("Status")
+    counters = [status.decode(msg.data)["StatusCntr"] for msg in frames_of(bus, 0x100)]
+    assert counters == [0, 1]
+    with pytest.raises(KeyError):
+        simulation.trigger("Other")
+
+
+def test_controller(tmp_path) -> None:
+    db_path = tmp_path / "restbus.dbc"
+    db_path.write_text(RESTBUS_DBC)
+    bus = RecordingBus()
+    controller = CanController("test", "pcan", 1, db_path=db_path, bus=bus)
+    controller.connect()
+    try:
+        simulation = controller.start_rest_bus_simulation("ECU2")
+        assert simulation.is_running
+        assert bus.wait_for(5)
+        controller.stop_sending()
+        assert not simulation.is_running
+        assert bus.task_registry.frame_ids == []
+    finally:
+        controller.disconnect()
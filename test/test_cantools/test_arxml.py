@@ -0,0 +1,88 @@
+import pathlib
+import pytest
+from xml.etree import ElementTree
+from jidutest_can.cantools import Database
+from jidutest_can.cantools.formats import arxml
+from jidutest_can.cantools.formats.arxml.system_loader import SystemLoader
+from jidutest_can.cantools.formats.arxml.utils import iterparse_arxml
+
+
+ARXML_PATH = pathlib.Path(__file__).parent.parent / "resource" / "system.arxml"
+NAMESPACE = "{http://autosar.org/schema/r4.0}"
+
+
+def describe(database) -> list:
+    """The loaded messages and signals as comparable values."""
+    return [
+        (message.name, message.frame_id, message.length, message.cycle_time,
+         [(signal.name, signal.start, signal.length, signal.byte_order, signal.scale,
+           signal.offset, signal.initial, signal.unit, signal.choices)
+          for signal in message.signals])
+        for message in database.messages
+    ]
+
+
+def test_load() -> None:
+    database = arxml.load_string(ARXML_PATH.read_text())
+    assert [bus.name for bus in database.buses] == ["Body"]
+    message = database.messages[0]
+    assert (message.name, message.frame_id, message.cycle_time) == ("Status_Frame", 0x123, 100)
+    speed = message.get_signal_by_name("Speed")
+    assert (speed.scale, speed.offset, speed.unit) == (0.5, -10, "km/h")
+    assert message.get_signal_by_name("Mode").choices == {0: "Off", 1: "On"}
+
+
+@pytest.mark.parametrize("low_memory", [False, True])
+def test_low_memory_equals_tree(low_memory: bool) -> None:
+    tree = arxml.load_string(ARXML_PATH.read_text())
+    with open(ARXML_PATH) as fin:
+        assert describe(arxml.load(fin, low_memory=low_memory)) == describe(tree)
+    database = Database()
+    database.add_arxml_file(ARXML_PATH, low_memory=low_memory)
+    assert describe(database) == describe(tree)
+
+
+def test_iterparse_drops_unused_elements() -> None:
+    root = iterparse_arxml(str(ARXML_PATH))
+    tags = {elem.tag[len(NAMESPACE):] for elem in root.iter()}
+    assert "CAN-FRAME" in tags
+    assert "COMPU-METHOD" in tags
+    for tag in ["ADMIN-DATA", "APPLICATION-SW-COMPONENT-TYPE", "SENDER-RECEIVER-INTERFACE",
+                "IMPLEMENTATION-DATA-TYPE"]:
+        assert tag not in tags
+    # the whitespace between the elements is not kept
+    assert root.text is None
+
+
+def test_child_lookup() -> None:
+    loader = SystemLoader(ElementTree.parse(ARXML_PATH).getroot(), strict=True)
+    loader.load()
+    cluster = loader._follow_arxml_reference(loader._root, "/Topology/Body", "CAN-CLUSTER")
+    assert cluster is not None
+    triggerings = loader._get_arxml_children(cluster, [
+        "CAN-CLUSTER-VARIANTS",
+        "*CAN-CLUSTER-CONDITIONAL",
+        "PHYSICAL-CHANNELS",
+        "*CAN-PHYSICAL-CHANNEL",
+        "FRAME-TRIGGERINGS",
+        "*CAN-FRAME-TRIGGERING",
+    ])
+    assert len(triggerings) == 1
+    # the '&' specifier follows the FRAME-REF child
+    frame = loader._get_unique_arxml_child(triggerings[0], "&FRAME")
+    assert frame.tag == NAMESPACE + "CAN-FRAME"
+    mappings = loader._get_arxml_children(frame, [
+        "PDU-TO-FRAME-MAPPINGS",
+        "*PDU-TO-FRAME-MAPPING",
+    ])
+    pdu = loader._get_unique_arxml_child(mappings[0], "&PDU")
+    signals = loader._get_arxml_children(pdu, [
+        "I-SIGNAL-TO-PDU-MAPPINGS",
+        "*I-SIGNAL-TO-I-PDU-MAPPING",
+        "&I-SIGNAL",
+    ])
+    assert [loader._get_unique_arxml_child(signal, "SHORT-NAME").text for signal in signals] == ["Speed", "Mode"]
+    assert loader._get_arxml_children(frame, ["UNKNOWN", "*CHILD"]) == []
+    # a unique location must not match more than one child
+    with pytest.raises(ValueError):
+        loader._get_arxml_children(pdu, ["I-SIGNAL-TO-PDU-MAPPINGS", "I-SIGNAL-TO-I-PDU-MAPPING"])
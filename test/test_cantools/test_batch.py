@@ -0,0 +1,123 @@
+import pathlib
+import random
+import struct
+import warnings
+import pytest
+from jidutest_can.can import RawMessage
+from jidutest_can.cantools import Database
+from jidutest_can.cantools import load_file
+
+np = pytest.importorskip("numpy")
+
+from jidutest_can.cantools.database.batch import BatchDecoder
+from jidutest_can.cantools.database.batch import NpzColumnWriter
+
+
+RESOURCE_DIR = pathlib.Path(__file__).parent.parent / "resource"
+
+MULTIPLEXED_DBC = '''VERSION ""
+
+BU_: ECU1
+
+BO_ 768 Mux: 8 ECU1
+ SG_ Selector M : 0|4@1+ (1,0) [0|15] "" Vector__XXX
+ SG_ LittleSigned m0 : 4|12@1- (0.5,0) [-1024|1023.5] "" Vector__XXX
+ SG_ BigUnsigned m0 : 23|16@0+ (1,0) [0|65535] "" Vector__XXX
+ SG_ BigSigned m1 : 15|20@0- (1,-100) [-524388|524187] "" Vector__XXX
+ SG_ Common : 56|8@1+ (1,0) [0|255] "" Vector__XXX
+
+BO_ 769 ScaledDouble: 8 ECU1
+ SG_ Double : 0|64@1- (10,-1) [0|0] "" Vector__XXX
+
+SIG_VALTYPE_ 769 Double : 2;
+'''
+
+
+@pytest.fixture
+def db() -> Database:
+    db = load_file(RESOURCE_DIR / "e2e.dbc")
+    db.add_dbc_file(RESOURCE_DIR / "float.dbc")
+    db.add_dbc_string(MULTIPLEXED_DBC)
+    return db
+
+
+def random_frames(db: Database, count: int) -> list:
+    generator = random.Random(0)
+    frames = []
+    for index in range(count):
+        message = generator.choice(db.messages)
+        data = bytes(generator.getrandbits(8) for _ in range(message.length))
+        frames.append(RawMessage(timestamp=index * 0.001, arbitration_id=message.frame_id, data=data))
+    return frames
+
+
+@pytest.mark.parametrize("scaling", [True, False])
+def test_columns_match_decode(db: Database, scaling: bool) -> None:
+    frames = random_frames(db, 3000)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", RuntimeWarning)
+        result = db.decode_batch(frames, scaling=scaling)
+    rows = {name: 0 for name in result}
+    for frame in frames:
+        message = db.get_message_by_frame_id(frame.arbitration_id)
+        columns = result[message.name]
+        row = rows[message.name]
+        rows[message.name] += 1
+        assert columns["timestamp"][row] == frame.timestamp
+        if message.is_multiplexed() and frame.data[0] & 0x0F > 1:
+            # unknown multiplexer id, only the multiplexer is decoded
+            assert np.isnan(columns["LittleSigned"][row]) and np.isnan(columns["BigSigned"][row])
+            continue
+        expected = message.decode(frame.data, decode_choices=False, scaling=scaling)
+        for name, column in columns.items():
+            if name == "timestamp":
+                continue
+            if name not in expected:
+                assert np.isnan(column[row])
+            else:
+                np.testing.assert_equal(column[row], expected[name])
+    assert rows == {name: len(columns["timestamp"]) for name, columns in result.items()}
+
+
+def test_float_overflow_is_infinite(db: Database) -> None:
+    frame = RawMessage(arbitration_id=769, data=struct.pack("<d", 1e308))
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", RuntimeWarning)
+        result = db.decode_batch([frame])
+    assert result["ScaledDouble"]["Double"][0] == np.inf
+    assert db.get_message_by_frame_id(769).decode(frame.data)["Double"] == np.inf
+
+
+def test_integer_columns(db: Database) -> None:
+    message = db.get_message_by_name("Msg2")
+    frame = RawMessage(arbitration_id=message.frame_id, data=bytes([1, 2, 3, 4, 5, 6, 7, 8]))
+    columns = db.decode_batch([frame])["Msg2"]
+    assert columns["Other"].dtype == np.int64
+    assert columns["timestamp"].dtype == np.float64
+
+
+def test_skipped_frames(db: Database) -> None:
+    decoder = BatchDecoder(db)
+    assert not decoder.add(RawMessage(arbitration_id=0x7FF, data=bytes(8)))
+    assert not decoder.add(RawMessage(arbitration_id=0x100, data=bytes(4)))
+    assert not decoder.add(RawMessage(arbitration_id=0x100, data=bytes(8), is_error_frame=True))
+    assert decoder.add(RawMessage(arbitration_id=0x100, data=bytes(8)))
+    assert decoder.skipped == 3
+    assert len(decoder.flush()["Msg1"]["timestamp"]) == 1
+    assert decoder.flush() == {}
+
+
+def test_npz_column_writer(db: Database, tmp_path: pathlib.Path) -> None:
+    frames = random_frames(db, 1000)
+    decoder = BatchDecoder(db)
+    path = tmp_path / "columns.npz"
+    with NpzColumnWriter(path) as writer:
+        for start in range(0, len(frames), 300):
+            writer.write(decoder.decode(frames[start:start + 300]))
+    expected = db.decode_batch(frames)
+    with np.load(path) as archive:
+        assert set(archive.files) == {f"{message}/{column}"
+                                      for message, columns in expected.items() for column in columns}
+        for message, columns in expected.items():
+            for column, values in columns.items():
+                np.testing.assert_array_equal(archive[f"{message}/{column}"], values)
@@ -0,0 +1,106 @@
+import pathlib
+import pickle
+import random
+import pytest
+from jidutest_can.cantools import Database
+from jidutest_can.cantools import Message
+from jidutest_can.cantools import load_file
+
+
+RESOURCE_DIR = pathlib.Path(__file__).parent.parent / "resource"
+
+MULTIPLEXED_DBC = '''VERSION ""
+
+BU_: ECU1
+
+BO_ 768 Mux: 8 ECU1
+ SG_ Selector M : 0|4@1+ (1,0) [0|15] "" Vector__XXX
+ SG_ LittleSigned m0 : 4|12@1- (0.5,0) [-1024|1023.5] "" Vector__XXX
+ SG_ BigUnsigned m0 : 23|16@0+ (1,0) [0|65535] "" Vector__XXX
+ SG_ BigSigned m1 : 15|20@0- (1,-100) [-524388|524187] "" Vector__XXX
+ SG_ Common : 56|8@1+ (1,0) [0|255] "" Vector__XXX
+'''
+
+
+def databases() -> list:
+    multiplexed = Database()
+    multiplexed.add_dbc_string(MULTIPLEXED_DBC)
+    return [load_file(RESOURCE_DIR / "e2e.dbc"), load_file(RESOURCE_DIR / "float.dbc"), multiplexed]
+
+
+def messages() -> list:
+    return [message for db in databases() for message in db.messages]
+
+
+def generic_codec(message: Message) -> Message:
+    generic = Message(message.frame_id, message.name, message.length, message.signals,
+                      is_extended_frame=message.is_extended_frame, strict=False, sort_signals=None)
+    generic.use_compiled_codec = False
+    generic.refresh()
+    return generic
+
+
+@pytest.mark.parametrize("message", messages(), ids=lambda message: message.name)
+def test_decode_matches_generic_codec(message: Message) -> None:
+    assert message.compiled_codec is not None
+    generic = generic_codec(message)
+    assert generic.compiled_codec is None
+    generator = random.Random(message.frame_id)
+    for _ in range(500):
+        data = bytes(generator.getrandbits(8) for _ in range(message.length))
+        if message.is_multiplexed() and data[0] & 0x0F > 1:
+            continue
+        for decode_choices in (True, False):
+            for scaling in (True, False):
+                compiled = message.decode(data, decode_choices, scaling)
+                expected = generic.decode(data, decode_choices, scaling)
+                # NaN payloads of float signals compare unequal
+                assert repr(compiled) == repr(expected)
+
+
+@pytest.mark.parametrize("message", messages(), ids=lambda message: message.name)
+def test_encode_matches_generic_codec(message: Message) -> None:
+    generic = generic_codec(message)
+    generator = random.Random(message.frame_id)
+    for _ in range(500):
+        data = bytes(generator.getrandbits(8) for _ in range(message.length))
+        if message.is_multiplexed() and data[0] & 0x0F > 1:
+            continue
+        signals = generic.decode(data, decode_choices=False, scaling=False)
+        if any(value != value for value in signals.values()):
+            continue
+        assert message.encode(signals, scaling=False, strict=False) == \
+               generic.encode(signals, scaling=False, strict=False)
+
+
+def test_encode_scaled_and_choices() -> None:
+    message = load_file(RESOURCE_DIR / "e2e.dbc").get_message_by_name("Msg1")
+    signals = {signal.name: 0 for signal in message.signals}
+    signals.update(Speed=-9.5, Mode="Auto", Wide=65535)
+    data = message.encode(signals)
+    decoded = message.decode(data)
+    assert decoded["Speed"] == -9.5
+    assert decoded["Mode"] == "Auto"
+    assert decoded["Wide"] == 65535
+    assert data == generic_codec(message).encode(signals)
+
+
+def test_refresh_recompiles() -> None:
+    message = load_file(RESOURCE_DIR / "e2e.dbc").get_message_by_name("Msg2")
+    codec = message.compiled_codec
+    message.refresh()
+    assert message.compiled_codec is not codec
+    message.use_compiled_codec = False
+    message.refresh()
+    assert message.compiled_codec is None
+
+
+def test_pickle_with_float_signals() -> None:
+    db = load_file(RESOURCE_DIR / "float.dbc")
+    restored = pickle.loads(pickle.dumps(db))
+    for message in db.messages:
+        copy = restored.get_message_by_name(message.name)
+        # the compiled codec is left out of the pickled state and compiled again
+        assert copy.compiled_codec is not None
+        data = bytes(range(1, message.length + 1))
+        assert copy.decode(data) == message.decode(data)
@@ -0,0 +1,59 @@
+import pathlib
+import pytest
+from jidutest_can.cantools import Database
+from jidutest_can.cantools import load_file
+
+
+DBC_PATH = pathlib.Path(__file__).parent.parent / "resource" / "e2e.dbc"
+
+
+@pytest.fixture
+def db() -> Database:
+    return load_file(DBC_PATH)
+
+
+def test_get_signal_by_name(db: Database) -> None:
+    signal = db.get_signal_by_name("Speed")
+    assert signal.name == "Speed"
+    assert signal in db.get_message_by_name("Msg1").signals
+
+
+def test_get_signal_by_name_with_other_case(db: Database) -> None:
+    with pytest.raises(KeyError):
+        db.get_signal_by_name("speed")
+
+
+def test_get_signal_by_unknown_name(db: Database) -> None:
+    with pytest.raises(KeyError):
+        db.get_signal_by_name("Unknown")
+
+
+def test_get_message_by_signal(db: Database) -> None:
+    assert db.get_message_by_signal("Other").name == "Msg2"
+    signal = db.get_signal_by_name("Wide")
+    assert db.get_message_by_signal(signal).name == "Msg1"
+    with pytest.raises(KeyError):
+        db.get_message_by_signal("Unknown")
+
+
+def test_signals(db: Database) -> None:
+    assert {signal.name for signal in db.signals} == {
+        signal.name for message in db.messages for signal in message.signals
+    }
+
+
+def test_index_follows_added_messages(db: Database) -> None:
+    db.add_dbc_string('VERSION ""\n'
+                      'BU_: ECU3\n'
+                      'BO_ 512 Msg3: 1 ECU3\n'
+                      ' SG_ Added : 0|8@1+ (1,0) [0|255] "" Vector__XXX\n')
+    assert db.get_message_by_signal("Added").name == "Msg3"
+    assert db.get_message_by_signal("Speed").name == "Msg1"
+
+
+def test_index_follows_refresh(db: Database) -> None:
+    message = db.get_message_by_name("Msg2")
+    db.messages.remove(message)
+    db.refresh()
+    with pytest.raises(KeyError):
+        db.get_message_by_signal("Other")
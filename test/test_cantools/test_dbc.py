@@ -0,0 +1,147 @@
+import pathlib
+import pytest
+from jidutest_can.cantools import Database
+from jidutest_can.cantools import Message
+from jidutest_can.cantools import Signal
+from jidutest_can.cantools.formats import dbc
+
+
+RESOURCE_DIR = pathlib.Path(__file__).parent.parent / "resource"
+
+STATEMENTS_DBC = '''VERSION "1.0"
+
+// a comment line
+NS_ :
+\tNS_DESC_
+\tCM_
+\tBA_DEF_
+\tBA_
+\tVAL_
+
+BS_:
+
+BU_: ECU1 ECU2
+
+VAL_TABLE_ OnOff 1 "On" 0 "Off" ;
+
+BO_ 256 Msg1: 8 ECU1
+ SG_ Mux M : 0|4@1+ (1,0) [0|15] "" ECU2
+ SG_ A m0 : 8|8@1+ (1,0) [0|255] "" ECU2
+ SG_ B m1 : 8|8@1- (0.5,-1) [-65|62.5] "deg" ECU2,ECU1
+ SG_ Big : 39|16@0+ (1,0) [0|65535] "" ECU2
+
+BO_ 2147484160 Msg2: 8 ECU2
+ SG_ Value : 0|32@1- (1,0) [0|0] "" ECU1
+ SG_ Counter : 32|4@1+ (1,0) [0|15] "" ECU1
+
+BO_TX_BU_ 256 : ECU1,ECU2;
+
+CM_ "Database comment";
+CM_ BU_ ECU1 "The first \\"ECU\\"";
+CM_ BO_ 256 "Message comment";
+CM_ SG_ 256 A "Signal comment
+over two lines";
+BA_DEF_ BO_ "GenMsgCycleTime" INT 0 10000;
+BA_DEF_ SG_ "GenSigStartValue" FLOAT 0 100;
+BA_DEF_ BU_ "NodeLayer" STRING ;
+BA_DEF_ BO_ "GenMsgSendType" ENUM "cyclic","spontaneous";
+BA_DEF_ "BusType" STRING ;
+BA_DEF_ BO_ "HexAttr" HEX 0 255;
+BA_DEF_DEF_ "GenMsgCycleTime" 100;
+BA_DEF_DEF_ "GenSigStartValue" 0;
+BA_DEF_DEF_ "NodeLayer" "";
+BA_DEF_DEF_ "GenMsgSendType" "cyclic";
+BA_DEF_DEF_ "BusType" "CAN";
+BA_DEF_DEF_ "HexAttr" 0;
+BA_ "BusType" "CAN FD";
+BA_ "GenMsgCycleTime" BO_ 256 20;
+BA_ "GenSigStartValue" SG_ 256 A 3.5;
+BA_ "NodeLayer" BU_ ECU1 "L2";
+BA_ "GenMsgSendType" BO_ 2147484160 1;
+VAL_ 256 A 0 "Zero" 255 "Max" ;
+SIG_VALTYPE_ 2147484160 Value : 1;
+SIG_GROUP_ 256 Grp 1 : A Big;
+'''
+
+ENVIRONMENT_VARIABLE_DBC = '''VERSION ""
+
+BU_: ECU1
+
+BO_ 256 Msg1: 8 ECU1
+ SG_ A : 0|8@1+ (1,0) [0|255] "" Vector__XXX
+
+EV_ EnvVar: 0 [0|100] "" 0 1 DUMMY_NODE_VECTOR0 Vector__XXX;
+'''
+
+
+def dbc_strings() -> list:
+    return [
+        (RESOURCE_DIR / "e2e.dbc").read_text(),
+        (RESOURCE_DIR / "float.dbc").read_text(),
+        STATEMENTS_DBC,
+    ]
+
+
+@pytest.mark.parametrize("string", dbc_strings())
+def test_fast_parser_equals_grammar(string: str) -> None:
+    assert dbc.FastParser().parse(string) is not None
+    fast = dbc.load_string(string)
+    grammar = dbc.load_string(string, fast=False)
+    assert dbc.dump_string(fast) == dbc.dump_string(grammar)
+
+
+def test_statements() -> None:
+    db = Database()
+    db.add_dbc_string(STATEMENTS_DBC)
+    assert db.version == "1.0"
+    assert db.dbc.attributes["BusType"].value == "CAN FD"
+    assert [node.name for node in db.nodes] == ["ECU1", "ECU2"]
+    assert db.nodes[0].comment == 'The first "ECU"'
+    msg1 = db.get_message_by_name("Msg1")
+    assert msg1.comment == "Message comment"
+    assert msg1.cycle_time == 20
+    assert msg1.senders == ["ECU1", "ECU2"]
+    assert msg1.is_multiplexed()
+    assert msg1.get_signal_by_name("A").comment == "Signal comment\nover two lines"
+    assert msg1.get_signal_by_name("A").choices[255] == "Max"
+    assert msg1.get_signal_by_name("B").receivers == ["ECU2", "ECU1"]
+    assert [group.name for group in msg1.signal_groups] == ["Grp"]
+    msg2 = db.get_message_by_name("Msg2")
+    assert msg2.is_extended_frame
+    assert msg2.frame_id == 0x200
+    assert msg2.get_signal_by_name("Value").is_float
+    assert db.dbc.value_tables["OnOff"] == {1: "On", 0: "Off"}
+
+
+def test_fallback_to_grammar() -> None:
+    assert dbc.FastParser().parse(ENVIRONMENT_VARIABLE_DBC) is None
+    database = dbc.load_string(ENVIRONMENT_VARIABLE_DBC)
+    assert list(database.dbc.environment_variables) == ["EnvVar"]
+
+
+def test_syntax_error() -> None:
+    string = STATEMENTS_DBC.replace("BO_ 256 Msg1: 8 ECU1", "BO_ 256 Msg1 8 ECU1")
+    assert dbc.FastParser().parse(string) is None
+    with pytest.raises(Exception, match="Invalid syntax"):
+        dbc.load_string(string)
+
+
+@pytest.mark.parametrize("start, byte_order, overlaps", [
+    (0, "little_endian", True),
+    (4, "little_endian", False),
+    (3, "little_endian", True),
+    (7, "big_endian", False),
+    (3, "big_endian", True),
+    # bits 1, 0, 15 and 14
+    (1, "big_endian", True),
+])
+def test_overlapping_signals(start: int, byte_order: str, overlaps: bool) -> None:
+    signals = [
+        Signal("First", 0, 4, "little_endian"),
+        Signal("Second", start, 4, byte_order),
+    ]
+    if overlaps:
+        with pytest.raises(Exception, match="overlap"):
+            Message(0x100, "Msg", 8, signals)
+    else:
+        Message(0x100, "Msg", 8, signals)
@@ -0,0 +1,125 @@
+import pathlib
+import pickle
+import pytest
+from jidutest_can.cantools import Database
+from jidutest_can.cantools.database import DecodeCache
+
+
+DBC_PATH = pathlib.Path(__file__).parent.parent / "resource" / "e2e.dbc"
+
+
+@pytest.fixture
+def db() -> Database:
+    database = Database()
+    database.add_dbc_file(DBC_PATH)
+    return database
+
+
+def payload(db: Database, **signals) -> bytes:
+    message = db.get_message_by_name("Msg1")
+    values = {signal.name: 0 for signal in message.signals}
+    values.update(signals)
+    return message.encode(values)
+
+
+def test_hits_and_misses(db: Database) -> None:
+    message = db.get_message_by_name("Msg1")
+    cache = DecodeCache()
+    data = payload(db, Speed=20, Mode=1)
+    assert cache.decode(message, data) == message.decode(data)
+    assert cache.decode(message, bytearray(data)) == message.decode(data)
+    # the options are part of the key
+    assert cache.decode(message, data, decode_choices=False)["Mode"] == 1
+    assert cache.decode(message, data, scaling=False)["Speed"] == 60
+    statistics = cache.statistics()
+    assert (statistics["entries"], statistics["hits"], statistics["misses"]) == (3, 1, 3)
+    assert statistics["hit_rate"] == 0.25
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.statistics()["hits"] == 1
+
+
+def test_lru_eviction(db: Database) -> None:
+    message = db.get_message_by_name("Msg1")
+    cache = DecodeCache(maxsize=2)
+    first, second, third = (payload(db, Speed=speed) for speed in (1, 2, 3))
+    cache.decode(message, first)
+    cache.decode(message, second)
+    # the first payload is used more recently than the second one now
+    cache.decode(message, first)
+    cache.decode(message, third)
+    assert len(cache) == 2
+    assert cache.evictions == 1
+    cache.decode(message, first)
+    assert cache.hits == 2
+    cache.decode(message, second)
+    assert cache.misses == 4
+
+
+def test_max_bytes(db: Database) -> None:
+    message = db.get_message_by_name("Msg1")
+    cache = DecodeCache(max_bytes=1)
+    for speed in range(3):
+        cache.decode(message, payload(db, Speed=speed))
+    # the last payload is kept even if it exceeds the limit on its own
+    assert len(cache) == 1
+    assert cache.evictions == 2
+    assert cache.size > cache.max_bytes
+
+
+def test_copy(db: Database) -> None:
+    message = db.get_message_by_name("Msg1")
+    data = payload(db, Speed=20)
+    cache = DecodeCache()
+    cache.decode(message, data)["Speed"] = 0
+    decoded = cache.decode(message, data)
+    assert decoded["Speed"] == 20
+    decoded["Speed"] = 0
+    assert cache.decode(message, data)["Speed"] == 20
+
+
+def test_read_only(db: Database) -> None:
+    message = db.get_message_by_name("Msg1")
+    data = payload(db, Speed=20)
+    cache = DecodeCache(copy=False)
+    decoded = cache.decode(message, data)
+    assert cache.decode(message, data) is decoded
+    with pytest.raises(TypeError):
+        decoded["Speed"] = 0
+
+
+def test_errors_are_not_cached(db: Database) -> None:
+    message = db.get_message_by_name("Msg1")
+    cache = DecodeCache()
+    for _ in range(2):
+        with pytest.raises(Exception):
+            cache.decode(message, b"\x00")
+    assert len(cache) == 0
+    assert cache.decode(message, b"\x00", allow_truncated=True) == message.decode(b"\x00", allow_truncated=True)
+
+
+def test_invalid_maxsize() -> None:
+    with pytest.raises(ValueError):
+        DecodeCache(maxsize=0)
+
+
+def test_pickle(db: Database) -> None:
+    cache = DecodeCache(maxsize=10, max_bytes=1000, copy=False)
+    cache.decode(db.get_message_by_name("Msg1"), payload(db))
+    restored = pickle.loads(pickle.dumps(cache))
+    assert (restored.maxsize, restored.max_bytes, restored.copy) == (10, 1000, False)
+    assert len(restored) == 0
+
+
+def test_database_cache(db: Database) -> None:
+    data = payload(db, Speed=20)
+    cache = db.enable_decode_cache(maxsize=16)
+    assert db.decode_cache is cache
+    assert db.get_message_by_name("Msg2").decode_cache is cache
+    assert db.decode_message("Msg1", data) == db.decode_message(0x100, data)
+    assert db.get_message_by_name("Msg1").decode(data)["Speed"] == 20
+    assert (cache.misses, cache.hits) == (1, 2)
+    db.disable_decode_cache()
+    assert db.decode_cache is None
+    db.decode_message("Msg1", data)
+    assert cache.hits == 2
@@ -0,0 +1,76 @@
+import os
+import pathlib
+import pickle
+import shutil
+import pytest
+from jidutest_can.cantools import DatabaseRegistry
+from jidutest_can.cantools.database import Error
+
+
+RESOURCE_DIR = pathlib.Path(__file__).parent.parent / "resource"
+
+
+@pytest.fixture
+def dbc_path(tmp_path: pathlib.Path) -> pathlib.Path:
+    path = tmp_path / "float.dbc"
+    shutil.copy(RESOURCE_DIR / "float.dbc", path)
+    return path
+
+
+def test_same_file_is_parsed_once(dbc_path: pathlib.Path) -> None:
+    registry = DatabaseRegistry(cache_dir=None)
+    db = registry.load_file(dbc_path)
+    assert registry.load_file(str(dbc_path)) is db
+    assert registry.statistics() == {"databases": 1, "hits": 1, "cache_hits": 0, "misses": 1}
+
+
+def test_shared_database_is_frozen(dbc_path: pathlib.Path) -> None:
+    db = DatabaseRegistry(cache_dir=None).load_file(dbc_path)
+    assert db.is_frozen
+    with pytest.raises(Error):
+        db.add_dbc_string('VERSION ""\n')
+
+
+def test_modified_file_is_parsed_again(dbc_path: pathlib.Path) -> None:
+    registry = DatabaseRegistry(cache_dir=None)
+    db = registry.load_file(dbc_path)
+    dbc_path.write_text(dbc_path.read_text().replace("FloatMsg", "RenamedMsg"))
+    os.utime(dbc_path, ns=(0, os.stat(dbc_path).st_mtime_ns + 10 ** 9))
+    modified = registry.load_file(dbc_path)
+    assert modified is not db
+    assert modified.get_message_by_name("RenamedMsg").frame_id == 512
+    assert registry.statistics()["databases"] == 1
+
+
+def test_persistent_cache_hit_with_float_signals(dbc_path: pathlib.Path, tmp_path: pathlib.Path) -> None:
+    cache_dir = str(tmp_path / "cache")
+    registry = DatabaseRegistry(cache_dir=cache_dir)
+    parsed = registry.load_file(dbc_path)
+    registry.close()
+    assert registry.misses == 1
+
+    registry = DatabaseRegistry(cache_dir=cache_dir)
+    cached = registry.load_file(dbc_path)
+    registry.close()
+    assert registry.statistics()["cache_hits"] == 1
+    assert registry.misses == 0
+
+    message = cached.get_message_by_name("FloatMsg")
+    assert message.compiled_codec is not None
+    data = parsed.get_message_by_name("FloatMsg").encode({"Temperature": -21.5, "Status": 3, "Level": 7.5})
+    assert message.decode(data) == {"Temperature": -21.5, "Status": 3, "Level": 7.5}
+    assert cached.get_message_by_name("DoubleMsg").decode(bytes(8)) == {"Value": 0.0}
+
+
+def test_pickled_message_compiles_its_codec(dbc_path: pathlib.Path) -> None:
+    db = DatabaseRegistry(cache_dir=None).load_file(dbc_path)
+    message = pickle.loads(pickle.dumps(db.get_message_by_name("FloatMsg")))
+    assert message.compiled_codec is not None
+    assert message.encode({"Temperature": 1.0, "Status": 0, "Level": 0}) == \
+           db.get_message_by_name("FloatMsg").encode({"Temperature": 1.0, "Status": 0, "Level": 0})
+
+
+def test_warm_up(dbc_path: pathlib.Path) -> None:
+    registry = DatabaseRegistry(cache_dir=None)
+    db, = registry.warm_up([dbc_path])
+    assert registry.load_file(dbc_path) is db
@@ -0,0 +1,156 @@
+import math
+import pathlib
+import random
+import pytest
+from jidutest_can.cantools import Database
+from jidutest_can.cantools import Message
+from jidutest_can.cantools import MessageTemplate
+from jidutest_can.cantools import load_file
+from jidutest_can.cantools.database import EncodeError
+from .test_codec import MULTIPLEXED_DBC
+from .test_codec import generic_codec
+
+
+RESOURCE_DIR = pathlib.Path(__file__).parent.parent / "resource"
+
+
+def messages() -> list:
+    return [message for name in ("e2e.dbc", "float.dbc") for message in load_file(RESOURCE_DIR / name).messages]
+
+
+@pytest.fixture(scope="module")
+def db() -> Database:
+    return load_file(RESOURCE_DIR / "e2e.dbc")
+
+
+@pytest.mark.parametrize("message", messages(), ids=lambda message: message.name)
+def test_patches_equal_encode(message: Message) -> None:
+    generator = random.Random(message.frame_id)
+    template = MessageTemplate(message, strict=False)
+    for _ in range(200):
+        data = bytes(generator.getrandbits(8) for _ in range(message.length))
+        raw = message.decode(data, decode_choices=False, scaling=False)
+        if any(isinstance(value, float) and math.isnan(value) for value in raw.values()):
+            continue
+        # a few signals at a time, the others keep their values
+        names = generator.sample(sorted(raw), generator.randint(1, len(raw)))
+        template.update({name: raw[name] for name in names}, scaling=False)
+        expected = message.decode(template.data, decode_choices=False, scaling=False)
+        expected.update({name: raw[name] for name in names})
+        assert template.data == message.encode(expected, scaling=False, strict=False)
+        for name in names:
+            assert template.get_raw(name) == raw[name]
+
+
+def test_initial_values() -> None:
+    message = load_file(RESOURCE_DIR / "float.dbc").get_message_by_name("FloatMsg")
+    template = MessageTemplate(message)
+    initial = {signal.name: signal.initial or 0 for signal in message.signals}
+    assert template.data == message.encode(initial, scaling=False, strict=False)
+
+
+def test_physical_values(db: Database) -> None:
+    message = db.get_message_by_name("Msg1")
+    template = MessageTemplate(message)
+    template.update({"Speed": 100, "Mode": "Auto"})
+    template["Flag"] = 1
+    assert template.get_raw("Speed") == 220
+    assert template["Speed"] == 100
+    assert template["Mode"] == 2
+    assert template.decode()["Mode"] == "Auto"
+    template.set_raw("Wide", 0x1234)
+    assert template.decode(scaling=False)["Wide"] == 0x1234
+    assert list(template) == [signal.name for signal in message.signals]
+
+
+def test_strict(db: Database) -> None:
+    message = db.get_message_by_name("Msg1")
+    template = MessageTemplate(message)
+    template.update({"Speed": 20})
+    data = template.data
+    with pytest.raises(EncodeError):
+        template.update({"Mode": 1, "Speed": 5000})
+    with pytest.raises(EncodeError):
+        template.update({"Mode": "Unknown"})
+    with pytest.raises(KeyError):
+        template.update({"Unknown": 1})
+    # a failing update leaves the payload unchanged
+    assert template.data == data
+    # out of range values are truncated to the signal if not strict
+    loose = MessageTemplate(message, strict=False)
+    loose.set_raw("Grp1Cntr", 15)
+    assert loose.get_raw("Grp1Cntr") == 15
+
+
+def test_data(db: Database) -> None:
+    message = db.get_message_by_name("Msg1")
+    template = MessageTemplate(message, bytes(range(8)))
+    assert bytes(template) == bytes(range(8))
+    copy = template.copy()
+    copy["Wide"] = 0
+    assert template.data == bytes(range(8))
+    template.data = bytes(8)
+    assert template.data == bytes(8)
+    with pytest.raises(ValueError):
+        template.data = bytes(4)
+    with pytest.raises(ValueError):
+        MessageTemplate(message, bytes(4))
+
+
+def test_multiplexed_signals() -> None:
+    db = Database()
+    db.add_dbc_string(MULTIPLEXED_DBC)
+    message = db.get_message_by_name("Mux")
+    template = MessageTemplate(message, strict=False)
+    template.update({"Selector": 1, "BigSigned": -1000, "Common": 7}, scaling=False)
+    assert template.data == message.encode({"Selector": 1, "BigSigned": -1000, "Common": 7},
+                                           scaling=False, strict=False)
+    assert template.get_raw("BigSigned") == -1000
+
+
+MUX_INITIAL_DBC = '''VERSION ""
+
+BU_: ECU1
+
+BO_ 769 MuxOff: 8 ECU1
+ SG_ Mux M : 0|4@1+ (1,0) [0|15] "" Vector__XXX
+ SG_ A m0 : 5|8@1+ (1,0) [0|255] "" Vector__XXX
+ SG_ B m1 : 9|8@1+ (1,0) [0|255] "" Vector__XXX
+ SG_ Common : 56|8@1+ (1,0) [0|255] "" Vector__XXX
+
+BO_ 770 MuxOn: 8 ECU1
+ SG_ Mux M : 0|4@1+ (1,0) [0|15] "" Vector__XXX
+ SG_ A m0 : 5|8@1+ (1,0) [0|255] "" Vector__XXX
+ SG_ B m1 : 9|8@1+ (1,0) [0|255] "" Vector__XXX
+
+BA_DEF_ SG_ "GenSigStartValue" FLOAT 0 100000;
+BA_DEF_DEF_ "GenSigStartValue" 0;
+BA_ "GenSigStartValue" SG_ 769 A 3;
+BA_ "GenSigStartValue" SG_ 769 B 200;
+BA_ "GenSigStartValue" SG_ 769 Common 7;
+BA_ "GenSigStartValue" SG_ 770 Mux 1;
+BA_ "GenSigStartValue" SG_ 770 A 3;
+BA_ "GenSigStartValue" SG_ 770 B 200;
+'''
+
+
+def test_multiplexed_initial_values() -> None:
+    db = Database()
+    db.add_dbc_string(MUX_INITIAL_DBC)
+    # only the branch selected by the initial value of the multiplexer is written
+    for name, expected in (("MuxOff", {"Mux": 0, "A": 3, "Common": 7}), ("MuxOn", {"Mux": 1, "B": 200})):
+        message = db.get_message_by_name(name)
+        template = MessageTemplate(message)
+        assert message.decode(template.data) == expected
+        assert template.data == message.encode(expected)
+
+def test_generic_codec(db: Database) -> None:
+    message = generic_codec(db.get_message_by_name("Msg1"))
+    template = MessageTemplate(message)
+    template.update({"Speed": 100, "Mode": "On"})
+    assert template.get_raw("Speed") == 220
+    expected = {signal.name: 0 for signal in message.signals}
+    expected.update({"Speed": 220, "Mode": 1})
+    assert template.data == message.encode(expected, scaling=False)
+    with pytest.raises(KeyError):
+        template.update({"Unknown": 1})